@@ -0,0 +1,88 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+"""A script to compare the timing of photon shooting Sersic and Spergel profiles using the default
+interval-based sampler and the inverse-CDF table sampler (GSParams.shoot_inverse_cdf=True).
+"""
+
+import os
+import sys
+import logging
+import time
+
+# This machinery lets us run Python examples even though they aren't positioned
+# properly to find galsim as a package in the current directory.
+try:
+    import galsim
+except ImportError:
+    path, filename = os.path.split(__file__)
+    sys.path.append(os.path.abspath(os.path.join(path, "..")))
+    import galsim
+
+NIMAGES = 100
+NPHOTONS = 500000        # Number of photons per draw
+PIXEL_SCALE = 1.0        # arcsec
+IMAGE_XMAX = 64          # pixels
+IMAGE_YMAX = 64          # pixels
+HALF_LIGHT_RADIUS = 5.
+SERSIC_N = [1.5, 2.5, 4., 6.]
+SPERGEL_NU = [-0.6, 0., 0.5, 2.]
+
+RANDOM_SEED = 3231139901
+
+def time_shoot(name, make_gal, logger):
+    """Shoot photons through the profile returned by make_gal(gsparams) with each of the two
+    sampling methods, recording the time taken for the first draw (which includes the setup of
+    the sampler) and for the remaining draws.
+    """
+    for inv_cdf in [False, True]:
+        gsparams = galsim.GSParams(shoot_inverse_cdf=inv_cdf)
+        rng = galsim.UniformDeviate(RANDOM_SEED)
+        image = galsim.ImageF(IMAGE_XMAX, IMAGE_YMAX, scale=PIXEL_SCALE)
+
+        t1 = time.time()
+        gal = make_gal(gsparams)
+        gal.drawImage(image, method='phot', n_photons=NPHOTONS, rng=rng)
+        t2 = time.time()
+        for i in range(1, NIMAGES):
+            gal = make_gal(gsparams)
+            gal.drawImage(image, method='phot', n_photons=NPHOTONS, rng=rng)
+        t3 = time.time()
+        logger.info(
+            '%s: shoot_inverse_cdf = %s, NIMAGES = %d, NPHOTONS = %d, '
+            'setup + first draw = %f sec, remaining draws = %f sec',
+            name, inv_cdf, NIMAGES, NPHOTONS, t2-t1, t3-t2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        format="%(message)s",
+        level=logging.DEBUG,
+        stream=sys.stdout
+    )
+    logger = logging.getLogger("time_inverse_cdf")
+    for n in SERSIC_N:
+        time_shoot('Sersic(n=%s)'%n,
+                   lambda gsp: galsim.Sersic(n=n, half_light_radius=HALF_LIGHT_RADIUS,
+                                             gsparams=gsp),
+                   logger)
+    for nu in SPERGEL_NU:
+        time_shoot('Spergel(nu=%s)'%nu,
+                   lambda gsp: galsim.Spergel(nu=nu, half_light_radius=HALF_LIGHT_RADIUS,
+                                              gsparams=gsp),
+                   logger)
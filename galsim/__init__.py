@@ -111,17 +111,18 @@ from .correlatednoise import CorrelatedNoise, getCOSMOSNoise, UncorrelatedNoise
 
 # GSObject
 from .base import GSParams, GSObject, Gaussian, Moffat, Airy, Kolmogorov, Pixel, Box, TopHat
-from .base import Exponential, Sersic, DeVaucouleurs, Spergel
+from .base import Exponential, Sersic, DeVaucouleurs, Spergel, Streak
 from .real import RealGalaxy, RealGalaxyCatalog, simReal
 from .phase_psf import Aperture, PhaseScreenList, PhaseScreenPSF, OpticalPSF
 from .phase_screens import AtmosphericScreen, Atmosphere, OpticalScreen
+from .psf_field import PSFField
 from .shapelet import Shapelet, ShapeletSize, FitShapelet
 from .interpolatedimage import Interpolant
 from .interpolatedimage import Nearest, Linear, Cubic, Quintic, Lanczos, SincInterpolant, Delta
 from .interpolatedimage import InterpolatedImage, InterpolatedKImage
 from .compound import Add, Sum, Convolve, Convolution, Deconvolve, Deconvolution
 from .compound import AutoConvolve, AutoConvolution, AutoCorrelate, AutoCorrelation
-from .compound import FourierSqrt, FourierSqrtProfile
+from .compound import FourierSqrt, FourierSqrtProfile, Cloud
 from .transform import Transform, Transformation
 
 # Chromatic
@@ -132,6 +133,7 @@ from .chromatic import ChromaticFourierSqrtProfile
 from .chromatic import ChromaticOpticalPSF, ChromaticAiry, InterpolatedChromaticObject
 from .sed import SED
 from .bandpass import Bandpass
+from .photon_array import PhotonArray, WavelengthSampler, PhotonDCR, PhotonGeometricOptics
 
 # WCS
 from .fits import FitsHeader
@@ -162,3 +164,4 @@ from . import dcr
 from . import meta_data
 from . import cdmodel
 from . import optics
+from . import serialize
@@ -46,6 +46,35 @@ from . import utilities
 from . import _galsim
 from ._galsim import GSParams
 
+def _parse_pos_arrays(args, kwargs, name1, name2):
+    """Check whether the arguments to xValue or kValue are arrays of positions.
+
+    If they are, return the x and y values as contiguous 1-d float arrays, along with the shape of
+    the output.  Otherwise return None, and the arguments should be parsed as a single position.
+    """
+    if len(args) == 2 and not kwargs:
+        x, y = args
+    elif len(args) == 0 and len(kwargs) == 2 and name1 in kwargs and name2 in kwargs:
+        x, y = kwargs[name1], kwargs[name2]
+    else:
+        return None
+    if np.ndim(x) == 0 and np.ndim(y) == 0:
+        return None
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    shape = x.shape
+    x = np.ascontiguousarray(x.ravel())
+    y = np.ascontiguousarray(y.ravel())
+    return x, y, shape
+
+def _fourier_draw_size(stepk, wmult, image_size, min_size):
+    """The size of the FFT to use in one direction, as FourierDrawSize in SBProfile.cpp.
+    """
+    N = int(np.ceil(2.*np.pi/stepk * wmult * (1.-1.e-12)))
+    N = 2*((N+1)//2)
+    N = max(N, image_size)
+    N = _galsim.goodFFTSize(N)
+    return max(N, min_size)
+
 class GSObject(object):
     """Base class for all GalSim classes that represent some kind of surface brightness profile.
 
@@ -207,7 +236,9 @@ class GSObject(object):
                   'shoot_accuracy' : float,
                   'allowed_flux_variation' : float,
                   'range_division_for_extrema' : int,
-                  'small_fraction_of_flux' : float
+                  'small_fraction_of_flux' : float,
+                  'shoot_inverse_cdf' : bool,
+                  'interpolate_sersic_n' : bool
                 }
     def __init__(self, obj):
         # This guarantees that all GSObjects have an SBProfile
@@ -347,10 +378,18 @@ class GSObject(object):
     def calculateHLR(self, size=None, scale=None, centroid=None, flux_frac=0.5):
         """Returns the half-light radius of the object.
 
-        If the profile has a half_light_radius attribute, it will just return that, but in the
-        general case, we draw the profile and estimate the half-light radius directly.
+        If the profile has a half_light_radius attribute, it will just return that.  Likewise,
+        a rotated or dilated version of such a profile just scales this value appropriately.
+        For other profiles that are axially symmetric about their centroid (e.g. a sum or
+        convolution of round profiles), the enclosed flux is integrated numerically, using the
+        Hankel transform of the Fourier-space profile if the real-space profile is not
+        analytic.  In these cases, the `size` and `scale` parameters are not used.
+
+        In the general case, we draw the profile and estimate the half-light radius directly.
+        The result is cached, so calling this again with the same arguments is fast.
 
-        This function (by default at least) is only accurate to a few percent, typically.
+        When the profile needs to be drawn, this function (by default at least) is only accurate
+        to a few percent, typically.
         Possibly worse depending on the profile being measured.  If you care about a high
         precision estimate of the half-light radius, the accuracy can be improved using the
         optional parameter scale to change the pixel scale used to draw the profile.
@@ -382,22 +421,32 @@ class GSObject(object):
 
         @returns an estimate of the half-light radius in physical units
         """
-        if hasattr(self, 'half_light_radius'):
-            return self.half_light_radius
-
-        if scale is None:
-            scale = self.nyquistScale() * 0.5
-
         if centroid is None:
             centroid = self.centroid()
 
-        # Draw the image.  Note: need a method that integrates over pixels to get flux right.
-        # The offset is to make all the rsq values different to help the precision a bit.
-        offset = galsim.PositionD(0.2, 0.33)
-        im = self.drawImage(nx=size, ny=size, scale=scale, offset=offset)
+        key = ('hlr', size, scale, centroid.x, centroid.y, flux_frac)
+        cache = self.__dict__.setdefault('_size_cache', {})
+        if key in cache:
+            return cache[key]
+
+        hlr = None
+        if self._isCentroid(centroid):
+            hlr = self._calculateExactHLR(flux_frac)
+
+        if hlr is None:
+            if scale is None:
+                scale = self.nyquistScale() * 0.5
+
+            # Draw the image.  Note: need a method that integrates over pixels to get flux right.
+            # The offset is to make all the rsq values different to help the precision a bit.
+            offset = galsim.PositionD(0.2, 0.33)
+            im = self.drawImage(nx=size, ny=size, scale=scale, offset=offset)
+
+            center = im.trueCenter() + offset + centroid/scale
+            hlr = im.calculateHLR(center=center, flux=self.flux, flux_frac=flux_frac)
 
-        center = im.trueCenter() + offset + centroid/scale
-        return im.calculateHLR(center=center, flux=self.flux, flux_frac=flux_frac)
+        cache[key] = hlr
+        return hlr
 
 
     def calculateMomentRadius(self, size=None, scale=None, centroid=None, rtype='det'):
@@ -418,13 +467,21 @@ class GSObject(object):
         it to return det(Q)^1/4.  And `rtype='both'` will return a tuple with both values.
 
         Note that for the special case of a Gaussian profile, no calculation is necessary, and
-        the `sigma` attribute will be used in both cases.  In the limit as scale->0, this
-        function will return the same value, but because finite pixels are drawn, the results
-        will not be precisely equal for real use cases.  The approximation being made is that
-        the integral of I(x,y) i j dx dy over each pixel can be approximated as
-        int(I(x,y) dx dy) * i_center * j_center.
-
-        This function (by default at least) is only accurate to a few percent, typically.
+        the `sigma` attribute will be used in both cases.  Similarly, the second moments are
+        known analytically for most of the simple profiles whose moments are finite
+        (e.g. Exponential, Sersic, Moffat with beta > 2, Spergel, Box), and they may be
+        propagated exactly through transformations, sums and convolutions of such profiles.
+        In these cases, the `size` and `scale` parameters are not used.
+
+        Otherwise, the profile is drawn and the moments measured from the image.  In the limit as
+        scale->0, this will approach the exact value, but because finite pixels are drawn, the
+        results will not be precisely equal for real use cases.  The approximation being made is
+        that the integral of I(x,y) i j dx dy over each pixel can be approximated as
+        int(I(x,y) dx dy) * i_center * j_center.  The result is cached, so calling this again with
+        the same arguments is fast.
+
+        When the profile needs to be drawn, this function (by default at least) is only accurate
+        to a few percent, typically.
         Possibly worse depending on the profile being measured.  If you care about a high
         precision estimate of the radius, the accuracy can be improved using the optional
         parameters size and scale to change the size and pixel scale used to draw the profile.
@@ -454,30 +511,56 @@ class GSObject(object):
         if rtype not in ['trace', 'det', 'both']:
             raise ValueError("rtype must be one of 'trace', 'det', or 'both'")
 
-        if hasattr(self, 'sigma'):
+        if centroid is None:
+            centroid = self.centroid()
+
+        if hasattr(self, 'sigma') and self._isCentroid(centroid):
             if rtype == 'both':
                 return self.sigma, self.sigma
             else:
                 return self.sigma
 
-        if scale is None:
-            scale = self.nyquistScale()
+        key = ('moments', size, scale, centroid.x, centroid.y)
+        cache = self.__dict__.setdefault('_size_cache', {})
+        if key not in cache:
+            Q = self._calculateMoments()
+            if Q is not None:
+                Qxx, Qxy, Qyy = Q
+                # Moments about some other point than the centroid pick up the offset.
+                c = self.centroid()
+                dx = c.x - centroid.x
+                dy = c.y - centroid.y
+                Qxx += dx*dx
+                Qxy += dx*dy
+                Qyy += dy*dy
+                cache[key] = (np.sqrt(0.5 * (Qxx + Qyy)), (Qxx*Qyy - Qxy**2)**0.25)
+            else:
+                if scale is None:
+                    scale = self.nyquistScale()
 
-        if centroid is None:
-            centroid = self.centroid()
+                # Draw the image.  Note: need a method that integrates over pixels to get flux
+                # right.
+                im = self.drawImage(nx=size, ny=size, scale=scale)
 
-        # Draw the image.  Note: need a method that integrates over pixels to get flux right.
-        im = self.drawImage(nx=size, ny=size, scale=scale)
+                center = im.trueCenter() + centroid/scale
+                cache[key] = im.calculateMomentRadius(center=center, flux=self.flux, rtype='both')
 
-        center = im.trueCenter() + centroid/scale
-        return im.calculateMomentRadius(center=center, flux=self.flux, rtype=rtype)
+        if rtype == 'both':
+            return cache[key]
+        elif rtype == 'trace':
+            return cache[key][0]
+        else:
+            return cache[key][1]
 
 
     def calculateFWHM(self, size=None, scale=None, centroid=None):
         """Returns the full-width half-maximum (FWHM) of the object.
 
-        If the profile has a fwhm attribute, it will just return that, but in the general case,
-        we draw the profile and estimate the FWHM directly.
+        If the profile has a fwhm attribute, it will just return that.  As with calculateHLR,
+        rotated or dilated versions of such profiles and other profiles that are axially symmetric
+        about their centroid are calculated without drawing.  In the general case, we draw the
+        profile and estimate the FWHM directly.  The result is cached, so calling this again with
+        the same arguments is fast.
 
         As with calculateHLR and calculateMomentRadius, this function optionally takes size and
         scale values to use for the image drawing.  The default is to use the the Nyquist scale
@@ -495,31 +578,85 @@ class GSObject(object):
 
         @returns an estimate of the full-width half-maximum in physical units
         """
-        if hasattr(self, 'fwhm'):
-            return self.fwhm
-
-        if scale is None:
-            scale = self.nyquistScale()
-
         if centroid is None:
             centroid = self.centroid()
 
-        # Draw the image.  Note: draw with method='sb' here, since the fwhm is a property of the
-        # raw surface brightness profile, not integrated over pixels.
-        # The offset is to make all the rsq values different to help the precision a bit.
-        offset = galsim.PositionD(0.2, 0.33)
+        key = ('fwhm', size, scale, centroid.x, centroid.y)
+        cache = self.__dict__.setdefault('_size_cache', {})
+        if key in cache:
+            return cache[key]
+
+        fwhm = None
+        if self._isCentroid(centroid):
+            fwhm = self._calculateExactFWHM()
+
+        if fwhm is None:
+            if scale is None:
+                scale = self.nyquistScale()
+
+            # Draw the image.  Note: draw with method='sb' here, since the fwhm is a property of
+            # the raw surface brightness profile, not integrated over pixels.
+            # The offset is to make all the rsq values different to help the precision a bit.
+            offset = galsim.PositionD(0.2, 0.33)
+
+            im = self.drawImage(nx=size, ny=size, scale=scale, offset=offset, method='sb')
 
-        im = self.drawImage(nx=size, ny=size, scale=scale, offset=offset, method='sb')
+            # Get the maximum value, assuming the maximum is at the centroid.
+            if self.isAnalyticX():
+                Imax = self.xValue(centroid)
+            else:
+                im1 = self.drawImage(nx=1, ny=1, scale=scale, method='sb', offset=-centroid/scale)
+                Imax = im1(1,1)
+
+            center = im.trueCenter() + offset + centroid/scale
+            fwhm = im.calculateFWHM(center=center, Imax=Imax)
+
+        cache[key] = fwhm
+        return fwhm
 
-        # Get the maximum value, assuming the maximum is at the centroid.
-        if self.isAnalyticX():
-            Imax = self.xValue(centroid)
+    def _isCentroid(self, pos):
+        # Check whether pos is the centroid of the profile.
+        c = self.centroid()
+        return pos.x == c.x and pos.y == c.y
+
+    def _centered(self):
+        # Return a version of the profile shifted to have its centroid at the origin.
+        c = self.centroid()
+        if c.x == 0. and c.y == 0.:
+            return self
         else:
-            im1 = self.drawImage(nx=1, ny=1, scale=scale, method='sb', offset=-centroid/scale)
-            Imax = im1(1,1)
+            return self.shift(-c.x, -c.y)
+
+    def _calculateExactHLR(self, flux_frac):
+        # Calculate the radius about the centroid enclosing flux_frac of the flux without drawing
+        # the profile.  Returns None if this is not possible.
+        if flux_frac == 0.5 and hasattr(self, 'half_light_radius'):
+            return self.half_light_radius
+        prof = self._centered()
+        if prof.isAxisymmetric() and 0. < flux_frac < 1.:
+            try:
+                return prof.SBProfile.calculateHLR(flux_frac)
+            except RuntimeError:
+                # Then draw it after all.
+                pass
+        return None
+
+    def _calculateExactFWHM(self):
+        # Calculate the FWHM without drawing the profile.  Returns None if this is not possible.
+        if hasattr(self, 'fwhm'):
+            return self.fwhm
+        prof = self._centered()
+        if prof.isAxisymmetric():
+            try:
+                return prof.SBProfile.calculateFWHM()
+            except RuntimeError:
+                pass
+        return None
 
-        center = im.trueCenter() + offset + centroid/scale
-        return im.calculateFWHM(center=center, Imax=Imax)
+    def _calculateMoments(self):
+        # Return the unweighted second moments (Qxx, Qxy, Qyy) of the flux-normalized profile
+        # about its centroid, or None if they are not known analytically.
+        return None
 
 
     @property
@@ -534,6 +671,13 @@ class GSObject(object):
         in real space.  The position argument may be provided as a PositionD or PositionI
         argument, or it may be given as x,y (either as a tuple or as two arguments).
 
+        The x and y values may also be NumPy arrays (or lists, etc.), in which case the
+        surface brightness is calculated at all of the positions `(x[i], y[i])` in a single call
+        to the C++ layer, which is much faster than calling xValue() in a loop.  In this case,
+        the return value is a NumPy array with the (broadcast) shape of x and y.
+
+            >>> vals = obj.xValue(x_array, y_array)
+
         The object surface brightness profiles are typically defined in world coordinates, so
         the position here should be in world coordinates as well.
 
@@ -550,6 +694,12 @@ class GSObject(object):
 
         @returns the surface brightness at that position.
         """
+        xy = _parse_pos_arrays(args,kwargs,'x','y')
+        if xy is not None:
+            x, y, shape = xy
+            vals = np.empty(x.shape, dtype=float)
+            self.SBProfile.xValueMany(x, y, vals)
+            return vals.reshape(shape)
         pos = galsim.utilities.parse_pos_args(args,kwargs,'x','y')
         return self.SBProfile.xValue(pos)
 
@@ -561,6 +711,9 @@ class GSObject(object):
         PositionD or PositionI argument, or it may be given as kx,ky (either as a tuple or as two
         arguments).
 
+        As with xValue(), kx and ky may also be NumPy arrays, in which case a complex NumPy array
+        of the values at all of the positions `(kx[i], ky[i])` is returned.
+
         Techinically, kValue() is available if and only if the given obj has `obj.isAnalyticK()
         == True`, but this is the case for all GSObjects currently, so that should never be an
         issue (unlike for xValue()).
@@ -569,6 +722,12 @@ class GSObject(object):
 
         @returns the amplitude of the fourier transform at that position.
         """
+        kxy = _parse_pos_arrays(args,kwargs,'kx','ky')
+        if kxy is not None:
+            kx, ky, shape = kxy
+            vals = np.empty(kx.shape, dtype=complex)
+            self.SBProfile.kValueMany(kx, ky, vals)
+            return vals.reshape(shape)
         kpos = galsim.utilities.parse_pos_args(args,kwargs,'kx','ky')
         return self.SBProfile.kValue(kpos)
 
@@ -956,7 +1115,7 @@ class GSObject(object):
     def drawImage(self, image=None, nx=None, ny=None, bounds=None, scale=None, wcs=None, dtype=None,
                   method='auto', gain=1., wmult=1., add_to_image=False, use_true_center=True,
                   offset=None, n_photons=0., rng=None, max_extra_noise=0., poisson_flux=None,
-                  setup_only=False, dx=None):
+                  n_threads=1, photon_ops=(), save_photons=False, setup_only=False, dx=None):
         """Draws an Image of the object.
 
         The drawImage() method is used to draw an Image of the current object using one of several
@@ -1075,6 +1234,24 @@ class GSObject(object):
         photon shooting.  But you can turn this off with `poisson_flux=False`.  It also defaults to
         False if you set an explicit value for `n_photons`.
 
+        For very bright objects, you can also shoot the photons using multiple threads by setting
+        `n_threads > 1`.  The photons are then shot in chunks, each with its own random number
+        generator seeded in turn from `rng`, so the resulting image is reproducible for a given
+        `rng` seed and number of threads.  This requires GalSim to have been compiled with OpenMP
+        support (`scons WITH_OPENMP=True`); otherwise, the photons are shot serially.  It is also
+        not available when using `max_extra_noise`, since then the number of photons is determined
+        iteratively.
+
+        You can also modify the photons before they are binned into the image by providing a list
+        of photon operators with `photon_ops`.  Each operator must have a method
+        `applyTo(photon_array, local_wcs, rng)`, which modifies the PhotonArray in place.  The
+        photon positions are in image coordinates relative to the nominal center of the profile
+        when the operators are applied, and `local_wcs` may be used to convert world-coordinate
+        shifts to pixels.  See WavelengthSampler and PhotonDCR for some examples.  In addition, if
+        `save_photons=True`, the returned image will have an attribute `photons`, which is a
+        PhotonArray with the photons that were shot, with positions in the coordinates of the
+        image.  Neither of these is compatible with `n_threads > 1`.
+
         The object will by default be drawn with its nominal center at the center location of the
         image.  There is thus a qualitative difference in the appearance of the rendered profile
         when drawn on even- and odd-sized images.  For a profile with a maximum at (0,0), this
@@ -1187,6 +1364,14 @@ class GSObject(object):
                             Poisson statistics for `n_photons` samples when photon shooting.
                             [default: True, unless `n_photons` is given, in which case the default
                             is False]
+        @param n_threads    The number of threads to use for photon shooting.  See discussion
+                            above for details.  Only relevant for `method='phot'` with
+                            `max_extra_noise=0`. [default: 1]
+        @param photon_ops   A list of operators that can modify the photon array before it is
+                            binned into the image.  Only relevant for `method='phot'`.
+                            [default: ()]
+        @param save_photons If True, save the PhotonArray as `image.photons`.  Only relevant for
+                            `method='phot'`. [default: False]
         @param setup_only   Don't actually draw anything on the image.  Just make sure the image
                             is set up correctly.  This is used internally by GalSim, but there
                             may be cases where the user will want the same functionality.
@@ -1235,6 +1420,16 @@ class GSObject(object):
             if type(max_extra_noise) != float:
                 max_extra_noise = float(max_extra_noise)
 
+            # Make sure the type of n_threads is correct and has a valid value:
+            if type(n_threads) != int:
+                n_threads = int(n_threads)
+            if n_threads < 1:
+                raise ValueError("Invalid n_threads < 1.")
+            if n_threads > 1 and max_extra_noise != 0.:
+                raise ValueError("n_threads > 1 is not compatible with max_extra_noise")
+            if n_threads > 1 and (photon_ops or save_photons):
+                raise ValueError("n_threads > 1 is not compatible with photon_ops or save_photons")
+
             # Setup the uniform_deviate if not provided one.
             if rng is None:
                 uniform_deviate = galsim.UniformDeviate()
@@ -1259,6 +1454,12 @@ class GSObject(object):
                 raise ValueError("max_extra_noise is only relevant for method='phot'")
             if poisson_flux is not None:
                 raise ValueError("poisson_flux is only relevant for method='phot'")
+            if n_threads != 1:
+                raise ValueError("n_threads is only relevant for method='phot'")
+            if photon_ops:
+                raise ValueError("photon_ops are only relevant for method='phot'")
+            if save_photons:
+                raise ValueError("save_photons is only relevant for method='phot'")
 
         # Check that the user isn't convolving by a Pixel already.  This is almost always an error.
         if method == 'auto' and isinstance(self, galsim.Convolution):
@@ -1322,9 +1523,20 @@ class GSObject(object):
 
         if method == 'phot':
             try:
-                image.added_flux = prof.SBProfile.drawShoot(
-                    imview.image, n_photons, uniform_deviate, gain, max_extra_noise,
-                    poisson_flux, add_to_image)
+                if photon_ops or save_photons:
+                    image.added_flux, photons = prof.drawPhot(
+                        imview, n_photons, uniform_deviate, gain, max_extra_noise,
+                        poisson_flux, add_to_image, photon_ops, local_wcs)
+                    if save_photons:
+                        # Put the photons in the coordinates of the returned image.
+                        cen = image.center()
+                        photons.x[:] += cen.x
+                        photons.y[:] += cen.y
+                        image.photons = photons
+                else:
+                    image.added_flux = prof.SBProfile.drawShoot(
+                        imview.image, n_photons, uniform_deviate, gain, max_extra_noise,
+                        poisson_flux, add_to_image, n_threads)
             except RuntimeError:
                 # Give some extra explanation as a warning, then raise the original exception
                 # so the traceback shows as much detail as possible.
@@ -1338,6 +1550,277 @@ class GSObject(object):
 
         return image
 
+    def drawPhot(self, image, n_photons=0., rng=None, gain=1., max_extra_noise=0.,
+                 poisson_flux=True, add_to_image=False, photon_ops=(), local_wcs=None):
+        """Draw this profile into an Image by shooting photons, applying any photon operators
+        to the photons before they are binned into the image.
+
+        This is usually called from the drawImage() function when using `method='phot'` with
+        either `photon_ops` or `save_photons`, rather than called directly by the user.  In
+        particular, the input image must already be set up with its center at (0,0), and the
+        profile should be given in image coordinates.  The algorithm for choosing the number of
+        photons to shoot is the same as that used by the C++ `drawShoot` method, but the photons
+        are shot in Python so that the PhotonArrays are available to the photon operators.
+
+        @param image        The Image onto which to draw the profile.
+        @param n_photons    The number of photons to shoot, or 0 to choose it automatically.
+                            [default: 0]
+        @param rng          A UniformDeviate to use for the random numbers. [default: None]
+        @param gain         The number of photons per ADU. [default: 1.]
+        @param max_extra_noise  The allowed extra noise in each pixel.  See drawImage() for
+                            details. [default: 0.]
+        @param poisson_flux Whether to allow total object flux scaling to vary according to
+                            Poisson statistics. [default: True]
+        @param add_to_image Whether to add flux to the existing image rather than clear out
+                            anything in the image before drawing. [default: False]
+        @param photon_ops   A list of operators that can modify the photon array before it is
+                            binned into the image. [default: ()]
+        @param local_wcs    The local WCS of the image, which is passed on to the photon
+                            operators. [default: None]
+
+        @returns a tuple (added_flux, photons), where added_flux is the total flux of photons
+                 that landed inside the image bounds, and photons is the PhotonArray of all
+                 the photons that were shot.
+        """
+        # Don't do more than this at a time to keep the memory usage reasonable.
+        maxN = 100000
+
+        ud = galsim.UniformDeviate(rng)
+
+        # See the long comment in SBProfile::drawShoot for the explanation of these values.
+        flux = self.getFlux()
+        posflux = self.SBProfile.getPositiveFlux()
+        negflux = self.SBProfile.getNegativeFlux()
+        eta = negflux / (posflux + negflux)
+        eta_factor = 1. - 2.*eta
+        mod_flux = flux / (eta_factor*eta_factor)
+        flux_scaling = eta_factor / gain
+
+        if poisson_flux:
+            mean = eta_factor*eta_factor * flux
+            pd = galsim.PoissonDeviate(ud, mean)
+            pd_val = pd() - mean + flux
+            ratio = pd_val / flux
+            flux_scaling *= ratio
+            mod_flux *= ratio
+
+        N = float(n_photons)
+        if N == 0.: N = mod_flux
+        origN = N
+
+        if not add_to_image: image.setZero()
+
+        # If we're automatically figuring out N based on max_extra_noise, start with 100 photons
+        # Otherwise we'll do a maximum of maxN at a time until we go through all N.
+        thisN = 100 if max_extra_noise > 0. else maxN
+        cen = self.centroid()
+        raw_Imax = 0.
+        Imax_count = 0
+        arrays = []
+        while True:
+            thisN = min(thisN, maxN, int(N+0.5))
+            photons = self.SBProfile.shoot(thisN, ud)
+            photons.scaleFlux(flux_scaling * thisN / origN)
+
+            if max_extra_noise > 0.:
+                # Estimate Imax from the photons before the operators move them around.
+                use = ((np.abs(photons.x - cen.x) <= 0.5) & (np.abs(photons.y - cen.y) <= 0.5))
+                Imax_count += np.sum(use)
+                raw_Imax += np.sum(photons.flux[use])
+
+            for op in photon_ops:
+                op.applyTo(photons, local_wcs, ud)
+            arrays.append(photons)
+
+            N -= thisN
+            if N < 1.: break
+
+            if max_extra_noise > 0.:
+                if Imax_count < 25 or raw_Imax < 0.: continue
+                Imax = raw_Imax * origN / (origN-N)
+                Ntot = mod_flux / (1. + max_extra_noise / Imax) - (origN-N)
+                thisN = int(min(Ntot, maxN))
+                if thisN <= 0: break
+
+        if N > 0.1:
+            # If we didn't shoot all the original number of photons, then our flux isn't right.
+            factor = origN / (origN-N)
+            for photons in arrays:
+                photons.scaleFlux(factor)
+
+        added_flux = 0.
+        for photons in arrays:
+            added_flux += photons.addTo(image.image)
+
+        photons = galsim.photon_array._concatenate(arrays)
+        return added_flux * gain, photons
+
+    def drawOffsetImages(self, offsets, image=None, nx=None, ny=None, bounds=None, scale=None,
+                         wcs=None, dtype=None, method='auto', gain=1., wmult=1.,
+                         use_true_center=True):
+        """Draws images of the profile at a number of different offsets, reusing a single k-space
+        image of the profile.
+
+        This is equivalent to calling
+
+            >>> images = [ obj.drawImage(..., offset=offset) for offset in offsets ]
+
+        but the k-space image of the profile (including the pixel convolution) is only computed
+        once.  Each image is then made by applying a phase ramp for its offset to the k-space
+        image, followed by an inverse FFT.  So there are no further evaluations of the profile's
+        k-space values for the subsequent offsets, which can be much faster when drawing many
+        dithered images, e.g. for use with galsim.utilities.interleaveImages().
+
+            >>> n = 2
+            >>> offsets = [ galsim.PositionD(dx,0.) for dx in [-0.25, 0.25] ]
+            >>> im_list = gal.drawOffsetImages(offsets, nx=16, ny=16, scale=1.0)
+            >>> img = galsim.utilities.interleaveImages(im_list, N=(n,1), offsets=offsets)
+
+        Only the FFT drawing methods are available, so `method` must be one of 'auto', 'fft',
+        or 'no_pixel'.  With 'auto', the profile is always drawn with an FFT, even if drawImage()
+        would have chosen to use real-space convolution.  The WCS must be uniform, since the same
+        local WCS is used for all of the offsets.
+
+        The parameters other than `offsets` have the same meaning as for drawImage().  If `image`
+        is provided, it is used for the first offset, and the other images are made with the same
+        bounds, wcs, and dtype.  Otherwise, the image size is determined as drawImage() would for
+        the first offset.
+
+        @param offsets          A list of offsets to apply, in pixels.  Each may be either a
+                                PositionD or a tuple (dx, dy).
+        @param image            If provided, this will be the image used for the first offset.
+                                [default: None]
+        @param nx               If provided and `image` is None, the x size of the images.
+                                [default: None]
+        @param ny               If provided and `image` is None, the y size of the images.
+                                [default: None]
+        @param bounds           If provided and `image` is None, the bounds of the images.
+                                [default: None]
+        @param scale            If provided, use this as the pixel scale for the images.
+                                [default: None]
+        @param wcs              If provided, use this as the wcs for the images.  It must be
+                                uniform. [default: None]
+        @param dtype            The data type to use for the images. [default: None]
+        @param method           Which method to use for rendering the images.  See above.
+                                [default: 'auto']
+        @param gain             The number of photons per ADU. [default: 1]
+        @param wmult            A multiplicative factor by which to enlarge (in each direction)
+                                the default automatically calculated FFT grid size. [default: 1]
+        @param use_true_center  Normally, the profile is drawn to be centered at the true center
+                                of the image (plus the offset).  If this is False, the center is
+                                taken to be image.center() instead. [default: True]
+
+        @returns a list of Images, one for each offset.
+        """
+        if method not in ['auto', 'fft', 'no_pixel']:
+            raise ValueError("Invalid method name = %s for drawOffsetImages"%method)
+
+        # Make sure the type of gain is correct and has a valid value:
+        if type(gain) != float:
+            gain = float(gain)
+        if gain <= 0.:
+            raise ValueError("Invalid gain <= 0.")
+
+        # Make sure the type of wmult is correct and has a valid value
+        if type(wmult) != float:
+            wmult = float(wmult)
+        if wmult <= 0:
+            raise ValueError("Invalid wmult <= 0.")
+
+        offsets = [ self._parse_offset(offset) for offset in offsets ]
+        if len(offsets) == 0:
+            return []
+
+        # Check for scale if using nx, ny, or bounds
+        if (scale is None and wcs is None and
+            (nx is not None or ny is not None or bounds is not None)):
+            raise ValueError("Must provide scale if providing nx,ny or bounds")
+
+        # Figure out what wcs we are going to use.
+        wcs = self._determine_wcs(scale, wcs, image)
+        if not wcs.isUniform():
+            raise ValueError("drawOffsetImages requires a uniform wcs")
+
+        # Convert the profile in world coordinates to the profile in image coordinates:
+        prof = wcs.local().toImage(self)
+
+        # If necessary, convolve by the pixel
+        if method != 'no_pixel':
+            prof = galsim.Convolve(prof, galsim.Pixel(scale = 1.0), real_space=False)
+
+        # Make sure image is setup correctly, as drawImage would for the first offset.
+        shape = prof._get_shape(image, nx, ny, bounds)
+        prof0 = prof._fix_center(shape, offsets[0], use_true_center, reverse=False)
+        image = prof0._setup_image(image, nx, ny, bounds, wmult, False, dtype)
+        image.wcs = wcs
+        shape = image.array.shape
+
+        # Choose the FFT size the same way as SBProfile::fourierDraw, separately in x and y.
+        stepkx, stepky = prof.SBProfile.getStepKXY()
+        maxkx, maxky = prof.SBProfile.getMaxKXY()
+        min_size = prof.gsparams.minimum_fft_size
+        NFTx = _fourier_draw_size(stepkx, wmult, shape[1], min_size)
+        NFTy = _fourier_draw_size(stepky, wmult, shape[0], min_size)
+        dkx = 2.*np.pi / NFTx
+        dky = 2.*np.pi / NFTy
+        # If maxK is beyond the Nyquist frequency, build the k image out to maxK and then
+        # wrap it (after applying the phase ramp) to get the right aliasing.
+        Nkx = NFTx if NFTx*dkx/2 > maxkx else 2 * int(np.ceil(maxkx / dkx))
+        Nky = NFTy if NFTy*dky/2 > maxky else 2 * int(np.ceil(maxky / dky))
+        if max(Nkx, Nky) > prof.gsparams.maximum_fft_size:
+            raise RuntimeError(
+                "drawOffsetImages requires an FFT that is too large, %d.\n"%max(Nkx, Nky) +
+                "If you can handle the large FFT, you may update gsparams.maximum_fft_size.")
+
+        # Check that the FFT covers the target image.
+        cen = image.center()
+        x = np.arange(image.xmin, image.xmax+1) - cen.x
+        y = np.arange(image.ymin, image.ymax+1) - cen.y
+        if (x[0] < -NFTx//2 or x[-1] >= NFTx//2 or y[0] < -NFTy//2 or y[-1] >= NFTy//2):
+            raise RuntimeError("drawOffsetImages FT bounds do not cover target image")
+        ix = x % NFTx
+        iy = y % NFTy
+
+        # This is the only place where the profile's k values are evaluated.  The k grid has
+        # different spacings in x and y in general, so use kValue rather than drawKImage.
+        kx = (np.arange(Nkx) - Nkx//2) * dkx
+        ky = (np.arange(Nky) - Nky//2) * dky
+        kxx, kyy = np.meshgrid(kx, ky)
+        kimage = prof.kValue(kxx, kyy)
+        wrap = Nkx > NFTx or Nky > NFTy
+        if wrap:
+            wrap_x = (np.arange(Nkx) - Nkx//2) % NFTx
+            wrap_y = (np.arange(Nky) - Nky//2) % NFTy
+            wrap_index = (wrap_y[:,np.newaxis] * NFTx + wrap_x[np.newaxis,:]).ravel()
+
+        images = []
+        for offset in offsets:
+            # Get the total shift, including the centering for even-sized images.
+            # cf. _fix_center.
+            dx = offset.x
+            dy = offset.y
+            if use_true_center:
+                if shape[1] % 2 == 0: dx -= 0.5
+                if shape[0] % 2 == 0: dy -= 0.5
+
+            kshift = (kimage * np.exp(-1j * ky * dy)[:,np.newaxis]
+                             * np.exp(-1j * kx * dx)[np.newaxis,:])
+            if wrap:
+                kwrap = (np.bincount(wrap_index, kshift.real.ravel(), NFTx*NFTy) +
+                         1j * np.bincount(wrap_index, kshift.imag.ravel(), NFTx*NFTy))
+                kwrap = kwrap.reshape(NFTy, NFTx)
+            else:
+                kwrap = np.fft.ifftshift(kshift)
+            xarray = np.fft.ifft2(kwrap).real[iy[:,np.newaxis], ix[np.newaxis,:]]
+
+            if len(images) > 0:
+                image = image.copy()
+            image.array[:,:] = xarray / gain
+            image.added_flux = xarray.sum()
+            images.append(image)
+
+        return images
+
     def drawKImage(self, re=None, im=None, nx=None, ny=None, bounds=None, scale=None, dtype=None,
                    gain=1., wmult=1., add_to_image=False, dk=None):
         """Draws the k-space Image (both real and imaginary parts) of the object, with bounds
@@ -1600,6 +2083,10 @@ class Gaussian(GSObject):
     @property
     def fwhm(self): return self.getFWHM()
 
+    def _calculateMoments(self):
+        s2 = self.sigma**2
+        return s2, 0., s2
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Gaussian) and
                 self.sigma == other.sigma and
@@ -1724,6 +2211,13 @@ class Moffat(GSObject):
     @property
     def trunc(self): return self.getTrunc()
 
+    def _calculateMoments(self):
+        # <r^2> = rd^2 / (beta-2), which is only finite for beta > 2 if not truncated.
+        if self.trunc == 0. and self.beta > 2.:
+            s2 = 0.5 * self.scale_radius**2 / (self.beta - 2.)
+            return s2, 0., s2
+        return None
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Moffat) and
                 self.beta == other.beta and
@@ -2160,6 +2654,10 @@ class Pixel(GSObject):
     @property
     def scale(self): return self.getScale()
 
+    def _calculateMoments(self):
+        s2 = self.scale**2 / 12.
+        return s2, 0., s2
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Pixel) and
                 self.scale == other.scale and
@@ -2229,6 +2727,9 @@ class Box(GSObject):
     @property
     def height(self): return self.getHeight()
 
+    def _calculateMoments(self):
+        return self.width**2 / 12., 0., self.height**2 / 12.
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Box) and
                 self.width == other.width and
@@ -2296,6 +2797,10 @@ class TopHat(GSObject):
     @property
     def radius(self): return self.getRadius()
 
+    def _calculateMoments(self):
+        s2 = 0.25 * self.radius**2
+        return s2, 0., s2
+
     def __eq__(self, other):
         return (isinstance(other, galsim.TopHat) and
                 self.radius == other.radius and
@@ -2324,6 +2829,152 @@ _galsim.SBTopHat.__repr__ = lambda self: \
         'galsim._galsim.SBTopHat(%r, %r, %r)'%self.__getinitargs__()
 
 
+class Streak(GSObject):
+    """A class describing a streak, the trail of a point source that moves during an exposure.
+
+    The flux is spread uniformly (per unit length) along a straight line segment or a polyline
+    of connected segments, and the profile has zero width.  It is normally used as a kernel to
+    be convolved with a PSF or a galaxy profile to represent a moving source, e.g. a satellite,
+    an asteroid or a trailed star:
+
+        >>> trail = galsim.Streak(length=12., angle=30.*galsim.degrees)
+        >>> final = galsim.Convolve(galaxy, psf, trail)
+
+    The Fourier transform is a sinc function along the direction of motion for each segment,
+    so the streak may be drawn with a DFT convolution.  Photon shooting places the photons
+    uniformly along the path.  A real-space convolution of a Streak with one other profile that
+    is analytic in real space (e.g. `galsim.Convolve(psf, trail, real_space=True)`) is done with
+    a 1-d integral of the other profile along the path.  A Streak on its own cannot be drawn in
+    real space, since its surface brightness is infinite on the path and zero elsewhere.
+
+    Initialization
+    --------------
+
+    A straight streak centered on the origin may be specified by its length and angle.
+    Alternatively, the path may be given as the x and y coordinates of the vertices of a
+    polyline, in which case the speed of the source is taken to be constant along the path.
+
+    @param length           The length of a straight streak. [One of `length` or both `x` and
+                            `y` is required.]
+    @param angle            The angle of a straight streak, measured counter-clockwise from the
+                            x axis, as an Angle instance. [default: 0 * galsim.degrees]
+    @param x                A list or array of the x coordinates of the vertices of the path.
+    @param y                A list or array of the y coordinates of the vertices of the path.
+    @param flux             The flux (in photons) of the profile. [default: 1]
+    @param gsparams         An optional GSParams argument.  See the docstring for GSParams for
+                            details. [default: None]
+
+    Methods
+    -------
+
+    In addition to the usual GSObject methods, Streak has the following access methods:
+
+        >>> x = streak.getX()
+        >>> y = streak.getY()
+        >>> length = streak.getLength()
+
+    """
+    _req_params = { "length" : float }
+    _opt_params = { "angle" : galsim.Angle, "flux" : float }
+    _single_params = []
+    _takes_rng = False
+
+    def __init__(self, length=None, angle=None, x=None, y=None, flux=1., gsparams=None):
+        if length is not None:
+            if x is not None or y is not None:
+                raise TypeError("Cannot specify both length and x,y for Streak")
+            if angle is None:
+                angle = 0. * galsim.degrees
+            elif not isinstance(angle, galsim.Angle):
+                raise TypeError("Input angle should be an Angle")
+            length = float(length)
+            if length <= 0.:
+                raise ValueError("Streak length must be > 0")
+            dx = 0.5 * length * angle.cos()
+            dy = 0.5 * length * angle.sin()
+            x = [-dx, dx]
+            y = [-dy, dy]
+        else:
+            if x is None or y is None:
+                raise TypeError("Streak requires either length or both x and y")
+            if angle is not None:
+                raise TypeError("Cannot specify angle with x,y for Streak")
+            x = [ float(xx) for xx in x ]
+            y = [ float(yy) for yy in y ]
+            if len(x) != len(y):
+                raise ValueError("x and y must be the same length for Streak")
+            if len(x) < 2:
+                raise ValueError("Streak requires at least 2 vertices")
+        GSObject.__init__(self, _galsim.SBStreak(x, y, flux, gsparams))
+        self._gsparams = gsparams
+
+    def getX(self):
+        """Return the x coordinates of the vertices of the path as a numpy array.
+        """
+        return np.array(self.SBProfile.getX())
+
+    def getY(self):
+        """Return the y coordinates of the vertices of the path as a numpy array.
+        """
+        return np.array(self.SBProfile.getY())
+
+    def getLength(self):
+        """Return the total length of the path.
+        """
+        return self.SBProfile.getLength()
+
+    @property
+    def x(self): return self.getX()
+    @property
+    def y(self): return self.getY()
+    @property
+    def length(self): return self.getLength()
+
+    def _calculateMoments(self):
+        # Each segment p0 + t d, 0 <= t <= 1, contributes
+        #     <p p^T> = p0 p0^T + (p0 d^T + d p0^T)/2 + d d^T/3
+        # weighted by its fraction of the total length.
+        x0 = self.x[:-1]
+        y0 = self.y[:-1]
+        dx = np.diff(self.x)
+        dy = np.diff(self.y)
+        w = np.sqrt(dx**2 + dy**2) / self.length
+        mx = np.sum(w * (x0 + 0.5*dx))
+        my = np.sum(w * (y0 + 0.5*dy))
+        Qxx = np.sum(w * (x0*x0 + x0*dx + dx*dx/3.)) - mx*mx
+        Qxy = np.sum(w * (x0*y0 + 0.5*(x0*dy + dx*y0) + dx*dy/3.)) - mx*my
+        Qyy = np.sum(w * (y0*y0 + y0*dy + dy*dy/3.)) - my*my
+        return Qxx, Qxy, Qyy
+
+    def __eq__(self, other):
+        return (isinstance(other, galsim.Streak) and
+                np.array_equal(self.x, other.x) and
+                np.array_equal(self.y, other.y) and
+                self.flux == other.flux and
+                self._gsparams == other._gsparams)
+
+    def __hash__(self):
+        return hash(("galsim.Streak", tuple(self.x), tuple(self.y), self.flux, self._gsparams))
+
+    def __repr__(self):
+        return 'galsim.Streak(x=%r, y=%r, flux=%r, gsparams=%r)'%(
+            self.x.tolist(), self.y.tolist(), self.flux, self._gsparams)
+
+    def __str__(self):
+        s = 'galsim.Streak(x=%s, y=%s'%(self.x.tolist(), self.y.tolist())
+        if self.flux != 1.0:
+            s += ', flux=%s'%self.flux
+        s += ')'
+        return s
+
+_galsim.SBStreak.__getinitargs__ = lambda self: (
+        self.getX(), self.getY(), self.getFlux(), self.getGSParams())
+_galsim.SBStreak.__getstate__ = lambda self: None
+_galsim.SBStreak.__setstate__ = lambda self, state: 1
+_galsim.SBStreak.__repr__ = lambda self: \
+        'galsim._galsim.SBStreak(%r, %r, %r, %r)'%self.__getinitargs__()
+
+
 class Sersic(GSObject):
     """A class describing a Sersic profile.
 
@@ -2354,6 +3005,18 @@ class Sersic(GSObject):
     considering the use of only discrete n values rather than allowing it to vary continuously.  For
     more details, see https://github.com/GalSim-developers/GalSim/issues/566.
 
+    Alternatively, you can set `interpolate_sersic_n=True` in the GSParams, in which case the
+    Fourier transform for any n is interpolated from the Hankel transform tables on a fixed grid of
+    n values, so continuously varying n does not require any new tables.  The interpolation error is
+    less than 1% of `kvalue_accuracy` (so well below the error in the tables themselves).  The
+    grid tables can also be built once and saved to disk with writeInterpolationTables(), and then
+    loaded by other processes with readInterpolationTables():
+
+        >>> galsim.Sersic.writeInterpolationTables('sersic_tables.pkl')   # Once
+        >>> galsim.Sersic.readInterpolationTables('sersic_tables.pkl')    # In each process
+        >>> gsparams = galsim.GSParams(interpolate_sersic_n=True)
+        >>> gal = galsim.Sersic(n=2.37, half_light_radius=1.2, gsparams=gsparams)
+
     Note that if you are building many Sersic profiles using truncation, the code will be more
     efficient if the truncation is always the same multiple of `scale_radius`, since it caches
     many calculations that depend on the ratio `trunc/scale_radius`.
@@ -2485,6 +3148,9 @@ class Sersic(GSObject):
         >>> n = sersic_obj.getN()
         >>> r0 = sersic_obj.getScaleRadius()
         >>> hlr = sersic_obj.getHalfLightRadius()
+
+    There are also two static methods for saving and loading the tables used for interpolating
+    in n, writeInterpolationTables() and readInterpolationTables().  See above.
     """
     _req_params = { "n" : float }
     _opt_params = { "flux" : float, "trunc" : float, "flux_untruncated" : bool }
@@ -2519,6 +3185,49 @@ class Sersic(GSObject):
         """
         return self.SBProfile.getTrunc()
 
+    @staticmethod
+    def writeInterpolationTables(file_name, gsparams=None):
+        """Write the Hankel transform tables for the grid of n values used when
+        `interpolate_sersic_n=True` to a file.
+
+        Any tables that have not been built yet in this process are built first, which can take
+        a few seconds.  The tables depend on the other GSParams values, so the ones written are
+        the ones used for the given `gsparams` (the value of `interpolate_sersic_n` in `gsparams`
+        is ignored).
+
+        @param file_name    The name of the file to write.
+        @param gsparams     An optional GSParams argument.  See the docstring for GSParams for
+                            details. [default: None]
+        """
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        if gsparams is None:
+            gsparams = galsim.GSParams()
+        tables = _galsim._getSersicInterpolationTables(gsparams)
+        with open(file_name, 'wb') as fout:
+            pickle.dump((gsparams, tables), fout, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def readInterpolationTables(file_name):
+        """Read the Hankel transform tables for the grid of n values used when
+        `interpolate_sersic_n=True` from a file written by writeInterpolationTables().
+
+        After this, Sersic profiles using the same GSParams as were used to write the file (other
+        than `interpolate_sersic_n`, which should be True) will use these tables rather than
+        building them again.
+
+        @param file_name    The name of the file to read.
+        """
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        with open(file_name, 'rb') as fin:
+            gsparams, tables = pickle.load(fin)
+        _galsim._setSersicInterpolationTables(gsparams, tables)
+
     @property
     def n(self): return self.getN()
     @property
@@ -2528,6 +3237,15 @@ class Sersic(GSObject):
     @property
     def trunc(self): return self.getTrunc()
 
+    def _calculateMoments(self):
+        # <r^2> = r0^2 Gamma(4n) / Gamma(2n) for the untruncated profile.
+        if self.trunc == 0.:
+            import math
+            s2 = 0.5 * self.scale_radius**2 * math.exp(math.lgamma(4.*self.n) -
+                                                       math.lgamma(2.*self.n))
+            return s2, 0., s2
+        return None
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Sersic) and
                 self.n == other.n and
@@ -2634,6 +3352,10 @@ class Exponential(GSObject):
     @property
     def half_light_radius(self): return self.getHalfLightRadius()
 
+    def _calculateMoments(self):
+        s2 = 3. * self.scale_radius**2
+        return s2, 0., s2
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Exponential) and
                 self.scale_radius == other.scale_radius and
@@ -2734,6 +3456,13 @@ class DeVaucouleurs(GSObject):
     @property
     def trunc(self): return self.getTrunc()
 
+    def _calculateMoments(self):
+        # <r^2> = r0^2 Gamma(16) / Gamma(8) for the untruncated profile.
+        if self.trunc == 0.:
+            s2 = 0.5 * self.scale_radius**2 * 1307674368000. / 5040.
+            return s2, 0., s2
+        return None
+
     def __eq__(self, other):
         return (isinstance(other, galsim.DeVaucouleurs) and
                 self.scale_radius == other.scale_radius and
@@ -2865,6 +3594,11 @@ class Spergel(GSObject):
     @property
     def half_light_radius(self): return self.getHalfLightRadius()
 
+    def _calculateMoments(self):
+        # <r^2> = 4 (nu+1) r0^2
+        s2 = 2. * (self.nu + 1.) * self.scale_radius**2
+        return s2, 0., s2
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Spergel) and
                 self.nu == other.nu and
@@ -2991,6 +3725,20 @@ range_division_for_extrema  The number of parts into which to split a range to b
 small_fraction_of_flux      When photon shooting, intervals with less than this fraction of
                             probability are considered ok to use with the dominant-sampling
                             algorithm. [default: 1.e-4]
+shoot_inverse_cdf           Whether to photon shoot Sersic and Spergel profiles by sampling the
+                            radius from a precomputed table of the inverse cumulative flux, which
+                            is usually faster than the default interval-based sampler once the
+                            table is built.  The table has one entry per `small_fraction_of_flux`
+                            of the total flux, and it is cached along with the other profile
+                            information. [default: False]
+interpolate_sersic_n        Whether to compute the Fourier transform of Sersic profiles by
+                            interpolating between tables built on a fixed grid of Sersic indices,
+                            rather than building a new table for each distinct value of n.  This
+                            is much faster when drawing many Sersic profiles with a continuous
+                            distribution of n.  The additional error from the interpolation is
+                            less than 1% of `kvalue_accuracy`.  Truncated Sersic profiles always
+                            use the exact tables.  See Sersic.writeInterpolationTables() for
+                            saving the tables to disk. [default: False]
 """
 
 _galsim.GSParams.__getinitargs__ = lambda self: (
@@ -3000,7 +3748,9 @@ _galsim.GSParams.__getinitargs__ = lambda self: (
         self.realspace_relerr, self.realspace_abserr,
         self.integration_relerr, self.integration_abserr,
         self.shoot_accuracy, self.allowed_flux_variation,
-        self.range_division_for_extrema, self.small_fraction_of_flux)
+        self.range_division_for_extrema, self.small_fraction_of_flux,
+        self.shoot_inverse_cdf, self.interpolate_sersic_n)
 _galsim.GSParams.__repr__ = lambda self: \
-        'galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%self.__getinitargs__()
+        ('galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%
+         self.__getinitargs__())
 _galsim.GSParams.__hash__ = lambda self: hash(repr(self))
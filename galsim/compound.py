@@ -19,6 +19,7 @@
 Some compound GSObject classes that contain other GSObject instances:
 
 Sum = sum of multiple profiles
+Cloud = sum of many shifted, dilated copies of one profile
 Convolution = convolution of multiple profiles
 Deconvolution = deconvolution by a given profile
 AutoConvolution = convolution of a profile by itself
@@ -27,6 +28,7 @@ FourierSqrt = Fourier-space square root of a profile
 """
 
 import galsim
+import numpy as np
 from . import _galsim
 
 def Add(*args, **kwargs):
@@ -154,6 +156,23 @@ class Sum(galsim.GSObject):
     @property
     def obj_list(self): return self._obj_list
 
+    def _calculateMoments(self):
+        # The flux-weighted mean of the moments of the components, each about the overall
+        # centroid.
+        Q_list = [ obj._calculateMoments() for obj in self.obj_list ]
+        if None in Q_list or self.flux == 0.:
+            return None
+        c = self.centroid()
+        Qxx = Qxy = Qyy = 0.
+        for obj, Q in zip(self.obj_list, Q_list):
+            ci = obj.centroid()
+            dx = ci.x - c.x
+            dy = ci.y - c.y
+            Qxx += obj.flux * (Q[0] + dx*dx)
+            Qxy += obj.flux * (Q[1] + dx*dy)
+            Qyy += obj.flux * (Q[2] + dy*dy)
+        return Qxx / self.flux, Qxy / self.flux, Qyy / self.flux
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Sum) and
                 self._obj_list == other._obj_list and
@@ -187,6 +206,158 @@ _galsim.SBAdd.__repr__ = lambda self: \
         'galsim._galsim.SBAdd(%r, %r)'%self.__getinitargs__()
 
 
+class Cloud(galsim.GSObject):
+    """A class for the sum of many shifted, dilated copies of one GSObject.
+
+    The Cloud class represents a profile made of many copies of a single base profile, each with
+    its own position, flux and size.  For example, it might be used for the knots of star
+    formation in a galaxy, each of which is a small Gaussian:
+
+        >>> knot = galsim.Gaussian(sigma=0.1)
+        >>> x, y = rng.normal(scale=0.8, size=(2,200))
+        >>> knots = galsim.Cloud(knot, x, y, flux=flux, dilation=dilation)
+
+    This is equivalent to a Sum of shifted and dilated copies of the base profile, but it is much
+    faster to draw when there are many copies.  The base profile only needs to be evaluated in
+    Fourier space once for each distinct dilation, rather than once for each copy, and photons are
+    shot from the base profile in a single call and then distributed among the copies.
+
+    Initialization
+    --------------
+
+    @param obj              The base profile to copy.
+    @param x                A list or array of the x positions of the copies.
+    @param y                A list or array of the y positions of the copies.
+    @param flux             A list or array of the flux of each copy.  [default: None, which
+                            means each copy has the flux of `obj`]
+    @param dilation         A list or array of the dilation of each copy relative to `obj`.
+                            These are flux-preserving, like GSObject.dilate().  [default: None,
+                            which means 1 for all copies]
+    @param gsparams         An optional GSParams argument.  See the docstring for GSParams for
+                            details. [default: None]
+
+    Note: if `gsparams` is unspecified (or None), then the Cloud instance inherits the same
+    GSParams as `obj`.
+
+    Methods
+    -------
+
+    There are no additional methods for Cloud beyond the usual GSObject methods.  The
+    parameters are available as the attributes `obj`, `x`, `y`, `flux_list` and `dilation`.
+    """
+    def __init__(self, obj, x, y, flux=None, dilation=None, gsparams=None):
+        if not isinstance(obj, galsim.GSObject):
+            raise TypeError("Argument to Cloud must be a GSObject.")
+        x = np.array(x, dtype=float).ravel()
+        y = np.array(y, dtype=float).ravel()
+        n = len(x)
+        if n == 0:
+            raise ValueError("Cloud requires at least one copy")
+        if len(y) != n:
+            raise ValueError("x and y must be the same length for Cloud")
+        if flux is None:
+            flux = np.empty(n)
+            flux[:] = obj.flux
+        else:
+            flux = np.array(flux, dtype=float).ravel()
+            if len(flux) != n:
+                raise ValueError("flux must be the same length as x and y for Cloud")
+        if dilation is None:
+            dilation = np.ones(n)
+        else:
+            dilation = np.array(dilation, dtype=float).ravel()
+            if len(dilation) != n:
+                raise ValueError("dilation must be the same length as x and y for Cloud")
+            if np.any(dilation <= 0.):
+                raise ValueError("dilation must be > 0 for Cloud")
+        if obj.flux == 0.:
+            raise ValueError("The base profile of a Cloud must have non-zero flux")
+
+        self._obj = obj
+        self._x = x
+        self._y = y
+        self._flux = flux
+        self._dilation = dilation
+        self._gsparams = gsparams
+
+        sbp = galsim._galsim.SBCloud(obj.SBProfile, x, y, flux / obj.flux, dilation, gsparams)
+        galsim.GSObject.__init__(self, sbp)
+        if hasattr(obj,'noise'):
+            import warnings
+            warnings.warn("Unable to propagate noise in galsim.Cloud")
+
+    @property
+    def obj(self): return self._obj
+    @property
+    def x(self): return self._x
+    @property
+    def y(self): return self._y
+    @property
+    def flux_list(self): return self._flux
+    @property
+    def dilation(self): return self._dilation
+
+    def _calculateMoments(self):
+        # The flux-weighted mean of the moments of the copies, each about the overall centroid.
+        Q = self.obj._calculateMoments()
+        if Q is None or self.flux == 0.:
+            return None
+        c0 = self.obj.centroid()
+        c = self.centroid()
+        dx = self.x + self.dilation * c0.x - c.x
+        dy = self.y + self.dilation * c0.y - c.y
+        d2 = self.dilation**2
+        Qxx = np.sum(self.flux_list * (d2 * Q[0] + dx*dx))
+        Qxy = np.sum(self.flux_list * (d2 * Q[1] + dx*dy))
+        Qyy = np.sum(self.flux_list * (d2 * Q[2] + dy*dy))
+        return Qxx / self.flux, Qxy / self.flux, Qyy / self.flux
+
+    def __eq__(self, other):
+        return (isinstance(other, galsim.Cloud) and
+                self.obj == other.obj and
+                np.array_equal(self.x, other.x) and
+                np.array_equal(self.y, other.y) and
+                np.array_equal(self.flux_list, other.flux_list) and
+                np.array_equal(self.dilation, other.dilation) and
+                self._gsparams == other._gsparams)
+
+    def __hash__(self):
+        return hash(("galsim.Cloud", self.obj, tuple(self.x), tuple(self.y),
+                     tuple(self.flux_list), tuple(self.dilation), self._gsparams))
+
+    def __repr__(self):
+        return 'galsim.Cloud(%r, x=%r, y=%r, flux=%r, dilation=%r, gsparams=%r)'%(
+            self.obj, self.x.tolist(), self.y.tolist(), self.flux_list.tolist(),
+            self.dilation.tolist(), self._gsparams)
+
+    def __str__(self):
+        return 'galsim.Cloud(%s, %d copies)'%(self.obj, len(self.x))
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        del d['SBProfile']
+        return d
+
+    def __setstate__(self, d):
+        self.__dict__ = d
+        self.__init__(self._obj, self._x, self._y, self._flux, self._dilation, self._gsparams)
+
+_galsim.SBCloud.__getinitargs__ = lambda self: (
+        self.getObj(), self.getX(), self.getY(), self.getFluxRatio(), self.getScale(),
+        self.getGSParams())
+_galsim.SBCloud.__getstate__ = lambda self: None
+_galsim.SBCloud.__setstate__ = lambda self, state: 1
+_galsim.SBCloud.__repr__ = lambda self: \
+        'galsim._galsim.SBCloud(%r, %r, %r, %r, %r, %r)'%self.__getinitargs__()
+
+
+def _isStreak(obj):
+    # Whether obj is a Streak, possibly transformed.
+    while isinstance(obj, galsim.Transformation):
+        obj = obj.original
+    return isinstance(obj, galsim.Streak)
+
+
 def Convolve(*args, **kwargs):
     """A function for convolving 2 or more GSObject or ChromaticObject instances.
 
@@ -340,17 +511,20 @@ class Convolution(galsim.GSObject):
                 real_space = False
 
             # Also can't do real space if any object is not analytic, so check for that.
+            # The exception is a Streak convolved with one analytic object, which is done
+            # with a 1-d integral along the streak.
             else:
-                for obj in args:
-                    if not obj.isAnalyticX():
-                        import warnings
-                        msg = """
-                        A component to be convolved is not analytic in real space.
-                        Cannot use real space convolution.
-                        Switching to DFT method."""
-                        warnings.warn(msg)
-                        real_space = False
-                        break
+                non_analytic = [ obj for obj in args if not obj.isAnalyticX() ]
+                if len(non_analytic) == 1 and len(args) == 2 and _isStreak(non_analytic[0]):
+                    non_analytic = []
+                if non_analytic:
+                    import warnings
+                    msg = """
+                    A component to be convolved is not analytic in real space.
+                    Cannot use real space convolution.
+                    Switching to DFT method."""
+                    warnings.warn(msg)
+                    real_space = False
 
         # If one of the objects has a noise attribute, then we convolve it by the others.
         # More than one is not allowed.
@@ -388,6 +562,13 @@ class Convolution(galsim.GSObject):
     @property
     def real_space(self): return self._real_space
 
+    def _calculateMoments(self):
+        # The moments of a convolution are the sums of the moments of the components.
+        Q_list = [ obj._calculateMoments() for obj in self.obj_list ]
+        if None in Q_list:
+            return None
+        return tuple(np.sum(Q_list, axis=0))
+
     def __eq__(self, other):
         return (isinstance(other, galsim.Convolution) and
                 self._obj_list == other._obj_list and
@@ -622,6 +803,14 @@ class AutoConvolution(galsim.GSObject):
     @property
     def real_space(self): return self._real_space
 
+    def _calculateMoments(self):
+        # Reflecting the profile doesn't change its second moments, so this is the same
+        # for both AutoConvolution and AutoCorrelation.
+        Q = self.orig_obj._calculateMoments()
+        if Q is None:
+            return None
+        return 2.*Q[0], 2.*Q[1], 2.*Q[2]
+
     def __eq__(self, other):
         return (isinstance(other, galsim.AutoConvolution) and
                 self.orig_obj == other.orig_obj and
@@ -762,6 +951,14 @@ class AutoCorrelation(galsim.GSObject):
     @property
     def real_space(self): return self._real_space
 
+    def _calculateMoments(self):
+        # Reflecting the profile doesn't change its second moments, so this is the same
+        # for both AutoConvolution and AutoCorrelation.
+        Q = self.orig_obj._calculateMoments()
+        if Q is None:
+            return None
+        return 2.*Q[0], 2.*Q[1], 2.*Q[2]
+
     def __eq__(self, other):
         return (isinstance(other, galsim.AutoCorrelation) and
                 self.orig_obj == other.orig_obj and
@@ -874,6 +1071,13 @@ class FourierSqrtProfile(galsim.GSObject):
     @property
     def orig_obj(self): return self._orig_obj
 
+    def _calculateMoments(self):
+        # The second moments are the second derivatives of -log(K) at k=0, so they are halved.
+        Q = self.orig_obj._calculateMoments()
+        if Q is None:
+            return None
+        return 0.5*Q[0], 0.5*Q[1], 0.5*Q[2]
+
     def __eq__(self, other):
         return (isinstance(other, galsim.FourierSqrtProfile) and
                 self._orig_obj == other._orig_obj and
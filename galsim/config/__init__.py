@@ -39,6 +39,7 @@ from . import input_real
 from . import input_cosmos
 from . import input_nfw
 from . import input_powerspectrum
+from . import input_psf_field
 
 from . import extra_psf
 from . import extra_weight
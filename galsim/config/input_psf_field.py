@@ -0,0 +1,112 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+from __future__ import print_function
+
+import galsim
+import copy
+
+# This file adds input type psf_field and gsobject type PSFField.
+
+# The psf_field input item has a psf field, which describes the PSF to build at each of the grid
+# positions.  It is built like any other psf in the config, with image_pos and world_pos set to
+# the grid position, so it can depend on position via e.g. Eval items.  We build the grid PSFs
+# here rather than passing a function to PSFField, since the kwargs need to be picklable when
+# the input object is made by the multiprocessing input manager.
+
+from .input import InputLoader
+class PSFFieldLoader(InputLoader):
+
+    def getKwargs(self, config, base, logger):
+        """Parse the config dict and return the kwargs needed to build the PSFField object.
+
+        @param config       The configuration dict for 'psf_field'
+        @param base         The base configuration dict
+        @param logger       If given, a logger object to log progress.
+
+        @returns kwargs, safe
+        """
+        req = { 'xmin' : float, 'xmax' : float, 'ymin' : float, 'ymax' : float }
+        opt = { 'nx' : int, 'ny' : int, 'scale' : float, 'image_size' : int, 'npca' : int,
+                'interpolant' : str }
+        kwargs, safe = galsim.config.GetAllParams(config, base, req=req, opt=opt, ignore=['psf'])
+        if 'psf' not in config:
+            raise AttributeError("psf_field requires a psf field")
+
+        bounds = galsim.BoundsD(kwargs.pop('xmin'), kwargs.pop('xmax'),
+                                kwargs.pop('ymin'), kwargs.pop('ymax'))
+        nx = kwargs.get('nx', 5)
+        ny = kwargs.get('ny', nx)
+        wcs = base.get('wcs', None)
+
+        psfs = []
+        for pos in galsim.psf_field._grid_positions(bounds, nx, ny):
+            # Use a shallow copy of base, so the positions don't leak into the rest of the config,
+            # and a fresh copy of the psf field, so nothing is cached between positions.
+            b = dict(base)
+            b['obj_num'] = base.get('obj_num', 0)
+            b['image_pos'] = pos
+            b['world_pos'] = wcs.toWorld(pos) if wcs is not None else pos
+            psf_config = { 'psf' : copy.deepcopy(config['psf']) }
+            psfs.append(galsim.config.BuildGSObject(psf_config, 'psf', b, logger=logger)[0])
+        if logger:
+            logger.debug('file %d: Built %d PSFs for psf_field',base.get('file_num',0),len(psfs))
+
+        kwargs['psf_func'] = psfs
+        kwargs['bounds'] = bounds
+        # The grid PSFs may depend on the wcs or on random values, so rebuild for each file.
+        return kwargs, False
+
+# Register this as a valid input type
+from .input import RegisterInputType
+RegisterInputType('psf_field', PSFFieldLoader(galsim.PSFField))
+
+
+def _BuildPSFField(config, base, ignore, gsparams, logger):
+    """@brief Build an interpolated PSF from the psf_field input item.
+    """
+    psf_field = galsim.config.GetInputObj('psf_field', config, base, 'PSFField')
+
+    opt = { 'flux' : float , 'num' : int, 'image_pos' : galsim.PositionD }
+    params, safe = galsim.config.GetAllParams(config, base, opt=opt, ignore=ignore)
+
+    if 'image_pos' in params:
+        image_pos = params['image_pos']
+    elif 'image_pos' in base:
+        image_pos = base['image_pos']
+    else:
+        raise ValueError("PSFField requested, but no image_pos defined in base.")
+
+    # Convert gsparams from a dict to an actual GSParams object
+    if gsparams: gsparams = galsim.GSParams(**gsparams)
+    else: gsparams = None
+
+    # Only methods are available through the input manager's proxy objects, so build the
+    # InterpolatedImage here from the array and scale, rather than calling getPSF.
+    im = galsim.ImageD(psf_field.getPSFArray(image_pos), scale=psf_field.getScale())
+    psf = galsim.InterpolatedImage(im, gsparams=gsparams)
+
+    if 'flux' in params:
+        psf = psf.withFlux(params['flux'])
+
+    # The PSF is different at each position, so it is not safe to reuse.
+    return psf, False
+
+# Register this as a valid gsobject type
+from .gsobject import RegisterObjectType
+RegisterObjectType('PSFField', _BuildPSFField, input_type='psf_field')
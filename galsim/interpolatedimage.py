@@ -26,6 +26,48 @@ from . import _galsim
 from ._galsim import Interpolant
 from ._galsim import Nearest, Linear, Cubic, Quintic, Lanczos, SincInterpolant, Delta
 import numpy as np
+import hashlib
+from collections import OrderedDict
+
+class _TableCache(object):
+    """A least-recently-used cache of SBInterpolatedImage objects, bounded by the (approximate)
+    total memory of the real- and Fourier-space tables they hold, rather than by the number of
+    items as in utilities.LRU_Cache.  (Also used for the OpticalPSF images in phase_psf.py.)
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.cache = OrderedDict()
+
+    def get(self, key):
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return None
+        # Put it back at the end, since it is now the most recently used.
+        self.cache[key] = entry
+        return entry[0]
+
+    def add(self, key, sbii, nbytes):
+        if nbytes > self.max_bytes:
+            return
+        if key in self.cache:
+            self.nbytes -= self.cache.pop(key)[1]
+        self.cache[key] = (sbii, nbytes)
+        self.nbytes += nbytes
+        self._trim()
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._trim()
+
+    def clear(self):
+        self.cache.clear()
+        self.nbytes = 0
+
+    def _trim(self):
+        while self.nbytes > self.max_bytes:
+            self.nbytes -= self.cache.popitem(last=False)[1][1]
+
 
 class InterpolatedImage(GSObject):
     """A class describing non-parametric profiles specified using an Image, which can be
@@ -174,6 +216,11 @@ class InterpolatedImage(GSObject):
                             [default: 0, i.e., pad with zeros]
     @param use_cache        Specify whether to cache `noise_pad` read in from a file to save having
                             to build a CorrelatedNoise object repeatedly from the same image.
+                            This also specifies whether to share the internal tables (including
+                            the Fourier-space table, which is the expensive part) with other
+                            InterpolatedImages made from identical image data with the same
+                            interpolants, `pad_factor`, `gsparams`, and stepk and maxk options.
+                            See resizeTableCache() below.
                             [default: True]
     @param rng              If padding by noise, the user can optionally supply the random noise
                             generator to use for drawing random numbers as `rng` (may be any kind of
@@ -230,7 +277,26 @@ class InterpolatedImage(GSObject):
     Methods
     -------
 
-    There are no additional methods for InterpolatedImage beyond the usual GSObject methods.
+    In addition to the usual GSObject methods, InterpolatedImage has a withImage() method for
+    quickly making a similar profile from a different image with the same shape:
+
+        >>> int_im2 = int_im.withImage(image2)
+
+    This is much faster than the normal constructor when making many InterpolatedImages from
+    images of the same size (e.g. postage stamps), since it reuses the stepk and maxk values of
+    the original profile, rather than calculating them again.
+
+    InterpolatedImages made from identical image data (e.g. the same galaxy from a
+    RealGalaxyCatalog used with different shears and rotations) share their internal real- and
+    Fourier-space tables, which are held in a least-recently-used cache.  The cache is keyed by the
+    data values (not the object identity) of the padded image, so it is safe to modify an image
+    and then make a new InterpolatedImage from it.  Images padded with noise are not cached, since
+    the padding is different each time.  The maximum memory to use for the cache (by default
+    128 MB) may be changed with
+
+        >>> galsim.InterpolatedImage.resizeTableCache(max_bytes)
+
+    where `max_bytes = 0` turns off the caching.
     """
     _req_params = { 'image' : str }
     _opt_params = {
@@ -251,6 +317,7 @@ class InterpolatedImage(GSObject):
     _single_params = []
     _takes_rng = True
     _cache_noise_pad = {}
+    _cache_tables = _TableCache(128 * 1024**2)
 
     def __init__(self, image, x_interpolant=None, k_interpolant=None, normalization='flux',
                  scale=None, wcs=None, flux=None, pad_factor=4., noise_pad_size=0, noise_pad=0.,
@@ -298,6 +365,7 @@ class InterpolatedImage(GSObject):
         # in anything we do here.  (e.g. set scale, etc.)
         self.image = image.view()
         self.use_cache = use_cache
+        self._normalization = normalization
 
         # Set the wcs if necessary
         if scale is not None:
@@ -438,10 +506,34 @@ class InterpolatedImage(GSObject):
         self._pad_factor = pad_factor
         self._gsparams = gsparams
 
-        # Make the SBInterpolatedImage out of the image.
-        sbii = galsim._galsim.SBInterpolatedImage(
-                pad_image.image, self.x_interpolant, self.k_interpolant, pad_factor,
-                _force_stepk, _force_maxk, gsparams)
+        # Look for an SBInterpolatedImage made from identical data that we can reuse.  Its
+        # Fourier-space table (and the stepk and maxk calculations that need it) is usually by far
+        # the most expensive part of making an InterpolatedImage.  The key uses a hash of the
+        # data rather than the id of the array, since the array may be modified in place (or
+        # freed and its memory reused) between calls.  Noise-padded images are different every
+        # time, so there is no point caching those.
+        # Note: repr of calculate_stepk/maxk, since True == 1. would otherwise collide with
+        # a max_stepk (or max_maxk) of 1.
+        use_table_cache = (use_cache and not noise_pad_size and
+                           InterpolatedImage._cache_tables.max_bytes > 0)
+        sbii = None
+        if use_table_cache:
+            pad_array = np.ascontiguousarray(pad_image.array)
+            b = pad_image.bounds
+            key = (hashlib.sha1(pad_array).hexdigest(), pad_array.dtype.str,
+                   b.xmin, b.xmax, b.ymin, b.ymax,
+                   self.x_interpolant, self.k_interpolant, pad_factor, gsparams,
+                   repr(calculate_stepk), repr(calculate_maxk), _force_stepk, _force_maxk)
+            sbii = InterpolatedImage._cache_tables.get(key)
+
+        if sbii is None:
+            # Make the SBInterpolatedImage out of the image.
+            sbii = galsim._galsim.SBInterpolatedImage(
+                    pad_image.image, self.x_interpolant, self.k_interpolant, pad_factor,
+                    _force_stepk, _force_maxk, gsparams)
+            new_sbii = True
+        else:
+            new_sbii = False
 
         # I think the only things that will mess up if getFlux() == 0 are the
         # calculateStepK and calculateMaxK functions, and rescaling the flux to some value.
@@ -449,18 +541,25 @@ class InterpolatedImage(GSObject):
             raise RuntimeError("This input image has zero total flux. "
                                "It does not define a valid surface brightness profile.")
 
-        if calculate_stepk:
-            if calculate_stepk is True:
-                sbii.calculateStepK()
-            else:
-                # If not a bool, then value is max_stepk
-                sbii.calculateStepK(max_stepk=calculate_stepk)
-        if calculate_maxk:
-            if calculate_maxk is True:
-                sbii.calculateMaxK()
-            else:
-                # If not a bool, then value is max_maxk
-                sbii.calculateMaxK(max_maxk=calculate_maxk)
+        if new_sbii:
+            if calculate_stepk:
+                if calculate_stepk is True:
+                    sbii.calculateStepK()
+                else:
+                    # If not a bool, then value is max_stepk
+                    sbii.calculateStepK(max_stepk=calculate_stepk)
+            if calculate_maxk:
+                if calculate_maxk is True:
+                    sbii.calculateMaxK()
+                else:
+                    # If not a bool, then value is max_maxk
+                    sbii.calculateMaxK(max_maxk=calculate_maxk)
+
+            if use_table_cache:
+                # The real-space table is Nk x Nk doubles, and the Fourier-space table is
+                # (Nk/2+1) x Nk complex doubles, where Nk is the padded size of the image.
+                Nk = galsim._galsim.goodFFTSize(int(pad_factor * max(pad_image.array.shape)))
+                InterpolatedImage._cache_tables.add(key, sbii, 16 * Nk * Nk)
 
         # If the user specified a surface brightness normalization for the input Image, then
         # need to rescale flux by the pixel area to get proper normalization.
@@ -506,6 +605,55 @@ class InterpolatedImage(GSObject):
 
         GSObject.__init__(self, sbp)
 
+    def withImage(self, image, flux=None, offset=None, use_true_center=True):
+        """Make a new InterpolatedImage from a different image with the same shape as the one
+        used for this profile.
+
+        The new profile uses the same interpolants, `normalization`, `pad_factor`, and `gsparams`
+        as this one.  It also uses the same values of stepk and maxk in pixel units, rather than
+        calculating them from the new image, which is most of the cost of constructing an
+        InterpolatedImage.  The new image is not copied (other than into the padded table used
+        by the C++ layer), so it should not be modified while the new profile is in use.
+
+        If the new image has no wcs, the wcs of the original image is used.  The new image is
+        only padded with zeros according to `pad_factor`; any `noise_pad` or `pad_image` used for
+        the original profile is not applied to the new image.
+
+        @param image            The new Image, which must have the same shape as the original.
+        @param flux             Optionally specify a total flux for the new profile.
+                                [default: None]
+        @param offset           The location in the new image to use as the center of the profile.
+                                [default: None]
+        @param use_true_center  Whether to use the true center of the new image as the center of
+                                the profile. [default: True]
+
+        @returns the new InterpolatedImage.
+        """
+        if not isinstance(image, galsim.Image):
+            raise TypeError("image must be a galsim.Image")
+        if image.array.shape != self.image.array.shape:
+            raise ValueError("image must have the same shape as the original image")
+        wcs = self.image.wcs if image.wcs is None else None
+        return InterpolatedImage(
+                image, x_interpolant=self.x_interpolant, k_interpolant=self.k_interpolant,
+                normalization=self._normalization, wcs=wcs, flux=flux,
+                pad_factor=self._pad_factor, use_true_center=use_true_center, offset=offset,
+                gsparams=self._gsparams,
+                _serialize_stepk=self._serialize_stepk, _serialize_maxk=self._serialize_maxk)
+
+    @staticmethod
+    def resizeTableCache(max_bytes):
+        """Change the maximum memory (in bytes) used by the cache of the internal tables shared
+        between InterpolatedImages made from identical images.
+
+        Items are removed from the cache in least-recently-used order until it fits into the new
+        size.  Setting `max_bytes = 0` clears the cache and turns off the sharing.  The default
+        size is 128 MB.
+
+        @param max_bytes    The maximum total size of the cached tables, in bytes.
+        """
+        InterpolatedImage._cache_tables.resize(max_bytes)
+
     def buildNoisePadImage(self, noise_pad_size, noise_pad, rng):
         """A helper function that builds the `pad_image` from the given `noise_pad` specification.
         """
@@ -585,6 +733,7 @@ class InterpolatedImage(GSObject):
         self.__dict__ = d
         self.__init__(self._pad_image,
                       x_interpolant=self.x_interpolant, k_interpolant=self.k_interpolant,
+                      normalization=self._normalization,
                       pad_factor=self._pad_factor, flux=self._flux,
                       offset=self._offset, use_true_center=False, gsparams=self._gsparams,
                       _serialize_stepk=self._serialize_stepk,
@@ -55,10 +55,13 @@ Atmosphere
 from itertools import chain
 from builtins import range, zip
 
+import os
 import numpy as np
+import hashlib
 import galsim
 from . import utilities
 from galsim import GSObject
+from .interpolatedimage import _TableCache
 
 
 class Aperture(object):
@@ -190,7 +193,7 @@ class Aperture(object):
                  oversampling=1.0, pad_factor=1.0, screen_list=None,
                  pupil_plane_im=None, pupil_angle=0.0*galsim.degrees,
                  pupil_plane_scale=None, pupil_plane_size=None,
-                 gsparams=None):
+                 gsparams=None, _screen_stepk=None):
 
         self.diam = diam  # Always need to explicitly specify an aperture diameter.
         self._gsparams = gsparams
@@ -248,6 +251,9 @@ class Aperture(object):
             stepk = min(stepk,
                         screen_list.stepK(lam=lam, diam=diam, obscuration=obscuration,
                                           gsparams=self._gsparams))
+        if _screen_stepk is not None:
+            # The stepK of a screen_list may also be given directly.  (Used by _get_aperture.)
+            stepk = min(stepk, _screen_stepk)
         good_pupil_scale = (stepk * lam * 1.e-9 * (galsim.radians / galsim.arcsec)
                             / (2 * np.pi * pad_factor))
 
@@ -500,6 +506,11 @@ class Aperture(object):
         """
         return self._illuminated
 
+    def _set_uv(self):
+        # The coordinate grids only depend on npix and pupil_plane_size, so they are shared by
+        # all Apertures with the same values.  They are read-only for that reason.
+        self._u, self._v, self._rsqr = _pupil_uv_cache(self.npix, self.pupil_plane_size)
+
     @property
     def rho(self):
         """ Unit-disk normalized pupil plane coordinate as a complex number:
@@ -515,33 +526,73 @@ class Aperture(object):
     def u(self):
         """Pupil horizontal coordinate array in meters."""
         if not hasattr(self, '_u'):
-            u = np.fft.fftshift(np.fft.fftfreq(self.npix, 1./self.pupil_plane_size))
-            self._u, self._v = np.meshgrid(u, u)
+            self._set_uv()
         return self._u
 
     @property
     def v(self):
         """Pupil vertical coordinate array in meters."""
         if not hasattr(self, '_v'):
-            u = np.fft.fftshift(np.fft.fftfreq(self.npix, 1./self.pupil_plane_size))
-            self._u, self._v = np.meshgrid(u, u)
+            self._set_uv()
         return self._v
 
     @property
     def rsqr(self):
         """Pupil radius squared array in meters squared."""
         if not hasattr(self, '_rsqr'):
-            self._rsqr = self.u**2 + self.v**2
+            self._set_uv()
         return self._rsqr
 
+    def _zernike_basis(self, jmax):
+        """Return the Noll-indexed Zernike polynomials evaluated over the illuminated pupil as a
+        read-only array with (at least) jmax+1 rows, congruent with rho[illuminated].  The basis is
+        computed once and kept with the Aperture, so it is only extended if a larger jmax is
+        requested.
+        """
+        if not hasattr(self, '_zern_basis') or len(self._zern_basis) <= jmax:
+            basis = galsim.phase_screens._zernike_basis(jmax, self.rho[self.illuminated])
+            basis.flags.writeable = False
+            self._zern_basis = basis
+        return self._zern_basis
+
     def __getstate__(self):
         # Let unpickled object reconstruct cached values on-the-fly instead of including them in the
         # pickle.
         d = self.__dict__
-        for k in ['_rho', '_u', '_v', '_rsqr']:
+        for k in ['_rho', '_u', '_v', '_rsqr', '_zern_basis']:
             d.pop(k, None)
         return d
 
+    def _nbytes(self):
+        """Return the approximate memory in bytes held by this Aperture.  The u, v and rsqr grids
+        are not included, since they are shared between Apertures (see _pupil_uv_cache).
+        """
+        nbytes = self.illuminated.nbytes
+        for k in ['_rho', '_zern_basis']:
+            if getattr(self, k, None) is not None:
+                nbytes += getattr(self, k).nbytes
+        return nbytes
+
+    def _illuminated_digest(self):
+        """Return a digest of the illuminated array, for use in cache keys.
+        """
+        if not hasattr(self, '_digest'):
+            self._digest = hashlib.sha1(np.ascontiguousarray(self.illuminated)).hexdigest()
+        return self._digest
+
+    def _pupil_extent(self):
+        """Return the largest separation in meters between two illuminated points of the pupil.
+
+        The Fourier transform of any PSF made with this aperture is the autocorrelation of the
+        complex pupil function, so it is exactly zero beyond k = 2 pi extent / lambda, whatever the
+        phases are.  This is an upper bound, using the largest illuminated radius, plus one pupil
+        pixel for the discretization.
+        """
+        if not hasattr(self, '_extent'):
+            self._extent = (2.*np.sqrt(np.max(self.rsqr[self.illuminated])) +
+                            self.pupil_plane_scale)
+        return self._extent
+
     # Some quick notes for Josh:
     # - Relation between real-space grid with size theta and pitch dtheta (dimensions of angle)
     #   and corresponding (fast) Fourier grid with size 2*maxK and pitch stepK (dimensions of
@@ -590,6 +641,89 @@ class Aperture(object):
         return (lam*1e-9) / self.pupil_plane_scale * galsim.radians/scale_unit
 
 
+def _pupil_uv(npix, pupil_plane_size):
+    """Make the read-only u, v, and rsqr pupil coordinate grids for an Aperture.
+    """
+    u = np.fft.fftshift(np.fft.fftfreq(npix, 1./pupil_plane_size))
+    u, v = np.meshgrid(u, u)
+    rsqr = u**2 + v**2
+    for a in (u, v, rsqr):
+        a.flags.writeable = False
+    return u, v, rsqr
+
+_pupil_uv_cache = galsim.utilities.LRU_Cache(_pupil_uv, maxsize=10)
+
+
+# The Apertures hold their illuminated masks, rho grids and Zernike bases, which can be large
+# for finely sampled pupils, so bound the cache by memory rather than by the number of Apertures.
+_aperture_cache = _TableCache(128 * 1024**2)
+
+
+def _optical_psf_image(aper, aberrations):
+    """Return the PSF image for Zernike `aberrations` in units of the wavelength, seen through
+    `aper`, as a read-only array that is centered and normalized to unit sum.
+
+    Since the aberrations are in waves at the wavelength of the PSF, the image array does not
+    depend on the wavelength.  Only its pixel scale does, via aper._sky_scale.  So the images are
+    cached, keyed on the aberrations and the aperture geometry.  The key uses a digest of the
+    illuminated pupil rather than the Aperture itself, so the cache doesn't keep Apertures alive,
+    and Apertures that are not themselves cached (e.g. those made from a pupil image array) don't
+    need to hash the full pupil array.
+    """
+    aberrations = tuple(aberrations)
+    key = (aper.diam, aper.pupil_plane_scale, aper.npix, aper._illuminated_digest(), aberrations)
+    img = _optical_psf_cache.get(key)
+    if img is None:
+        wf = galsim.phase_screens.zernike_wavefront(aper, aberrations, lam_0=1.0)
+        expwf_grid = np.zeros(aper.illuminated.shape, dtype=np.complex128)
+        expwf_grid[aper.illuminated] = np.exp(2j * np.pi * wf)
+        img = np.fft.fftshift(np.abs(np.fft.fft2(np.fft.fftshift(expwf_grid)))**2)
+        img /= img.sum()
+        img.flags.writeable = False
+        _optical_psf_cache.add(key, img, img.nbytes)
+    return img
+
+# Each entry is npix x npix doubles, so bound the cache by memory.  It only needs to hold the
+# wavelengths of one ChromaticOpticalPSF at a time to be useful.
+_optical_psf_cache = _TableCache(64 * 1024**2)
+
+
+def _get_aperture(diam, lam=None, screen_list=None, gsparams=None, **kwargs):
+    """Return an Aperture with the given parameters, reusing a previously constructed one with the
+    same parameters if possible.
+
+    The Aperture only depends on the `screen_list` through its stepK, so that is used in the key
+    for the cache rather than the screens themselves.  Apertures made from a pupil plane image
+    given as an Image or array rather than a file name are not cached.
+    A pupil plane image given as a file name is cached along with the file's modification time, so
+    the Aperture is made again if the file is rewritten.
+    """
+    pupil_plane_im = kwargs.get('pupil_plane_im', None)
+    if ((screen_list is not None and lam is None) or
+            isinstance(pupil_plane_im, (np.ndarray, galsim.Image))):
+        return Aperture(diam, lam=lam, screen_list=screen_list, gsparams=gsparams, **kwargs)
+    mtime = None
+    if pupil_plane_im is not None:
+        try:
+            mtime = os.path.getmtime(pupil_plane_im)
+        except OSError:
+            # Let Aperture raise the appropriate error.
+            return Aperture(diam, lam=lam, screen_list=screen_list, gsparams=gsparams, **kwargs)
+    screen_stepk = None
+    if screen_list is not None:
+        screen_list = PhaseScreenList(screen_list)
+        screen_stepk = screen_list.stepK(lam=lam, diam=diam,
+                                         obscuration=kwargs.get('obscuration', 0.0),
+                                         gsparams=gsparams)
+    key = (diam, lam, screen_stepk, gsparams, mtime) + tuple(sorted(kwargs.items()))
+    aper = _aperture_cache.get(key)
+    if aper is None:
+        aper = Aperture(diam, lam=lam, gsparams=gsparams, _screen_stepk=screen_stepk, **kwargs)
+    # Add it again even if it was found, since its Zernike basis may have grown since.
+    _aperture_cache.add(key, aper, aper._nbytes())
+    return aper
+
+
 class PhaseScreenList(object):
     """ List of phase screens that can be turned into a PSF.  Screens can be either atmospheric
     layers or optical phase screens.  Generally, one would assemble a PhaseScreenList object using
@@ -642,6 +776,9 @@ class PhaseScreenList(object):
     advance_by()       Advance each phase screen in list by specified amount.
     reset()            Reset each phase screen to t=0.
     wavefront()        Compute the cumulative wavefront due to all screens.
+    write()            Write the phase screens to a FITS file.
+    read()             Read phase screens from a FITS file written by write().  (This is a
+                       static method, used as `screens = galsim.PhaseScreenList.read(file_name)`.)
 
     @param layers  Sequence of phase screens.
     """
@@ -764,6 +901,63 @@ class PhaseScreenList(object):
                 # Time indep phase screen
                 pass
 
+    def write(self, file_name, dir=None, clobber=True, compression='auto'):
+        """Write the phase screens to a FITS file.
+
+        Each screen is written in its own HDU.  For an AtmosphericScreen, this is the current
+        realization of the screen in single precision, with the screen parameters, its position
+        (the origin) and the states of its random number generators in the header.  So reading
+        the file back in with PhaseScreenList.read() gives screens equal to the current ones,
+        including their subsequent evolution, and much faster than generating them again.  This
+        is an efficient way to share a large atmosphere between processes.
+
+        @param file_name    The name of the file to write to.
+        @param dir          Optionally a directory name can be provided if `file_name` does not
+                            already include it. [default: None]
+        @param clobber      Setting `clobber=True` will silently overwrite existing files.
+                            [default: True]
+        @param compression  Which compression scheme to use for the whole file, as for
+                            galsim.fits.writeFile.  [default: 'auto']
+        """
+        from galsim._pyfits import pyfits
+        hdu_list = pyfits.HDUList([pyfits.PrimaryHDU()])
+        for layer in self:
+            if not hasattr(layer, '_write_hdu'):
+                raise TypeError("Cannot write phase screen %s to a file"%layer)
+            hdu_list.append(layer._write_hdu())
+        galsim.fits.writeFile(file_name, hdu_list, dir=dir, clobber=clobber,
+                              compression=compression)
+
+    @staticmethod
+    def read(file_name, dir=None, compression='auto'):
+        """Read phase screens from a FITS file written by PhaseScreenList.write().
+
+        The screens are read completely into memory, so each process that reads the file holds its
+        own copy of them.
+
+        @param file_name    The name of the file to read in.
+        @param dir          Optionally a directory name can be provided if `file_name` does not
+                            already include it. [default: None]
+        @param compression  Which decompression scheme to use for the whole file, as for
+                            galsim.fits.readFile.  [default: 'auto']
+
+        @returns a PhaseScreenList.
+        """
+        screen_types = { 'AtmosphericScreen' : galsim.AtmosphericScreen,
+                         'OpticalScreen' : galsim.OpticalScreen }
+        hdu, hdu_list, fin = galsim.fits.readFile(file_name, dir=dir, hdu=0,
+                                                  compression=compression)
+        try:
+            layers = []
+            for hdu in hdu_list[1:]:
+                gs_type = hdu.header.get('GS_TYPE', None)
+                if gs_type not in screen_types:
+                    raise IOError("Invalid phase screen type %s in %s"%(gs_type, file_name))
+                layers.append(screen_types[gs_type]._read_hdu(hdu))
+        finally:
+            galsim.fits.closeHDUList(hdu_list, fin)
+        return galsim.PhaseScreenList(layers)
+
     def wavefront(self, aper, theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin), compact=True):
         """ Compute cumulative wavefront due to all phase screens in PhaseScreenList.
 
@@ -781,6 +975,67 @@ class PhaseScreenList(object):
         """
         return np.sum([layer.wavefront(aper, theta, compact) for layer in self],axis=0)
 
+    def _wavefront_gradient(self, u, v, theta, aper):
+        """Compute the gradient of the cumulative wavefront at arbitrary pupil positions `u`, `v` in
+        meters.  Returns a tuple of the u and v derivatives in nanometers per meter.
+        """
+        dwdu = np.zeros_like(u, dtype=float)
+        dwdv = np.zeros_like(v, dtype=float)
+        for layer in self:
+            du, dv = layer._wavefront_gradient(u, v, theta, aper)
+            dwdu += du
+            dwdv += dv
+        return dwdu, dwdv
+
+    def _snapshot(self):
+        """Return a PhaseScreenList of copies of the screens at the current time, which are not
+        changed by subsequent calls to advance().  Returns None if any of the screens do not
+        support this.
+        """
+        if not all(hasattr(layer, '_snapshot') for layer in self):
+            return None
+        return PhaseScreenList([layer._snapshot() for layer in self])
+
+    def _wavefront_batch(self, aper, thetas):
+        """Compute the compact cumulative wavefront for each field angle in `thetas`.  Returns an
+        array with one row for each field angle, identical to wavefront(aper, theta) for that
+        angle.
+        """
+        wfs = []
+        for layer in self:
+            if hasattr(layer, '_wavefront_batch'):
+                wfs.append(layer._wavefront_batch(aper, thetas))
+            else:
+                wfs.append(np.array([layer.wavefront(aper, th) for th in thetas]))
+        return np.sum(wfs, axis=0)
+
+    def _step_batch(self, PSFs, index, buf):
+        """Add the current instantaneous PSF to each of a list of PhaseScreenPSFs, which must all
+        share the same aperture and wavelength.
+
+        This gives identical results to calling PSF._step() for each PSF, but the wavefronts for
+        all of the field angles are evaluated together, and the Fourier transforms are done as
+        stacked batches in a preallocated buffer, which is much faster when there are many PSFs.
+
+        @param PSFs     The list of PhaseScreenPSFs to update.
+        @param index    The flattened indices in the pupil plane array of the illuminated pixels
+                        after an fftshift.
+        @param buf      A complex buffer of shape (nbatch, ny, nx), which is zero except at
+                        `index`.  The PSFs are done nbatch at a time.
+        """
+        aper = PSFs[0].aper
+        lam = PSFs[0].lam
+        nbatch = len(buf)
+        wf = self._wavefront_batch(aper, [PSF.theta for PSF in PSFs])
+        expwf = np.exp(2j * np.pi * wf / lam)
+        for k0 in range(0, len(PSFs), nbatch):
+            k1 = min(k0 + nbatch, len(PSFs))
+            b = buf[:k1-k0]
+            b.reshape(k1-k0, -1)[:, index] = expwf[k0:k1]
+            ftexpwf = np.fft.fft2(b)
+            for k in range(k0, k1):
+                PSFs[k].img += np.abs(ftexpwf[k-k0])**2
+
     def makePSF(self, lam, **kwargs):
         """Compute one PSF or multiple PSFs from the current PhaseScreenList, depending on the type
         of `theta`.  If `theta` is an iterable of 2-tuples, then return a list of PSFs at the
@@ -807,6 +1062,11 @@ class PhaseScreenList(object):
         @param aper                Aperture to use to compute PSF(s).  [default: None]
         @param gsparams            An optional GSParams argument.  See the docstring for GSParams
                                    for details.  [default: None]
+        @param n_threads           The number of threads to use for the time integration of a single
+                                   PSF.  See the PhaseScreenPSF docstring for details.  This is
+                                   ignored when `theta` is a list of field angles, since then the
+                                   time steps for all of the PSFs are batched together.
+                                   [default: 1]
 
         The following are optional keywords to use to setup the aperture if `aper` is not provided.
 
@@ -871,16 +1131,34 @@ class PhaseScreenList(object):
             # order of the PSF and time loops so we're not recomputing screens needlessly when we go
             # from PSF1 to PSF2 and so on.  For frozen-flow AtmosphericScreens, there's not much
             # difference with either loop order, so we just always make the PSF loop the inner loop.
+            # All of the PSFs share a single Aperture, so the time steps can be done for all of
+            # them at once with _step_batch.
             kwargs['_eval_now'] = False
+            if kwargs.get('aper', None) is None:
+                aper_kwargs = dict((k, kwargs.pop(k)) for k in list(kwargs)
+                                   if k not in _PhaseScreenPSF_kwargs)
+                if 'diam' not in aper_kwargs:
+                    raise ValueError("Diameter required if aperture not specified directly.")
+                kwargs['aper'] = _get_aperture(lam=lam, screen_list=self,
+                                               gsparams=kwargs.get('gsparams', None),
+                                               **aper_kwargs)
             PSFs = []
             for th in theta:
                 PSFs.append(PhaseScreenPSF(self, lam, theta=th, **kwargs))
 
+            # Rather than fftshift the full pupil plane array for every PSF, find where each
+            # illuminated pixel ends up after the fftshift, and write the wavefront straight there.
+            aper = kwargs['aper']
+            ny, nx = aper.illuminated.shape
+            iy, ix = np.nonzero(aper.illuminated)
+            index = ((iy + ny//2) % ny) * nx + (ix + nx//2) % nx
+            nbatch = max(1, min(len(PSFs), _batch_bytes // (16 * nx * ny)))
+            buf = np.zeros((nbatch, ny, nx), dtype=np.complex128)
+
             flux = kwargs.get('flux', 1.0)
             _nstep = PSFs[0]._nstep
             for i in range(_nstep):
-                for PSF in PSFs:
-                    PSF._step()
+                self._step_batch(PSFs, index, buf)
                 self.advance()
 
             suppress_warning = kwargs.pop('suppress_warning', False)
@@ -912,6 +1190,16 @@ class PhaseScreenList(object):
         return np.sum([layer.stepK(**kwargs)**(-5./3) for layer in self])**(-3./5)
 
 
+# The maximum size in bytes of the buffer used by PhaseScreenList._step_batch for each stacked
+# batch of Fourier transforms.
+_batch_bytes = 2**28
+
+# The keyword arguments of PhaseScreenPSF that are not used to construct an Aperture.
+_PhaseScreenPSF_kwargs = ('exptime', 'flux', 'aper', 'theta', 'interpolant', 'scale_unit',
+                          'suppress_warning', 'gsparams', 'n_threads', '_eval_now', '_bar',
+                          '_force_stepk', '_force_maxk')
+
+
 class PhaseScreenPSF(GSObject):
     """A PSF surface brightness profile constructed by integrating over time the instantaneous PSF
     derived from a set of phase screens and an aperture.
@@ -963,6 +1251,11 @@ class PhaseScreenPSF(GSObject):
                                `suppress_warning=True`.  [default: False]
     @param gsparams            An optional GSParams argument.  See the docstring for GSParams for
                                details. [default: None]
+    @param n_threads           The number of threads to use for the time integration.  The screens
+                               are still advanced serially, but the instantaneous PSFs are computed
+                               in parallel, since numpy releases the GIL for the FFTs.  The result
+                               is the same as with `n_threads=1`, up to rounding in the order of
+                               the sum over time steps.  [default: 1]
 
     The following are optional keywords to use to setup the aperture if `aper` is not provided:
 
@@ -1005,7 +1298,7 @@ class PhaseScreenPSF(GSObject):
     """
     def __init__(self, screen_list, lam, exptime=0.0, flux=1.0, aper=None,
                  theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin), interpolant=None,
-                 scale_unit=galsim.arcsec, suppress_warning=False, gsparams=None,
+                 scale_unit=galsim.arcsec, suppress_warning=False, gsparams=None, n_threads=1,
                  _eval_now=True, _bar=None, _force_stepk=None, _force_maxk=None, **kwargs):
         # Hidden `_bar` kwarg can be used with astropy.console.utils.ProgressBar to print out a
         # progress bar during long calculations.
@@ -1019,7 +1312,7 @@ class PhaseScreenPSF(GSObject):
             # Check here for diameter.
             if 'diam' not in kwargs:
                 raise ValueError("Diameter required if aperture not specified directly.")
-            aper = Aperture(lam=lam, screen_list=screen_list, gsparams=gsparams, **kwargs)
+            aper = _get_aperture(lam=lam, screen_list=screen_list, gsparams=gsparams, **kwargs)
         self.aper = aper
         if not isinstance(theta[0], galsim.Angle) or not isinstance(theta[1], galsim.Angle):
             raise TypeError("theta must be 2-tuple of galsim.Angle's.")
@@ -1049,12 +1342,19 @@ class PhaseScreenPSF(GSObject):
         # PhaseScreenList.makePSFs() optimizes multiple PSF evaluation by iterating over PSFs inside
         # of the normal iterate over time loop.  So only do the time loop here and now if we're not
         # doing a makePSFs().
+        if n_threads != 1:
+            n_threads = int(n_threads)
+            if n_threads < 1:
+                raise ValueError("Invalid n_threads < 1.")
         if _eval_now:
-            for i in range(self._nstep):
-                self._step()
-                self.screen_list.advance()
-                if _bar is not None:
-                    _bar.update()
+            if n_threads > 1 and self._nstep > 1 and self.screen_list._snapshot() is not None:
+                self._integrate_threaded(min(n_threads, self._nstep), _bar)
+            else:
+                for i in range(self._nstep):
+                    self._step()
+                    self.screen_list.advance()
+                    if _bar is not None:
+                        _bar.update()
             self._finalize(flux, suppress_warning)
 
     def __str__(self):
@@ -1077,14 +1377,73 @@ class PhaseScreenPSF(GSObject):
     def __hash__(self):
         return hash(("galsim.PhaseScreenPSF", self.ii))
 
-    def _step(self):
-        """Compute the current instantaneous PSF and add it to the developing integrated PSF."""
-        wf = self.screen_list.wavefront(self.aper, self.theta)
+    def _step(self, screen_list=None, img=None):
+        """Compute the current instantaneous PSF and add it to the developing integrated PSF.
+
+        By default, this uses self.screen_list and adds to self.img.  The threaded integration
+        passes a snapshot of the screens and its own partial image instead.
+        """
+        if screen_list is None: screen_list = self.screen_list
+        if img is None: img = self.img
+        wf = screen_list.wavefront(self.aper, self.theta)
         expwf = np.exp(2j * np.pi * wf / self.lam)
         expwf_grid = np.zeros_like(self.aper.illuminated).astype(np.complex128)
         expwf_grid[self.aper.illuminated] = expwf
         ftexpwf = np.fft.fft2(np.fft.fftshift(expwf_grid))
-        self.img += np.abs(ftexpwf)**2
+        img += np.abs(ftexpwf)**2
+
+    def _integrate_threaded(self, n_threads, _bar=None):
+        """Do the time integration using n_threads threads.
+
+        The screens are advanced serially in this thread, which is cheap for frozen-flow screens,
+        and for boiling screens it is the only way to get the same screens as the serial
+        integration.  At each time step, a snapshot of the screens is handed to one of the threads,
+        in turn.  Each thread accumulates its time steps into its own partial image, and these
+        are summed at the end.  The FFTs and array operations in numpy release the GIL, so the
+        threads can run concurrently.
+        """
+        import threading
+        try:
+            from queue import Queue
+        except ImportError:  # pragma: no cover
+            from Queue import Queue
+
+        # Bound the queues, so boiling screens don't pile up in memory.
+        queues = [ Queue(maxsize=2) for k in range(n_threads) ]
+        imgs = [ np.zeros_like(self.img) for k in range(n_threads) ]
+        errors = []
+
+        def work(queue, img):
+            while True:
+                screen_list = queue.get()
+                if screen_list is None:
+                    break
+                if not errors:
+                    try:
+                        self._step(screen_list, img)
+                    except Exception as e:
+                        errors.append(e)
+
+        threads = [ threading.Thread(target=work, args=(queues[k], imgs[k]))
+                    for k in range(n_threads) ]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        try:
+            for i in range(self._nstep):
+                queues[i % n_threads].put(self.screen_list._snapshot())
+                self.screen_list.advance()
+                if _bar is not None:
+                    _bar.update()
+        finally:
+            for queue in queues:
+                queue.put(None)
+            for t in threads:
+                t.join()
+        if errors:
+            raise errors[0]
+        for img in imgs:
+            self.img += img
 
     def _finalize(self, flux, suppress_warning):
         """Take accumulated integrated PSF image and turn it into a proper GSObject."""
@@ -1106,18 +1465,51 @@ class PhaseScreenPSF(GSObject):
                     use_true_center=False, normalization='sb', gsparams=self._gsparams)
 
         GSObject.__init__(self, self.ii)
+        if not suppress_warning:
+            self._check_stepk()
 
+    def _finalize_image(self, img, flux, suppress_warning):
+        """Like _finalize, but starting from a centered PSF image normalized to unit sum, such as
+        the cached OpticalPSF images.
+
+        The InterpolatedImage is made from the unit-sum image, rather than the surface brightness
+        image, since the former is the same for any wavelength and flux.  This lets it share its
+        tables and calculated stepk with other PSFs via the InterpolatedImage cache.  The maxk is
+        set from the aperture geometry rather than calculated.
+        """
+        self.img = galsim.ImageD(img * (flux / self.scale**2), scale=self.scale)
+
+        if self._serialize_maxk is None:
+            # In units of 1/pixel.  See Aperture._pupil_extent.
+            maxk = min(2.*np.pi * self.aper._pupil_extent() / self.aper.pupil_plane_size, np.pi)
+            self.ii = galsim.InterpolatedImage(
+                    galsim.ImageD(img.copy(), scale=self.scale), x_interpolant=self.interpolant,
+                    flux=flux, calculate_stepk=True, _serialize_maxk=maxk,
+                    use_true_center=False, normalization='flux', gsparams=self._gsparams)
+            self._serialize_stepk = self.ii._serialize_stepk
+            self._serialize_maxk = self.ii._serialize_maxk
+        else:
+            self.ii = galsim.InterpolatedImage(
+                    self.img, x_interpolant=self.interpolant,
+                    _serialize_stepk=self._serialize_stepk, _serialize_maxk=self._serialize_maxk,
+                    use_true_center=False, normalization='sb', gsparams=self._gsparams)
+
+        GSObject.__init__(self, self.ii)
         if not suppress_warning:
-            specified_stepk = 2*np.pi/(self.img.array.shape[0]*self.scale)
-            observed_stepk = self.SBProfile.stepK()
+            self._check_stepk()
+
+    def _check_stepk(self):
+        """Warn if the stepk of the final profile implies the PSF image was too small."""
+        specified_stepk = 2*np.pi/(self.img.array.shape[0]*self.scale)
+        observed_stepk = self.SBProfile.stepK()
 
-            if observed_stepk < specified_stepk:
-                import warnings
-                warnings.warn(
-                    "The calculated stepk (%g) for PhaseScreenPSF is smaller "%observed_stepk +
-                    "than what was used to build the wavefront (%g). "%specified_stepk +
-                    "This could lead to aliasing problems. " +
-                    "Increasing pad_factor is recommended.")
+        if observed_stepk < specified_stepk:
+            import warnings
+            warnings.warn(
+                "The calculated stepk (%g) for PhaseScreenPSF is smaller "%observed_stepk +
+                "than what was used to build the wavefront (%g). "%specified_stepk +
+                "This could lead to aliasing problems. " +
+                "Increasing pad_factor is recommended.")
 
     def __getstate__(self):
         # The SBProfile is picklable, but it is pretty inefficient, due to the large images being
@@ -1393,10 +1785,13 @@ class OpticalPSF(GSObject):
                 lam_0=lam)
         self._screens = galsim.PhaseScreenList(optics_screen)
 
-        # Make the aperture.
+        # Make the aperture.  Without any other phase screens, the pupil geometry does not depend
+        # on the wavelength, so leave it out of the cache key.  Then OpticalPSFs at different
+        # wavelengths (e.g., from a ChromaticOpticalPSF) share one Aperture, with its pupil grids
+        # and Zernike basis, and just have a different image scale.
         if aper is None:
-            aper = galsim.Aperture(
-                    diam, lam=lam, circular_pupil=circular_pupil, obscuration=obscuration,
+            aper = _get_aperture(
+                    diam, circular_pupil=circular_pupil, obscuration=obscuration,
                     nstruts=nstruts, strut_thick=strut_thick, strut_angle=strut_angle,
                     oversampling=oversampling, pad_factor=pad_factor,
                     pupil_plane_im=pupil_plane_im, pupil_angle=pupil_angle,
@@ -1412,12 +1807,22 @@ class OpticalPSF(GSObject):
         self._suppress_warning = suppress_warning
 
         # Finally, put together to make the PSF.
-        self._psf = galsim.PhaseScreenPSF(self._screens, lam=self._lam, flux=self._flux,
-                                          aper=aper, interpolant=self._interpolant,
-                                          scale_unit=self._scale_unit, gsparams=self._gsparams,
-                                          suppress_warning=self._suppress_warning)
+        self._psf = self._make_psf(aper)
         GSObject.__init__(self, self._psf)
 
+    def _make_psf(self, aper):
+        """Make the PhaseScreenPSF for this OpticalPSF.
+
+        The PSF image only depends on the aperture and the aberrations in waves, so it is cached
+        and shared between OpticalPSFs with the same ones, whatever their wavelength and flux.
+        """
+        psf = galsim.PhaseScreenPSF(self._screens, lam=self._lam, aper=aper,
+                                    interpolant=self._interpolant, scale_unit=self._scale_unit,
+                                    gsparams=self._gsparams, _eval_now=False)
+        img = _optical_psf_image(aper, self._screens[0].aberrations)
+        psf._finalize_image(img, self._flux, self._suppress_warning)
+        return psf
+
 
     def __str__(self):
         screen = self._psf.screen_list[0]
@@ -1463,8 +1868,5 @@ class OpticalPSF(GSObject):
     def __setstate__(self, d):
         self.__dict__ = d
         aper = self.__dict__.pop('aper')
-        self._psf = galsim.PhaseScreenPSF(self._screens, lam=self._lam, flux=self._flux,
-                                          aper=aper, interpolant=self._interpolant,
-                                          scale_unit=self._scale_unit, gsparams=self._gsparams,
-                                          suppress_warning=self._suppress_warning)
+        self._psf = self._make_psf(aper)
         GSObject.__init__(self, self._psf)
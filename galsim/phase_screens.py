@@ -92,16 +92,25 @@ class AtmosphericScreen(object):
         if rng is None:
             rng = galsim.BaseDeviate()
 
+        self._xs = np.linspace(-0.5*self.screen_size, 0.5*self.screen_size, self.npix,
+                               endpoint=False)
+        self._ys = self._xs
+
         # Should only be using private constructor variables when reconstituting from
-        # eval(repr(obj)).
+        # eval(repr(obj)) or PhaseScreenList.read().
         if _orig_rng is not None:
             self.orig_rng = _orig_rng
             self.rng = rng
-            self.tab2d = _tab2d
-            # Last two might get quickly deleted if alpha==1, but that's okay.
-            self.psi = _psi
+            self.origin = np.array(_origin, dtype=float)
+            # psi only depends on the parameters above, so it doesn't need to be stored.
+            if _psi is not None:
+                self.psi = _psi
+            elif self.alpha != 1.0:
+                self._init_psi()
             self.screen = _screen
-            self.origin = _origin
+            if _tab2d is None:
+                _tab2d = galsim.LookupTable2D(self._xs, self._ys, _screen, edge_mode='wrap')
+            self.tab2d = _tab2d
         else:
             self.orig_rng = rng
             self._init_psi()
@@ -109,20 +118,23 @@ class AtmosphericScreen(object):
 
         # Free some RAM for frozen-flow screen.
         if self.alpha == 1.0:
-            del self.psi, self.screen
+            self.__dict__.pop('psi', None)
+            self.__dict__.pop('screen', None)
 
     def __str__(self):
         return "galsim.AtmosphericScreen(altitude=%s)" % self.altitude
 
     def __repr__(self):
         s = ("galsim.AtmosphericScreen(%r, %r, altitude=%r, time_step=%r, r0_500=%r, L0=%r, " +
-             "vx=%r, vy=%r, alpha=%r, rng=%r, _origin=array(%r), _orig_rng=%r, _tab2d=%r") % (
+             "vx=%r, vy=%r, alpha=%r, rng=%r, _origin=array(%r), _orig_rng=%r") % (
                 self.screen_size, self.screen_scale, self.altitude, self.time_step, self.r0_500,
-                self.L0, self.vx, self.vy, self.alpha, self.rng, self.origin, self.orig_rng,
-                self.tab2d)
+                self.L0, self.vx, self.vy, self.alpha, self.rng, self.origin.tolist(),
+                self.orig_rng)
+        # The table is remade from the screen if we have it, so only include one of them.
         if self.alpha != 1.0:
-            s += ", _screen=array(%r, dtype=%s)" % (self.screen.to_list(), self.screen.dtype)
-            s += ", _psi=array(%r, dtype=%s)" % (self.screen.to_list(), self.screen.dtype)
+            s += ", _screen=array(%r, dtype=%s)" % (self.screen.tolist(), self.screen.dtype)
+        else:
+            s += ", _tab2d=%r" % self.tab2d
         s += ")"
         return s
 
@@ -158,9 +170,13 @@ class AtmosphericScreen(object):
 
     def _init_psi(self):
         """Assemble 2D von Karman sqrt power spectrum.
+
+        The screen is real, so only the non-negative x frequencies are needed (the layout used by
+        np.fft.rfft2).  This is stored in single precision to save memory.
         """
-        fx = np.fft.fftfreq(self.npix, self.screen_scale)
-        fx, fy = np.meshgrid(fx, fx)
+        fx = np.fft.rfftfreq(self.npix, self.screen_scale)
+        fy = np.fft.fftfreq(self.npix, self.screen_scale)
+        fx, fy = np.meshgrid(fx, fy)
 
         L0_inv = 1./self.L0 if self.L0 is not None else 0.0
         old_settings = np.seterr(all='ignore')
@@ -170,12 +186,19 @@ class AtmosphericScreen(object):
         np.seterr(**old_settings)
         self.psi *= 500.0  # Multiply by 500 here so we can divide by arbitrary lam later.
         self.psi[0, 0] = 0.0
+        self.psi = self.psi.astype(np.float32)
 
     def _random_screen(self):
         """Generate a random phase screen with power spectrum given by self.psi**2"""
         gd = galsim.GaussianDeviate(self.rng)
-        noise = utilities.rand_arr(self.psi.shape, gd)
-        return np.fft.ifft2(np.fft.fft2(noise)*self.psi).real
+        shape = (self.npix, self.npix)
+        noise = utilities.rand_arr(shape, gd)
+        # psi is symmetric under k -> -k, so this is the same as ifft2(fft2(noise)*psi).real, but
+        # with half the work and memory.
+        ft = np.fft.rfft2(noise)
+        del noise
+        ft *= self.psi
+        return np.fft.irfft2(ft, s=shape).astype(np.float32)
 
     def advance(self):
         """Advance phase screen realization by self.time_step."""
@@ -184,7 +207,9 @@ class AtmosphericScreen(object):
         self.origin -= (self.vx*self.time_step, self.vy*self.time_step)
         # "Boil" the atmsopheric screen if alpha not 1.
         if self.alpha != 1.0:
-            self.screen = self.alpha*self.screen + np.sqrt(1.-self.alpha**2)*self._random_screen()
+            # Don't update self.screen in place, since snapshots may share it.
+            self.screen = (np.float32(self.alpha)*self.screen +
+                           np.float32(np.sqrt(1.-self.alpha**2))*self._random_screen())
             self.tab2d = galsim.LookupTable2D(self._xs, self._ys, self.screen, edge_mode='wrap')
 
     def advance_by(self, dt):
@@ -238,8 +263,43 @@ class AtmosphericScreen(object):
             u, v = aper.u[aper.illuminated], aper.v[aper.illuminated]
         else:
             u, v = aper.u, aper.v
-        return self.tab2d(u + self.origin[0] + 1000*self.altitude*theta[0].tan(),
-                          v + self.origin[1] + 1000*self.altitude*theta[1].tan())
+        return self._wavefront_shifted(u, v, [theta])[0]
+
+    def _wavefront_gradient(self, u, v, theta, aper):
+        """Compute the gradient of the wavefront at arbitrary pupil positions.
+
+        @param u        Horizontal pupil positions in meters.
+        @param v        Vertical pupil positions in meters.
+        @param theta    Field angle, as a 2-tuple of `galsim.Angle`s.
+        @param aper     `galsim.Aperture` of the telescope.  (Not used for this screen.)
+        @returns        Tuple of the u and v derivatives of the wavefront in nanometers per meter.
+        """
+        return self.tab2d.gradient(u + self.origin[0] + 1000*self.altitude*theta[0].tan(),
+                                   v + self.origin[1] + 1000*self.altitude*theta[1].tan())
+
+    def _snapshot(self):
+        """Return a copy of the screen at the current time, which is not changed by subsequent
+        calls to advance().  The screen itself is not copied, since advance() never modifies it
+        in place, so this is cheap.
+        """
+        import copy
+        ret = copy.copy(self)
+        ret.origin = self.origin.copy()
+        return ret
+
+    def _wavefront_batch(self, aper, thetas):
+        """Compute the wavefront over the illuminated pixels of `aper` for each field angle in
+        `thetas`.  Returns an array with one row for each field angle, which is identical to
+        wavefront(aper, theta) for that angle, but evaluated with a single table lookup.
+        """
+        return self._wavefront_shifted(aper.u[aper.illuminated], aper.v[aper.illuminated], thetas)
+
+    def _wavefront_shifted(self, u, v, thetas):
+        """Compute the wavefront at pupil positions `u`, `v` for each field angle in `thetas`.
+        """
+        du = np.array([self.origin[0] + 1000*self.altitude*th[0].tan() for th in thetas])
+        dv = np.array([self.origin[1] + 1000*self.altitude*th[1].tan() for th in thetas])
+        return self.tab2d.evalShifted(u, v, du, dv)
 
     def reset(self):
         """Reset phase screen back to time=0."""
@@ -249,11 +309,55 @@ class AtmosphericScreen(object):
         # Only need to reset/create tab2d if not frozen or doesn't already exist
         if self.alpha != 1.0 or not hasattr(self, 'tab2d'):
             self.screen = self._random_screen()
-            self._xs = np.linspace(-0.5*self.screen_size, 0.5*self.screen_size, self.npix,
-                                   endpoint=False)
-            self._ys = self._xs
             self.tab2d = galsim.LookupTable2D(self._xs, self._ys, self.screen, edge_mode='wrap')
 
+    def _write_hdu(self):
+        """Return a FITS HDU with the current realization of this screen.  Used by
+        PhaseScreenList.write().
+        """
+        from galsim._pyfits import pyfits
+        if self.alpha == 1.0:
+            screen = self.tab2d.f[:-1, :-1]
+        else:
+            screen = self.screen
+        hdu = pyfits.ImageHDU(np.ascontiguousarray(screen, dtype=np.float32))
+        header = hdu.header
+        header['GS_TYPE'] = 'AtmosphericScreen'
+        header['SCALE'] = self.screen_scale
+        header['ALTITUDE'] = self.altitude
+        header['TSTEP'] = self.time_step
+        header['R0_500'] = self.r0_500
+        if self.L0 is not None:
+            header['L0'] = self.L0
+        header['VX'] = self.vx
+        header['VY'] = self.vy
+        header['ALPHA'] = self.alpha
+        header['ORIGIN_X'] = self.origin[0]
+        header['ORIGIN_Y'] = self.origin[1]
+        # Long strings are written with CONTINUE cards.
+        header['RNG'] = self.rng.serialize()
+        header['ORIG_RNG'] = self.orig_rng.serialize()
+        return hdu
+
+    @staticmethod
+    def _read_hdu(hdu):
+        """Make an AtmosphericScreen from an HDU written by _write_hdu().
+        """
+        header = hdu.header
+        # FITS data are big-endian, so this is always a copy in native byte order.  The table for
+        # interpolating the screen is another (double precision) copy, so the screen is never used
+        # directly from the file, even if pyfits memory-maps it.
+        screen = np.array(hdu.data, dtype=np.float32)
+        npix = screen.shape[0]
+        scale = header['SCALE']
+        # Use a screen_size a bit less than npix * scale, so rounding cannot change npix.
+        return AtmosphericScreen(
+                (npix-0.5)*scale, scale, altitude=header['ALTITUDE'], time_step=header['TSTEP'],
+                r0_500=header['R0_500'], L0=header.get('L0', None), vx=header['VX'],
+                vy=header['VY'], alpha=header['ALPHA'], rng=galsim.BaseDeviate(header['RNG']),
+                _orig_rng=galsim.BaseDeviate(header['ORIG_RNG']),
+                _origin=(header['ORIGIN_X'], header['ORIGIN_Y']), _screen=screen)
+
 
 def Atmosphere(screen_size, rng=None, **kwargs):
     """Create an atmosphere as a list of turbulent phase screens at different altitudes.  The
@@ -453,19 +557,65 @@ def _zern_rho_coefs(n, m):
 def _zern_coef_array(n, m, shape=None):
     """Assemble coefficient array for evaluating Zernike (n, m) as the real part of a
     bivariate polynomial in abs(rho)^2 and rho, where rho is a complex array indicating position on
-    a unit disc.
+    a unit disc.  The returned array is shared between callers, so it is read-only.
     """
     if shape is None:
         shape = ((n//2)+1, abs(m)+1)
+    return _zern_coef_array_cache(n, m, tuple(shape))
+
+
+def _make_zern_coef_array(n, m, shape):
     out = np.zeros(shape, dtype=np.complex128)
     coefs = np.array(_zern_rho_coefs(n, m), dtype=np.complex128)
     if m < 0:
         coefs *= -1j
     for i, c in enumerate(coefs[abs(m)::2]):
         out[i, abs(m)] = c
+    out.flags.writeable = False
+    return out
+
+# The same few coefficient arrays are needed by every OpticalScreen, so don't recompute them.
+_zern_coef_array_cache = utilities.LRU_Cache(_make_zern_coef_array, maxsize=1000)
+
+
+def _zernike_basis(jmax, rho):
+    """Evaluate the Noll-indexed Zernike polynomials j = 1..jmax at the complex unit-disc positions
+    `rho`.  Returns an array of shape (jmax+1, len(rho)), whose row 0 is zero to match the unused
+    aberrations[0] entry.
+    """
+    rsqr = np.abs(rho)**2
+    out = np.zeros((jmax+1, len(rho)), dtype=np.float64)
+    for j in range(1, jmax+1):
+        out[j] = horner2d(rsqr, rho, _zern_coef_array(*_noll_to_zern(j))).real
     return out
 
 
+def zernike_wavefront(aper, aberrations, lam_0=500.0):
+    """Compute the wavefront over the illuminated pixels of `aper` for one or many sets of Zernike
+    aberrations.
+
+    The Zernike polynomials are evaluated over the aperture once and cached (see
+    Aperture._zernike_basis), so each wavefront is a single matrix product.  This makes it
+    efficient to compute the wavefronts of field-dependent aberrations, e.g., for a grid of optical
+    PSFs across a focal plane.
+
+    @param aper         `galsim.Aperture` over which to compute the wavefronts.
+    @param aberrations  Aberrations in units of reference wavelength, ordered according to the Noll
+                        convention as for OpticalScreen (so aberrations[0] is unused).  Either a
+                        1d array, or a 2d array with one set of aberrations per row.
+    @param lam_0        Reference wavelength in nanometers at which the aberrations are specified.
+                        [default: 500]
+    @returns  Wavefront lag or lead in nanometers, congruent with array[aper.illuminated].  If
+              `aberrations` is 2d, the output is 2d with one wavefront per row.
+    """
+    aberrations = np.asarray(aberrations, dtype=np.float64)
+    jmax = aberrations.shape[-1] - 1
+    if jmax < 1:
+        return np.zeros(aberrations.shape[:-1] + (np.count_nonzero(aper.illuminated),))
+    basis = aper._zernike_basis(jmax)[:jmax+1]
+    return np.dot(aberrations * lam_0, basis)
+
+
 def horner(x, coef):
     """Evaluate univariate polynomial using Horner's method.
 
@@ -630,8 +780,64 @@ class OpticalScreen(object):
         """
         # ignore theta
         if compact:
-            r = aper.rho[aper.illuminated]
-        else:
-            r = aper.rho
+            return zernike_wavefront(aper, self.aberrations, self.lam_0)
+        r = aper.rho
         rsqr = np.abs(r)**2
         return horner2d(rsqr, r, self.coef_array).real * self.lam_0
+
+    def _wavefront_gradient(self, u, v, theta, aper):
+        """Compute the gradient of the wavefront at arbitrary pupil positions.
+
+        @param u        Horizontal pupil positions in meters.
+        @param v        Vertical pupil positions in meters.
+        @param theta    Field angle, as a 2-tuple of `galsim.Angle`s.  (Not used for this screen.)
+        @param aper     `galsim.Aperture` of the telescope, which sets the unit disk of the Zernike
+                        polynomials.
+        @returns        Tuple of the u and v derivatives of the wavefront in nanometers per meter.
+        """
+        # Each term of the wavefront is Re(c |rho|^2a rho^b) = Re(c rho^(a+b) conj(rho)^a).  So
+        # d/du = 2/diam (d/drho + d/dconj(rho)) and d/dv = 2/diam i (d/drho - d/dconj(rho)).
+        r = (np.asarray(u) + 1j * np.asarray(v)) * (2./aper.diam)
+        rc = np.conj(r)
+        drho = np.zeros_like(r)
+        drhoc = np.zeros_like(r)
+        for a in range(self.coef_array.shape[0]):
+            for b in range(self.coef_array.shape[1]):
+                c = self.coef_array[a, b]
+                if c == 0: continue
+                p = a + b
+                if p > 0:
+                    drho += c * p * r**(p-1) * rc**a
+                if a > 0:
+                    drhoc += c * a * r**p * rc**(a-1)
+        scale = 2. * self.lam_0 / aper.diam
+        return (drho + drhoc).real * scale, (1j * (drho - drhoc)).real * scale
+
+    def _snapshot(self):
+        """This screen is time independent, so it is its own snapshot."""
+        return self
+
+    def _wavefront_batch(self, aper, thetas):
+        """Compute the wavefront over the illuminated pixels of `aper` for each field angle in
+        `thetas`.  The optical wavefront is independent of field angle, so it is only computed once.
+        """
+        return np.tile(self.wavefront(aper), (len(thetas), 1))
+
+    def _write_hdu(self):
+        """Return a FITS HDU with the aberrations of this screen.  Used by PhaseScreenList.write().
+        """
+        from galsim._pyfits import pyfits
+        # Pad out to the minimum length accepted by the constructor.
+        aberrations = np.zeros(max(len(self.aberrations), 3))
+        aberrations[:len(self.aberrations)] = self.aberrations
+        hdu = pyfits.ImageHDU(aberrations)
+        hdu.header['GS_TYPE'] = 'OpticalScreen'
+        hdu.header['LAM_0'] = self.lam_0
+        return hdu
+
+    @staticmethod
+    def _read_hdu(hdu):
+        """Make an OpticalScreen from an HDU written by _write_hdu().
+        """
+        return OpticalScreen(aberrations=np.array(hdu.data, dtype=float),
+                             lam_0=hdu.header['LAM_0'])
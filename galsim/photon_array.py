@@ -0,0 +1,450 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file photon_array.py
+Python layer for the PhotonArray class and the photon operators that can be applied to the photons
+when drawing with method='phot'.
+"""
+
+import numpy as np
+
+import galsim
+from ._galsim import PhotonArray
+from .utilities import set_func_doc
+
+PhotonArray.__doc__ = """
+The PhotonArray class encapsulates the concept of a collection of photons incident on a detector.
+
+A PhotonArray object is not typically constructed directly by the user.  Rather, it is typically
+constructed as the return value of the `SBProfile.shoot` method, or it is saved as an attribute
+of the image returned by drawImage when using `method='phot'` and `save_photons=True`.
+
+The photons are stored in arrays of x and y positions, fluxes and (optionally) wavelengths.
+The arrays are available as the attributes `x`, `y`, `flux`, and `wavelength`, which are numpy
+arrays that are views into the C++ storage.  So they may be modified in place, and the changes
+will be seen by subsequent operations on the PhotonArray (e.g. `addTo`).  The `wavelength` array
+is only allocated the first time it is accessed.
+
+Initialization
+--------------
+
+    >>> photon_array = galsim.PhotonArray(N)
+
+@param N        The number of photons to store in this PhotonArray.  The arrays are initialized
+                with zeros.
+
+Methods
+-------
+
+    >>> n = photon_array.size()             # or len(photon_array)
+    >>> f = photon_array.getTotalFlux()
+    >>> photon_array.setTotalFlux(flux)
+    >>> photon_array.scaleFlux(scale)
+    >>> photon_array.scaleXY(scale)
+    >>> added_flux = photon_array.addTo(image.image)
+
+The last of these bins the photons into the pixels of an ImageView (which is the C++ `image`
+attribute of an Image object), and returns the total flux of the photons that fell within the
+image bounds.
+"""
+
+PhotonArray.x = property(lambda self: self.getXArray(),
+                         doc="The x positions of the photons as a numpy array view.")
+PhotonArray.y = property(lambda self: self.getYArray(),
+                         doc="The y positions of the photons as a numpy array view.")
+PhotonArray.flux = property(lambda self: self.getFluxArray(),
+                            doc="The fluxes of the photons as a numpy array view.")
+PhotonArray.wavelength = property(lambda self: self.getWavelengthArray(),
+                                  doc="The wavelengths of the photons in nm as a numpy array view.")
+PhotonArray.__repr__ = lambda self: 'galsim.PhotonArray(%d)'%self.size()
+
+set_func_doc(PhotonArray.addTo, """Add the flux of the photons to the pixels of an ImageView.
+
+@param image    The ImageView (i.e. the C++ `image` attribute of an Image) to add the photons to.
+
+@returns the total flux of the photons that landed inside the image bounds.
+""")
+
+
+def _concatenate(photon_arrays):
+    """Combine a list of PhotonArrays into a single new PhotonArray.
+    """
+    if len(photon_arrays) == 1:
+        return photon_arrays[0]
+    N = sum([pa.size() for pa in photon_arrays])
+    ret = PhotonArray(N)
+    keep_wave = all([pa.hasAllocatedWavelengths() for pa in photon_arrays])
+    x = ret.x
+    y = ret.y
+    flux = ret.flux
+    if keep_wave: wave = ret.wavelength
+    i1 = 0
+    for pa in photon_arrays:
+        i2 = i1 + pa.size()
+        x[i1:i2] = pa.x
+        y[i1:i2] = pa.y
+        flux[i1:i2] = pa.flux
+        if keep_wave: wave[i1:i2] = pa.wavelength
+        i1 = i2
+    ret.setCorrelated(any([pa.isCorrelated() for pa in photon_arrays]))
+    return ret
+
+
+class WavelengthSampler(object):
+    """A photon operator that assigns wavelengths to the photons, drawn from the photon
+    distribution of an SED through a Bandpass.
+
+    The wavelengths are drawn by inverting the cumulative distribution of `sed * bandpass`
+    tabulated on a grid of wavelengths.  If either the SED or the Bandpass is defined by a
+    LookupTable, then the union of their `wave_list` values is used for the grid.  Otherwise,
+    `npoints` evenly spaced wavelengths between the limits of the bandpass are used.
+
+    @param sed          The SED to use for the object's spectral energy distribution.
+    @param bandpass     A Bandpass object representing a filter, or None to sample over the full
+                        SED wavelength range.
+    @param npoints      The number of points to use for the wavelength grid if neither the SED
+                        nor the Bandpass has a `wave_list`. [default: 1000]
+    """
+    def __init__(self, sed, bandpass, npoints=1000):
+        self.sed = sed
+        self.bandpass = bandpass
+        self.npoints = npoints
+
+        if bandpass is not None:
+            blue_limit = bandpass.blue_limit
+            red_limit = bandpass.red_limit
+            wave_list = np.union1d(bandpass.wave_list, sed.wave_list)
+        else:
+            blue_limit = sed.blue_limit
+            red_limit = sed.red_limit
+            wave_list = np.array(sed.wave_list)
+            if blue_limit is None or red_limit is None:
+                raise ValueError("Need a bandpass for an SED without a defined wavelength range")
+        if len(wave_list) > 0:
+            wave_list = wave_list[(wave_list >= blue_limit) & (wave_list <= red_limit)]
+        else:
+            wave_list = np.linspace(blue_limit, red_limit, npoints)
+
+        density = sed(wave_list)
+        if bandpass is not None:
+            density = density * bandpass(wave_list)
+        # Use trapezoid rule to get the cumulative distribution.
+        cdf = np.zeros(len(wave_list))
+        cdf[1:] = np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(wave_list))
+        if not cdf[-1] > 0.:
+            raise ValueError("The SED has no flux through the given bandpass")
+        self._wave = wave_list
+        self._cdf = cdf / cdf[-1]
+
+    def applyTo(self, photon_array, local_wcs=None, rng=None):
+        """Assign wavelengths to the photons sampled from the SED * Bandpass.
+
+        @param photon_array     A PhotonArray to apply the operator to.
+        @param local_wcs        A LocalWCS instance defining the local WCS for the current photon
+                                bundle in case the operator needs this information. [default: None]
+        @param rng              A random number generator to use. [default: None]
+        """
+        u = np.empty(photon_array.size())
+        galsim.UniformDeviate(rng).generate(u)
+        photon_array.wavelength[:] = np.interp(u, self._cdf, self._wave)
+
+    def __eq__(self, other):
+        return (isinstance(other, WavelengthSampler) and
+                self.sed == other.sed and
+                self.bandpass == other.bandpass and
+                self.npoints == other.npoints)
+
+    def __ne__(self, other): return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(("galsim.WavelengthSampler", self.sed, self.bandpass, self.npoints))
+
+    def __repr__(self):
+        return 'galsim.WavelengthSampler(sed=%r, bandpass=%r, npoints=%r)'%(
+                self.sed, self.bandpass, self.npoints)
+
+
+class PhotonDCR(object):
+    """A photon operator that applies the effect of differential chromatic refraction (DCR).
+
+    This is the photon-shooting analog of ChromaticAtmosphere.  Each photon is shifted according
+    to the difference between the refraction at its wavelength and the refraction at
+    `base_wavelength`.  The photons must already have wavelengths assigned, e.g. by applying a
+    WavelengthSampler earlier in the list of `photon_ops`.  Note that the wavelength dependence
+    of the seeing (the `alpha` parameter of ChromaticAtmosphere) is not included here.
+
+    The zenith and parallactic angles may be specified in any of the ways accepted by
+    ChromaticAtmosphere:
+
+      1) explicitly provide `zenith_angle = ...` as a keyword of type Angle, and
+         `parallactic_angle` will be assumed to be 0 by default.
+      2) explicitly provide both `zenith_angle = ...` and `parallactic_angle = ...` as
+         keywords of type Angle.
+      3) provide the coordinates of the object `obj_coord = ...` and the coordinates of the zenith
+         `zenith_coord = ...` as keywords of type CelestialCoord.
+      4) provide the coordinates of the object `obj_coord = ...` as a CelestialCoord, the
+         hour angle of the object `HA = ...` as an Angle, and the latitude of the observer
+         `latitude = ...` as an Angle.
+
+    You may also provide `temperature`, `pressure`, and `H2O_pressure` keywords, which are passed
+    on to galsim.dcr.get_refraction.
+
+    @param base_wavelength      Wavelength (in nm) represented by the fiducial photon positions.
+    @param scale_unit           Units used for the world coordinates of the image being drawn,
+                                either as an AngleUnit or a string that can be used to construct
+                                one. [default: galsim.arcsec]
+    @param **kwargs             The angle and atmospheric parameters described above.
+    """
+    def __init__(self, base_wavelength, scale_unit=galsim.arcsec, **kwargs):
+        if isinstance(scale_unit, str):
+            scale_unit = galsim.angle.get_angle_unit(scale_unit)
+        self.base_wavelength = base_wavelength
+        self.scale_unit = scale_unit
+
+        if 'zenith_angle' in kwargs:
+            self.zenith_angle = kwargs.pop('zenith_angle')
+            self.parallactic_angle = kwargs.pop('parallactic_angle', 0.0*galsim.degrees)
+            if not isinstance(self.zenith_angle, galsim.Angle) or \
+                    not isinstance(self.parallactic_angle, galsim.Angle):
+                raise TypeError("zenith_angle and parallactic_angle must be galsim.Angles!")
+        elif 'obj_coord' in kwargs:
+            obj_coord = kwargs.pop('obj_coord')
+            if 'zenith_coord' in kwargs:
+                zenith_coord = kwargs.pop('zenith_coord')
+                self.zenith_angle, self.parallactic_angle = galsim.dcr.zenith_parallactic_angles(
+                    obj_coord=obj_coord, zenith_coord=zenith_coord)
+            else:
+                if 'HA' not in kwargs or 'latitude' not in kwargs:
+                    raise TypeError("PhotonDCR requires either zenith_coord or (HA, "
+                                    +"latitude) when obj_coord is specified!")
+                HA = kwargs.pop('HA')
+                latitude = kwargs.pop('latitude')
+                self.zenith_angle, self.parallactic_angle = galsim.dcr.zenith_parallactic_angles(
+                    obj_coord=obj_coord, HA=HA, latitude=latitude)
+        else:
+            raise TypeError("Need to specify zenith_angle and parallactic_angle!")
+
+        # Any remaining kwargs will get forwarded to galsim.dcr.get_refraction
+        # Check that they're valid
+        for kw in kwargs:
+            if kw not in ['temperature', 'pressure', 'H2O_pressure']:
+                raise TypeError("Got unexpected keyword: {0}".format(kw))
+        self.kw = kwargs
+
+        self.base_refraction = galsim.dcr.get_refraction(self.base_wavelength, self.zenith_angle,
+                                                         **kwargs)
+
+    def applyTo(self, photon_array, local_wcs=None, rng=None):
+        """Apply the DCR effect to the photons
+
+        @param photon_array     A PhotonArray to apply the operator to.
+        @param local_wcs        A LocalWCS instance defining the local WCS for the current photon
+                                bundle.  If None, the photons are taken to be in world
+                                coordinates. [default: None]
+        @param rng              A random number generator to use. [default: None]
+        """
+        if not photon_array.hasAllocatedWavelengths():
+            raise RuntimeError("PhotonDCR requires that wavelengths be set")
+        w = photon_array.wavelength
+        shift_mag = galsim.dcr.get_refraction(w, self.zenith_angle, **self.kw)
+        shift_mag -= self.base_refraction
+        shift_mag *= galsim.radians / self.scale_unit
+        sinp, cosp = self.parallactic_angle.sincos()
+        du = -shift_mag * sinp
+        dv = shift_mag * cosp
+        if local_wcs is None:
+            photon_array.x[:] += du
+            photon_array.y[:] += dv
+        else:
+            photon_array.x[:] += local_wcs._x(du, dv)
+            photon_array.y[:] += local_wcs._y(du, dv)
+
+    def __eq__(self, other):
+        return (isinstance(other, PhotonDCR) and
+                self.base_wavelength == other.base_wavelength and
+                self.scale_unit == other.scale_unit and
+                self.zenith_angle == other.zenith_angle and
+                self.parallactic_angle == other.parallactic_angle and
+                self.kw == other.kw)
+
+    def __ne__(self, other): return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(("galsim.PhotonDCR", self.base_wavelength, self.scale_unit,
+                     self.zenith_angle, self.parallactic_angle, frozenset(self.kw.items())))
+
+    def __repr__(self):
+        s = 'galsim.PhotonDCR(base_wavelength=%r, scale_unit=%r, '%(
+                self.base_wavelength, self.scale_unit)
+        s += 'zenith_angle=%r, parallactic_angle=%r'%(self.zenith_angle, self.parallactic_angle)
+        for k,v in self.kw.items():
+            s += ', %s=%r'%(k,v)
+        s += ')'
+        return s
+
+
+class PhotonGeometricOptics(object):
+    """A photon operator that deflects the photons by the wavefront gradient of a PhaseScreenList,
+    using the geometric optics approximation.
+
+    This is an alternative to PhaseScreenPSF for rendering the PSF of a set of phase screens, which
+    avoids the large pupil plane Fourier transforms at every time step of a long exposure.  Each
+    photon is assigned a random position in the illuminated part of the aperture and a random time
+    during the exposure.  It is then deflected by the gradient of the total wavefront at that
+    position and time, summed over all of the screens at the given field angle.  The wavefront
+    gradient is achromatic, so the wavelength of the photons is not needed.
+
+    Geometric optics does not include diffraction.  Since the diffraction by the aperture simply
+    convolves the geometric PSF, this is handled by drawing a profile for the diffraction-limited
+    PSF of the aperture, which is defined in k space, with `method='phot'` and this operator in the
+    `photon_ops`.  E.g.:
+
+        >>> op = galsim.PhotonGeometricOptics(atm, exptime=30., diam=4.0, obscuration=0.4)
+        >>> airy = galsim.Airy(lam=700., diam=4.0, obscuration=0.4)
+        >>> image = airy.drawImage(nx=64, ny=64, scale=0.2, method='phot', photon_ops=[op])
+
+    Any other objects to be convolved with the PSF (e.g. a galaxy) may be included in the drawn
+    profile as well.
+
+    The screens are advanced in time over the exposure during construction, just as they are for
+    PhaseScreenPSF, and a snapshot of the screens is kept for each time step.  This way, each batch
+    of photons sees the same exposure.  For frozen-flow screens, the snapshots are cheap, but for
+    boiling screens (alpha < 1), each snapshot includes the full screen array.
+
+    @param screen_list      A PhaseScreenList (or list of phase screens) through which to shoot the
+                            photons.
+    @param exptime          Time in seconds over which to integrate the PSF.  [default: 0.]
+    @param aper             Aperture through which to shoot the photons.  [default: None]
+    @param theta            Field angle of the PSF, as a 2-tuple of Angles.
+                            [default: (0.0*galsim.arcmin, 0.0*galsim.arcmin)]
+    @param scale_unit       Units used for the world coordinates of the image being drawn, either
+                            as an AngleUnit or a string that can be used to construct one.
+                            [default: galsim.arcsec]
+    @param **kwargs         If `aper` is not provided, any keywords to use to construct it.  See the
+                            docstring for Aperture for details.  At least `diam` is required.
+    """
+    def __init__(self, screen_list, exptime=0., aper=None,
+                 theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin), scale_unit=galsim.arcsec,
+                 **kwargs):
+        if not isinstance(screen_list, galsim.PhaseScreenList):
+            screen_list = galsim.PhaseScreenList(screen_list)
+        if isinstance(scale_unit, str):
+            scale_unit = galsim.angle.get_angle_unit(scale_unit)
+        if aper is None:
+            if 'diam' not in kwargs:
+                raise ValueError("Diameter required if aperture not specified directly.")
+            aper = galsim.Aperture(**kwargs)
+        if not isinstance(theta[0], galsim.Angle) or not isinstance(theta[1], galsim.Angle):
+            raise TypeError("theta must be 2-tuple of galsim.Angle's.")
+        if exptime < 0:
+            raise ValueError("Cannot integrate PSF for negative time.")
+        self.exptime = float(exptime)
+        self.aper = aper
+        self.theta = theta
+        self.scale_unit = scale_unit
+
+        # Use the same time steps as PhaseScreenPSF.
+        if screen_list.time_step is None:
+            nstep = 1
+        else:
+            nstep = int(np.round(self.exptime/screen_list.time_step))
+        if nstep == 0:
+            nstep = 1
+        self._screens = []
+        for i in range(nstep):
+            snapshot = screen_list._snapshot()
+            if snapshot is None:
+                raise TypeError("PhotonGeometricOptics requires phase screens that can be "
+                                "snapshotted, such as AtmosphericScreen and OpticalScreen.")
+            self._screens.append(snapshot)
+            screen_list.advance()
+
+        self._u = aper.u[aper.illuminated]
+        self._v = aper.v[aper.illuminated]
+
+    @property
+    def screen_list(self):
+        """The phase screens at the start of the exposure."""
+        return self._screens[0]
+
+    def applyTo(self, photon_array, local_wcs=None, rng=None):
+        """Deflect the photons by the wavefront gradient.
+
+        @param photon_array     A PhotonArray to apply the operator to.
+        @param local_wcs        A LocalWCS instance defining the local WCS for the current photon
+                                bundle.  If None, the photons are taken to be in world
+                                coordinates. [default: None]
+        @param rng              A random number generator to use. [default: None]
+        """
+        n = photon_array.size()
+        ud = galsim.UniformDeviate(rng)
+        r = np.empty(n)
+
+        # Pick a random illuminated pixel of the pupil plane for each photon, and a uniformly
+        # distributed position within that pixel.
+        ud.generate(r)
+        k = np.minimum((r * len(self._u)).astype(int), len(self._u)-1)
+        ud.generate(r)
+        u = self._u[k] + (r-0.5) * self.aper.pupil_plane_scale
+        ud.generate(r)
+        v = self._v[k] + (r-0.5) * self.aper.pupil_plane_scale
+
+        # Pick a random time step for each photon, and do all the photons in each time step
+        # together.
+        nstep = len(self._screens)
+        ud.generate(r)
+        step = np.minimum((r * nstep).astype(int), nstep-1)
+        order = np.argsort(step, kind='mergesort')
+        counts = np.bincount(step, minlength=nstep)
+        dwdu = np.empty(n)
+        dwdv = np.empty(n)
+        i1 = 0
+        for screens, count in zip(self._screens, counts):
+            if count == 0: continue
+            index = order[i1:i1+count]
+            dwdu[index], dwdv[index] = screens._wavefront_gradient(u[index], v[index],
+                                                                   self.theta, self.aper)
+            i1 += count
+
+        # The wavefront gradient is in nm/m, which is the deflection angle in units of 1.e-9
+        # radians.
+        factor = 1.e-9 * (galsim.radians / self.scale_unit)
+        du = dwdu * factor
+        dv = dwdv * factor
+        if local_wcs is None:
+            photon_array.x[:] += du
+            photon_array.y[:] += dv
+        else:
+            photon_array.x[:] += local_wcs._x(du, dv)
+            photon_array.y[:] += local_wcs._y(du, dv)
+
+    def __eq__(self, other):
+        return (isinstance(other, PhotonGeometricOptics) and
+                self.screen_list == other.screen_list and
+                self.exptime == other.exptime and
+                self.aper == other.aper and
+                self.theta == other.theta and
+                self.scale_unit == other.scale_unit)
+
+    def __ne__(self, other): return not self.__eq__(other)
+
+    # No hash since the phase screens are mutable.
+    __hash__ = None
+
+    def __repr__(self):
+        return 'galsim.PhotonGeometricOptics(%r, exptime=%r, aper=%r, theta=%r, scale_unit=%r)'%(
+                self.screen_list, self.exptime, self.aper, self.theta, self.scale_unit)
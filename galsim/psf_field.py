@@ -0,0 +1,170 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file psf_field.py
+A spatially varying PSF model built by interpolating the principal components of PSF images drawn
+on a grid of positions.
+"""
+
+import numpy as np
+import galsim
+
+
+def _grid_positions(bounds, nx, ny):
+    """Return the nx * ny grid positions spanning `bounds`, with x varying fastest.
+    """
+    x = np.linspace(bounds.xmin, bounds.xmax, nx)
+    y = np.linspace(bounds.ymin, bounds.ymax, ny)
+    return [ galsim.PositionD(xx, yy) for yy in y for xx in x ]
+
+
+class PSFField(object):
+    """A PSF that varies across the field of view, interpolated from PSF images drawn on a grid of
+    positions.
+
+    Building a new OpticalPSF or PhaseScreenPSF for every object is expensive, since each one needs
+    its own FFT.  A PSFField instead builds the PSF only at the nodes of an `nx` by `ny` grid
+    spanning `bounds`, draws each one, and compresses the images into their mean plus `npca`
+    principal components.  The PSF at any other position is then an InterpolatedImage of the
+    mean image plus the principal components, with coefficients interpolated from the grid.
+
+    The PSFs on the grid are given by `psf_func`, a function that takes a PositionD and returns the
+    PSF there as a GSObject.  For example, for a field-dependent optical PSF:
+
+        >>> def psf_func(pos):
+        ...     return galsim.OpticalPSF(lam=700., diam=4., defocus=0.1 + 1.e-4 * pos.x)
+        >>> psf_field = galsim.PSFField(psf_func, galsim.BoundsD(0, 2048, 0, 4096), nx=5, ny=9)
+        >>> psf = psf_field.getPSF(galsim.PositionD(123.4, 3456.7))
+
+    Or for the WFIRST PSF on one SCA with some position-dependent extra aberrations:
+
+        >>> def psf_func(pos):
+        ...     return galsim.wfirst.getPSF(SCAs=7, wavelength=1293., approximate_struts=True,
+        ...                                 extra_aberrations=my_aberrations(pos))[7]
+
+    If `batch` is True, then `psf_func` is called once with the list of all the grid positions, and
+    should return a list of PSFs.  This lets PhaseScreenList.makePSF build the PSFs for all the
+    positions together:
+
+        >>> def psf_func(positions):
+        ...     theta = [(pos.x*galsim.arcsec, pos.y*galsim.arcsec) for pos in positions]
+        ...     return atm.makePSF(lam=700., diam=4., exptime=15., theta=theta)
+        >>> psf_field = galsim.PSFField(psf_func, galsim.BoundsD(-600, 600, -600, 600), batch=True)
+
+    Finally, `psf_func` may simply be a list of the PSFs at the grid positions, ordered with x
+    varying fastest.  The grid positions are equally spaced and include the edges of `bounds`.
+
+    The PSFs are drawn with method='no_pixel', so the returned profiles are in the same coordinates
+    as the PSFs from `psf_func`.  Positions outside of `bounds` raise a ValueError.
+
+    @param psf_func         A function returning the PSF at a given position, or a list of PSFs at
+                            the grid positions.  See above.
+    @param bounds           A BoundsI or BoundsD giving the region over which to model the PSF.
+    @param nx               Number of grid positions in the x direction. [default: 5]
+    @param ny               Number of grid positions in the y direction. [default: nx]
+    @param scale            The pixel scale at which to draw the PSF images.  [default: None, which
+                            means to use the Nyquist scale of the first PSF]
+    @param image_size       The size of the (square) PSF images.  [default: None, which means to
+                            use a good size for the first PSF]
+    @param npca             The number of principal components to keep.  [default: None, which
+                            means to keep all of them, so the PSFs at the grid positions are
+                            reproduced exactly]
+    @param interpolant      The interpolant to use for the principal component coefficients
+                            between grid positions.  See LookupTable2D for the options.
+                            [default: 'cubic']
+    @param batch            Whether to call `psf_func` with a list of all the grid positions.
+                            [default: False]
+    """
+    def __init__(self, psf_func, bounds, nx=5, ny=None, scale=None, image_size=None, npca=None,
+                 interpolant='cubic', batch=False):
+        if ny is None:
+            ny = nx
+        if nx < 2 or ny < 2:
+            raise ValueError("PSFField requires nx >= 2 and ny >= 2")
+        if isinstance(bounds, galsim.BoundsI):
+            bounds = galsim.BoundsD(bounds.xmin, bounds.xmax, bounds.ymin, bounds.ymax)
+        if not isinstance(bounds, galsim.BoundsD) or not bounds.isDefined():
+            raise ValueError("PSFField requires a defined BoundsI or BoundsD")
+        self.bounds = bounds
+        self.nx = nx
+        self.ny = ny
+
+        positions = _grid_positions(bounds, nx, ny)
+        if batch:
+            psfs = psf_func(positions)
+        elif isinstance(psf_func, (list, tuple)):
+            psfs = psf_func
+        else:
+            psfs = [ psf_func(pos) for pos in positions ]
+        if len(psfs) != nx*ny:
+            raise ValueError("Expected %d PSFs, got %d"%(nx*ny, len(psfs)))
+
+        if scale is None:
+            scale = psfs[0].nyquistScale()
+        if image_size is None:
+            image_size = psfs[0].SBProfile.getGoodImageSize(scale, 1.0)
+        self.scale = scale
+        self.image_size = image_size
+
+        # Draw all the PSFs, one per row.
+        images = np.empty((len(psfs), image_size*image_size))
+        im = galsim.ImageD(image_size, image_size, scale=scale)
+        for k, psf in enumerate(psfs):
+            psf.drawImage(image=im, method='no_pixel')
+            images[k] = im.array.ravel()
+
+        # The principal components are the right singular vectors of the mean-subtracted images.
+        self.mean = images.mean(axis=0)
+        u, s, vt = np.linalg.svd(images - self.mean, full_matrices=False)
+        if npca is None or npca > len(s):
+            npca = len(s)
+        self.npca = npca
+        self.basis = vt[:npca]
+        coefs = (u[:, :npca] * s[:npca]).reshape(ny, nx, npca)
+
+        x = np.linspace(bounds.xmin, bounds.xmax, nx)
+        y = np.linspace(bounds.ymin, bounds.ymax, ny)
+        self._tables = [ galsim.LookupTable2D(x, y, coefs[:,:,k].T, interpolant=interpolant)
+                         for k in range(npca) ]
+
+    def getScale(self):
+        return self.scale
+
+    def getCoefficients(self, pos):
+        """Returns the interpolated principal component coefficients at position `pos`.
+        """
+        if not self.bounds.includes(pos.x, pos.y):
+            raise ValueError("Position %s is outside of the PSFField bounds %s"%(pos, self.bounds))
+        return np.array([ tab(pos.x, pos.y) for tab in self._tables ])
+
+    def getPSFArray(self, pos):
+        """Returns the PSF image at position `pos` as a numpy array.
+        """
+        ar = self.mean + np.dot(self.getCoefficients(pos), self.basis)
+        return ar.reshape(self.image_size, self.image_size)
+
+    def getPSF(self, pos, gsparams=None):
+        """Returns the PSF at position `pos`.
+
+        @param pos          The position at which to build the PSF.
+        @param gsparams     An optional GSParams argument.  See the docstring for GSParams for
+                            details. [default: None]
+
+        @returns the PSF as an InterpolatedImage.
+        """
+        im = galsim.ImageD(self.getPSFArray(pos), scale=self.scale)
+        return galsim.InterpolatedImage(im, gsparams=gsparams)
@@ -85,6 +85,8 @@ There are a few methods that are common to all BaseDeviate classes, so we descri
     dev.clearCache()    Clear the internal cache of the Deviate, if there is any.
     dev.duplicate()     Create a duplicate of the current Deviate, which will produce an identical
                         series of values as the original.
+    dev.generate(array) Fill a numpy array with values drawn from the distribution.  (Not
+                        available for a pure BaseDeviate.)
 """
 
 set_func_doc(_galsim.BaseDeviate.seed, """
@@ -134,6 +136,20 @@ GaussianDeviate, since it generates two values at a time, saving the second one
 next output value.
 """)
 
+def _BaseDeviate_generate(self, array):
+    """Generate many pseudo-random values, filling in the values of a numpy array.
+
+    This is equivalent to filling the array one value at a time by calling the deviate, but
+    the loop is done in C++, so it is much faster.  The array is updated in place.
+
+    @param array    A numpy array to fill with random values.
+    """
+    array_1d = np.ascontiguousarray(array.ravel(), dtype=float)
+    self._generate(array_1d)
+    if not np.may_share_memory(array, array_1d):
+        array[...] = array_1d.reshape(array.shape)
+_galsim.BaseDeviate.generate = _BaseDeviate_generate
+
 def _BaseDeviate_eq(self, other):
     return (type(self) == type(other) and
             self.serialize() == other.serialize())
@@ -0,0 +1,234 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file serialize.py
+Compact serialization of GalSim objects, for sending them between processes or saving them
+to disk.
+
+The regular pickle module works for all GalSim objects, but objects such as InterpolatedImage
+and RealGalaxy carry their images with them, and pickle writes each array into the stream as
+an opaque string.  An array that appears in several places in a profile tree (e.g. the same
+galaxy image read twice from a catalog) is written each time, and padded images, which are
+mostly zeros, are written in full.
+
+The functions here use the same machinery as pickle for everything but the numpy arrays.
+The arrays are pulled out of the pickle stream, stored only once per distinct content, and
+optionally compressed.  The array payloads may also be passed out-of-band to a callback
+function, rather than being copied into the returned string, e.g. to place them in shared
+memory or to send them as separate messages.
+
+    >>> data = galsim.serialize.dumps(obj)
+    >>> obj2 = galsim.serialize.loads(data)
+    >>> assert obj2 == obj
+
+or, with the array payloads sent separately:
+
+    >>> buffers = []
+    >>> data = galsim.serialize.dumps(obj, buffer_callback=buffers.append)
+    >>> obj2 = galsim.serialize.loads(data, buffers=buffers)
+
+The round trip is exact: the arrays come back with the same dtype (including byte order),
+shape, memory order and values.  As with pickle, an array that appears several times in the
+object comes back as a single array, while separate arrays with equal contents come back as
+separate arrays, even though their contents are only stored once.
+"""
+
+import io
+import pickle
+import struct
+import hashlib
+import zlib
+import numpy as np
+
+# A string at the start of the serialization to identify the format.
+_magic = b'GSSER1'
+# The format of the length fields.
+_length_fmt = '<Q'
+_length_size = struct.calcsize(_length_fmt)
+# Compressed payloads are only kept if they are at most this fraction of the original size.
+_min_compression = 0.9
+
+
+class _ArrayPickler(pickle.Pickler):
+    """A Pickler that takes numpy arrays out of the pickle stream.
+
+    Each array is replaced by a reference to an entry in self.arrays, which holds one array
+    for each distinct content found, along with a copy number, which distinguishes separate
+    arrays with the same content.  The same array object always gets the same copy number, so
+    that the unpickler can restore separate arrays as separate objects.
+    """
+    def __init__(self, file, protocol):
+        pickle.Pickler.__init__(self, file, protocol)
+        self.arrays = []
+        self._index = {}    # (dtype, shape, order, hash) -> index into self.arrays
+        self._ncopies = []  # The number of separate arrays found for each entry of self.arrays
+        self._ids = {}      # id(array) -> (pid, array).  Keep the array to hold the id valid.
+
+    def persistent_id(self, obj):
+        # Note: object arrays can hold arbitrary python objects, so let pickle handle those.
+        if type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+        if id(obj) in self._ids:
+            return self._ids[id(obj)][0]
+        if obj.flags.f_contiguous and not obj.flags.c_contiguous:
+            order = 'F'
+        else:
+            order = 'C'
+        payload = obj.tobytes(order=order)
+        key = (obj.dtype, obj.shape, order, hashlib.sha1(payload).digest())
+        if key not in self._index:
+            self._index[key] = len(self.arrays)
+            self.arrays.append((obj.dtype, obj.shape, order, payload))
+            self._ncopies.append(0)
+        k = self._index[key]
+        pid = ('array', k, self._ncopies[k])
+        self._ncopies[k] += 1
+        self._ids[id(obj)] = (pid, obj)
+        return pid
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """An Unpickler that restores the arrays removed by _ArrayPickler.
+    """
+    def __init__(self, file, arrays):
+        pickle.Unpickler.__init__(self, file)
+        self.arrays = arrays
+        self._restored = {}     # (index, copy number) -> array
+
+    def persistent_load(self, pid):
+        tag, k, n = pid
+        if tag != 'array':
+            raise pickle.UnpicklingError("Invalid persistent id: %r"%(pid,))
+        if (k,n) not in self._restored:
+            # The first array with each content can use the decoded array directly.  Any others
+            # were separate arrays in the original object, so they need their own copies.
+            a = self.arrays[k]
+            if any(key[0] == k for key in self._restored):
+                a = a.copy(order='K')
+            self._restored[(k,n)] = a
+        return self._restored[(k,n)]
+
+
+def dumps(obj, buffer_callback=None, compress=1):
+    """Serialize an object to a compact string of bytes.
+
+    Any picklable object may be serialized, but the format is mostly aimed at GSObjects,
+    ChromaticObjects and other objects that hold numpy arrays, such as InterpolatedImage,
+    RealGalaxy or LookupTable.  The arrays are written only once for each distinct content,
+    even if they are separate copies in the object, and are compressed with zlib if that
+    makes them appreciably smaller.
+
+    If `buffer_callback` is given, the payloads of the arrays are not included in the returned
+    string.  Rather, `buffer_callback` is called once with each payload, in order, as a
+    memoryview.  The same payloads must then be passed to loads() as the `buffers` argument.
+    This follows the convention of pickle protocol 5, but works with all versions of python.
+
+    @param obj              The object to serialize.
+    @param buffer_callback  A function to receive the array payloads out-of-band.
+                            [default: None, which means to include them in the returned string]
+    @param compress         The zlib compression level to use for the array payloads, or 0 to
+                            not compress them. [default: 1]
+
+    @returns the serialized object as a bytes string.
+    """
+    f = io.BytesIO()
+    pickler = _ArrayPickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.dump(obj)
+    obj_data = f.getvalue()
+
+    index = []
+    payloads = []
+    for dtype, shape, order, payload in pickler.arrays:
+        nbytes = len(payload)
+        compressed = False
+        if compress and nbytes > 0:
+            z = zlib.compress(payload, compress)
+            if len(z) <= _min_compression * nbytes:
+                payload = z
+                compressed = True
+        index.append((dtype, shape, order, compressed, len(payload)))
+        payloads.append(payload)
+
+    in_band = buffer_callback is None
+    header = pickle.dumps((index, in_band), pickle.HIGHEST_PROTOCOL)
+
+    out = [ _magic,
+            struct.pack(_length_fmt, len(header)), header,
+            struct.pack(_length_fmt, len(obj_data)), obj_data ]
+    if in_band:
+        out.extend(payloads)
+    else:
+        for payload in payloads:
+            buffer_callback(memoryview(payload))
+    return b''.join(out)
+
+
+def loads(data, buffers=None):
+    """Reconstruct an object that was serialized with dumps().
+
+    @param data         The bytes string returned by dumps().
+    @param buffers      If dumps() was given a `buffer_callback`, the array payloads that were
+                        passed to it, in the same order.  Any objects supporting the buffer
+                        protocol are allowed.  [default: None]
+
+    @returns the reconstructed object.
+    """
+    data = memoryview(data)
+    if data[:len(_magic)].tobytes() != _magic:
+        raise ValueError("data is not a valid galsim.serialize string")
+    pos = len(_magic)
+
+    def read_block(pos):
+        n, = struct.unpack(_length_fmt, data[pos:pos+_length_size].tobytes())
+        pos += _length_size
+        return data[pos:pos+n], pos+n
+
+    header, pos = read_block(pos)
+    index, in_band = pickle.loads(header.tobytes())
+    obj_data, pos = read_block(pos)
+
+    if in_band:
+        if buffers is not None:
+            raise ValueError("buffers given, but the array payloads are included in data")
+        payloads = []
+        for entry in index:
+            n = entry[4]
+            payloads.append(data[pos:pos+n])
+            pos += n
+    else:
+        if buffers is None:
+            raise ValueError("buffers are required, since dumps() was given a buffer_callback")
+        payloads = [ memoryview(b) for b in buffers ]
+        if len(payloads) != len(index):
+            raise ValueError("Expecting %d buffers, but got %d"%(len(index), len(payloads)))
+
+    arrays = []
+    for (dtype, shape, order, compressed, n), payload in zip(index, payloads):
+        if len(payload) != n:
+            raise ValueError("Array payload has the wrong length: %d != %d"%(len(payload), n))
+        if compressed:
+            payload = zlib.decompress(payload.tobytes())
+        if len(payload) == 0:
+            a = np.empty(shape, dtype=dtype, order=order)
+        else:
+            # Copy, so the array is writeable and doesn't hold a reference to data.
+            a = np.frombuffer(payload, dtype=dtype)
+            a = a.reshape(shape, order=order).copy(order=order)
+        arrays.append(a)
+
+    unpickler = _ArrayUnpickler(io.BytesIO(obj_data.tobytes()), arrays)
+    return unpickler.load()
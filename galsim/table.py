@@ -325,6 +325,11 @@ class LookupTable2D(object):
       - 'floor'
       - 'ceil'
       - 'nearest'
+      - 'cubic'
+
+    The 'cubic' interpolant is a bicubic Hermite interpolation using derivatives estimated from
+    finite differences of the tabulated values (which is Catmull-Rom interpolation for equally
+    spaced x and y), so both the interpolated function and its gradient are continuous.
 
         >>> tab2d = galsim.LookupTable2D(x, y, z, interpolant='floor')
         >>> tab2d(2.2, 3.7)
@@ -379,8 +384,8 @@ class LookupTable2D(object):
     @param x              Strictly increasing array of `x` positions at which to create table.
     @param y              Strictly increasing array of `y` positions at which to create table.
     @param f              Nx by Ny input array of function values.
-    @param interpolant    Interpolant to use.  One of 'floor', 'ceil', 'nearest', or 'linear'.
-                          [Default: 'linear']
+    @param interpolant    Interpolant to use.  One of 'floor', 'ceil', 'nearest', 'linear', or
+                          'cubic'.  [Default: 'linear']
     @param edge_mode      Keyword controlling how extrapolation beyond the input range is handled.
                           See above for details.  [Default: 'raise']
     @param constant       A constant to return when extrapolating beyond the input range and
@@ -423,7 +428,9 @@ class LookupTable2D(object):
                 raise ValueError("Cannot use edge_mode='wrap' unless either x and y are equally "
                                  "spaced or first/last row/column of f are identical.")
 
-        self.table = _galsim._LookupTable2D(self.x, self.y, self.f, self.interpolant)
+        # The C++ table does the wrapping itself for edge_mode='wrap'.
+        self.table = _galsim._LookupTable2D(self.x, self.y, self.f, self.interpolant,
+                                            self.edge_mode == 'wrap')
 
     def _inbounds(self, x, y):
         """Return whether or not *all* coords specified by x and y are in bounds of the original
@@ -431,15 +438,12 @@ class LookupTable2D(object):
         return (np.min(x) >= self.x[0] and np.max(x) <= self.x[-1] and
                 np.min(y) >= self.y[0] and np.max(y) <= self.y[-1])
 
-    def _wrap_args(self, x, y):
-        """Wrap points back into the fundamental period."""
-        return ((x-self.x[0]) % self.xperiod + self.x[0],
-                (y-self.y[0]) % self.yperiod + self.y[0])
-
     def _call_raise(self, x, y):
         if not self._inbounds(x, y):
             raise ValueError("Extrapolating beyond input range.")
+        return self._call_table(x, y)
 
+    def _call_table(self, x, y):
         from numbers import Real
         if isinstance(x, Real):
             return self.table(x, y)
@@ -455,8 +459,7 @@ class LookupTable2D(object):
             return f
 
     def _call_wrap(self, x, y):
-        x, y = self._wrap_args(x, y)
-        return self._call_raise(x, y)
+        return self._call_table(x, y)
 
     def _call_constant(self, x, y):
         from numbers import Real
@@ -489,6 +492,81 @@ class LookupTable2D(object):
         elif self.edge_mode == 'constant':
             return self._call_constant(x, y)
 
+    def gradient(self, x, y):
+        """Calculate the gradient of the interpolated function at an arbitrary point or points.
+
+        The 'floor', 'ceil', and 'nearest' interpolants are piecewise constant, so their gradient
+        is zero.  Points beyond the input range are handled according to `edge_mode`, where the
+        gradient of a constant extrapolation is zero.
+
+        @param x        Float or array of floats at which to evaluate the gradient.
+        @param y        Float or array of floats at which to evaluate the gradient.
+
+        @returns a tuple (dfdx, dfdy) of the derivatives of the function with respect to x and y,
+                 each of which is a float or an array with the same shape as x and y.
+        """
+        if self.edge_mode == 'raise' and not self._inbounds(x, y):
+            raise ValueError("Extrapolating beyond input range.")
+
+        from numbers import Real
+        if isinstance(x, Real):
+            if self.edge_mode == 'constant' and not self._inbounds(x, y):
+                return 0., 0.
+            return self.table.gradient(x, y)
+        else:
+            x = np.array(x, dtype=float)
+            y = np.array(y, dtype=float)
+            shape = x.shape
+            x = x.ravel()
+            y = y.ravel()
+            dfdx = np.zeros_like(x)
+            dfdy = np.zeros_like(x)
+            if self.edge_mode == 'constant':
+                good = ((x >= self.x[0]) & (x <= self.x[-1]) &
+                        (y >= self.y[0]) & (y <= self.y[-1]))
+                tmpx = np.empty((sum(good),), dtype=float)
+                tmpy = np.empty((sum(good),), dtype=float)
+                self.table.gradientMany(x[good], y[good], tmpx, tmpy)
+                dfdx[good] = tmpx
+                dfdy[good] = tmpy
+            else:
+                self.table.gradientMany(x, y, dfdx, dfdy)
+            return dfdx.reshape(shape), dfdy.reshape(shape)
+
+    def evalShifted(self, x, y, dx, dy):
+        """Evaluate the table at many shifted copies of one set of points in a single call.
+
+        This is equivalent to
+
+            >>> np.array([tab2d(x + dx[m], y + dy[m]) for m in range(len(dx))])
+
+        but without the temporary arrays or the Python loop.
+
+        @param x        Array of x positions.
+        @param y        Array of y positions, the same shape as x.
+        @param dx       Array of shifts in x.
+        @param dy       Array of shifts in y, the same length as dx.
+
+        @returns an array of shape (len(dx),) + x.shape.
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        dx = np.ascontiguousarray(dx, dtype=float).ravel()
+        dy = np.ascontiguousarray(dy, dtype=float).ravel()
+        shape = (len(dx),) + x.shape
+        if self.edge_mode == 'constant':
+            f = self(x.ravel() + dx[:,np.newaxis], y.ravel() + dy[:,np.newaxis])
+            return f.reshape(shape)
+        if self.edge_mode == 'raise' and len(dx) > 0 and x.size > 0:
+            if not (np.min(x) + np.min(dx) >= self.x[0] and
+                    np.max(x) + np.max(dx) <= self.x[-1] and
+                    np.min(y) + np.min(dy) >= self.y[0] and
+                    np.max(y) + np.max(dy) <= self.y[-1]):
+                raise ValueError("Extrapolating beyond input range.")
+        f = np.empty((len(dx), x.size), dtype=float)
+        self.table.interpManyShifted(x.ravel(), y.ravel(), dx, dy, f)
+        return f.reshape(shape)
+
     def __str__(self):
         return ("galsim.LookupTable2D(x=[%s,...,%s], y=[%s,...,%s], "
                 "f=[[%s,...,%s],...,[%s,...,%s]], interpolant=%r, edge_mode=%r)"%(
@@ -517,23 +595,26 @@ def _LookupTable2D_eq(self, other):
             and np.array_equal(self.getXArgs(), other.getXArgs())
             and np.array_equal(self.getYArgs(), other.getYArgs())
             and np.array_equal(self.getVals(), other.getVals())
-            and self.getInterp() == other.getInterp())
+            and self.getInterp() == other.getInterp()
+            and self.isPeriodic() == other.isPeriodic())
 
 def _LookupTable2D_str(self):
     x = self.getXArgs()
     y = self.getYArgs()
     f = self.getVals()
     return ("galsim._galsim._LookupTable2D(x=[%s,...,%s], y=[%s,...,%s], "
-            "f=[[%s,...,%s],...,[%s,...,%s]]), interpolant=%r"%(
-            x[0], x[-1], y[0], y[-1], f[0,0], f[0,-1], f[-1,0], f[-1,-1], self.getInterp()))
+            "f=[[%s,...,%s],...,[%s,...,%s]]), interpolant=%r, periodic=%r"%(
+            x[0], x[-1], y[0], y[-1], f[0,0], f[0,-1], f[-1,0], f[-1,-1], self.getInterp(),
+            self.isPeriodic()))
 
 _galsim._LookupTable2D.__getinitargs__ = lambda self: \
-        (self.getXArgs(), self.getYArgs(), self.getVals(), self.getInterp())
+        (self.getXArgs(), self.getYArgs(), self.getVals(), self.getInterp(), self.isPeriodic())
 _galsim._LookupTable2D.__eq__ = _LookupTable2D_eq
 _galsim._LookupTable2D.__hash__ = lambda self: \
         hash(("_galsim._LookupTable2D", tuple(self.getXArgs()), tuple(self.getYArgs()),
-              tuple(np.array(self.getVals()).ravel()), self.getInterp()))
+              tuple(np.array(self.getVals()).ravel()), self.getInterp(), self.isPeriodic()))
 _galsim._LookupTable2D.__str__ = _LookupTable2D_str
 _galsim._LookupTable2D.__repr__ = lambda self: \
-        'galsim._galsim._LookupTable(array(%r), array(%r), array(%r), %r)'%(
-        self.getXArgs().tolist(), self.getYArgs().tolist(), self.getVals(), self.getInterp())
+        'galsim._galsim._LookupTable2D(array(%r), array(%r), array(%r), %r, %r)'%(
+        self.getXArgs().tolist(), self.getYArgs().tolist(), self.getVals().tolist(),
+        self.getInterp(), self.isPeriodic())
@@ -140,6 +140,36 @@ class Transformation(galsim.GSObject):
     @property
     def flux_ratio(self): return self.getFluxRatio()
 
+    def _isScaledRotation(self):
+        # Check whether the jacobian is just a rotation and/or dilation (i.e. no shear).
+        dudx, dudy, dvdx, dvdy = self.jac.ravel()
+        return dudx == dvdy and dudy == -dvdx
+
+    def _calculateExactHLR(self, flux_frac):
+        # A rotation and dilation just scales the radius.  The offset doesn't matter, since the
+        # radius is measured relative to the centroid.
+        if self._isScaledRotation():
+            hlr = self.original._calculateExactHLR(flux_frac)
+            if hlr is not None:
+                return np.sqrt(abs(np.linalg.det(self.jac))) * hlr
+        return galsim.GSObject._calculateExactHLR(self, flux_frac)
+
+    def _calculateExactFWHM(self):
+        if self._isScaledRotation():
+            fwhm = self.original._calculateExactFWHM()
+            if fwhm is not None:
+                return np.sqrt(abs(np.linalg.det(self.jac))) * fwhm
+        return galsim.GSObject._calculateExactFWHM(self)
+
+    def _calculateMoments(self):
+        # The moments transform as Q -> J Q J^T.
+        Q = self.original._calculateMoments()
+        if Q is None:
+            return None
+        Qxx, Qxy, Qyy = Q
+        Q = self.jac.dot(np.array([[Qxx, Qxy], [Qxy, Qyy]])).dot(self.jac.T)
+        return Q[0,0], Q[0,1], Q[1,1]
+
     # There's really no good way to check that two callables are equal, except if they literally
     # point to the same object.  So we'll just check for that for _jac, _offset, and _flux_ratio.
     def __eq__(self, other):
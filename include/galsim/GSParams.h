@@ -101,6 +101,14 @@ namespace galsim {
          *                                    extrema.
          * @param small_fraction_of_flux      Intervals with less than this fraction of probability
          *                                    are ok to use dominant-sampling method.
+         * @param shoot_inverse_cdf           Whether to photon shoot radial profiles that lack an
+         *                                    analytic inverse cumulative flux (Sersic, Spergel)
+         *                                    using a precomputed table of the inverse cumulative
+         *                                    flux rather than the interval-tree sampler.
+         * @param interpolate_sersic_n        Whether to compute the Fourier transform of Sersic
+         *                                    profiles by interpolating between tables on a fixed
+         *                                    grid of Sersic indices rather than building a new
+         *                                    table for each distinct n.
          */
         GSParams(int _minimum_fft_size,
                  int _maximum_fft_size,
@@ -117,7 +125,9 @@ namespace galsim {
                  double _shoot_accuracy,
                  double _allowed_flux_variation,
                  int _range_division_for_extrema,
-                 double _small_fraction_of_flux);
+                 double _small_fraction_of_flux,
+                 bool _shoot_inverse_cdf,
+                 bool _interpolate_sersic_n);
 
         /**
          * A reasonable set of default values
@@ -141,7 +151,9 @@ namespace galsim {
             shoot_accuracy(1.e-5),
             allowed_flux_variation(0.81),
             range_division_for_extrema(32),
-            small_fraction_of_flux(1.e-4)
+            small_fraction_of_flux(1.e-4),
+            shoot_inverse_cdf(false),
+            interpolate_sersic_n(false)
             {}
 
         bool operator==(const GSParams& rhs) const;
@@ -168,6 +180,8 @@ namespace galsim {
         double allowed_flux_variation;
         int range_division_for_extrema;
         double small_fraction_of_flux;
+        bool shoot_inverse_cdf;
+        bool interpolate_sersic_n;
 
     };
 
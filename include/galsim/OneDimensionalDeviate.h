@@ -255,6 +255,54 @@ namespace galsim {
         const GSParamsPtr _gsparams;
     };
 
+    /**
+     * @brief Class which samples a non-negative axisymmetric function on the plane by lookup in
+     * a precomputed table of its inverse cumulative flux.
+     *
+     * This is an alternative to `OneDimensionalDeviate` for radial profiles.  On construction,
+     * the domain is divided into annuli that each contain the same fraction of the total flux,
+     * namely `small_fraction_of_flux` from the GSParams.  The squared radii of the annulus
+     * boundaries are stored in a table with uniform spacing in cumulative flux.  Each photon then
+     * needs only one uniform deviate for the cumulative flux (plus one for the azimuth), which is
+     * mapped to a radius by linear interpolation in r^2 within the table.  That is, the surface
+     * brightness is taken to be constant within each annulus.  There is no tree descent or
+     * rejection, and all photons have the same flux.
+     *
+     * The `range` argument has the same meaning as for `OneDimensionalDeviate`.  The function
+     * must be non-negative over the whole range.
+     */
+    class RadialInverseCDF
+    {
+    public:
+        /**
+         * @brief constructor
+         * @param[in] fluxDensity  The FluxDensity being sampled.  It is only used during
+         *                         construction, so it does not need to persist afterwards.
+         * @param[in] range        Ordered argument vector specifying the domain for sampling.
+         * @param[in] gsparams     GSParams object storing constants that control the accuracy of
+         *                         operations, if different from the default.
+         */
+        RadialInverseCDF(
+            const FluxDensity& fluxDensity, const std::vector<double>& range,
+            const GSParamsPtr& gsparams);
+
+        double getPositiveFlux() const {return _flux;}
+
+        double getNegativeFlux() const {return 0.;}
+
+        /**
+         * @brief Draw photons from the distribution.
+         * @param[in] N number of photons to draw
+         * @param[in] ud UniformDeviate used to produce random selections.
+         */
+        boost::shared_ptr<PhotonArray> shoot(int N, UniformDeviate ud) const;
+
+    private:
+
+        std::vector<double> _rsq; // r^2 at uniformly spaced values of the cumulative flux
+        double _flux; // Total flux within the range
+    };
+
 } // namespace galsim
 
 #endif
@@ -118,6 +118,50 @@ namespace galsim {
          */
         double getFlux(int i) const { return _flux[i]; }
 
+        /**
+         * @brief Access wavelength of a photon
+         *
+         * @param[in] i Index of desired photon (no bounds checking)
+         * @returns wavelength of photon in nm
+         */
+        double getWavelength(int i) const { return _wave[i]; }
+
+        /**
+         * @brief Set wavelength of a photon
+         *
+         * @param[in] i Index of desired photon (no bounds checking)
+         * @param[in] wave wavelength of photon in nm
+         */
+        void setWavelength(int i, double wave) { _wave[i] = wave; }
+
+        /**
+         * @brief Allocate space for the photon wavelengths, which are not stored by default.
+         */
+        void allocateWavelengths() { _wave.resize(_x.size(), 0.); }
+
+        /**
+         * @brief Check if the wavelength array has been allocated.
+         *
+         * This is trivially true for an empty PhotonArray.
+         */
+        bool hasAllocatedWavelengths() const { return _wave.size() > 0 || _x.size() == 0; }
+
+        //@{
+        /**
+         * @brief Direct access to the underlying storage of the photon information.
+         *
+         * These are used by the python layer to make numpy arrays that are views into the
+         * storage of this PhotonArray.  Any operation that changes the size of the array
+         * (e.g. append) will invalidate such views.
+         *
+         * The wavelength array is only valid if allocateWavelengths() has been called.
+         */
+        double* getXArray() { return _x.empty() ? 0 : &_x[0]; }
+        double* getYArray() { return _y.empty() ? 0 : &_y[0]; }
+        double* getFluxArray() { return _flux.empty() ? 0 : &_flux[0]; }
+        double* getWavelengthArray() { return _wave.empty() ? 0 : &_wave[0]; }
+        //@}
+
         /**
          * @brief Return sum of all photons' fluxes
          *
@@ -151,6 +195,8 @@ namespace galsim {
         /**
          * @brief Extend this array with the contents of another.
          *
+         * The wavelengths are only retained if both arrays have allocated wavelengths.
+         *
          * @param[in] rhs PhotonArray whose contents to append to this one.
          */
         void append(const PhotonArray& rhs);
@@ -216,6 +262,7 @@ namespace galsim {
         std::vector<double> _x;      // Vector holding x coords of photons
         std::vector<double> _y;      // Vector holding y coords of photons
         std::vector<double> _flux;   // Vector holding flux of photons
+        std::vector<double> _wave;   // Vector holding wavelength of photons (empty if unused)
         bool _is_correlated;          // Are the photons correlated?
     };
 
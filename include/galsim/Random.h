@@ -238,6 +238,15 @@ namespace galsim {
          */
         double operator()() { return _val(); }
 
+        /**
+         * @brief Fill an array of N values with draws from the distribution.
+         *
+         * @param[in] N     The number of values to draw.
+         * @param[out] data Pointer to the start of the array to fill.
+         */
+        void generate(int N, double* data)
+        { for (int i=0; i<N; ++i) data[i] = _val(); }
+
    protected:
 
         boost::shared_ptr<rng_type> _rng;
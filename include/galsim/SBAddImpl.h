@@ -40,6 +40,10 @@ namespace galsim {
 
         double maxK() const { return _maxMaxK; }
         double stepK() const { return _minStepK; }
+        void getMaxKXY(double& maxkx, double& maxky) const
+        { maxkx = _maxMaxKx; maxky = _maxMaxKy; }
+        void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = _minStepKx; stepky = _minStepKy; }
 
         void getXRange(double& xmin, double& xmax, std::vector<double>& splits) const
         {
@@ -130,6 +134,9 @@ namespace galsim {
         void fillKValue(tmv::MatrixView<std::complex<double> > val,
                         double kx0, double dkx, double dkxy,
                         double ky0, double dky, double dkyx) const;
+        void xValueMany(const double* x, const double* y, double* val, int n) const;
+        void kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                        int n) const;
 
         typedef std::list<SBProfile>::iterator Iter;
         typedef std::list<SBProfile>::const_iterator ConstIter;
@@ -145,6 +152,8 @@ namespace galsim {
         double _sumfy; ///< Keeps track of the cumulated `fy` of all summands.
         double _maxMaxK; ///< Keeps track of the cumulated `maxK()` of all summands.
         double _minStepK; ///< Keeps track of the cumulated `minStepK()` of all summands.
+        double _maxMaxKx, _maxMaxKy; ///< The same for `getMaxKXY()`.
+        double _minStepKx, _minStepKy; ///< The same for `getStepKXY()`.
         double _minMinX; ///< Keeps track of the cumulated `minX()` of all summands.
         double _maxMaxX; ///< Keeps track of the cumulated `maxX()` of all summands.
         double _minMinY; ///< Keeps track of the cumulated `minY()` of all summands.
@@ -64,6 +64,7 @@ namespace galsim {
     protected:
 
         class SBBoxImpl;
+        friend class SBConvolve;
 
     private:
         // op= is undefined
@@ -0,0 +1,97 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_SBCloud_H
+#define GalSim_SBCloud_H
+/**
+ * @file SBCloud.h @brief SBProfile that is the sum of many shifted, scaled copies of one profile.
+ */
+
+#include <vector>
+#include "SBProfile.h"
+
+namespace galsim {
+
+    /**
+     * @brief The sum of many shifted, dilated and flux-scaled copies of one SBProfile.
+     *
+     * This is equivalent to an SBAdd of an SBTransform of the adaptee for each copy, but it
+     * is much faster when there are many copies (e.g. the knots of star formation in a
+     * galaxy).  In k space, the adaptee only needs to be evaluated once for each distinct
+     * dilation, and the copies are summed with their phase factors.  Photons are shot from the
+     * adaptee in a single call and then assigned to copies in proportion to their flux.
+     *
+     * The i-th copy has surface brightness
+     *
+     *     f_i(x) = flux_ratio[i] / scale[i]^2 * f((x - pos[i]) / scale[i])
+     *
+     * where pos[i] = (x[i], y[i]), so its flux is flux_ratio[i] times the flux of the adaptee.
+     */
+    class SBCloud : public SBProfile
+    {
+    public:
+        /**
+         * @brief Constructor.
+         *
+         * @param[in] adaptee     The SBProfile to copy.
+         * @param[in] x           The x positions of the copies.
+         * @param[in] y           The y positions of the copies.
+         * @param[in] flux_ratio  The flux of each copy relative to the flux of the adaptee.
+         * @param[in] scale       The dilation of each copy.  These must be > 0.
+         * @param[in] gsparams    GSParams object storing constants that control the accuracy of
+         *                        image operations and rendering, if different from the default.
+         */
+        SBCloud(const SBProfile& adaptee,
+                const std::vector<double>& x, const std::vector<double>& y,
+                const std::vector<double>& flux_ratio, const std::vector<double>& scale,
+                const GSParamsPtr& gsparams);
+
+        /// @brief Copy constructor.
+        SBCloud(const SBCloud& rhs);
+
+        /// @brief Destructor.
+        ~SBCloud();
+
+        /// @brief Get the SBProfile being copied.
+        SBProfile getObj() const;
+
+        /// @brief Get the x positions of the copies.
+        const std::vector<double>& getX() const;
+
+        /// @brief Get the y positions of the copies.
+        const std::vector<double>& getY() const;
+
+        /// @brief Get the flux ratios of the copies.
+        const std::vector<double>& getFluxRatio() const;
+
+        /// @brief Get the dilations of the copies.
+        const std::vector<double>& getScale() const;
+
+    protected:
+
+        class SBCloudImpl;
+
+    private:
+        // op= is undefined
+        void operator=(const SBCloud& rhs);
+    };
+
+}
+
+#endif
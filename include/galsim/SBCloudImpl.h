@@ -0,0 +1,123 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_SBCloudImpl_H
+#define GalSim_SBCloudImpl_H
+
+#include "SBProfileImpl.h"
+#include "SBCloud.h"
+
+namespace galsim {
+
+    class SBCloud::SBCloudImpl : public SBProfile::SBProfileImpl
+    {
+    public:
+        SBCloudImpl(const SBProfile& adaptee,
+                    const std::vector<double>& x, const std::vector<double>& y,
+                    const std::vector<double>& flux_ratio, const std::vector<double>& scale,
+                    const GSParamsPtr& gsparams);
+        ~SBCloudImpl() {}
+
+        double xValue(const Position<double>& p) const;
+        std::complex<double> kValue(const Position<double>& k) const;
+
+        SBProfile getObj() const { return _adaptee; }
+        const std::vector<double>& getX() const { return _x; }
+        const std::vector<double>& getY() const { return _y; }
+        const std::vector<double>& getFluxRatio() const { return _flux_ratio; }
+        const std::vector<double>& getScale() const { return _scale; }
+
+        double maxK() const { return _maxk; }
+        double stepK() const { return _stepk; }
+        void getMaxKXY(double& maxkx, double& maxky) const
+        { maxkx = _maxkx; maxky = _maxky; }
+        void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = _stepkx; stepky = _stepky; }
+
+        bool isAxisymmetric() const { return false; }
+        bool hasHardEdges() const { return _adaptee.hasHardEdges(); }
+        bool isAnalyticX() const { return _adaptee.isAnalyticX(); }
+        bool isAnalyticK() const { return _adaptee.isAnalyticK(); }
+
+        Position<double> centroid() const { return _centroid; }
+        double getFlux() const { return _flux; }
+        double getPositiveFlux() const { return _positive_flux; }
+        double getNegativeFlux() const { return _negative_flux; }
+
+        /**
+         * @brief Shoot photons through this SBCloud.
+         *
+         * All N photons are shot from the adaptee at once.  Then each photon is assigned to a
+         * copy with probability proportional to the absolute flux of the copy, and it is
+         * moved and its flux rescaled accordingly.
+         */
+        boost::shared_ptr<PhotonArray> shoot(int N, UniformDeviate ud) const;
+
+        // Overrides for better efficiency
+        void fillXValue(tmv::MatrixView<double> val,
+                        double x0, double dx, int izero,
+                        double y0, double dy, int jzero) const;
+        void fillXValue(tmv::MatrixView<double> val,
+                        double x0, double dx, double dxy,
+                        double y0, double dy, double dyx) const;
+        void fillKValue(tmv::MatrixView<std::complex<double> > val,
+                        double kx0, double dkx, int izero,
+                        double ky0, double dky, int jzero) const;
+        void fillKValue(tmv::MatrixView<std::complex<double> > val,
+                        double kx0, double dkx, double dkxy,
+                        double ky0, double dky, double dkyx) const;
+
+        std::string serialize() const;
+
+    private:
+        // Add the sum of flux_ratio[i] * exp(-i k.pos[i]) over the copies in the given group
+        // to phase, where k = (kx0 + i dkx + j dkxy, ky0 + i dkyx + j dky).
+        void addPhases(tmv::MatrixView<std::complex<double> > phase,
+                       const std::vector<int>& group,
+                       double kx0, double dkx, double dkxy,
+                       double ky0, double dky, double dkyx) const;
+
+        SBProfile _adaptee;
+        std::vector<double> _x;
+        std::vector<double> _y;
+        std::vector<double> _flux_ratio;
+        std::vector<double> _scale;
+
+        // The distinct values of scale, and the indices of the copies with each one.
+        std::vector<double> _group_scale;
+        std::vector<std::vector<int> > _groups;
+
+        // The cumulative absolute flux of the copies, for choosing copies when shooting.
+        std::vector<double> _cumflux;
+
+        double _flux;
+        double _positive_flux;
+        double _negative_flux;
+        Position<double> _centroid;
+        double _maxk, _maxkx, _maxky;
+        double _stepk, _stepkx, _stepky;
+
+        // Copy constructor and op= are undefined.
+        SBCloudImpl(const SBCloudImpl& rhs);
+        void operator=(const SBCloudImpl& rhs);
+    };
+
+}
+
+#endif
@@ -25,6 +25,55 @@
 
 namespace galsim {
 
+    // Defined in RealSpaceConvolve.cpp
+    //
+    // A faster real-space convolution of an axisymmetric profile f with an axis-aligned box,
+    // such as a pixel.  The integral of f over any rectangle can be written in terms of
+    //     S(X,Y) = int_0^X int_0^Y f(x,y) dy dx
+    // at its four corners.  For an axisymmetric f, S is a 1-d integral over angle of
+    //     C(R) = int_0^R f(r) r dr,
+    // which is tabulated once when the RealSpaceBoxConvolver is constructed.
+    class RealSpaceBoxConvolver
+    {
+    public:
+        // The box has the given width and height, is centered at cen, and has surface
+        // brightness norm.
+        RealSpaceBoxConvolver(const SBProfile& round, double width, double height,
+                              const Position<double>& cen, double norm,
+                              const GSParamsPtr& gsparams);
+
+        double xValue(const Position<double>& pos) const;
+
+        // When the box is the same size as the grid spacing (e.g. a pixel), adjacent grid
+        // points share the corners of their boxes, so S only needs to be calculated about once
+        // per grid point.
+        void fillXValue(tmv::MatrixView<double> val,
+                        double x0, double dx, double y0, double dy) const;
+
+        class RadialIntegral;
+
+    private:
+        double S(double x, double y) const;
+
+        boost::shared_ptr<RadialIntegral> _C;
+        double _wo2;
+        double _ho2;
+        Position<double> _cen;
+        double _norm;
+        double _relerr;
+        double _abserr;
+    };
+
+    // Defined in RealSpaceConvolve.cpp
+    //
+    // The real-space convolution of an analytic profile f with a streak along the polyline
+    // with the given vertices.  The streak has zero width, so the convolution is a sum of
+    // 1-d integrals of f along each segment, weighted by the fraction of the path length
+    // in that segment.
+    double RealSpaceStreakConvolve(
+        const SBProfile& prof, const std::vector<Position<double> >& points,
+        const Position<double>& pos, double flux, const GSParamsPtr& gsparams);
+
     class SBConvolve::SBConvolveImpl: public SBProfileImpl
     {
     public:
@@ -49,6 +98,10 @@ namespace galsim {
         bool isAnalyticK() const { return true; }    // convolvees must all meet this
         double maxK() const { return _minMaxK; }
         double stepK() const { return _netStepK; }
+        void getMaxKXY(double& maxkx, double& maxky) const
+        { maxkx = _minMaxKx; maxky = _minMaxKy; }
+        void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = _netStepKx; stepky = _netStepKy; }
 
         void getXRange(double& xmin, double& xmax, std::vector<double>& splits) const
         {
@@ -120,6 +173,12 @@ namespace galsim {
         void fillKValue(tmv::MatrixView<std::complex<double> > val,
                         double kx0, double dkx, double dkxy,
                         double ky0, double dky, double dkyx) const;
+        void fillXValue(tmv::MatrixView<double> val,
+                        double x0, double dx, int izero,
+                        double y0, double dy, int jzero) const;
+        void fillXValue(tmv::MatrixView<double> val,
+                        double x0, double dx, double dxy,
+                        double y0, double dy, double dyx) const;
 
         std::string serialize() const;
 
@@ -127,18 +186,40 @@ namespace galsim {
         typedef std::list<SBProfile>::iterator Iter;
         typedef std::list<SBProfile>::const_iterator ConstIter;
 
+        // Make _boxConvolver if this is a real-space convolution of an axisymmetric profile
+        // with an axis-aligned box.  Or if one of the two profiles is a streak, set up
+        // _streakPoints, _streakOther and _streakFlux.
+        void setupBoxConvolver() const;
+
+        // If prof is an SBBox, possibly scaled along the axes and shifted, return true and set
+        // its width, height, center and surface brightness.
+        static bool GetBox(const SBProfile& prof, double& width, double& height,
+                           Position<double>& cen, double& norm);
+
+        // If prof is an SBStreak, possibly transformed, return true and set the vertices of
+        // its path and its flux.
+        static bool GetStreak(const SBProfile& prof, std::vector<Position<double> >& points,
+                              double& flux);
+
         std::list<SBProfile> _plist; ///< list of profiles to convolve
         double _x0; ///< Centroid position in x.
         double _y0; ///< Centroid position in y.
         bool _isStillAxisymmetric; ///< Is output SBProfile shape still circular?
         double _minMaxK; ///< Minimum maxK() of the convolved SBProfiles.
         double _netStepK; ///< Minimum stepK() of the convolved SBProfiles.
+        double _minMaxKx, _minMaxKy; ///< The same for `getMaxKXY()`.
+        double _netStepKx, _netStepKy; ///< The same for `getStepKXY()`.
         double _sumMinX; ///< sum of minX() of the convolved SBProfiles.
         double _sumMaxX; ///< sum of maxX() of the convolved SBProfiles.
         double _sumMinY; ///< sum of minY() of the convolved SBProfiles.
         double _sumMaxY; ///< sum of maxY() of the convolved SBProfiles.
         double _fluxProduct; ///< Flux of the product.
         bool _real_space; ///< Whether to do convolution as an integral in real space.
+        mutable bool _boxChecked; ///< Whether setupBoxConvolver has been called.
+        mutable boost::shared_ptr<RealSpaceBoxConvolver> _boxConvolver;
+        mutable std::vector<Position<double> > _streakPoints; ///< Path of a streak component.
+        mutable boost::shared_ptr<SBProfile> _streakOther; ///< The other component.
+        mutable double _streakFlux; ///< Flux of the streak component.
 
         void initialize();
 
@@ -169,6 +250,14 @@ namespace galsim {
         bool isAnalyticK() const { return true; }
         double maxK() const { return _adaptee.maxK(); }
         double stepK() const { return _adaptee.stepK() / sqrt(2.); }
+        void getMaxKXY(double& maxkx, double& maxky) const
+        { _adaptee.getMaxKXY(maxkx, maxky); }
+        void getStepKXY(double& stepkx, double& stepky) const
+        {
+            _adaptee.getStepKXY(stepkx, stepky);
+            stepkx /= sqrt(2.);
+            stepky /= sqrt(2.);
+        }
 
         Position<double> centroid() const { return _adaptee.centroid() * 2.; }
 
@@ -225,6 +314,14 @@ namespace galsim {
         bool isAnalyticK() const { return true; }
         double maxK() const { return _adaptee.maxK(); }
         double stepK() const { return _adaptee.stepK() / sqrt(2.); }
+        void getMaxKXY(double& maxkx, double& maxky) const
+        { _adaptee.getMaxKXY(maxkx, maxky); }
+        void getStepKXY(double& stepkx, double& stepky) const
+        {
+            _adaptee.getStepKXY(stepkx, stepky);
+            stepkx /= sqrt(2.);
+            stepky /= sqrt(2.);
+        }
 
         Position<double> centroid() const { return Position<double>(0., 0.); }
 
@@ -157,6 +157,31 @@ namespace galsim {
          */
         std::complex<double> kValue(const Position<double>& k) const;
 
+        /**
+         * @brief Return values of SBProfile at many 2D positions in real space.
+         *
+         * This is equivalent to calling xValue() for each position, but it avoids the overhead
+         * of separate calls, and some derived classes (e.g. SBTransform, SBAdd) can process
+         * all the positions at once.
+         *
+         * @param[in] x     Array of x positions.
+         * @param[in] y     Array of y positions.
+         * @param[out] val  Array to be filled with the values at each (x[i], y[i]).
+         * @param[in] n     The number of positions.
+         */
+        void xValueMany(const double* x, const double* y, double* val, int n) const;
+
+        /**
+         * @brief Return values of SBProfile at many 2D positions in k space.
+         *
+         * @param[in] kx    Array of kx positions.
+         * @param[in] ky    Array of ky positions.
+         * @param[out] val  Array to be filled with the values at each (kx[i], ky[i]).
+         * @param[in] n     The number of positions.
+         */
+        void kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                        int n) const;
+
         //@{
         /**
          *  @brief Define the range over which the profile is not trivially zero.
@@ -182,6 +207,22 @@ namespace galsim {
         /// @brief Sampling in k-space necessary to avoid folding too much of image in x space.
         double stepK() const;
 
+        /**
+         * @brief The values of maxK() appropriate for the x and y directions separately.
+         *
+         * For elongated profiles, the k values may become negligible at a much smaller value
+         * of |kx| than of |ky| (or vice versa).  Both returned values are <= maxK().
+         */
+        void getMaxKXY(double& maxkx, double& maxky) const;
+
+        /**
+         * @brief The values of stepK() appropriate for the x and y directions separately.
+         *
+         * For elongated profiles, the extent in x may be much smaller than the extent in y
+         * (or vice versa).  Both returned values are >= stepK().
+         */
+        void getStepKXY(double& stepkx, double& stepky) const;
+
         /**
          * @brief Determine a good size for a drawn image based on dx and stepK()
          *
@@ -195,6 +236,34 @@ namespace galsim {
          */
         int getGoodImageSize(double dx, double wmult) const;
 
+        /**
+         * @brief Calculate the radius that encloses a given fraction of the flux.
+         *
+         * This is only valid for profiles that are axisymmetric about x=y=0.
+         *
+         * If the profile is analytic in real space, the enclosed flux is calculated by
+         * integrating 2 pi r xValue(r) directly.  Otherwise, it is calculated from the radial
+         * k-space profile as F(R) = R int_0^inf K(k) J_1(kR) dk.
+         *
+         * @param[in] flux_frac  The fraction of the flux to be enclosed.
+         *
+         * @returns the radius enclosing the given fraction of the flux.
+         */
+        double calculateHLR(double flux_frac) const;
+
+        /**
+         * @brief Calculate the full-width half-maximum of the profile.
+         *
+         * This is only valid for profiles that are axisymmetric about x=y=0 and that have their
+         * maximum at the center.
+         *
+         * If the profile is not analytic in real space, the radial profile is calculated from the
+         * k-space profile as I(r) = 1/(2pi) int_0^inf K(k) J_0(kr) k dk.
+         *
+         * @returns the full-width half-maximum.
+         */
+        double calculateFWHM() const;
+
         /**
          * @brief Check whether the SBProfile is known to have rotational symmetry about x=y=0
          *
@@ -387,6 +456,13 @@ namespace galsim {
          *                         Poisson statistics for `N` samples
          * @param[in] add_to_image Whether to add flux to the existing image rather than draw
          *                         an image from scratch.
+         * @param[in] n_threads The number of threads to use for shooting the photons.  If > 1
+         *                      (and GalSim was compiled with OpenMP), the photons are split
+         *                      into chunks, each with its own rng seeded in order from `ud`,
+         *                      and each thread bins its photons into a private image buffer.
+         *                      The result is reproducible for a given seed.  This is only
+         *                      available when max_extra_noise = 0; otherwise the number of
+         *                      photons is determined iteratively, which is inherently serial.
          * @returns The total flux of photons the landed inside the image bounds.
          *
          * Note: N is input as a double so that very large values of N don't have to
@@ -396,7 +472,7 @@ namespace galsim {
         template <typename T>
         double drawShoot(
             ImageView<T> image, double N, UniformDeviate ud, double gain,
-            double max_extra_noise, bool poisson_flux, bool add_to_image) const;
+            double max_extra_noise, bool poisson_flux, bool add_to_image, int n_threads) const;
 
 
         /**
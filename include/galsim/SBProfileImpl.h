@@ -72,6 +72,12 @@ namespace galsim {
                                 double kx0, double dkx, double dkxy,
                                 double ky0, double dky, double dkyx) const;
 
+        // Calculate xValues and kValues at arbitrary lists of positions (x[i],y[i]).
+        // Again, the default is to call xValue or kValue for each position.
+        virtual void xValueMany(const double* x, const double* y, double* val, int n) const;
+        virtual void kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                                int n) const;
+
         virtual double maxK() const =0;
         virtual double stepK() const =0;
         virtual bool isAxisymmetric() const =0;
@@ -93,6 +99,15 @@ namespace galsim {
             double /*x*/, double& ymin, double& ymax, std::vector<double>& splits) const
         { getYRange(ymin,ymax,splits); }
 
+        // The maxK and stepK values for the x and y directions separately.  Profiles that may
+        // be much more extended in one direction than the other (e.g. SBTransform) override
+        // these, which lets fourierDraw use a rectangular FFT.
+        virtual void getMaxKXY(double& maxkx, double& maxky) const
+        { maxkx = maxky = maxK(); }
+
+        virtual void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = stepky = stepK(); }
+
         virtual double getPositiveFlux() const { return getFlux()>0. ? getFlux() : 0.; }
 
         virtual double getNegativeFlux() const { return getFlux()>0. ? 0. : -getFlux(); }
@@ -129,6 +144,15 @@ namespace galsim {
                                 double kx0, double dkx, int nkx1,
                                 double ky0, double dky, int nky1) const;
 
+        // A helper function for composite profiles (SBAdd, SBConvolve), which need a temporary
+        // matrix for each component after the first.  Large grids are filled in strips of
+        // columns, so the temporaries only need to be the size of one strip, and each strip is
+        // combined while it is still in cache.  On output, strips holds the first column of each
+        // strip, followed by n.  The return value is the maximum width of a strip.
+        // If jzero != 0, the strip that contains it is centered on it, so components that use
+        // fillXValueQuadrant or fillKValueQuadrant can still do so there.
+        static int getStrips(int m, int n, int jzero, std::vector<int>& strips);
+
     private:
         // Copy constructor and op= are undefined.
         SBProfileImpl(const SBProfileImpl& rhs);
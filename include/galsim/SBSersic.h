@@ -38,6 +38,9 @@ namespace galsim {
         // How many Sersic profiles to save in the cache
         const int max_sersic_cache = 100;
 
+        // How many grids of Sersic profiles (one per GSParams) to save for interpolating in n
+        const int max_sersic_grid_cache = 4;
+
     }
 
     /**
@@ -164,6 +167,38 @@ namespace galsim {
             SBSersic(4., size, rType, flux, trunc, flux_untruncated, gsparams) {}
     };
 
+    /**
+     * @brief Get the Fourier transform lookup tables for the grid of Sersic indices that is
+     * used when `gsparams.interpolate_sersic_n` is true, building any that are not yet built.
+     *
+     * The value of `gsparams.interpolate_sersic_n` is ignored here; the grid is the one that is
+     * used by Sersic profiles with the other parameters in `gsparams`.  Each of the output
+     * vectors has one element per grid node, with the values described in
+     * SersicInfo::getFTTable().
+     *
+     * @param[in]  gsparams  The GSParams for which to get the grid.
+     * @param[out] params    The parameters of the table for each node.
+     * @param[out] logk      The log(k) values of the table for each node.
+     * @param[out] ft        The tabulated values for each node.
+     */
+    void GetSersicInterpolationTables(const GSParamsPtr& gsparams,
+                                      std::vector<std::vector<double> >& params,
+                                      std::vector<std::vector<double> >& logk,
+                                      std::vector<std::vector<double> >& ft);
+
+    /**
+     * @brief Set the Fourier transform lookup tables for the grid of Sersic indices from the
+     * output of a previous call to GetSersicInterpolationTables() with the same GSParams.
+     *
+     * This lets the tables be built once and then loaded by other processes, rather than each
+     * process doing the Hankel transforms itself.  An SBError is thrown if the tables do not
+     * match the grid for these GSParams.
+     */
+    void SetSersicInterpolationTables(const GSParamsPtr& gsparams,
+                                      const std::vector<std::vector<double> >& params,
+                                      const std::vector<std::vector<double> >& logk,
+                                      const std::vector<std::vector<double> >& ft);
+
 }
 
 #endif
@@ -26,6 +26,58 @@
 
 namespace galsim {
 
+    class SersicInfo;
+
+    /**
+     * @brief A private class that holds the SersicInfo objects for a fixed grid of Sersic
+     * indices, which are used to interpolate the Fourier transform for arbitrary `n` when
+     * `gsparams->interpolate_sersic_n` is true.
+     *
+     * The grid is uniform in log(n), and the interpolation is a 4-point Lagrange interpolation
+     * in log(n) of the transforms at the same k in units of the half-light radius.  The grid
+     * spacing scales as kvalue_accuracy^(1/4), which keeps the interpolation error below 1% of
+     * kvalue_accuracy over the full range of allowed n.
+     */
+    class SersicInfoGrid
+    {
+    public:
+        /// @brief Constructor
+        SersicInfoGrid(const GSParamsPtr& gsparams);
+
+        /// @brief The number of grid nodes.
+        int size() const { return int(_nodes.size()); }
+
+        /// @brief The Sersic index of node `i`.
+        double getN(int i) const;
+
+        /// @brief The SersicInfo for node `i`, which is constructed the first time it is needed.
+        boost::shared_ptr<SersicInfo> getNode(int i) const;
+
+        /**
+         * @brief Get the interpolation weights for Sersic index `n`.
+         *
+         * @param[in]  n  The Sersic index.
+         * @param[out] w  The weights of the 4 nodes starting at the returned index.
+         * @returns the index of the first node to use.
+         */
+        int getWeights(double n, double* w) const;
+
+        /// @brief Get the (cached) grid for the given GSParams.
+        static boost::shared_ptr<SersicInfoGrid> get(const GSParamsPtr& gsparams);
+
+    private:
+
+        SersicInfoGrid(const SersicInfoGrid& rhs); ///< Hide the copy constructor.
+        void operator=(const SersicInfoGrid& rhs); ///<Hide assignment operator.
+
+        GSParamsPtr _gsparams;  ///< The GSParams for the nodes, with interpolate_sersic_n=false.
+        double _logn_min;       ///< log(n) of the first node.
+        double _dlogn;          ///< Grid spacing in log(n).
+        mutable std::vector<boost::shared_ptr<SersicInfo> > _nodes;
+
+        static LRUCache<GSParamsPtr, SersicInfoGrid> cache;
+    };
+
     /// @brief A private class that caches the needed parameters for each Sersic index `n`.
     class SersicInfo
     {
@@ -83,6 +135,26 @@ namespace galsim {
          */
         boost::shared_ptr<PhotonArray> shoot(int N, UniformDeviate ud) const;
 
+        /**
+         * @brief Get the lookup table for the Fourier transform, building it if necessary.
+         *
+         * @param[out] params  The values (n, maxk, kderiv2, kderiv4, ksq_min, ksq_max,
+         *                     highk_a, highk_b).
+         * @param[out] logk    The log(k) values of the table entries.
+         * @param[out] ft      The tabulated values of k^2 F(k).
+         */
+        void getFTTable(std::vector<double>& params, std::vector<double>& logk,
+                        std::vector<double>& ft) const;
+
+        /**
+         * @brief Set the lookup table for the Fourier transform from the output of a previous
+         * call to getFTTable() for the same n and GSParams.
+         *
+         * This does nothing if the table has already been built.
+         */
+        void setFTTable(const std::vector<double>& params, const std::vector<double>& logk,
+                        const std::vector<double>& ft) const;
+
     private:
 
         SersicInfo(const SersicInfo& rhs); ///< Hide the copy constructor.
@@ -116,9 +188,15 @@ namespace galsim {
         mutable double _highk_a; ///< Coefficient of 1/k^2 in high-k asymptote
         mutable double _highk_b; ///< Coefficient of 1/k^3 in high-k asymptote
 
+        // Nodes used for the Fourier transform if interpolating in n (otherwise empty):
+        std::vector<boost::shared_ptr<SersicInfo> > _nodes;
+        double _node_w[4];       ///< Interpolation weights for each node.
+        double _node_kscale[4];  ///< Ratio of this HLR to the HLR of each node.
+
         // Classes used for photon shooting
         mutable boost::shared_ptr<FluxDensity> _radial;
         mutable boost::shared_ptr<OneDimensionalDeviate> _sampler;
+        mutable boost::shared_ptr<RadialInverseCDF> _inv_cdf;
 
         // Helper functions used internally:
         void buildFT() const;
@@ -102,6 +102,7 @@ namespace galsim {
         // Classes used for photon shooting
         mutable boost::shared_ptr<FluxDensity> _radial;
         mutable boost::shared_ptr<OneDimensionalDeviate> _sampler;
+        mutable boost::shared_ptr<RadialInverseCDF> _inv_cdf;
     };
 
     class SBSpergel::SBSpergelImpl : public SBProfileImpl
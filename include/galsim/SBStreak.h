@@ -0,0 +1,81 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_SBStreak_H
+#define GalSim_SBStreak_H
+/**
+ * @file SBStreak.h @brief SBProfile of a streak along a line segment or a path of segments.
+ */
+
+#include "SBProfile.h"
+
+namespace galsim {
+
+    /**
+     * @brief Surface Brightness Profile for a streak, such as the path of a moving source.
+     *
+     * The flux is spread uniformly along a path of connected line segments, in proportion to
+     * their lengths, as for a source moving at a constant speed.  The profile has no extent
+     * perpendicular to the path, so it is not analytic in real space.  However, its Fourier
+     * transform is analytic (a sinc function along each segment), and it may be convolved with
+     * another profile in real space, in which case the convolution is a 1-d integral of the
+     * other profile along the path.
+     */
+    class SBStreak : public SBProfile
+    {
+    public:
+        /**
+         * @brief Constructor.
+         *
+         * @param[in] x        x positions of the vertices of the path.
+         * @param[in] y        y positions of the vertices of the path.
+         * @param[in] flux     flux.
+         * @param[in] gsparams GSParams object storing constants that control the accuracy of image
+         *                     operations and rendering, if different from the default.
+         */
+        SBStreak(const std::vector<double>& x, const std::vector<double>& y, double flux,
+                 const GSParamsPtr& gsparams);
+
+        /// @brief Copy constructor.
+        SBStreak(const SBStreak& rhs);
+
+        /// @brief Destructor.
+        ~SBStreak();
+
+        /// @brief Returns the x positions of the vertices of the path.
+        const std::vector<double>& getX() const;
+
+        /// @brief Returns the y positions of the vertices of the path.
+        const std::vector<double>& getY() const;
+
+        /// @brief Returns the total length of the path.
+        double getLength() const;
+
+    protected:
+
+        class SBStreakImpl;
+        friend class SBConvolve;
+
+    private:
+        // op= is undefined
+        void operator=(const SBStreak& rhs);
+    };
+}
+
+#endif
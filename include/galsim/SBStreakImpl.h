@@ -0,0 +1,101 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_SBStreakImpl_H
+#define GalSim_SBStreakImpl_H
+
+#include "SBProfileImpl.h"
+#include "SBStreak.h"
+
+namespace galsim {
+
+    class SBStreak::SBStreakImpl : public SBProfileImpl
+    {
+    public:
+        SBStreakImpl(const std::vector<double>& x, const std::vector<double>& y, double flux,
+                     const GSParamsPtr& gsparams);
+        ~SBStreakImpl() {}
+
+        // The profile is zero everywhere except on the path, where it is infinite.
+        // So do not use this function for filling an image!
+        double xValue(const Position<double>& ) const { return 0.; }
+        std::complex<double> kValue(const Position<double>& k) const;
+
+        bool isAxisymmetric() const { return false; }
+        bool hasHardEdges() const { return true; }
+        bool isAnalyticX() const { return false; }
+        bool isAnalyticK() const { return true; }
+
+        // The Fourier transform does not decrease at all perpendicular to each segment.
+        double maxK() const { return integ::MOCK_INF; }
+        double stepK() const { return _stepk; }
+        void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = _stepkx; stepky = _stepky; }
+
+        void getXRange(double& xmin, double& xmax, std::vector<double>& ) const
+        { xmin = _xmin;  xmax = _xmax; }
+
+        void getYRange(double& ymin, double& ymax, std::vector<double>& ) const
+        { ymin = _ymin;  ymax = _ymax; }
+
+        Position<double> centroid() const { return _centroid; }
+
+        double getFlux() const { return _flux; }
+
+        const std::vector<double>& getX() const { return _x; }
+        const std::vector<double>& getY() const { return _y; }
+        double getLength() const { return _length; }
+
+        /**
+         * @brief Shoot photons through this SBStreak.
+         *
+         * The photons are placed uniformly along the path, with the segment for each photon
+         * chosen in proportion to the segment lengths.
+         */
+        boost::shared_ptr<PhotonArray> shoot(int N, UniformDeviate ud) const;
+
+        // Overrides for better efficiency
+        void fillKValue(tmv::MatrixView<std::complex<double> > val,
+                        double kx0, double dkx, int izero,
+                        double ky0, double dky, int jzero) const;
+        void fillKValue(tmv::MatrixView<std::complex<double> > val,
+                        double kx0, double dkx, double dkxy,
+                        double ky0, double dky, double dkyx) const;
+
+        std::string serialize() const;
+
+    private:
+        std::vector<double> _x;     ///< x positions of the vertices.
+        std::vector<double> _y;     ///< y positions of the vertices.
+        double _flux;
+        double _length;             ///< Total length of the path.
+        std::vector<double> _cumlength;  ///< Length of the path up to each vertex.
+        std::vector<double> _weight;     ///< flux * (segment length) / (total length).
+        Position<double> _centroid;
+        double _stepk, _stepkx, _stepky;
+        double _xmin, _xmax, _ymin, _ymax;
+
+        // Copy constructor and op= are undefined.
+        SBStreakImpl(const SBStreakImpl& rhs);
+        void operator=(const SBStreakImpl& rhs);
+    };
+
+}
+
+#endif
@@ -76,6 +76,7 @@ namespace galsim {
     protected:
 
         class SBTransformImpl;
+        friend class SBConvolve;
 
     private:
         // op= is undefined
@@ -45,6 +45,9 @@ namespace galsim {
 
         double maxK() const { return _maxk; }
         double stepK() const { return _stepk; }
+        void getMaxKXY(double& maxkx, double& maxky) const { maxkx = _maxkx; maxky = _maxky; }
+        void getStepKXY(double& stepkx, double& stepky) const
+        { stepkx = _stepkx; stepky = _stepky; }
 
         void getXRange(double& xmin, double& xmax, std::vector<double>& splits) const;
 
@@ -92,6 +95,9 @@ namespace galsim {
         void fillKValue(tmv::MatrixView<std::complex<double> > val,
                         double kx0, double dkx, double dkxy,
                         double ky0, double dky, double dkyx) const;
+        void xValueMany(const double* x, const double* y, double* val, int n) const;
+        void kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                        int n) const;
 
         std::string serialize() const;
 
@@ -110,6 +116,8 @@ namespace galsim {
         double _invdet;  ///< Inverse determinant of `M` matrix.
         double _maxk;
         double _stepk;
+        double _maxkx, _maxky; ///< maxK in the x and y directions separately.
+        double _stepkx, _stepky; ///< stepK in the x and y directions separately.
         bool _stillIsAxisymmetric; ///< Is output SBProfile shape still circular?
         double _xmin, _xmax, _ymin, _ymax; ///< Ranges propagated from adaptee
         double _coeff_b, _coeff_c, _coeff_c2; ///< Values used in getYRangeX(x,ymin,ymax);
@@ -209,34 +209,53 @@ namespace galsim {
      * Requirements for A,V:
      *   A must have ordering operators (< > ==) and the normal arithmetic ops (+ - * /)
      *   V must have + and *.
+     *
+     * The cubic interpolant is a bicubic Hermite interpolation, using derivatives estimated by
+     * finite differences of the tabulated values.  (On an equally spaced grid, this is Catmull-Rom
+     * interpolation.)  So the interpolated function and its gradient are continuous.
+     *
+     * If periodic is true, then the last row and column of vals must be identical to the first,
+     * and arguments are wrapped into the range of the table with period xmax-xmin (and similarly
+     * for y) rather than throwing an exception when out of range.
      */
     template<class V, class A>
     class Table2D
     {
     public:
-        enum interpolant { linear, floor, ceil, nearest };
+        enum interpolant { linear, floor, ceil, nearest, cubic };
 
         /// Table from xargs, yargs, vals
-        Table2D(const A* _xargs, const A* _yargs, const V* _vals, int Nx, int Ny, interpolant in);
+        Table2D(const A* _xargs, const A* _yargs, const V* _vals, int Nx, int Ny, interpolant in,
+                bool periodic=false);
 
         A xmin() const {return xargs.front();}
         A xmax() const {return xargs.back();}
         A ymin() const {return yargs.front();}
         A ymax() const {return yargs.back();}
 
-        /// interp, but exception if beyond bounds
-        V lookup(const A x, const A y) const;
+        /// interp, but exception if beyond bounds (unless periodic)
+        V lookup(A x, A y) const;
 
         /// interp many values at once
         void interpMany(const A* xvec, const A* yvec, V* valvec, int N) const;
         void interpManyMesh(const A* xvec, const A* yvec, V* valvec, int Nx, int Ny) const;
 
+        /// interp at many shifted copies of the points (xvec, yvec).  On output, valvec[m*N+k]
+        /// is the value at (xvec[k] + dxvec[m], yvec[k] + dyvec[m]).
+        void interpManyShifted(const A* xvec, const A* yvec, int N,
+                               const A* dxvec, const A* dyvec, int M, V* valvec) const;
+
+        /// gradient of the interpolated function
+        void gradient(A x, A y, V& dfdx, V& dfdy) const;
+        void gradientMany(const A* xvec, const A* yvec, V* dfdxvec, V* dfdyvec, int N) const;
+
         const std::vector<A>& getXArgs() const { return xargs.getArgs(); }
         const std::vector<A>& getYArgs() const { return yargs.getArgs(); }
         const std::vector<V>& getVals() const { return vals; }
         int getNx() const {return Nx;}
         int getNy() const {return Ny;}
         interpolant getInterp() const { return iType; }
+        bool isPeriodic() const { return periodic; }
 
     private:
         interpolant iType;
@@ -244,6 +263,13 @@ namespace galsim {
         const ArgVec<A> xargs;
         const ArgVec<A> yargs;
         const std::vector<V> vals;
+        const bool periodic;
+
+        // Derivatives df/dx, df/dy, d2f/dxdy at the grid points for the cubic interpolant.
+        std::vector<V> fx, fy, fxy;
+        void setupCubic();
+
+        void wrap(A& x, A& y) const;
 
         typedef V (Table2D<V,A>::*Table2DMemFn)(const A x, const A y, int i, int j) const;
         Table2DMemFn interpolate;
@@ -251,6 +277,14 @@ namespace galsim {
         V floorInterpolate(const A x, const A y, int i, int j) const;
         V ceilInterpolate(const A x, const A y, int i, int j) const;
         V nearestInterpolate(const A x, const A y, int i, int j) const;
+        V cubicInterpolate(const A x, const A y, int i, int j) const;
+
+        typedef void (Table2D<V,A>::*Table2DGradFn)(const A x, const A y, int i, int j,
+                                                    V& dfdx, V& dfdy) const;
+        Table2DGradFn interpGradient;
+        void linearGradient(const A x, const A y, int i, int j, V& dfdx, V& dfdy) const;
+        void constantGradient(const A x, const A y, int i, int j, V& dfdx, V& dfdy) const;
+        void cubicGradient(const A x, const A y, int i, int j, V& dfdx, V& dfdy) const;
     };
 }
 
@@ -0,0 +1,117 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#include "galsim/IgnoreWarnings.h"
+
+#define BOOST_NO_CXX11_SMART_PTR
+#include "boost/python.hpp" // header that includes Python.h always needs to come first
+
+#include "NumpyHelper.h"
+#include "PhotonArray.h"
+
+namespace bp = boost::python;
+
+// Note that docstrings are now added in galsim/photon_array.py
+namespace galsim {
+namespace {
+
+    // A deleter that holds a reference to the python PhotonArray object.  The numpy arrays
+    // we make here are views into the PhotonArray's storage, so this keeps the PhotonArray
+    // alive for as long as any of those arrays exist.
+    struct PhotonArrayOwner {
+        explicit PhotonArrayOwner(const bp::object& pa) : owner(pa) {}
+        void operator()(double* p) { owner = bp::object(); }
+        bp::object owner;
+    };
+
+    struct PyPhotonArray {
+
+        static bp::object MakeView(const bp::object& self, double* data, int n)
+        {
+            boost::shared_ptr<double> owner(data, PhotonArrayOwner(self));
+            return MakeNumpyArray(data, n, 1, false, owner);
+        }
+
+        static bp::object GetXArray(const bp::object& self)
+        {
+            PhotonArray& pa = bp::extract<PhotonArray&>(self);
+            return MakeView(self, pa.getXArray(), pa.size());
+        }
+
+        static bp::object GetYArray(const bp::object& self)
+        {
+            PhotonArray& pa = bp::extract<PhotonArray&>(self);
+            return MakeView(self, pa.getYArray(), pa.size());
+        }
+
+        static bp::object GetFluxArray(const bp::object& self)
+        {
+            PhotonArray& pa = bp::extract<PhotonArray&>(self);
+            return MakeView(self, pa.getFluxArray(), pa.size());
+        }
+
+        static bp::object GetWavelengthArray(const bp::object& self)
+        {
+            PhotonArray& pa = bp::extract<PhotonArray&>(self);
+            if (!pa.hasAllocatedWavelengths()) pa.allocateWavelengths();
+            return MakeView(self, pa.getWavelengthArray(), pa.size());
+        }
+
+        template <typename U, typename W>
+        static void wrapTemplates(W& wrapper) {
+            wrapper
+                .def("addTo",
+                     (double (PhotonArray::*)(ImageView<U>&) const)&PhotonArray::addTo,
+                     bp::arg("image"));
+        }
+
+        static void wrap()
+        {
+            bp::class_<PhotonArray, boost::shared_ptr<PhotonArray> >
+                pyPhotonArray("PhotonArray", bp::no_init);
+            pyPhotonArray
+                .def(bp::init<int>(bp::arg("N")))
+                .def("size", &PhotonArray::size)
+                .def("__len__", &PhotonArray::size)
+                .def("getTotalFlux", &PhotonArray::getTotalFlux)
+                .def("setTotalFlux", &PhotonArray::setTotalFlux, bp::arg("flux"))
+                .def("scaleFlux", &PhotonArray::scaleFlux, bp::arg("scale"))
+                .def("scaleXY", &PhotonArray::scaleXY, bp::arg("scale"))
+                .def("setCorrelated", &PhotonArray::setCorrelated, bp::arg("is_corr")=true)
+                .def("isCorrelated", &PhotonArray::isCorrelated)
+                .def("hasAllocatedWavelengths", &PhotonArray::hasAllocatedWavelengths)
+                .def("getXArray", &GetXArray)
+                .def("getYArray", &GetYArray)
+                .def("getFluxArray", &GetFluxArray)
+                .def("getWavelengthArray", &GetWavelengthArray)
+                ;
+            wrapTemplates<float>(pyPhotonArray);
+            wrapTemplates<double>(pyPhotonArray);
+        }
+
+    }; // struct PyPhotonArray
+
+} // anonymous
+
+void pyExportPhotonArray()
+{
+    PyPhotonArray::wrap();
+}
+
+} // namespace galsim
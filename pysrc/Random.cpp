@@ -21,6 +21,7 @@
 
 #define BOOST_NO_CXX11_SMART_PTR
 #include "boost/python.hpp"
+#include "NumpyHelper.h"
 #include "Random.h"
 
 namespace bp = boost::python;
@@ -56,6 +57,13 @@ namespace galsim {
 
     struct PyBaseDeviate {
 
+        static void Generate(BaseDeviate& self, const bp::object& array)
+        {
+            double* data = GetNumpyArrayData<double>(array.ptr());
+            int N = GetNumpyArrayDim(array.ptr(), 0);
+            self.generate(N, data);
+        }
+
         static void wrap() {
             bp::class_<BaseDeviateCallBack>
                 pyBaseDeviate("BaseDeviate", "", bp::no_init);
@@ -74,6 +82,7 @@ namespace galsim {
                 .def("duplicate", &BaseDeviate::duplicate)
                 .def("discard", &BaseDeviate::discard)
                 .def("raw", &BaseDeviate::raw)
+                .def("_generate", &Generate, bp::args("array"))
                 .def("__repr__", &BaseDeviate::repr)
                 .def("__str__", &BaseDeviate::str)
                 .enable_pickling()
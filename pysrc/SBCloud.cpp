@@ -0,0 +1,104 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+
+#include "galsim/IgnoreWarnings.h"
+
+#define BOOST_NO_CXX11_SMART_PTR
+#include "boost/python.hpp"
+#include "boost/python/stl_iterator.hpp"
+
+#include "SBCloud.h"
+
+namespace bp = boost::python;
+
+namespace galsim {
+
+    struct PySBCloud
+    {
+
+        static std::vector<double> convert(const bp::object& arg, const char* name)
+        {
+            std::vector<double> v;
+            try {
+                bp::stl_input_iterator<double> it(arg);
+                bp::stl_input_iterator<double> end;
+                v.insert(v.end(),it,end);
+            } catch (std::exception& e) {
+                std::string msg = std::string("Unable to convert ") + name + " to C++ vector";
+                PyErr_SetString(PyExc_ValueError, msg.c_str());
+                bp::throw_error_already_set();
+            }
+            return v;
+        }
+
+        static bp::list toList(const std::vector<double>& v)
+        {
+            bp::list l;
+            for (size_t i=0; i!=v.size(); ++i) l.append(v[i]);
+            return l;
+        }
+
+        static SBCloud* construct(
+            const SBProfile& adaptee, const bp::object& x, const bp::object& y,
+            const bp::object& flux_ratio, const bp::object& scale,
+            boost::shared_ptr<GSParams> gsparams)
+        {
+            std::vector<double> vx = convert(x, "x");
+            std::vector<double> vy = convert(y, "y");
+            std::vector<double> vf = convert(flux_ratio, "flux_ratio");
+            std::vector<double> vs = convert(scale, "scale");
+            if (vy.size() != vx.size() || vf.size() != vx.size() || vs.size() != vx.size()) {
+                PyErr_SetString(PyExc_ValueError,
+                                "x, y, flux_ratio and scale must be the same size");
+                bp::throw_error_already_set();
+            }
+            return new SBCloud(adaptee, vx, vy, vf, vs, gsparams);
+        }
+
+        static bp::list getX(const SBCloud& cloud) { return toList(cloud.getX()); }
+        static bp::list getY(const SBCloud& cloud) { return toList(cloud.getY()); }
+        static bp::list getFluxRatio(const SBCloud& cloud) { return toList(cloud.getFluxRatio()); }
+        static bp::list getScale(const SBCloud& cloud) { return toList(cloud.getScale()); }
+
+        static void wrap()
+        {
+            bp::class_<SBCloud,bp::bases<SBProfile> >("SBCloud", bp::no_init)
+                .def("__init__", bp::make_constructor(
+                        &construct, bp::default_call_policies(),
+                        (bp::arg("adaptee"), bp::arg("x"), bp::arg("y"), bp::arg("flux_ratio"),
+                         bp::arg("scale"), bp::arg("gsparams")=bp::object())
+                ))
+                .def(bp::init<const SBCloud&>())
+                .def("getObj", &SBCloud::getObj)
+                .def("getX", &getX)
+                .def("getY", &getY)
+                .def("getFluxRatio", &getFluxRatio)
+                .def("getScale", &getScale)
+                .enable_pickling()
+                ;
+        }
+    };
+
+    void pyExportSBCloud()
+    {
+        PySBCloud::wrap();
+    }
+
+} // namespace galsim
@@ -19,7 +19,7 @@
 
 #include "galsim/IgnoreWarnings.h"
 
-#define BOOST_PYTHON_MAX_ARITY 20  // We have a function with 17 params here...
+#define BOOST_PYTHON_MAX_ARITY 20  // We have a function with 18 params here...
                                    // c.f. www.boost.org/libs/python/doc/v2/configuration.html
 
 #define BOOST_NO_CXX11_SMART_PTR
@@ -29,6 +29,7 @@
 #include "SBProfile.h"
 #include "SBTransform.h"
 #include "FFT.h"  // For goodFFTSize
+#include "NumpyHelper.h"
 
 namespace bp = boost::python;
 
@@ -41,7 +42,7 @@ namespace galsim {
             bp::class_<GSParams, boost::shared_ptr<GSParams> > ("GSParams", bp::no_init)
                 .def(bp::init<
                     int, int, double, double, double, double, double, double, double, double,
-                    double, double, double, double, int, double>((
+                    double, double, double, double, int, double, bool, bool>((
                         bp::arg("minimum_fft_size")=128,
                         bp::arg("maximum_fft_size")=4096,
                         bp::arg("folding_threshold")=5.e-3,
@@ -57,7 +58,9 @@ namespace galsim {
                         bp::arg("shoot_accuracy")=1.e-5,
                         bp::arg("allowed_flux_variation")=0.81,
                         bp::arg("range_division_for_extrema")=32,
-                        bp::arg("small_fraction_of_flux")=1.e-4)
+                        bp::arg("small_fraction_of_flux")=1.e-4,
+                        bp::arg("shoot_inverse_cdf")=false,
+                        bp::arg("interpolate_sersic_n")=false)
                     )
                 )
                 .def_readonly("minimum_fft_size", &GSParams::minimum_fft_size)
@@ -76,6 +79,8 @@ namespace galsim {
                 .def_readonly("allowed_flux_variation", &GSParams::allowed_flux_variation)
                 .def_readonly("range_division_for_extrema", &GSParams::range_division_for_extrema)
                 .def_readonly("small_fraction_of_flux", &GSParams::small_fraction_of_flux)
+                .def_readonly("shoot_inverse_cdf", &GSParams::shoot_inverse_cdf)
+                .def_readonly("interpolate_sersic_n", &GSParams::interpolate_sersic_n)
                 .def(bp::self == bp::other<GSParams>())
                 .enable_pickling()
                 ;
@@ -92,6 +97,44 @@ namespace galsim {
     struct PySBProfile
     {
 
+        static void xValueMany(const SBProfile& prof, const bp::object& x, const bp::object& y,
+                               const bp::object& vals)
+        {
+            const double* xvec = GetNumpyArrayData<double>(x.ptr());
+            const double* yvec = GetNumpyArrayData<double>(y.ptr());
+            double* valvec = GetNumpyArrayData<double>(vals.ptr());
+            int N = GetNumpyArrayDim(x.ptr(), 0);
+            assert(N == GetNumpyArrayDim(y.ptr(), 0));
+            assert(N == GetNumpyArrayDim(vals.ptr(), 0));
+            prof.xValueMany(xvec, yvec, valvec, N);
+        }
+
+        static void kValueMany(const SBProfile& prof, const bp::object& kx, const bp::object& ky,
+                               const bp::object& vals)
+        {
+            const double* kxvec = GetNumpyArrayData<double>(kx.ptr());
+            const double* kyvec = GetNumpyArrayData<double>(ky.ptr());
+            std::complex<double>* valvec = GetNumpyArrayData<std::complex<double> >(vals.ptr());
+            int N = GetNumpyArrayDim(kx.ptr(), 0);
+            assert(N == GetNumpyArrayDim(ky.ptr(), 0));
+            assert(N == GetNumpyArrayDim(vals.ptr(), 0));
+            prof.kValueMany(kxvec, kyvec, valvec, N);
+        }
+
+        static bp::tuple getMaxKXY(const SBProfile& prof)
+        {
+            double maxkx, maxky;
+            prof.getMaxKXY(maxkx, maxky);
+            return bp::make_tuple(maxkx, maxky);
+        }
+
+        static bp::tuple getStepKXY(const SBProfile& prof)
+        {
+            double stepkx, stepky;
+            prof.getStepKXY(stepkx, stepky);
+            return bp::make_tuple(stepkx, stepky);
+        }
+
         template <typename U, typename W>
         static void wrapTemplates(W & wrapper) {
             // We don't need to wrap templates in a separate function, but it keeps us
@@ -101,16 +144,19 @@ namespace galsim {
             wrapper
                 .def("drawShoot",
                      (double (SBProfile::*)(ImageView<U>, double, UniformDeviate,
-                                            double, double, bool, bool)
+                                            double, double, bool, bool, int)
                       const)&SBProfile::drawShoot,
                      (bp::arg("image"), bp::arg("N")=0., bp::arg("ud"),
                       bp::arg("gain")=1., bp::arg("max_extra_noise")=0.,
-                      bp::arg("poisson_flux")=true, bp::arg("add_to_image")=false),
+                      bp::arg("poisson_flux")=true, bp::arg("add_to_image")=false,
+                      bp::arg("n_threads")=1),
                      "Draw object into existing image using photon shooting.\n"
                      "\n"
                      "Setting optional integer arg poissonFlux != 0 allows profile flux to vary\n"
                      "according to Poisson statistics for N samples.\n"
                      "\n"
+                     "Setting n_threads > 1 shoots the photons in parallel chunks.\n"
+                     "\n"
                      "Returns total flux of photons that landed inside image bounds.")
                 .def("draw",
                      (double (SBProfile::*)(ImageView<U>, double, double) const)&SBProfile::draw,
@@ -171,13 +217,25 @@ namespace galsim {
                      "require an FFT to determine real-space values.")
                 .def("kValue", &SBProfile::kValue,
                      "Return value of SBProfile at a chosen 2d position in k-space.")
+                .def("xValueMany", &xValueMany, (bp::arg("x"), bp::arg("y"), bp::arg("vals")),
+                     "Fill the numpy array vals with the real-space values at positions (x,y).")
+                .def("kValueMany", &kValueMany, (bp::arg("kx"), bp::arg("ky"), bp::arg("vals")),
+                     "Fill the complex numpy array vals with the k-space values at (kx,ky).")
                 .def("maxK", &SBProfile::maxK, "Value of k beyond which aliasing can be neglected")
                 .def("nyquistDx", &SBProfile::nyquistDx,
                      "Image pixel spacing that does not alias maxK")
                 .def("getGoodImageSize", &SBProfile::getGoodImageSize,
                      "A good image size for drawing the SBProfile")
+                .def("calculateHLR", &SBProfile::calculateHLR, bp::args("flux_frac"),
+                     "Radius enclosing flux_frac of the flux of an axisymmetric profile")
+                .def("calculateFWHM", &SBProfile::calculateFWHM,
+                     "Full-width half-maximum of an axisymmetric profile")
                 .def("stepK", &SBProfile::stepK,
                      "Sampling in k space necessary to avoid folding of image in x space")
+                .def("getMaxKXY", &getMaxKXY,
+                     "The values of maxK appropriate for the x and y directions separately")
+                .def("getStepKXY", &getStepKXY,
+                     "The values of stepK appropriate for the x and y directions separately")
                 .def("isAxisymmetric", &SBProfile::isAxisymmetric)
                 .def("hasHardEdges", &SBProfile::hasHardEdges)
                 .def("isAnalyticX", &SBProfile::isAnalyticX,
@@ -188,6 +246,8 @@ namespace galsim {
                      "without DFT.")
                 .def("centroid", &SBProfile::centroid)
                 .def("getFlux", &SBProfile::getFlux)
+                .def("getPositiveFlux", &SBProfile::getPositiveFlux)
+                .def("getNegativeFlux", &SBProfile::getNegativeFlux)
                 .def("scaleFlux", &SBProfile::scaleFlux, bp::args("fluxRatio"))
                 .def("rotate", &SBProfile::rotate, bp::args("theta"))
                 .def("shift", &SBProfile::shift, bp::args("delta"))
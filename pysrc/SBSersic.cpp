@@ -117,10 +117,67 @@ namespace galsim {
         }
     };
 
+    struct PySersicInterpolationTables
+    {
+
+        static bp::list ToList(const std::vector<double>& v)
+        {
+            bp::list l;
+            for (size_t i=0; i!=v.size(); ++i) l.append(v[i]);
+            return l;
+        }
+
+        static std::vector<double> ToVector(const bp::object& obj)
+        {
+            std::vector<double> v;
+            try {
+                bp::stl_input_iterator<double> it(obj);
+                bp::stl_input_iterator<double> end;
+                v.insert(v.end(),it,end);
+            } catch (std::exception& e) {
+                PyErr_SetString(PyExc_ValueError, "Unable to convert table to C++ vector");
+                bp::throw_error_already_set();
+            }
+            return v;
+        }
+
+        static bp::list GetTables(boost::shared_ptr<GSParams> gsparams)
+        {
+            std::vector<std::vector<double> > params, logk, ft;
+            GetSersicInterpolationTables(gsparams, params, logk, ft);
+            bp::list tables;
+            for (size_t i=0; i!=params.size(); ++i)
+                tables.append(bp::make_tuple(ToList(params[i]), ToList(logk[i]), ToList(ft[i])));
+            return tables;
+        }
+
+        static void SetTables(boost::shared_ptr<GSParams> gsparams, const bp::object& tables)
+        {
+            std::vector<std::vector<double> > params, logk, ft;
+            bp::stl_input_iterator<bp::object> it(tables);
+            bp::stl_input_iterator<bp::object> end;
+            for (; it != end; ++it) {
+                bp::object table = *it;
+                params.push_back(ToVector(table[0]));
+                logk.push_back(ToVector(table[1]));
+                ft.push_back(ToVector(table[2]));
+            }
+            SetSersicInterpolationTables(gsparams, params, logk, ft);
+        }
+
+        static void wrap()
+        {
+            bp::def("_getSersicInterpolationTables", &GetTables, (bp::arg("gsparams")));
+            bp::def("_setSersicInterpolationTables", &SetTables,
+                    (bp::arg("gsparams"), bp::arg("tables")));
+        }
+    };
+
     void pyExportSBSersic()
     {
         PySBSersic::wrap();
         PySBDeVaucouleurs::wrap();
+        PySersicInterpolationTables::wrap();
     }
 
 } // namespace galsim
@@ -0,0 +1,101 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#include "galsim/IgnoreWarnings.h"
+
+#define BOOST_NO_CXX11_SMART_PTR
+#include "boost/python.hpp"
+#include "boost/python/stl_iterator.hpp"
+
+#include "SBStreak.h"
+
+namespace bp = boost::python;
+
+namespace galsim {
+
+    struct PySBStreak
+    {
+
+        static SBStreak* construct(
+            const bp::object& x, const bp::object& y, double flux,
+            boost::shared_ptr<GSParams> gsparams)
+        {
+            std::vector<double> vx, vy;
+            try {
+                bp::stl_input_iterator<double> x_it(x);
+                bp::stl_input_iterator<double> end;
+                vx.insert(vx.end(),x_it,end);
+            } catch (std::exception& e) {
+                PyErr_SetString(PyExc_ValueError, "Unable to convert x to C++ vector");
+                bp::throw_error_already_set();
+            }
+            try {
+                bp::stl_input_iterator<double> y_it(y);
+                bp::stl_input_iterator<double> end;
+                vy.insert(vy.end(),y_it,end);
+            } catch (std::exception& e) {
+                PyErr_SetString(PyExc_ValueError, "Unable to convert y to C++ vector");
+                bp::throw_error_already_set();
+            }
+            if (vx.size() != vy.size()) {
+                PyErr_SetString(PyExc_ValueError, "x and y must be the same size");
+                bp::throw_error_already_set();
+            }
+            return new SBStreak(vx, vy, flux, gsparams);
+        }
+
+        static bp::list getX(const SBStreak& streak)
+        {
+            const std::vector<double>& x = streak.getX();
+            bp::list l;
+            for (size_t i=0; i!=x.size(); ++i) l.append(x[i]);
+            return l;
+        }
+
+        static bp::list getY(const SBStreak& streak)
+        {
+            const std::vector<double>& y = streak.getY();
+            bp::list l;
+            for (size_t i=0; i!=y.size(); ++i) l.append(y[i]);
+            return l;
+        }
+
+        static void wrap()
+        {
+            bp::class_<SBStreak,bp::bases<SBProfile> >("SBStreak", bp::no_init)
+                .def("__init__", bp::make_constructor(
+                        &construct, bp::default_call_policies(),
+                        (bp::arg("x"), bp::arg("y"), bp::arg("flux")=1.,
+                         bp::arg("gsparams")=bp::object())
+                ))
+                .def(bp::init<const SBStreak&>())
+                .def("getX", &getX)
+                .def("getY", &getY)
+                .def("getLength", &SBStreak::getLength)
+                .enable_pickling()
+                ;
+        }
+    };
+
+    void pyExportSBStreak()
+    {
+        PySBStreak::wrap();
+    }
+
+} // namespace galsim
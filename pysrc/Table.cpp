@@ -150,7 +150,7 @@ namespace {
     struct PyTable2D{
         static Table2D<double, double>* makeTable2D(
             const bp::object& x, const bp::object& y, const bp::object& f,
-            const std::string& interp)
+            const std::string& interp, bool periodic)
         {
             const int Nx = GetNumpyArrayDim(f.ptr(), 0);
             const int Ny = GetNumpyArrayDim(f.ptr(), 1);
@@ -166,11 +166,12 @@ namespace {
             else if (interp == "floor") i = Table2D<double,double>::floor;
             else if (interp == "ceil") i = Table2D<double,double>::ceil;
             else if (interp == "nearest") i = Table2D<double,double>::nearest;
+            else if (interp == "cubic") i = Table2D<double,double>::cubic;
             else {
                 PyErr_SetString(PyExc_ValueError, "Invalid interpolant");
                 bp::throw_error_already_set();
             }
-            return new Table2D<double,double>(xargs, yargs, vals, Nx, Ny, i);
+            return new Table2D<double,double>(xargs, yargs, vals, Nx, Ny, i, periodic);
         }
 
         static void interpMany(const Table2D<double,double>& table2d,
@@ -198,6 +199,42 @@ namespace {
             table2d.interpManyMesh(xvec, yvec, valvec, Nx, Ny);
         }
 
+        static void interpManyShifted(const Table2D<double,double>& table2d,
+                                      const bp::object& x, const bp::object& y,
+                                      const bp::object& dx, const bp::object& dy,
+                                      const bp::object& vals)
+        {
+            const double* xvec = GetNumpyArrayData<double>(x.ptr());
+            const double* yvec = GetNumpyArrayData<double>(y.ptr());
+            const double* dxvec = GetNumpyArrayData<double>(dx.ptr());
+            const double* dyvec = GetNumpyArrayData<double>(dy.ptr());
+            double* valvec = GetNumpyArrayData<double>(vals.ptr());
+            int N = GetNumpyArrayDim(x.ptr(), 0);
+            int M = GetNumpyArrayDim(dx.ptr(), 0);
+            assert(M == GetNumpyArrayDim(vals.ptr(), 0));
+            assert(N == GetNumpyArrayDim(vals.ptr(), 1));
+            table2d.interpManyShifted(xvec, yvec, N, dxvec, dyvec, M, valvec);
+        }
+
+        static bp::tuple gradient(const Table2D<double,double>& table2d, double x, double y)
+        {
+            double dfdx, dfdy;
+            table2d.gradient(x, y, dfdx, dfdy);
+            return bp::make_tuple(dfdx, dfdy);
+        }
+
+        static void gradientMany(const Table2D<double,double>& table2d,
+                                 const bp::object& x, const bp::object& y,
+                                 const bp::object& dfdx, const bp::object& dfdy)
+        {
+            const double* xvec = GetNumpyArrayData<double>(x.ptr());
+            const double* yvec = GetNumpyArrayData<double>(y.ptr());
+            double* dfdxvec = GetNumpyArrayData<double>(dfdx.ptr());
+            double* dfdyvec = GetNumpyArrayData<double>(dfdy.ptr());
+            int N = GetNumpyArrayDim(x.ptr(), 0);
+            table2d.gradientMany(xvec, yvec, dfdxvec, dfdyvec, N);
+        }
+
         static bp::object convertGetXArgs(const Table2D<double,double>& table2d)
         {
             const std::vector<double>& x = table2d.getXArgs();
@@ -228,6 +265,8 @@ namespace {
                     return std::string("ceil");
                 case Table2D<double,double>::nearest:
                     return std::string("nearest");
+                case Table2D<double,double>::cubic:
+                    return std::string("cubic");
                 default:
                     PyErr_SetString(PyExc_ValueError, "Invalid interpolant");
                     bp::throw_error_already_set();
@@ -243,12 +282,16 @@ namespace {
                 .def("__init__",
                     bp::make_constructor(
                         &makeTable2D, bp::default_call_policies(),
-                        (bp::arg("x"), bp::arg("y"), bp::arg("f"), bp::arg("interp"))
+                        (bp::arg("x"), bp::arg("y"), bp::arg("f"), bp::arg("interp"),
+                         bp::arg("periodic")=false)
                     )
                 )
                 .def("__call__", &Table2D<double,double>::lookup)
                 .def("interpMany", &interpMany)
                 .def("interpManyMesh", &interpManyMesh)
+                .def("interpManyShifted", &interpManyShifted)
+                .def("gradient", &gradient)
+                .def("gradientMany", &gradientMany)
                 .def("xmin", &Table2D<double,double>::xmin)
                 .def("xmax", &Table2D<double,double>::xmax)
                 .def("ymin", &Table2D<double,double>::ymin)
@@ -257,6 +300,7 @@ namespace {
                 .def("getYArgs", &convertGetYArgs)
                 .def("getVals", &convertGetVals)
                 .def("getInterp", &convertGetInterp)
+                .def("isPeriodic", &Table2D<double,double>::isPeriodic)
                 .enable_pickling()
                 ;
         }
@@ -38,13 +38,16 @@ namespace galsim {
     void pyExportAngle();
     void pyExportBounds();
     void pyExportImage();
+    void pyExportPhotonArray();
     void pyExportSBProfile();
     void pyExportSBAdd();
+    void pyExportSBCloud();
     void pyExportSBConvolve();
     void pyExportSBDeconvolve();
     void pyExportSBFourierSqrt();
     void pyExportSBTransform();
     void pyExportSBBox();
+    void pyExportSBStreak();
     void pyExportSBGaussian();
     void pyExportSBExponential();
     void pyExportSBSersic();
@@ -82,13 +85,16 @@ BOOST_PYTHON_MODULE(_galsim) {
     galsim::pyExportAngle();
     galsim::pyExportBounds();
     galsim::pyExportImage();
+    galsim::pyExportPhotonArray();
     galsim::pyExportSBProfile();
     galsim::pyExportSBAdd();
+    galsim::pyExportSBCloud();
     galsim::pyExportSBConvolve();
     galsim::pyExportSBDeconvolve();
     galsim::pyExportSBFourierSqrt();
     galsim::pyExportSBTransform();
     galsim::pyExportSBBox();
+    galsim::pyExportSBStreak();
     galsim::pyExportSBGaussian();
     galsim::pyExportSBExponential();
     galsim::pyExportSBSersic();
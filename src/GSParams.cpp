@@ -36,7 +36,9 @@ namespace galsim {
                        double _shoot_accuracy,
                        double _allowed_flux_variation,
                        int _range_division_for_extrema,
-                       double _small_fraction_of_flux) :
+                       double _small_fraction_of_flux,
+                       bool _shoot_inverse_cdf,
+                       bool _interpolate_sersic_n) :
         minimum_fft_size(_minimum_fft_size),
         maximum_fft_size(_maximum_fft_size),
         folding_threshold(_folding_threshold),
@@ -52,7 +54,9 @@ namespace galsim {
         shoot_accuracy(_shoot_accuracy),
         allowed_flux_variation(_allowed_flux_variation),
         range_division_for_extrema(_range_division_for_extrema),
-        small_fraction_of_flux(_small_fraction_of_flux)
+        small_fraction_of_flux(_small_fraction_of_flux),
+        shoot_inverse_cdf(_shoot_inverse_cdf),
+        interpolate_sersic_n(_interpolate_sersic_n)
     {}
 
     bool GSParams::operator==(const GSParams& rhs) const
@@ -79,6 +83,8 @@ namespace galsim {
         else if (allowed_flux_variation != rhs.allowed_flux_variation) return false;
         else if (range_division_for_extrema != rhs.range_division_for_extrema) return false;
         else if (small_fraction_of_flux != rhs.small_fraction_of_flux) return false;
+        else if (shoot_inverse_cdf != rhs.shoot_inverse_cdf) return false;
+        else if (interpolate_sersic_n != rhs.interpolate_sersic_n) return false;
         else return true;
     }
 
@@ -117,6 +123,10 @@ namespace galsim {
         else if (range_division_for_extrema > rhs.range_division_for_extrema) return false;
         else if (small_fraction_of_flux < rhs.small_fraction_of_flux) return true;
         else if (small_fraction_of_flux > rhs.small_fraction_of_flux) return false;
+        else if (shoot_inverse_cdf < rhs.shoot_inverse_cdf) return true;
+        else if (shoot_inverse_cdf > rhs.shoot_inverse_cdf) return false;
+        else if (interpolate_sersic_n < rhs.interpolate_sersic_n) return true;
+        else if (interpolate_sersic_n > rhs.interpolate_sersic_n) return false;
         else return false;
     }
 
@@ -131,7 +141,9 @@ namespace galsim {
             << gsp.integration_relerr << "," << gsp.integration_abserr << ",  "
             << gsp.shoot_accuracy << "," 
             << gsp.allowed_flux_variation << "," << gsp.range_division_for_extrema << ","
-            << gsp.small_fraction_of_flux;
+            << gsp.small_fraction_of_flux << ","
+            << gsp.shoot_inverse_cdf << ","
+            << gsp.interpolate_sersic_n;
         return os;
     }
 
@@ -401,4 +401,122 @@ namespace galsim {
         return result;
     }
 
+    // Integrate the flux in the annulus r1 < r < r2, splitting the integral at any of the
+    // range boundaries, since the function need not be smooth across them.
+    static double AnnulusFlux(const FluxDensity& fluxDensity, const std::vector<double>& range,
+                              double r1, double r2, const GSParamsPtr& gsparams)
+    {
+        RTimesF<FluxDensity> integrand(fluxDensity);
+        double flux = 0.;
+        for (size_t i=1; i<range.size()-1 && r1 < r2; ++i) {
+            if (range[i] > r1 && range[i] < r2) {
+                flux += integ::int1d(integrand, r1, range[i],
+                                     gsparams->integration_relerr,
+                                     gsparams->integration_abserr);
+                r1 = range[i];
+            }
+        }
+        flux += integ::int1d(integrand, r1, r2,
+                             gsparams->integration_relerr,
+                             gsparams->integration_abserr);
+        return flux;
+    }
+
+    RadialInverseCDF::RadialInverseCDF(const FluxDensity& fluxDensity,
+                                       const std::vector<double>& range,
+                                       const GSParamsPtr& gsparams)
+    {
+        dbg<<"Start RadialInverseCDF constructor\n";
+        dbg<<"Input range has "<<range.size()<<" entries\n";
+        assert(range.size() >= 2);
+        const double rmin = range.front();
+        const double rmax = range.back();
+
+        _flux = AnnulusFlux(fluxDensity, range, rmin, rmax, gsparams);
+        dbg<<"flux = "<<_flux<<std::endl;
+        assert(_flux > 0.);
+
+        // Each entry in the table is separated by this much flux.
+        const int nbins = std::max(int(std::ceil(1. / gsparams->small_fraction_of_flux)), 1);
+        const double dflux = _flux / nbins;
+        dbg<<"nbins = "<<nbins<<std::endl;
+
+        _rsq.resize(nbins+1);
+        _rsq[0] = rmin*rmin;
+        _rsq[nbins] = rmax*rmax;
+
+        // Find each successive radius by Newton-Raphson iteration from the previous one.
+        // Keep track of the actual cumulative flux so that errors don't accumulate.
+        const int maxiter = 20;
+        const double tol = 1.e-10;
+        double r1 = rmin;
+        double cumflux = 0.;
+        for (int k=1; k<nbins; ++k) {
+            double target = k*dflux - cumflux;
+            // Initial guess assumes the surface brightness is constant from r1 to r2.
+            double f1 = fluxDensity(r1);
+            double r2 = f1 > 0. ? std::sqrt(r1*r1 + target / (M_PI*f1)) : rmax;
+            if (r2 > rmax) r2 = rmax;
+            double annflux = AnnulusFlux(fluxDensity, range, r1, r2, gsparams);
+            for (int iter=0; iter<maxiter; ++iter) {
+                double deriv = 2.*M_PI*r2*fluxDensity(r2);
+                if (!(deriv > 0.)) break;
+                double dr = (target - annflux) / deriv;
+                double r2new = r2 + dr;
+                // Keep r2 within (r1, rmax]
+                if (r2new <= r1) r2new = 0.5*(r1+r2);
+                if (r2new > rmax) r2new = rmax;
+                if (r2new == r2) break;
+                r2 = r2new;
+                annflux = AnnulusFlux(fluxDensity, range, r1, r2, gsparams);
+                if (std::abs(dr) < tol * r2) break;
+            }
+            xdbg<<"k = "<<k<<": r = "<<r2<<", cumflux = "<<cumflux+annflux<<std::endl;
+            _rsq[k] = r2*r2;
+            cumflux += annflux;
+            r1 = r2;
+        }
+        dbg<<"Final cumflux = "<<cumflux+AnnulusFlux(fluxDensity, range, r1, rmax, gsparams)
+            <<std::endl;
+    }
+
+    boost::shared_ptr<PhotonArray> RadialInverseCDF::shoot(int N, UniformDeviate ud) const
+    {
+        dbg<<"RadialInverseCDF shoot: N = "<<N<<std::endl;
+        assert(N>=0);
+        boost::shared_ptr<PhotonArray> result(new PhotonArray(N));
+        if (N==0) return result;
+        double fluxPerPhoton = _flux / N;
+        const int nbins = _rsq.size()-1;
+
+        for (int i=0; i<N; i++) {
+#ifdef USE_COS_SIN
+            double u = ud() * nbins;
+            int k = std::min(int(u), nbins-1);
+            double rsq = _rsq[k] + (u-k) * (_rsq[k+1]-_rsq[k]);
+            double radius = std::sqrt(rsq);
+            double theta = 2.*M_PI*ud();
+            double sintheta, costheta;
+            (theta * radians).sincos(sintheta,costheta);
+            result->setPhoton(i, radius*costheta, radius*sintheta, fluxPerPhoton);
+#else
+            // First get a point uniformly distributed in unit circle
+            double xu, yu, rsq;
+            do {
+                xu = 2.*ud()-1.;
+                yu = 2.*ud()-1.;
+                rsq = xu*xu+yu*yu;
+            } while (rsq>=1. || rsq==0.);
+            // Now rsq is unit deviate from 0 to 1, which we use for the cumulative flux.
+            double u = rsq * nbins;
+            int k = std::min(int(u), nbins-1);
+            double newrsq = _rsq[k] + (u-k) * (_rsq[k+1]-_rsq[k]);
+            double rScale = std::sqrt(newrsq / rsq);
+            result->setPhoton(i, xu*rScale, yu*rScale, fluxPerPhoton);
+#endif
+        }
+        dbg<<"RadialInverseCDF Realized flux = "<<result->getTotalFlux()<<std::endl;
+        return result;
+    }
+
 } // namespace galsim
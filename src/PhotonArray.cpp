@@ -80,6 +80,12 @@ namespace galsim {
         if (rhs.size()==0) return;      // Nothing needed for empty RHS.
         int oldSize = size();
         int finalSize = oldSize + rhs.size();
+        if (hasAllocatedWavelengths() && rhs.hasAllocatedWavelengths()) {
+            _wave.resize(finalSize);
+            std::copy(rhs._wave.begin(), rhs._wave.end(), _wave.begin()+oldSize);
+        } else {
+            _wave.clear();
+        }
         _x.resize(finalSize);
         _y.resize(finalSize);
         _flux.resize(finalSize);
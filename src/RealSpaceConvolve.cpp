@@ -20,6 +20,7 @@
 //#define DEBUGLOGGING
 
 #include "SBProfile.h"
+#include "SBConvolveImpl.h"
 #include "integ/Int.h"
 #include "Solve.h"
 
@@ -382,4 +383,307 @@ namespace galsim {
         return result;
     }
 
+    // f(pos - p0 - t d) for t in [0,1], the profile along one segment of a streak.
+    class StreakSegmentFunc : public std::unary_function<double,double>
+    {
+    public:
+        StreakSegmentFunc(const SBProfile& prof, const Position<double>& p0,
+                          const Position<double>& d) :
+            _prof(prof), _p0(p0), _d(d) {}
+        double operator()(double t) const { return _prof.xValue(_p0 - t*_d); }
+    private:
+        const SBProfile& _prof;
+        Position<double> _p0;
+        Position<double> _d;
+    };
+
+    // Restrict [tmin,tmax] to the t values where c - t d is in [vmin,vmax], and add the
+    // t values of the given splits to tsplits.
+    static void UpdateTRange(double c, double d, double vmin, double vmax,
+                             const std::vector<double>& splits,
+                             double& tmin, double& tmax, std::vector<double>& tsplits)
+    {
+        if (d == 0.) {
+            if (c < vmin || c > vmax) tmax = tmin;
+            return;
+        }
+        double t1 = (c - vmax) / d;
+        double t2 = (c - vmin) / d;
+        if (t1 > t2) std::swap(t1,t2);
+        tmin = std::max(tmin, t1);
+        tmax = std::min(tmax, t2);
+        for (size_t k=0; k<splits.size(); ++k) tsplits.push_back((c - splits[k]) / d);
+    }
+
+    double RealSpaceStreakConvolve(
+        const SBProfile& prof, const std::vector<Position<double> >& points,
+        const Position<double>& pos, double flux, const GSParamsPtr& gsparams)
+    {
+        xdbg<<"Start RealSpaceStreakConvolve for pos = "<<pos<<std::endl;
+        double xmin, xmax, ymin, ymax;
+        std::vector<double> xsplits, ysplits;
+        prof.getXRange(xmin,xmax,xsplits);
+        prof.getYRange(ymin,ymax,ysplits);
+
+        std::vector<double> length(points.size()-1);
+        double total_length = 0.;
+        for (size_t i=0; i<length.size(); ++i) {
+            Position<double> d = points[i+1] - points[i];
+            length[i] = std::sqrt(d.x*d.x + d.y*d.y);
+            total_length += length[i];
+        }
+
+        double abserr = gsparams->realspace_abserr * std::abs(prof.getFlux());
+        double result = 0.;
+        for (size_t i=0; i<length.size(); ++i) {
+            if (length[i] == 0.) continue;
+            // The integrand is prof(pos - p_i - t d_i) for t in [0,1].
+            Position<double> c = pos - points[i];
+            Position<double> d = points[i+1] - points[i];
+            double tmin = 0., tmax = 1.;
+            std::vector<double> tsplits;
+            UpdateTRange(c.x,d.x,xmin,xmax,xsplits,tmin,tmax,tsplits);
+            UpdateTRange(c.y,d.y,ymin,ymax,ysplits,tmin,tmax,tsplits);
+            xdbg<<"Segment "<<i<<": t range = "<<tmin<<" ... "<<tmax<<std::endl;
+            if (tmin >= tmax) continue;
+
+            integ::IntRegion<double> treg(tmin,tmax);
+            for (size_t k=0; k<tsplits.size(); ++k) {
+                double t = tsplits[k];
+                if (t > tmin && t < tmax) treg.addSplit(t);
+            }
+            StreakSegmentFunc func(prof,c,d);
+            double weight = flux * length[i] / total_length;
+            result += weight * integ::int1d(func, treg, gsparams->realspace_relerr, abserr);
+        }
+        xdbg<<"Found result = "<<result<<std::endl;
+        return result;
+    }
+
+    // f(r) r for an axisymmetric profile f.
+    class RadialFluxIntegrand : public std::unary_function<double,double>
+    {
+    public:
+        RadialFluxIntegrand(const SBProfile& prof) : _prof(prof) {}
+        double operator()(double r) const { return _prof.xValue(Position<double>(r,0.)) * r; }
+    private:
+        const SBProfile& _prof;
+    };
+
+    // C(R) = int_0^R f(r) r dr, tabulated at nodes chosen so that cubic Hermite interpolation
+    // (using C'(R) = f(R) R) is accurate to within tol.  Beyond _rmax, C(R) = _total.  This is
+    // either where a profile with a finite extent has its edge, or far enough out that the
+    // remaining integral is less than tol.
+    class RealSpaceBoxConvolver::RadialIntegral
+    {
+    public:
+        RadialIntegral(const SBProfile& prof, double tol) : _prof(prof), _tol(tol)
+        {
+            dbg<<"Start RadialIntegral with tol = "<<tol<<std::endl;
+            RadialFluxIntegrand func(_prof);
+            double xmin, xmax;
+            std::vector<double> splits;
+            _prof.getXRange(xmin,xmax,splits);
+            _hasEdge = (xmax < integ::MOCK_INF);
+            double tail = 0.;
+            if (_hasEdge) {
+                _rmax = xmax;
+            } else {
+                _rmax = M_PI / _prof.stepK();
+                tail = integ::int1d(func, _rmax, integ::MOCK_INF, 1.e-6, 0.1*_tol);
+                while (std::abs(tail) > _tol) {
+                    _rmax *= 2.;
+                    tail = integ::int1d(func, _rmax, integ::MOCK_INF, 1.e-6, 0.1*_tol);
+                }
+            }
+            dbg<<"rmax = "<<_rmax<<", tail = "<<tail<<std::endl;
+
+            // Start with nodes spaced logarithmically down to rmax/2^20, and then refine these
+            // as needed.
+            _r.push_back(0.);
+            _c.push_back(0.);
+            _d.push_back(0.);
+            double a = 0.;
+            for (int i=20; i>=0; --i) {
+                double b = std::ldexp(_rmax, -i);
+                addInterval(a, b, 0);
+                a = b;
+            }
+            _total = _c.back() + tail;
+            dbg<<"Using "<<_r.size()<<" nodes.  total = "<<_total<<std::endl;
+        }
+
+        double operator()(double R) const
+        {
+            if (R >= _rmax) return _total;
+            int k = std::upper_bound(_r.begin(), _r.end(), R) - _r.begin();
+            assert(k > 0 && k < int(_r.size()));
+            const double h = _r[k] - _r[k-1];
+            const double t = (R - _r[k-1]) / h;
+            const double t2 = t*t;
+            const double t3 = t2*t;
+            return (2.*t3 - 3.*t2 + 1.) * _c[k-1] + (t3 - 2.*t2 + t) * h * _d[k-1]
+                + (3.*t2 - 2.*t3) * _c[k] + (t3 - t2) * h * _d[k];
+        }
+
+        double getRMax() const { return _rmax; }
+        double getTotal() const { return _total; }
+
+    private:
+
+        // Add the interval (a,b] to the table, splitting it if the interpolated value at the
+        // midpoint is not accurate enough.
+        void addInterval(double a, double b, int depth)
+        {
+            RadialFluxIntegrand func(_prof);
+            const double ca = _c.back();
+            const double da = _d.back();
+            const double m = 0.5*(a+b);
+            const double cm = ca + integ::int1d(func, a, m, 1.e-12, 0.01*_tol);
+            const double cb = cm + integ::int1d(func, m, b, 1.e-12, 0.01*_tol);
+            // Use the value just inside a hard edge.
+            const double db = (_hasEdge && b == _rmax) ?
+                func(b * (1.-1.e-12)) / (1.-1.e-12) : func(b);
+            const double interp = 0.5*(ca+cb) + 0.125*(b-a)*(da-db);
+            if (std::abs(interp - cm) > _tol && depth < 40) {
+                addInterval(a, m, depth+1);
+                addInterval(m, b, depth+1);
+            } else {
+                _r.push_back(b);
+                _c.push_back(cb);
+                _d.push_back(db);
+            }
+        }
+
+        SBProfile _prof;
+        double _tol;
+        bool _hasEdge;
+        double _rmax;
+        double _total;
+        std::vector<double> _r;  // The nodes
+        std::vector<double> _c;  // C(r)
+        std::vector<double> _d;  // C'(r) = f(r) r
+    };
+
+    // C(x/cos(theta)) or C(y/sin(theta)), the integrand for S(x,y) on either side of the
+    // diagonal of the rectangle.
+    class SIntegrand : public std::unary_function<double,double>
+    {
+    public:
+        SIntegrand(const RealSpaceBoxConvolver::RadialIntegral& C, double x, bool use_cos) :
+            _C(C), _x(x), _use_cos(use_cos) {}
+        double operator()(double theta) const
+        { return _C(_x / (_use_cos ? std::cos(theta) : std::sin(theta))); }
+    private:
+        const RealSpaceBoxConvolver::RadialIntegral& _C;
+        double _x;
+        bool _use_cos;
+    };
+
+    RealSpaceBoxConvolver::RealSpaceBoxConvolver(
+        const SBProfile& round, double width, double height, const Position<double>& cen,
+        double norm, const GSParamsPtr& gsparams) :
+        _wo2(0.5*width), _ho2(0.5*height), _cen(cen), _norm(norm),
+        _relerr(1.e-3 * gsparams->realspace_relerr)
+    {
+        dbg<<"Start RealSpaceBoxConvolver: width,height = "<<width<<','<<height;
+        dbg<<", cen = "<<cen<<", norm = "<<norm<<std::endl;
+        assert(round.isAxisymmetric());
+        // The error in the convolution is about 4 * norm * (error in S), so this is well
+        // within realspace_abserr * flux for boxes larger than about 0.03 x 0.03.
+        _abserr = 1.e-3 * gsparams->realspace_abserr * std::abs(round.getFlux());
+        _C.reset(new RadialIntegral(round, 0.1 * _abserr / (M_PI/2.)));
+    }
+
+    double RealSpaceBoxConvolver::S(double x, double y) const
+    {
+        if (x == 0. || y == 0.) return 0.;
+        // S(-x,y) = S(x,-y) = -S(x,y)
+        double sign = 1.;
+        if (x < 0.) { x = -x; sign = -sign; }
+        if (y < 0.) { y = -y; sign = -sign; }
+
+        // In polar coordinates, the rectangle extends to r = x/cos(theta) for theta < theta0,
+        // and to r = y/sin(theta) for theta > theta0.
+        const double rmax = _C->getRMax();
+        const double theta0 = std::atan2(y,x);
+        double result = 0.;
+        if (x >= rmax) {
+            result += _C->getTotal() * theta0;
+        } else {
+            integ::IntRegion<double> reg(0.,theta0);
+            double split = std::acos(x/rmax);
+            if (split < theta0) reg.addSplit(split);
+            result += integ::int1d(SIntegrand(*_C,x,true), reg, _relerr, _abserr);
+        }
+        if (y >= rmax) {
+            result += _C->getTotal() * (M_PI/2. - theta0);
+        } else {
+            integ::IntRegion<double> reg(theta0,M_PI/2.);
+            double split = std::asin(y/rmax);
+            if (split > theta0) reg.addSplit(split);
+            result += integ::int1d(SIntegrand(*_C,y,false), reg, _relerr, _abserr);
+        }
+        return sign * result;
+    }
+
+    double RealSpaceBoxConvolver::xValue(const Position<double>& pos) const
+    {
+        const double x1 = pos.x - _cen.x - _wo2;
+        const double x2 = pos.x - _cen.x + _wo2;
+        const double y1 = pos.y - _cen.y - _ho2;
+        const double y2 = pos.y - _cen.y + _ho2;
+        return _norm * (S(x2,y2) - S(x1,y2) - S(x2,y1) + S(x1,y1));
+    }
+
+    // Set up the edges x-wo2 and x+wo2 of the box for each x = x0 + i dx.  The edges for
+    // point i are xe[lo[i]] and xe[hi[i]].  If the box is the same width as the spacing,
+    // adjacent points share an edge.
+    static void SetEdges(double x0, double dx, int m, double wo2,
+                         std::vector<double>& xe, std::vector<int>& lo, std::vector<int>& hi)
+    {
+        lo.resize(m);
+        hi.resize(m);
+        if (std::abs(2.*wo2 - std::abs(dx)) < 1.e-10 * wo2) {
+            xe.resize(m+1);
+            for (int k=0; k<=m; ++k) xe[k] = x0 + (k-0.5)*dx;
+            for (int i=0; i<m; ++i) {
+                lo[i] = dx > 0. ? i : i+1;
+                hi[i] = dx > 0. ? i+1 : i;
+            }
+        } else {
+            xe.resize(2*m);
+            for (int i=0; i<m; ++i) {
+                xe[i] = x0 + i*dx - wo2;
+                xe[m+i] = x0 + i*dx + wo2;
+                lo[i] = i;
+                hi[i] = m+i;
+            }
+        }
+    }
+
+    void RealSpaceBoxConvolver::fillXValue(tmv::MatrixView<double> val,
+                                           double x0, double dx, double y0, double dy) const
+    {
+        dbg<<"RealSpaceBoxConvolver fillXValue\n";
+        dbg<<"x = "<<x0<<" + i * "<<dx<<std::endl;
+        dbg<<"y = "<<y0<<" + j * "<<dy<<std::endl;
+        const int m = val.colsize();
+        const int n = val.rowsize();
+        std::vector<double> xe, ye;
+        std::vector<int> ilo, ihi, jlo, jhi;
+        SetEdges(x0 - _cen.x, dx, m, _wo2, xe, ilo, ihi);
+        SetEdges(y0 - _cen.y, dy, n, _ho2, ye, jlo, jhi);
+
+        tmv::Matrix<double> s(xe.size(), ye.size());
+        for (size_t j=0; j<ye.size(); ++j)
+            for (size_t i=0; i<xe.size(); ++i)
+                s(i,j) = S(xe[i],ye[j]);
+
+        for (int j=0; j<n; ++j)
+            for (int i=0; i<m; ++i)
+                val(i,j) = _norm * (s(ihi[i],jhi[j]) - s(ilo[i],jhi[j])
+                                    - s(ihi[i],jlo[j]) + s(ilo[i],jlo[j]));
+    }
+
 }
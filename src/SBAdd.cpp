@@ -81,6 +81,7 @@ namespace galsim {
     {
         _sumflux = _sumfx = _sumfy = 0.;
         _maxMaxK = _minStepK = 0.;
+        _maxMaxKx = _maxMaxKy = _minStepKx = _minStepKy = 0.;
         _allAxisymmetric = _allAnalyticX = _allAnalyticK = true;
         _anyHardEdges = false;
 
@@ -95,6 +96,13 @@ namespace galsim {
                 _maxMaxK = it->maxK();
             if ( _minStepK<=0. || (it->stepK() < _minStepK) )
                 _minStepK = it->stepK();
+            double maxkx, maxky, stepkx, stepky;
+            it->getMaxKXY(maxkx, maxky);
+            it->getStepKXY(stepkx, stepky);
+            if (maxkx > _maxMaxKx) _maxMaxKx = maxkx;
+            if (maxky > _maxMaxKy) _maxMaxKy = maxky;
+            if (_minStepKx<=0. || stepkx < _minStepKx) _minStepKx = stepkx;
+            if (_minStepKy<=0. || stepky < _minStepKy) _minStepKy = stepky;
             _allAxisymmetric = _allAxisymmetric && it->isAxisymmetric();
             _anyHardEdges = _anyHardEdges || it->hasHardEdges();
             _allAnalyticX = _allAnalyticX && it->isAnalyticX();
@@ -123,6 +131,40 @@ namespace galsim {
         return kv;
     }
 
+    void SBAdd::SBAddImpl::xValueMany(const double* x, const double* y,
+                                      double* val, int n) const
+    {
+        if (n <= 0) return;
+        ConstIter pptr = _plist.begin();
+        assert(pptr != _plist.end());
+        pptr->xValueMany(x, y, val, n);
+        if (++pptr != _plist.end()) {
+            std::vector<double> val2(n);
+            for (; pptr != _plist.end(); ++pptr) {
+                pptr->xValueMany(x, y, &val2[0], n);
+                for (int i=0; i<n; ++i) val[i] += val2[i];
+            }
+        }
+    }
+
+    void SBAdd::SBAddImpl::kValueMany(const double* kx, const double* ky,
+                                      std::complex<double>* val, int n) const
+    {
+        if (n <= 0) return;
+        ConstIter pptr = _plist.begin();
+        assert(pptr != _plist.end());
+        pptr->kValueMany(kx, ky, val, n);
+        if (++pptr != _plist.end()) {
+            std::vector<std::complex<double> > val2(n);
+            for (; pptr != _plist.end(); ++pptr) {
+                pptr->kValueMany(kx, ky, &val2[0], n);
+                for (int i=0; i<n; ++i) val[i] += val2[i];
+            }
+        }
+    }
+
+    // For large grids, the sums are done in strips of columns (cf. getStrips), so the
+    // temporary for the other components only needs to be the size of one strip.
     void SBAdd::SBAddImpl::fillXValue(tmv::MatrixView<double> val,
                                       double x0, double dx, int izero,
                                       double y0, double dy, int jzero) const
@@ -130,14 +172,23 @@ namespace galsim {
         dbg<<"SBAdd fillXValue\n";
         dbg<<"x = "<<x0<<" + i * "<<dx<<", izero = "<<izero<<std::endl;
         dbg<<"y = "<<y0<<" + j * "<<dy<<", jzero = "<<jzero<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillXValue(val,x0,dx,izero,y0,dy,jzero);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<double> val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillXValue(val2.view(),x0,dx,izero,y0,dy,jzero);
-                val += val2;
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), jzero, strips);
+        tmv::Matrix<double> val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            const int jz = (jzero >= j0 && jzero < j1) ? jzero - j0 : 0;
+            tmv::MatrixView<double> v = val.colRange(j0,j1);
+            tmv::MatrixView<double> v2 = val2.colRange(0,j1-j0);
+            const double y1 = y0 + j0*dy;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillXValue(v,x0,dx,izero,y1,dy,jz);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillXValue(v2,x0,dx,izero,y1,dy,jz);
+                v += v2;
             }
         }
     }
@@ -149,14 +200,23 @@ namespace galsim {
         dbg<<"SBAdd fillKValue\n";
         dbg<<"kx = "<<kx0<<" + i * "<<dkx<<", izero = "<<izero<<std::endl;
         dbg<<"ky = "<<ky0<<" + j * "<<dky<<", jzero = "<<jzero<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKValue(val,kx0,dkx,izero,ky0,dky,jzero);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<std::complex<double> > val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillKValue(val2.view(),kx0,dkx,izero,ky0,dky,jzero);
-                val += val2;
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), jzero, strips);
+        tmv::Matrix<std::complex<double> > val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            const int jz = (jzero >= j0 && jzero < j1) ? jzero - j0 : 0;
+            tmv::MatrixView<std::complex<double> > v = val.colRange(j0,j1);
+            tmv::MatrixView<std::complex<double> > v2 = val2.colRange(0,j1-j0);
+            const double ky1 = ky0 + j0*dky;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillKValue(v,kx0,dkx,izero,ky1,dky,jz);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillKValue(v2,kx0,dkx,izero,ky1,dky,jz);
+                v += v2;
             }
         }
     }
@@ -168,14 +228,23 @@ namespace galsim {
         dbg<<"SBAdd fillXValue\n";
         dbg<<"x = "<<x0<<" + i * "<<dx<<" + j * "<<dxy<<std::endl;
         dbg<<"y = "<<y0<<" + i * "<<dyx<<" + j * "<<dy<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillXValue(val,x0,dx,dxy,y0,dy,dyx);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<double> val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillXValue(val2.view(),x0,dx,dxy,y0,dy,dyx);
-                val += val2;
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), 0, strips);
+        tmv::Matrix<double> val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            tmv::MatrixView<double> v = val.colRange(j0,j1);
+            tmv::MatrixView<double> v2 = val2.colRange(0,j1-j0);
+            const double x1 = x0 + j0*dxy;
+            const double y1 = y0 + j0*dy;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillXValue(v,x1,dx,dxy,y1,dy,dyx);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillXValue(v2,x1,dx,dxy,y1,dy,dyx);
+                v += v2;
             }
         }
     }
@@ -187,14 +256,23 @@ namespace galsim {
         dbg<<"SBAdd fillKValue\n";
         dbg<<"kx = "<<kx0<<" + i * "<<dkx<<" + j * "<<dkxy<<std::endl;
         dbg<<"ky = "<<ky0<<" + i * "<<dkyx<<" + j * "<<dky<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKValue(val,kx0,dkx,dkxy,ky0,dky,dkyx);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<std::complex<double> > val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillKValue(val2.view(),kx0,dkx,dkxy,ky0,dky,dkyx);
-                val += val2;
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), 0, strips);
+        tmv::Matrix<std::complex<double> > val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            tmv::MatrixView<std::complex<double> > v = val.colRange(j0,j1);
+            tmv::MatrixView<std::complex<double> > v2 = val2.colRange(0,j1-j0);
+            const double kx1 = kx0 + j0*dkxy;
+            const double ky1 = ky0 + j0*dky;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillKValue(v,kx1,dkx,dkxy,ky1,dky,dkyx);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillKValue(v2,kx1,dkx,dkxy,ky1,dky,dkyx);
+                v += v2;
             }
         }
     }
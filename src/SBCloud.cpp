@@ -0,0 +1,319 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+//#define DEBUGLOGGING
+
+#include "SBCloud.h"
+#include "SBCloudImpl.h"
+#include <map>
+#include <algorithm>  // For upper_bound
+
+#ifdef DEBUGLOGGING
+#include <fstream>
+//std::ostream* dbgout = new std::ofstream("debug.out");
+//int verbose_level = 2;
+#endif
+
+namespace galsim {
+
+    SBCloud::SBCloud(const SBProfile& adaptee,
+                     const std::vector<double>& x, const std::vector<double>& y,
+                     const std::vector<double>& flux_ratio, const std::vector<double>& scale,
+                     const GSParamsPtr& gsparams) :
+        SBProfile(new SBCloudImpl(adaptee,x,y,flux_ratio,scale,gsparams)) {}
+
+    SBCloud::SBCloud(const SBCloud& rhs) : SBProfile(rhs) {}
+
+    SBCloud::~SBCloud() {}
+
+    SBProfile SBCloud::getObj() const
+    {
+        assert(dynamic_cast<const SBCloudImpl*>(_pimpl.get()));
+        return static_cast<const SBCloudImpl&>(*_pimpl).getObj();
+    }
+
+    const std::vector<double>& SBCloud::getX() const
+    {
+        assert(dynamic_cast<const SBCloudImpl*>(_pimpl.get()));
+        return static_cast<const SBCloudImpl&>(*_pimpl).getX();
+    }
+
+    const std::vector<double>& SBCloud::getY() const
+    {
+        assert(dynamic_cast<const SBCloudImpl*>(_pimpl.get()));
+        return static_cast<const SBCloudImpl&>(*_pimpl).getY();
+    }
+
+    const std::vector<double>& SBCloud::getFluxRatio() const
+    {
+        assert(dynamic_cast<const SBCloudImpl*>(_pimpl.get()));
+        return static_cast<const SBCloudImpl&>(*_pimpl).getFluxRatio();
+    }
+
+    const std::vector<double>& SBCloud::getScale() const
+    {
+        assert(dynamic_cast<const SBCloudImpl*>(_pimpl.get()));
+        return static_cast<const SBCloudImpl&>(*_pimpl).getScale();
+    }
+
+    static void WriteList(std::ostream& os, const std::vector<double>& v)
+    {
+        os << "[";
+        for (size_t i=0; i<v.size(); ++i) os << (i==0 ? "" : ", ") << v[i];
+        os << "]";
+    }
+
+    std::string SBCloud::SBCloudImpl::serialize() const
+    {
+        std::ostringstream oss(" ");
+        oss.precision(std::numeric_limits<double>::digits10 + 4);
+        oss << "galsim._galsim.SBCloud(" << _adaptee.serialize() << ", ";
+        WriteList(oss, _x);
+        oss << ", ";
+        WriteList(oss, _y);
+        oss << ", ";
+        WriteList(oss, _flux_ratio);
+        oss << ", ";
+        WriteList(oss, _scale);
+        oss << ", galsim.GSParams("<<*gsparams<<"))";
+        return oss.str();
+    }
+
+    SBCloud::SBCloudImpl::SBCloudImpl(const SBProfile& adaptee,
+                                      const std::vector<double>& x, const std::vector<double>& y,
+                                      const std::vector<double>& flux_ratio,
+                                      const std::vector<double>& scale,
+                                      const GSParamsPtr& gsparams) :
+        SBProfileImpl(gsparams ? gsparams : GetImpl(adaptee)->gsparams),
+        _adaptee(adaptee), _x(x), _y(y), _flux_ratio(flux_ratio), _scale(scale)
+    {
+        const int n = _x.size();
+        if (n == 0)
+            throw SBError("SBCloud requires at least one copy");
+        if (int(_y.size()) != n || int(_flux_ratio.size()) != n || int(_scale.size()) != n)
+            throw SBError("SBCloud requires x, y, flux_ratio and scale to be the same length");
+
+        // Group the copies by their scale, so the adaptee only needs to be evaluated once
+        // for each distinct scale in fillKValue.
+        std::map<double, std::vector<int> > groups;
+        for (int i=0; i<n; ++i) {
+            if (!(_scale[i] > 0.))
+                throw SBError("SBCloud requires scale > 0");
+            groups[_scale[i]].push_back(i);
+        }
+        for (std::map<double, std::vector<int> >::const_iterator it=groups.begin();
+             it!=groups.end(); ++it) {
+            _group_scale.push_back(it->first);
+            _groups.push_back(it->second);
+        }
+        dbg<<"SBCloud has "<<n<<" copies with "<<_groups.size()<<" distinct scales\n";
+
+        double f0 = _adaptee.getFlux();
+        double pos0 = _adaptee.getPositiveFlux();
+        double neg0 = _adaptee.getNegativeFlux();
+        Position<double> c0 = _adaptee.centroid();
+        double sum_ratio = 0.;
+        _positive_flux = _negative_flux = 0.;
+        _centroid = Position<double>(0.,0.);
+        _cumflux.resize(n);
+        double cumflux = 0.;
+        for (int i=0; i<n; ++i) {
+            double r = _flux_ratio[i];
+            sum_ratio += r;
+            _centroid += r * (Position<double>(_x[i],_y[i]) + _scale[i] * c0);
+            if (r >= 0.) {
+                _positive_flux += r * pos0;
+                _negative_flux += r * neg0;
+            } else {
+                _positive_flux -= r * neg0;
+                _negative_flux -= r * pos0;
+            }
+            cumflux += std::abs(r);
+            _cumflux[i] = cumflux;
+        }
+        _flux = sum_ratio * f0;
+        if (sum_ratio != 0.) _centroid /= sum_ratio;
+
+        // The extent of the cloud is the largest extent of any copy, where the adaptee has an
+        // extent of about pi/stepk.
+        double maxk0x, maxk0y, stepk0x, stepk0y;
+        _adaptee.getMaxKXY(maxk0x, maxk0y);
+        _adaptee.getStepKXY(stepk0x, stepk0y);
+        const double R0 = M_PI / _adaptee.stepK();
+        const double R0x = M_PI / stepk0x;
+        const double R0y = M_PI / stepk0y;
+        double R = 0., Rx = 0., Ry = 0.;
+        for (int i=0; i<n; ++i) {
+            R = std::max(R, sqrt(_x[i]*_x[i] + _y[i]*_y[i]) + _scale[i] * R0);
+            Rx = std::max(Rx, std::abs(_x[i]) + _scale[i] * R0x);
+            Ry = std::max(Ry, std::abs(_y[i]) + _scale[i] * R0y);
+        }
+        _stepk = M_PI / R;
+        _stepkx = std::max(M_PI / Rx, _stepk);
+        _stepky = std::max(M_PI / Ry, _stepk);
+
+        // The smallest copies have the largest maxk.
+        const double min_scale = _group_scale.front();
+        _maxk = _adaptee.maxK() / min_scale;
+        _maxkx = std::min(maxk0x / min_scale, _maxk);
+        _maxky = std::min(maxk0y / min_scale, _maxk);
+        dbg<<"maxK() = "<<_maxk<<", stepK() = "<<_stepk<<std::endl;
+    }
+
+    double SBCloud::SBCloudImpl::xValue(const Position<double>& p) const
+    {
+        double val = 0.;
+        for (size_t i=0; i<_x.size(); ++i) {
+            double s = _scale[i];
+            Position<double> p1((p.x-_x[i])/s, (p.y-_y[i])/s);
+            val += _flux_ratio[i] / (s*s) * _adaptee.xValue(p1);
+        }
+        return val;
+    }
+
+    std::complex<double> SBCloud::SBCloudImpl::kValue(const Position<double>& k) const
+    {
+        std::complex<double> val = 0.;
+        for (size_t g=0; g<_groups.size(); ++g) {
+            const std::vector<int>& group = _groups[g];
+            std::complex<double> phase = 0.;
+            for (size_t ii=0; ii<group.size(); ++ii) {
+                const int i = group[ii];
+                phase += _flux_ratio[i] * std::polar(1., -(k.x*_x[i] + k.y*_y[i]));
+            }
+            val += _adaptee.kValue(_group_scale[g] * k) * phase;
+        }
+        return val;
+    }
+
+    void SBCloud::SBCloudImpl::fillXValue(tmv::MatrixView<double> val,
+                                          double x0, double dx, int izero,
+                                          double y0, double dy, int jzero) const
+    {
+        // The zero positions are not useful here, since the copies are shifted.
+        fillXValue(val,x0,dx,0.,y0,dy,0.);
+    }
+
+    void SBCloud::SBCloudImpl::fillXValue(tmv::MatrixView<double> val,
+                                          double x0, double dx, double dxy,
+                                          double y0, double dy, double dyx) const
+    {
+        dbg<<"SBCloud fillXValue\n";
+        dbg<<"x = "<<x0<<" + i * "<<dx<<" + j * "<<dxy<<std::endl;
+        dbg<<"y = "<<y0<<" + i * "<<dyx<<" + j * "<<dy<<std::endl;
+        tmv::Matrix<double> temp(val.colsize(), val.rowsize());
+        val.setZero();
+        for (size_t i=0; i<_x.size(); ++i) {
+            double s = _scale[i];
+            GetImpl(_adaptee)->fillXValue(temp.view(),(x0-_x[i])/s,dx/s,dxy/s,
+                                          (y0-_y[i])/s,dy/s,dyx/s);
+            val += (_flux_ratio[i] / (s*s)) * temp;
+        }
+    }
+
+    void SBCloud::SBCloudImpl::addPhases(tmv::MatrixView<std::complex<double> > phase,
+                                         const std::vector<int>& group,
+                                         double kx0, double dkx, double dkxy,
+                                         double ky0, double dky, double dkyx) const
+    {
+        // exp(-i k.pos) = exp(-i (kx0 x + ky0 y)) exp(-i i (dkx x + dkyx y))
+        //                     * exp(-i j (dkxy x + dky y))
+        // so the phases for each copy are an outer product of two vectors, which are
+        // calculated by recursion.
+        const int m = phase.colsize();
+        const int n = phase.rowsize();
+        tmv::Vector<std::complex<double> > ex(m);
+        tmv::Vector<std::complex<double> > ey(n);
+        for (size_t ii=0; ii<group.size(); ++ii) {
+            const int k = group[ii];
+            const double x = _x[k];
+            const double y = _y[k];
+            std::complex<double> dphase = std::polar(1., -(dkx*x + dkyx*y));
+            std::complex<double> ph = 1.;
+            for (int i=0; i<m; ++i, ph*=dphase) ex(i) = ph;
+            dphase = std::polar(1., -(dkxy*x + dky*y));
+            ph = std::polar(_flux_ratio[k], -(kx0*x + ky0*y));
+            for (int j=0; j<n; ++j, ph*=dphase) ey(j) = ph;
+            phase += ex ^ ey;
+        }
+    }
+
+    void SBCloud::SBCloudImpl::fillKValue(tmv::MatrixView<std::complex<double> > val,
+                                          double kx0, double dkx, int izero,
+                                          double ky0, double dky, int jzero) const
+    {
+        dbg<<"SBCloud fillKValue\n";
+        dbg<<"kx = "<<kx0<<" + i * "<<dkx<<", izero = "<<izero<<std::endl;
+        dbg<<"ky = "<<ky0<<" + j * "<<dky<<", jzero = "<<jzero<<std::endl;
+        tmv::Matrix<std::complex<double> > temp(val.colsize(), val.rowsize());
+        tmv::Matrix<std::complex<double> > phase(val.colsize(), val.rowsize());
+        val.setZero();
+        for (size_t g=0; g<_groups.size(); ++g) {
+            const double s = _group_scale[g];
+            GetImpl(_adaptee)->fillKValue(temp.view(),s*kx0,s*dkx,izero,s*ky0,s*dky,jzero);
+            phase.setZero();
+            addPhases(phase.view(),_groups[g],kx0,dkx,0.,ky0,dky,0.);
+            temp = ElemProd(temp,phase);
+            val += temp;
+        }
+    }
+
+    void SBCloud::SBCloudImpl::fillKValue(tmv::MatrixView<std::complex<double> > val,
+                                          double kx0, double dkx, double dkxy,
+                                          double ky0, double dky, double dkyx) const
+    {
+        dbg<<"SBCloud fillKValue\n";
+        dbg<<"kx = "<<kx0<<" + i * "<<dkx<<" + j * "<<dkxy<<std::endl;
+        dbg<<"ky = "<<ky0<<" + i * "<<dkyx<<" + j * "<<dky<<std::endl;
+        tmv::Matrix<std::complex<double> > temp(val.colsize(), val.rowsize());
+        tmv::Matrix<std::complex<double> > phase(val.colsize(), val.rowsize());
+        val.setZero();
+        for (size_t g=0; g<_groups.size(); ++g) {
+            const double s = _group_scale[g];
+            GetImpl(_adaptee)->fillKValue(temp.view(),s*kx0,s*dkx,s*dkxy,s*ky0,s*dky,s*dkyx);
+            phase.setZero();
+            addPhases(phase.view(),_groups[g],kx0,dkx,dkxy,ky0,dky,dkyx);
+            temp = ElemProd(temp,phase);
+            val += temp;
+        }
+    }
+
+    boost::shared_ptr<PhotonArray> SBCloud::SBCloudImpl::shoot(int N, UniformDeviate u) const
+    {
+        dbg<<"Cloud shoot: N = "<<N<<std::endl;
+        dbg<<"Target flux = "<<getFlux()<<std::endl;
+        // Shoot all the photons from the adaptee at once.  Each copy has an absolute flux of
+        // |flux_ratio| times that of the adaptee, so choosing copies with probability
+        // proportional to |flux_ratio| and scaling the photon fluxes by the sum of |flux_ratio|
+        // gives the right total.
+        boost::shared_ptr<PhotonArray> result = _adaptee.shoot(N,u);
+        const double total = _cumflux.back();
+        for (int k=0; k<result->size(); k++) {
+            int i = std::upper_bound(_cumflux.begin(), _cumflux.end()-1, u() * total)
+                - _cumflux.begin();
+            double s = _scale[i];
+            double fscale = _flux_ratio[i] >= 0. ? total : -total;
+            result->setPhoton(k, _x[i] + s * result->getX(k), _y[i] + s * result->getY(k),
+                              fscale * result->getFlux(k));
+        }
+        dbg<<"Cloud Realized flux = "<<result->getTotalFlux()<<std::endl;
+        return result;
+    }
+
+}
@@ -22,6 +22,9 @@
 #include "SBConvolve.h"
 #include "SBConvolveImpl.h"
 #include "SBTransform.h"
+#include "SBTransformImpl.h"
+#include "SBBoxImpl.h"
+#include "SBStreakImpl.h"
 
 #ifdef DEBUGLOGGING
 #include <fstream>
@@ -66,7 +69,7 @@ namespace galsim {
     SBConvolve::SBConvolveImpl::SBConvolveImpl(const std::list<SBProfile>& slist, bool real_space,
                                                const GSParamsPtr& gsparams) :
         SBProfileImpl(gsparams ? gsparams : GetImpl(slist.front())->gsparams),
-        _real_space(real_space)
+        _real_space(real_space), _boxChecked(false), _streakFlux(0.)
     {
         for (ConstIter sptr = slist.begin(); sptr!=slist.end(); ++sptr)
             add(*sptr);
@@ -119,7 +122,11 @@ namespace galsim {
         } else {
             if (!rhs.isAnalyticK() && !_real_space)
                 throw SBError("SBConvolve requires members to be analytic in k");
-            if (!rhs.isAnalyticX() && _real_space)
+            // A streak is not analytic in x, but real-space convolutions of a streak with one
+            // other profile are done with a 1-d integral along the path.  cf. setupBoxConvolver.
+            std::vector<Position<double> > points;
+            double flux;
+            if (!rhs.isAnalyticX() && _real_space && !GetStreak(rhs,points,flux))
                 throw SBError("Real-space SBConvolve requires members to be analytic in x");
             _plist.push_back(rhs);
         }
@@ -133,6 +140,8 @@ namespace galsim {
         _isStillAxisymmetric = true;
 
         _netStepK = 0.;  // Accumulate Sum 1/stepk^2
+        _minMaxKx = _minMaxKy = 0.;
+        _netStepKx = _netStepKy = 0.;
         for(ConstIter it=_plist.begin(); it!=_plist.end(); ++it) {
             double maxk = it->maxK();
             double stepk = it->stepK();
@@ -142,9 +151,18 @@ namespace galsim {
             _y0 += it->centroid().y;
             if ( _minMaxK<=0. || maxk < _minMaxK) _minMaxK = maxk;
             _netStepK += 1./(stepk*stepk);
+            double maxkx, maxky, stepkx, stepky;
+            it->getMaxKXY(maxkx, maxky);
+            it->getStepKXY(stepkx, stepky);
+            if ( _minMaxKx<=0. || maxkx < _minMaxKx) _minMaxKx = maxkx;
+            if ( _minMaxKy<=0. || maxky < _minMaxKy) _minMaxKy = maxky;
+            _netStepKx += 1./(stepkx*stepkx);
+            _netStepKy += 1./(stepky*stepky);
             _isStillAxisymmetric = _isStillAxisymmetric && it->isAxisymmetric();
         }
         _netStepK = 1./sqrt(_netStepK);  // Convert to (Sum 1/stepk^2)^(-1/2)
+        _netStepKx = 1./sqrt(_netStepKx);
+        _netStepKy = 1./sqrt(_netStepKy);
         dbg<<"Net maxK, stepK = "<<_minMaxK<<" , "<<_netStepK<<std::endl;
     }
 
@@ -157,6 +175,11 @@ namespace galsim {
         // For now, we don't bother implementing this for N > 2.
 
         if (_plist.size() == 2) {
+            setupBoxConvolver();
+            if (_boxConvolver) return _boxConvolver->xValue(pos);
+            if (_streakOther)
+                return RealSpaceStreakConvolve(*_streakOther,_streakPoints,pos,_streakFlux,
+                                               this->gsparams);
             const SBProfile& p1 = _plist.front();
             const SBProfile& p2 = _plist.back();
             if (p2.isAxisymmetric())
@@ -171,6 +194,117 @@ namespace galsim {
             throw SBError("Real-space integration of more than 2 profiles is not implemented.");
     }
 
+    bool SBConvolve::SBConvolveImpl::GetBox(const SBProfile& prof, double& width, double& height,
+                                            Position<double>& cen, double& norm)
+    {
+        const SBBox::SBBoxImpl* box = dynamic_cast<const SBBox::SBBoxImpl*>(GetImpl(prof));
+        if (box) {
+            width = box->getWidth();
+            height = box->getHeight();
+            cen = Position<double>(0.,0.);
+            norm = box->getFlux() / (width * height);
+            return true;
+        }
+        const SBTransform::SBTransformImpl* trans =
+            dynamic_cast<const SBTransform::SBTransformImpl*>(GetImpl(prof));
+        if (!trans) return false;
+        double mA, mB, mC, mD;
+        trans->getJac(mA,mB,mC,mD);
+        if (mB != 0. || mC != 0.) return false;
+        Position<double> cen1;
+        if (!GetBox(trans->getObj(),width,height,cen1,norm)) return false;
+        width *= std::abs(mA);
+        height *= std::abs(mD);
+        cen = trans->getOffset() + Position<double>(mA*cen1.x, mD*cen1.y);
+        norm *= trans->getFluxScaling();
+        return true;
+    }
+
+    bool SBConvolve::SBConvolveImpl::GetStreak(const SBProfile& prof,
+                                               std::vector<Position<double> >& points,
+                                               double& flux)
+    {
+        const SBStreak::SBStreakImpl* streak =
+            dynamic_cast<const SBStreak::SBStreakImpl*>(GetImpl(prof));
+        if (streak) {
+            const std::vector<double>& x = streak->getX();
+            const std::vector<double>& y = streak->getY();
+            points.resize(x.size());
+            for (size_t i=0; i<x.size(); ++i) points[i] = Position<double>(x[i],y[i]);
+            flux = streak->getFlux();
+            return true;
+        }
+        const SBTransform::SBTransformImpl* trans =
+            dynamic_cast<const SBTransform::SBTransformImpl*>(GetImpl(prof));
+        if (!trans) return false;
+        if (!GetStreak(trans->getObj(),points,flux)) return false;
+        double mA, mB, mC, mD;
+        trans->getJac(mA,mB,mC,mD);
+        Position<double> cen = trans->getOffset();
+        for (size_t i=0; i<points.size(); ++i) {
+            Position<double> p = points[i];
+            points[i] = cen + Position<double>(mA*p.x + mB*p.y, mC*p.x + mD*p.y);
+        }
+        flux *= trans->getFluxScaling() * std::abs(mA*mD - mB*mC);
+        return true;
+    }
+
+    void SBConvolve::SBConvolveImpl::setupBoxConvolver() const
+    {
+        if (_boxChecked) return;
+        _boxChecked = true;
+        if (!_real_space || _plist.size() != 2 || _fluxProduct == 0.) return;
+        double width, height, norm;
+        Position<double> cen;
+        const SBProfile& p1 = _plist.front();
+        const SBProfile& p2 = _plist.back();
+        if (p1.isAxisymmetric() && GetBox(p2,width,height,cen,norm)) {
+            dbg<<"Use RealSpaceBoxConvolver with p1 round\n";
+            _boxConvolver.reset(
+                new RealSpaceBoxConvolver(p1,width,height,cen,norm,this->gsparams));
+        } else if (p2.isAxisymmetric() && GetBox(p1,width,height,cen,norm)) {
+            dbg<<"Use RealSpaceBoxConvolver with p2 round\n";
+            _boxConvolver.reset(
+                new RealSpaceBoxConvolver(p2,width,height,cen,norm,this->gsparams));
+        } else if (GetStreak(p1,_streakPoints,_streakFlux)) {
+            dbg<<"Use RealSpaceStreakConvolve with p1 a streak\n";
+            if (!p2.isAnalyticX())
+                throw SBError("Real-space convolution with a streak requires the other profile "
+                              "to be analytic in x");
+            _streakOther.reset(new SBProfile(p2));
+        } else if (GetStreak(p2,_streakPoints,_streakFlux)) {
+            dbg<<"Use RealSpaceStreakConvolve with p2 a streak\n";
+            if (!p1.isAnalyticX())
+                throw SBError("Real-space convolution with a streak requires the other profile "
+                              "to be analytic in x");
+            _streakOther.reset(new SBProfile(p1));
+        }
+    }
+
+    void SBConvolve::SBConvolveImpl::fillXValue(tmv::MatrixView<double> val,
+                                                double x0, double dx, int izero,
+                                                double y0, double dy, int jzero) const
+    {
+        dbg<<"SBConvolve fillXValue\n";
+        dbg<<"x = "<<x0<<" + i * "<<dx<<", izero = "<<izero<<std::endl;
+        dbg<<"y = "<<y0<<" + j * "<<dy<<", jzero = "<<jzero<<std::endl;
+        setupBoxConvolver();
+        if (_boxConvolver) _boxConvolver->fillXValue(val,x0,dx,y0,dy);
+        else SBProfileImpl::fillXValue(val,x0,dx,izero,y0,dy,jzero);
+    }
+
+    void SBConvolve::SBConvolveImpl::fillXValue(tmv::MatrixView<double> val,
+                                                double x0, double dx, double dxy,
+                                                double y0, double dy, double dyx) const
+    {
+        dbg<<"SBConvolve fillXValue\n";
+        dbg<<"x = "<<x0<<" + i * "<<dx<<" + j * "<<dxy<<std::endl;
+        dbg<<"y = "<<y0<<" + i * "<<dyx<<" + j * "<<dy<<std::endl;
+        setupBoxConvolver();
+        if (_boxConvolver && dxy == 0. && dyx == 0.) _boxConvolver->fillXValue(val,x0,dx,y0,dy);
+        else SBProfileImpl::fillXValue(val,x0,dx,dxy,y0,dy,dyx);
+    }
+
     std::complex<double> SBConvolve::SBConvolveImpl::kValue(const Position<double>& k) const
     {
         ConstIter pptr = _plist.begin();
@@ -180,6 +314,8 @@ namespace galsim {
         return kv;
     }
 
+    // As for SBAdd, large grids are done in strips of columns (cf. getStrips), so the
+    // temporary for the other components only needs to be the size of one strip.
     void SBConvolve::SBConvolveImpl::fillKValue(tmv::MatrixView<std::complex<double> > val,
                                                 double kx0, double dkx, int izero,
                                                 double ky0, double dky, int jzero) const
@@ -187,14 +323,23 @@ namespace galsim {
         dbg<<"SBConvolve fillKValue\n";
         dbg<<"kx = "<<kx0<<" + i * "<<dkx<<", izero = "<<izero<<std::endl;
         dbg<<"ky = "<<ky0<<" + j * "<<dky<<", jzero = "<<jzero<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKValue(val,kx0,dkx,izero,ky0,dky,jzero);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<std::complex<double> > val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillKValue(val2.view(),kx0,dkx,izero,ky0,dky,jzero);
-                val = ElemProd(val,val2);
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), jzero, strips);
+        tmv::Matrix<std::complex<double> > val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            const int jz = (jzero >= j0 && jzero < j1) ? jzero - j0 : 0;
+            tmv::MatrixView<std::complex<double> > v = val.colRange(j0,j1);
+            tmv::MatrixView<std::complex<double> > v2 = val2.colRange(0,j1-j0);
+            const double ky1 = ky0 + j0*dky;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillKValue(v,kx0,dkx,izero,ky1,dky,jz);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillKValue(v2,kx0,dkx,izero,ky1,dky,jz);
+                v = ElemProd(v,v2);
             }
         }
     }
@@ -206,14 +351,23 @@ namespace galsim {
         dbg<<"SBConvolve fillKValue\n";
         dbg<<"kx = "<<kx0<<" + i * "<<dkx<<" + j * "<<dkxy<<std::endl;
         dbg<<"ky = "<<ky0<<" + i * "<<dkyx<<" + j * "<<dky<<std::endl;
-        ConstIter pptr = _plist.begin();
-        assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKValue(val,kx0,dkx,dkxy,ky0,dky,dkyx);
-        if (++pptr != _plist.end()) {
-            tmv::Matrix<std::complex<double> > val2(val.colsize(),val.rowsize());
-            for (; pptr != _plist.end(); ++pptr) {
-                GetImpl(*pptr)->fillKValue(val2.view(),kx0,dkx,dkxy,ky0,dky,dkyx);
-                val = ElemProd(val,val2);
+        assert(_plist.begin() != _plist.end());
+        const int m = val.colsize();
+        std::vector<int> strips;
+        const int nb = getStrips(m, val.rowsize(), 0, strips);
+        tmv::Matrix<std::complex<double> > val2(m, _plist.size() > 1 ? nb : 1);
+        for (size_t k=0; k+1<strips.size(); ++k) {
+            const int j0 = strips[k];
+            const int j1 = strips[k+1];
+            tmv::MatrixView<std::complex<double> > v = val.colRange(j0,j1);
+            tmv::MatrixView<std::complex<double> > v2 = val2.colRange(0,j1-j0);
+            const double kx1 = kx0 + j0*dkxy;
+            const double ky1 = ky0 + j0*dky;
+            ConstIter pptr = _plist.begin();
+            GetImpl(*pptr)->fillKValue(v,kx1,dkx,dkxy,ky1,dky,dkyx);
+            for (++pptr; pptr != _plist.end(); ++pptr) {
+                GetImpl(*pptr)->fillKValue(v2,kx1,dkx,dkxy,ky1,dky,dkyx);
+                v = ElemProd(v,v2);
             }
         }
     }
@@ -25,6 +25,12 @@
 #include "SBTransform.h"
 #include "SBProfileImpl.h"
 #include "FFT.h"
+#include "integ/Int.h"
+#include "Solve.h"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 #ifdef DEBUGLOGGING
 #include <fstream>
@@ -94,6 +100,164 @@ namespace galsim {
         return _pimpl->kValue(k);
     }
 
+    // Integrate a k-space integrand from 0 to infinity.  We split the integral at maxK, since the
+    // integrand is usually much smaller beyond that, but it is not always negligible for the
+    // precision we want here.
+    template <class T>
+    double IntegrateK(const T& func, double maxk, double relerr, double abserr)
+    {
+        return integ::int1d(func, 0., maxk, relerr, abserr) +
+            integ::int1d(func, maxk, integ::MOCK_INF, relerr, abserr);
+    }
+
+    // Integrand class for the Hankel transform of the radial k-space profile
+    class RadialHankelIntegrand : public std::unary_function<double,double>
+    {
+    public:
+        RadialHankelIntegrand(const SBProfile& prof, double r) : _prof(prof), _r(r) {}
+        double operator()(double k) const
+        { return _prof.kValue(Position<double>(k,0.)).real() * k * j0(k*_r); }
+    private:
+        const SBProfile& _prof;
+        double _r;
+    };
+
+    // The radial profile I(r), either directly from xValue or from the Hankel transform of
+    // the k-space profile.
+    class RadialXValue : public std::unary_function<double,double>
+    {
+    public:
+        RadialXValue(const SBProfile& prof) :
+            _prof(prof), _gsparams(prof.getGSParams()),
+            _abserr(_gsparams->integration_abserr * std::abs(prof.getFlux()) *
+                    prof.maxK() * prof.maxK()) {}
+
+        double operator()(double r) const
+        {
+            if (_prof.isAnalyticX()) {
+                return _prof.xValue(Position<double>(r,0.));
+            } else {
+                RadialHankelIntegrand I(_prof, r);
+                return IntegrateK(I, _prof.maxK(),
+                                  _gsparams->integration_relerr, _abserr) / (2.*M_PI);
+            }
+        }
+    private:
+        const SBProfile& _prof;
+        boost::shared_ptr<GSParams> _gsparams;
+        double _abserr;
+    };
+
+    // I(r) - target  (used for solving for fwhm)
+    class RadialTargetValue : public std::unary_function<double,double>
+    {
+    public:
+        RadialTargetValue(const SBProfile& prof, double target) : _f(prof), _target(target) {}
+        double operator()(double r) const { return _f(r) - _target; }
+    private:
+        RadialXValue _f;
+        double _target;
+    };
+
+    // Integrand classes for the enclosed flux in real and k space
+    class EnclosedFluxXIntegrand : public std::unary_function<double,double>
+    {
+    public:
+        EnclosedFluxXIntegrand(const SBProfile& prof) : _prof(prof) {}
+        double operator()(double r) const
+        { return 2.*M_PI * r * _prof.xValue(Position<double>(r,0.)); }
+    private:
+        const SBProfile& _prof;
+    };
+
+    class EnclosedFluxKIntegrand : public std::unary_function<double,double>
+    {
+    public:
+        EnclosedFluxKIntegrand(const SBProfile& prof, double r) : _prof(prof), _r(r) {}
+        double operator()(double k) const
+        { return _prof.kValue(Position<double>(k,0.)).real() * j1(k*_r); }
+    private:
+        const SBProfile& _prof;
+        double _r;
+    };
+
+    // F(R) - target  (used for solving for hlr)
+    class EnclosedFluxTarget : public std::unary_function<double,double>
+    {
+    public:
+        EnclosedFluxTarget(const SBProfile& prof, double target) :
+            _prof(prof), _gsparams(prof.getGSParams()), _target(target),
+            _abserr(_gsparams->integration_abserr * std::abs(prof.getFlux())) {}
+
+        double operator()(double r) const
+        {
+            double flux;
+            if (_prof.isAnalyticX()) {
+                EnclosedFluxXIntegrand I(_prof);
+                flux = integ::int1d(I, 0., r, _gsparams->integration_relerr, _abserr);
+            } else {
+                EnclosedFluxKIntegrand I(_prof, r);
+                flux = r * IntegrateK(I, _prof.maxK(), _gsparams->integration_relerr, _abserr);
+            }
+            return flux - _target;
+        }
+    private:
+        const SBProfile& _prof;
+        boost::shared_ptr<GSParams> _gsparams;
+        double _target;
+        double _abserr;
+    };
+
+    double SBProfile::calculateHLR(double flux_frac) const
+    {
+        dbg<<"Start calculateHLR: flux_frac = "<<flux_frac<<std::endl;
+        assert(isAxisymmetric());
+        if (flux_frac <= 0. || flux_frac >= 1.)
+            throw SBError("flux_frac must be between 0 and 1");
+        EnclosedFluxTarget func(*this, flux_frac * getFlux());
+        // Start with the range that encloses (1-folding_threshold) of the flux, and expand
+        // it if necessary.
+        double rmax = M_PI / stepK();
+        Solve<EnclosedFluxTarget> solver(func, 0., rmax);
+        solver.setMethod(Brent);
+        solver.setXTolerance(1.e-10 * rmax);
+        solver.bracketUpper();
+        double R = solver.root();
+        dbg<<"R = "<<R<<std::endl;
+        return R;
+    }
+
+    double SBProfile::calculateFWHM() const
+    {
+        dbg<<"Start calculateFWHM"<<std::endl;
+        assert(isAxisymmetric());
+        RadialXValue f(*this);
+        double Imax = f(0.);
+        dbg<<"Imax = "<<Imax<<std::endl;
+        RadialTargetValue func(*this, 0.5 * Imax);
+        double rmax = M_PI / stepK();
+        Solve<RadialTargetValue> solver(func, 0., rmax);
+        solver.setMethod(Brent);
+        solver.setXTolerance(1.e-10 * rmax);
+        solver.bracketUpper();
+        double R = solver.root();
+        dbg<<"R = "<<R<<std::endl;
+        return 2.*R;
+    }
+
+    void SBProfile::xValueMany(const double* x, const double* y, double* val, int n) const
+    {
+        assert(_pimpl.get());
+        _pimpl->xValueMany(x, y, val, n);
+    }
+
+    void SBProfile::kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                               int n) const
+    {
+        assert(_pimpl.get());
+        _pimpl->kValueMany(kx, ky, val, n);
+    }
+
     void SBProfile::getXRange(double& xmin, double& xmax, std::vector<double>& splits) const
     {
         assert(_pimpl.get());
@@ -125,6 +289,18 @@ namespace galsim {
         return _pimpl->stepK();
     }
 
+    void SBProfile::getMaxKXY(double& maxkx, double& maxky) const
+    {
+        assert(_pimpl.get());
+        _pimpl->getMaxKXY(maxkx, maxky);
+    }
+
+    void SBProfile::getStepKXY(double& stepkx, double& stepky) const
+    {
+        assert(_pimpl.get());
+        _pimpl->getStepKXY(stepkx, stepky);
+    }
+
     bool SBProfile::isAxisymmetric() const
     {
         assert(_pimpl.get());
@@ -252,6 +428,18 @@ namespace galsim {
         return _pimpl->fillXImage(I, gain);
     }
 
+    void SBProfile::SBProfileImpl::xValueMany(const double* x, const double* y,
+                                              double* val, int n) const
+    {
+        for (int i=0; i<n; ++i) val[i] = xValue(Position<double>(x[i],y[i]));
+    }
+
+    void SBProfile::SBProfileImpl::kValueMany(const double* kx, const double* ky,
+                                              std::complex<double>* val, int n) const
+    {
+        for (int i=0; i<n; ++i) val[i] = kValue(Position<double>(kx[i],ky[i]));
+    }
+
     // The derived classes pretty much all override these functions, since there are
     // almost always (at least minor) efficiency gains from doing so.  But we have
     // them here in case someone doesn't want to bother for a new class.
@@ -392,81 +580,66 @@ namespace galsim {
         return totalflux * gain;
     }
 
+    // Determine the size of the FFT to use in one direction for fourierDraw.
+    // This is the same calculation as getGoodImageSize(1.,wmult), but using the stepk
+    // for this direction, and then made large enough to cover the target image.
+    static int FourierDrawSize(double stepk, double wmult, int image_size, int min_size)
+    {
+        double Nd = 2.*M_PI/stepk * wmult;
+        int N = int(std::ceil(Nd*(1.-1.e-12)));
+        N = 2*( (N+1)/2);
+        if (image_size > N) N = image_size;
+        N = goodFFTSize(N);
+        return std::max(N, min_size);
+    }
+
     // Now the more complex case: real space via FT from k space.
     // Will enforce image size is power of 2 or 3x2^n.
     // Aliasing will be handled by folding the k values before transforming
     // And enforce no image folding
+    //
+    // The FFT need not be square.  Elongated profiles (e.g. highly sheared ones) can have
+    // very different extents in the x and y directions, both in real space and in k space,
+    // so the sizes in each direction are determined separately.
     template <typename T>
     double SBProfile::fourierDraw(ImageView<T> I, double gain, double wmult) const
     {
         dbg<<"Start fourierDraw"<<std::endl;
-        Bounds<int> imgBounds; // Bounds for output image
         dbg<<"  maxK() = "<<maxK()<<std::endl;
         dbg<<"  stepK() = "<<stepK()<<std::endl;
         dbg<<"  image bounds = "<<I.getBounds()<<std::endl;
         dbg<<"  wmult = "<<wmult<<std::endl;
 
-        int Nnofold = getGoodImageSize(1.,wmult);
-        dbg<<"Nnofold = "<<Nnofold<<std::endl;
+        double maxkx, maxky, stepkx, stepky;
+        getMaxKXY(maxkx, maxky);
+        getStepKXY(stepkx, stepky);
+        dbg<<"  maxK in x,y = "<<maxkx<<','<<maxky<<std::endl;
+        dbg<<"  stepK in x,y = "<<stepkx<<','<<stepky<<std::endl;
 
         // We must make something big enough to cover the target image size:
-        int xSize, ySize;
-        xSize = I.getXMax()-I.getXMin()+1;
-        ySize = I.getYMax()-I.getYMin()+1;
-        if (xSize  > Nnofold) Nnofold = xSize;
-        if (ySize  > Nnofold) Nnofold = ySize;
-        dbg<<" After scale up to image size, Nnofold = "<<Nnofold<<std::endl;
-
-        // Round up to a good size for making FFTs:
-        int NFT = goodFFTSize(Nnofold);
-        NFT = std::max(NFT,_pimpl->gsparams->minimum_fft_size);
-        dbg << " After adjustments: Nnofold " << Nnofold << " NFT " << NFT << std::endl;
-
-        double dk = 2.*M_PI/NFT;
-        dbg <<
-            " After adjustments: dk " << dk <<
-            " maxK " << dk*NFT/2 << std::endl;
-        xdbg<<"dk - stepK() = "<<dk-(stepK()*(1.+1.e-8))<<std::endl;
-        xassert(dk <= stepK()*(1. + 1.e-8)); // Add a little slop in case of rounding errors.
-        boost::shared_ptr<XTable> xt;
-        if (NFT*dk/2 > maxK()) {
-            dbg<<"NFT*dk/2 = "<<NFT*dk/2<<" > maxK() = "<<maxK()<<std::endl;
-            dbg<<"Use NFT = "<<NFT<<std::endl;
-            if (NFT > _pimpl->gsparams->maximum_fft_size)
-                FormatAndThrow<SBError>() <<
-                    "fourierDraw() requires an FFT that is too large, " << NFT <<
-                    "\nIf you can handle the large FFT, you may update gsparams.maximum_fft_size.";
-            // No aliasing: build KTable and transform
-            KTable kt(NFT,dk);
-            assert(_pimpl.get());
-            _pimpl->fillKGrid(kt);
-            xt = kt.transform();
-        } else {
-            dbg<<"NFT*dk/2 = "<<NFT*dk/2<<" <= maxK() = "<<maxK()<<std::endl;
-            // There will be aliasing.  Construct a KTable out to maxK() and
-            // then wrap it
-            int Nk = int(std::ceil(maxK()/dk)) * 2;
-            dbg<<"Use Nk = "<<Nk<<std::endl;
-            if (Nk > _pimpl->gsparams->maximum_fft_size)
-                FormatAndThrow<SBError>() <<
-                    "fourierDraw() requires an FFT that is too large, " << Nk <<
-                    "\nIf you can handle the large FFT, you may update gsparams.maximum_fft_size.";
-            KTable kt(Nk, dk);
-            assert(_pimpl.get());
-            _pimpl->fillKGrid(kt);
-            xt = kt.wrap(NFT)->transform();
-        }
-        int Nxt = xt->getN();
-        dbg<<"Nxt = "<<Nxt<<std::endl;
-
-#ifdef OUTPUT_FFT
-        std::ofstream fout("xt.dat");
-        tmv::MatrixView<double> mxt(xt->getArray(),Nxt,Nxt,1,Nxt,tmv::NonConj);
-        fout << tmv::EigenIO() << mxt << std::endl;
-        fout.close();
-#endif
+        int xSize = I.getXMax()-I.getXMin()+1;
+        int ySize = I.getYMax()-I.getYMin()+1;
+        const int min_size = _pimpl->gsparams->minimum_fft_size;
+        const int NFTx = FourierDrawSize(stepkx, wmult, xSize, min_size);
+        const int NFTy = FourierDrawSize(stepky, wmult, ySize, min_size);
+        dbg<<" After adjustments: NFT = "<<NFTx<<','<<NFTy<<std::endl;
+
+        double dkx = 2.*M_PI/NFTx;
+        double dky = 2.*M_PI/NFTy;
+        xassert(dkx <= stepkx*(1. + 1.e-8)); // Add a little slop in case of rounding errors.
+        xassert(dky <= stepky*(1. + 1.e-8));
+
+        // If maxK is beyond the Nyquist frequency, there will be aliasing.  In this case,
+        // build the k values out to maxK and then wrap them.
+        const int Nkx = NFTx*dkx/2 > maxkx ? NFTx : int(std::ceil(maxkx/dkx)) * 2;
+        const int Nky = NFTy*dky/2 > maxky ? NFTy : int(std::ceil(maxky/dky)) * 2;
+        dbg<<"Use Nk = "<<Nkx<<','<<Nky<<std::endl;
+        if (Nkx > _pimpl->gsparams->maximum_fft_size || Nky > _pimpl->gsparams->maximum_fft_size)
+            FormatAndThrow<SBError>() <<
+                "fourierDraw() requires an FFT that is too large, " << std::max(Nkx,Nky) <<
+                "\nIf you can handle the large FFT, you may update gsparams.maximum_fft_size.";
 
-        Bounds<int> xb(-Nxt/2, Nxt/2-1, -Nxt/2, Nxt/2-1);
+        Bounds<int> xb(-NFTx/2, NFTx/2-1, -NFTy/2, NFTy/2-1);
         if (I.getYMin() < xb.getYMin()
             || I.getYMax() > xb.getYMax()
             || I.getXMin() < xb.getXMin()
@@ -475,10 +648,59 @@ namespace galsim {
                 << " and FFT range " << xb << std::endl;
             throw SBError("fourierDraw() FT bounds do not cover target image");
         }
+
+        // Calculate the k values for kx >= 0.  The others follow from f(-k) = conj(f(k)).
+        const int Nkxo2 = Nkx/2;
+        const int Nkyo2 = Nky/2;
+        tmv::Matrix<std::complex<double> > val(Nkxo2+1,Nky+1);
+#ifdef DEBUGLOGGING
+        val.setAllTo(999.);
+#endif
+        assert(_pimpl.get());
+        _pimpl->fillKValue(val.view(),0.,dkx,0,-Nkyo2*dky,dky,Nkyo2);
+
+        // Accumulate these into the (NFTx/2+1) x NFTy array that FFTW uses for a complex to
+        // real transform, wrapping any values beyond the Nyquist frequency.
+        // The values at kx = +-Nkx/2 and ky = +-Nky/2 are each given half weight, which is
+        // what fillKGrid does for the square KTables.  Otherwise you can get strange effects
+        // when the profile isn't radially symmetric. e.g. A shift will induce a spurious shear.
+        const int NFTxo2 = NFTx/2;
+        FFTW_Array<std::complex<double> > karray((NFTxo2+1)*NFTy, 0.);
+        for (int iy=-Nkyo2; iy<=Nkyo2; ++iy) {
+            const double wy = (iy == -Nkyo2 || iy == Nkyo2) ? 0.5 : 1.;
+            const int iyout = ((iy % NFTy) + NFTy) % NFTy;
+            for (int ix=-Nkxo2; ix<=Nkxo2; ++ix) {
+                const int ixout = ((ix % NFTx) + NFTx) % NFTx;
+                if (ixout > NFTxo2) continue;
+                const double w = (ix == -Nkxo2 || ix == Nkxo2) ? 0.5*wy : wy;
+                std::complex<double> f = ix >= 0 ? val(ix,iy+Nkyo2) : std::conj(val(-ix,Nkyo2-iy));
+                karray[iyout*(NFTxo2+1) + ixout] += w * f;
+            }
+        }
+
+        // To put x=0 in the center of the array, we need to flip every other sign of the
+        // k array.  Also apply the normalization here.
+        const double fac = dkx * dky / (4.*M_PI*M_PI);
+        long ind=0;
+        for (int iy=0; iy<NFTy; ++iy) {
+            for (int ix=0; ix<=NFTxo2; ++ix, ++ind) {
+                if ((ix+iy)%2==0) karray[ind] *= fac;
+                else karray[ind] *= -fac;
+            }
+        }
+
+        FFTW_Array<double> xarray(NFTx*NFTy);
+        fftw_plan plan = fftw_plan_dft_c2r_2d(
+            NFTy, NFTx, karray.get_fftw(), xarray.get_fftw(), FFTW_ESTIMATE);
+        if (plan==NULL) throw FFTInvalid();
+        fftw_execute(plan);
+        fftw_destroy_plan(plan);
+
         double sum=0.;
         for (int y = I.getYMin(); y <= I.getYMax(); y++) {
+            const double* xptr = xarray.get() + (y+NFTy/2)*NFTx + NFTxo2;
             for (int x = I.getXMin(); x <= I.getXMax(); x++) {
-                double temp = xt->xval(x,y) / gain;
+                double temp = xptr[x] / gain;
                 I(x,y) += T(temp);
                 sum += temp;
             }
@@ -768,10 +990,155 @@ namespace galsim {
         FillQuadrant(*this,val,kx0,dkx,nkx1,ky0,dky,nky1);
     }
 
+    int SBProfile::SBProfileImpl::getStrips(int m, int n, int jzero, std::vector<int>& strips)
+    {
+        // Aim for strips of about 2^18 elements, which is 4 MB for complex values.
+        const int max_size = 1<<18;
+        const int nb = std::max(max_size / std::max(m,1), 1);
+        xdbg<<"getStrips: m,n = "<<m<<','<<n<<", jzero = "<<jzero<<", nb = "<<nb<<std::endl;
+        strips.clear();
+        if (n <= nb) {
+            strips.push_back(0);
+            strips.push_back(n);
+            return n;
+        }
+        // The first column of the strip centered on jzero.  If jzero == 0, this is just 0.
+        const int jc = std::max(jzero - nb/2, 0);
+        for (int j=0; j<jc; j+=nb) strips.push_back(j);
+        for (int j=jc; j<n; j+=nb) strips.push_back(j);
+        strips.push_back(n);
+        xdbg<<"Using "<<strips.size()-1<<" strips\n";
+        return nb;
+    }
+
+    // Helper function for drawShoot when n_threads > 1.
+    // The photons are split into chunks of at most maxN, which are distributed over the
+    // threads.  Each chunk gets its own UniformDeviate, seeded in order from u, so the photons
+    // in each chunk do not depend on which thread shoots them.  Each thread bins its photons
+    // into a private buffer, and the buffers are added to img in thread order at the end, so
+    // the result is reproducible for a given seed and number of threads.
+    template <class T>
+    static double ShootThreaded(const SBProfile& prof, ImageView<T> img, double N, int maxN,
+                                UniformDeviate u, double flux_scaling, int n_threads)
+    {
+        // Split up the photons the same way the serial loop in drawShoot does.
+        std::vector<int> chunk_n;
+        std::vector<long> chunk_seed;
+        double shotN = 0.;
+        while (true) {
+            int thisN = maxN;
+            if (thisN > N) thisN = int(N+0.5);
+            chunk_n.push_back(thisN);
+            // A seed of 0 would mean to seed from the system, so avoid that.
+            long seed = u.raw();
+            if (seed == 0) seed = 1;
+            chunk_seed.push_back(seed);
+            shotN += thisN;
+            N -= thisN;
+            if (N < 1.) break;
+        }
+        const int nchunks = chunk_n.size();
+        dbg<<"ShootThreaded: "<<nchunks<<" chunks using "<<n_threads<<" threads\n";
+
+        // Normalizing the flux by the number of photons actually shot (rather than N)
+        // means we never need to rescale the image at the end.
+        //
+        // The first chunk is always shot on this thread, since many profiles build their
+        // photon-shooting samplers lazily on the first call to shoot(), which is not safe
+        // to do concurrently.
+        double added_flux = 0.;
+        {
+            UniformDeviate ud(chunk_seed[0]);
+            boost::shared_ptr<PhotonArray> pa = prof.shoot(chunk_n[0], ud);
+            pa->scaleFlux(flux_scaling * chunk_n[0] / shotN);
+            added_flux += pa->addTo(img);
+        }
+        if (nchunks == 1) return added_flux;
+
+#ifndef _OPENMP
+        n_threads = 1;
+#endif
+        if (n_threads > nchunks-1) n_threads = nchunks-1;
+        const Bounds<int> b = img.getBounds();
+        std::vector<boost::shared_ptr<ImageAlloc<T> > > buffers(n_threads);
+        std::vector<double> thread_flux(n_threads, 0.);
+        // Exceptions cannot propagate out of an OpenMP parallel region, and a thread must not
+        // leave the worksharing loop early either, since the other threads would then wait
+        // for it at the implicit barrier.  So catch them inside the loop, skip the remaining
+        // chunks, and rethrow (as the same type for SBErrors) after the parallel region.
+        // error_type is 0 for no error, 1 for SBError, 2 for any other std::exception.
+        std::vector<int> error_type(n_threads, 0);
+        std::vector<std::string> errors(n_threads);
+        bool failed = false;
+
+#ifdef _OPENMP
+#pragma omp parallel num_threads(n_threads)
+#endif
+        {
+#ifdef _OPENMP
+            const int ithread = omp_get_thread_num();
+#else
+            const int ithread = 0;
+#endif
+            try {
+                buffers[ithread].reset(new ImageAlloc<T>(b, T(0)));
+            } catch (std::exception& e) {
+                error_type[ithread] = 2;
+                errors[ithread] = e.what();
+            }
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+            for (int k=1; k<nchunks; ++k) {
+                bool skip = error_type[ithread] != 0;
+                if (!skip) {
+#ifdef _OPENMP
+#pragma omp critical (shoot_threaded_error)
+#endif
+                    skip = failed;
+                }
+                if (skip) continue;
+                try {
+                    ImageView<T> buffer = buffers[ithread]->view();
+                    UniformDeviate ud(chunk_seed[k]);
+                    boost::shared_ptr<PhotonArray> pa = prof.shoot(chunk_n[k], ud);
+                    pa->scaleFlux(flux_scaling * chunk_n[k] / shotN);
+                    thread_flux[ithread] += pa->addTo(buffer);
+                } catch (SBError& e) {
+                    error_type[ithread] = 1;
+                    errors[ithread] = e.what();
+                } catch (std::exception& e) {
+                    error_type[ithread] = 2;
+                    errors[ithread] = e.what();
+                }
+                if (error_type[ithread] != 0) {
+#ifdef _OPENMP
+#pragma omp critical (shoot_threaded_error)
+#endif
+                    failed = true;
+                }
+            }
+        }
+
+        for (int i=0; i<n_threads; ++i) {
+            if (error_type[i] == 1) {
+                // what() already includes the "SB Error: " prefix.
+                throw SBError(errors[i].substr(std::string("SB Error: ").size()));
+            } else if (error_type[i] == 2) {
+                throw std::runtime_error(errors[i]);
+            }
+        }
+        for (int i=0; i<n_threads; ++i) {
+            img += *buffers[i];
+            added_flux += thread_flux[i];
+        }
+        return added_flux;
+    }
+
     template <class T>
     double SBProfile::drawShoot(
         ImageView<T> img, double N, UniformDeviate u, double gain, double max_extra_noise,
-        bool poisson_flux, bool add_to_image) const
+        bool poisson_flux, bool add_to_image, int n_threads) const
     {
         // If N = 0, this routine will try to end up with an image with the number of real
         // photons = flux that has the corresponding Poisson noise. For profiles that are
@@ -837,6 +1204,7 @@ namespace galsim {
         dbg<<"gain = "<<gain<<std::endl;
         dbg<<"max_extra_noise = "<<max_extra_noise<<std::endl;
         dbg<<"poisson = "<<poisson_flux<<std::endl;
+        dbg<<"n_threads = "<<n_threads<<std::endl;
 
         // Don't do more than this at a time to keep the  memory usage reasonable.
         const int maxN = 100000;
@@ -906,6 +1274,14 @@ namespace galsim {
         double negative_flux = 0.;
 #endif
 
+        // The threaded version doesn't support the iterative determination of N that
+        // we do when max_extra_noise > 0, so only use it when the number of photons is known.
+        if (n_threads > 1 && max_extra_noise == 0.) {
+            added_flux = ShootThreaded(*this, img, N, maxN, u, flux_scaling, n_threads);
+            dbg<<"Added flux (falling within image bounds) = "<<added_flux*gain<<std::endl;
+            return added_flux * gain;
+        }
+
         // If we're automatically figuring out N based on max_extra_noise, start with 100 photons
         // Otherwise we'll do a maximum of maxN at a time until we go through all N.
         int thisN = max_extra_noise > 0. ? 100 : maxN;
@@ -1055,10 +1431,10 @@ namespace galsim {
 
     template double SBProfile::drawShoot(
         ImageView<float> image, double N, UniformDeviate ud, double gain,
-        double max_extra_noise, bool poisson_flux, bool add_to_image) const;
+        double max_extra_noise, bool poisson_flux, bool add_to_image, int n_threads) const;
     template double SBProfile::drawShoot(
         ImageView<double> image, double N, UniformDeviate ud, double gain,
-        double max_extra_noise, bool poisson_flux, bool add_to_image) const;
+        double max_extra_noise, bool poisson_flux, bool add_to_image, int n_threads) const;
 
     template double SBProfile::draw(ImageView<float> img, double gain, double wmult) const;
     template double SBProfile::draw(ImageView<double> img, double gain, double wmult) const;
@@ -381,6 +381,17 @@ namespace galsim {
 
         if (_n < sbp::minimum_sersic_n || _n > sbp::maximum_sersic_n)
             throw SBError("Requested Sersic index out of range");
+
+        if (_gsparams->interpolate_sersic_n && !_truncated) {
+            // Use the Fourier transforms of the nearest grid nodes rather than building our own.
+            boost::shared_ptr<SersicInfoGrid> grid = SersicInfoGrid::get(_gsparams);
+            int i0 = grid->getWeights(_n, _node_w);
+            for (int j=0; j<4; ++j) {
+                _nodes.push_back(grid->getNode(i0+j));
+                _node_kscale[j] = getHLR() / _nodes[j]->getHLR();
+            }
+            dbg<<"Interpolating using nodes starting at n = "<<grid->getN(i0)<<std::endl;
+        }
     }
 
     double SersicInfo::stepK() const
@@ -401,7 +412,14 @@ namespace galsim {
 
     double SersicInfo::maxK() const
     {
-        if (_maxk == 0.) buildFT();
+        if (_maxk == 0.) {
+            if (_nodes.empty()) buildFT();
+            else {
+                // Use the largest maxk of the nodes, scaled to the same half-light radius.
+                for (int j=0; j<4; ++j)
+                    _maxk = std::max(_maxk, _nodes[j]->maxK() / _node_kscale[j]);
+            }
+        }
         return _maxk;
     }
 
@@ -441,6 +459,13 @@ namespace galsim {
     double SersicInfo::kValue(double ksq) const
     {
         assert(ksq >= 0.);
+        if (!_nodes.empty()) {
+            // Interpolate in log(n) between the nodes' transforms at the same k * re.
+            double val = 0.;
+            for (int j=0; j<4; ++j)
+                val += _node_w[j] * _nodes[j]->kValue(ksq * _node_kscale[j] * _node_kscale[j]);
+            return val;
+        }
         if (_ft.size() == 0) buildFT();
 
         if (ksq>=_ksq_max)
@@ -637,6 +662,125 @@ namespace galsim {
         }
     }
 
+    void SersicInfo::getFTTable(std::vector<double>& params, std::vector<double>& logk,
+                                std::vector<double>& ft) const
+    {
+        if (_ft.size() == 0) buildFT();
+        params.resize(8);
+        params[0] = _n;
+        params[1] = _maxk;
+        params[2] = _kderiv2;
+        params[3] = _kderiv4;
+        params[4] = _ksq_min;
+        params[5] = _ksq_max;
+        params[6] = _highk_a;
+        params[7] = _highk_b;
+        logk = _ft.getArgs();
+        ft = _ft.getVals();
+    }
+
+    void SersicInfo::setFTTable(const std::vector<double>& params,
+                                const std::vector<double>& logk,
+                                const std::vector<double>& ft) const
+    {
+        if (params.size() != 8 || std::abs(params[0] - _n) > 1.e-10 * _n)
+            throw SBError("Sersic Fourier transform table is for a different Sersic index");
+        if (logk.size() != ft.size() || logk.size() < 2)
+            throw SBError("Invalid Sersic Fourier transform table");
+        if (_ft.size() > 0) return;
+
+        _maxk = params[1];
+        _kderiv2 = params[2];
+        _kderiv4 = params[3];
+        _ksq_min = params[4];
+        _ksq_max = params[5];
+        _highk_a = params[6];
+        _highk_b = params[7];
+        for (size_t i=0; i<logk.size(); ++i) _ft.addEntry(logk[i], ft[i]);
+    }
+
+    LRUCache<GSParamsPtr, SersicInfoGrid> SersicInfoGrid::cache(sbp::max_sersic_grid_cache);
+
+    boost::shared_ptr<SersicInfoGrid> SersicInfoGrid::get(const GSParamsPtr& gsparams)
+    { return cache.get(gsparams); }
+
+    SersicInfoGrid::SersicInfoGrid(const GSParamsPtr& gsparams) :
+        _gsparams(gsparams.duplicate()), _logn_min(std::log(sbp::minimum_sersic_n))
+    {
+        // The nodes themselves use the exact calculation.
+        _gsparams->interpolate_sersic_n = false;
+
+        // The interpolation error scales as dlogn^4.  For dlogn = 0.05 and the default
+        // kvalue_accuracy = 1.e-5, the maximum error over the allowed range of n is < 1.e-7,
+        // so scaling dlogn as kvalue_accuracy^(1/4) keeps it below 1% of kvalue_accuracy.
+        double dlogn = 0.05 * sqrt(sqrt(gsparams->kvalue_accuracy / 1.e-5));
+        if (dlogn > 0.2) dlogn = 0.2;
+        double logn_range = std::log(sbp::maximum_sersic_n) - _logn_min;
+        int nsteps = int(std::ceil(logn_range / dlogn));
+        _dlogn = logn_range / nsteps;
+        _nodes.resize(nsteps+1);
+        dbg<<"SersicInfoGrid with "<<_nodes.size()<<" nodes, dlogn = "<<_dlogn<<std::endl;
+    }
+
+    double SersicInfoGrid::getN(int i) const
+    {
+        // Make sure rounding errors don't take the end points out of the allowed range.
+        double n = std::exp(_logn_min + i*_dlogn);
+        return std::max(sbp::minimum_sersic_n, std::min(sbp::maximum_sersic_n, n));
+    }
+
+    boost::shared_ptr<SersicInfo> SersicInfoGrid::getNode(int i) const
+    {
+        assert(i >= 0 && i < int(_nodes.size()));
+        if (!_nodes[i]) _nodes[i].reset(new SersicInfo(getN(i), 0., _gsparams));
+        return _nodes[i];
+    }
+
+    int SersicInfoGrid::getWeights(double n, double* w) const
+    {
+        // Use nodes i0..i0+3, with n between the middle two except at the ends of the grid.
+        double x = (std::log(n) - _logn_min) / _dlogn;
+        int i0 = int(std::floor(x)) - 1;
+        if (i0 < 0) i0 = 0;
+        if (i0 > int(_nodes.size()) - 4) i0 = int(_nodes.size()) - 4;
+        // Lagrange weights for nodes at t = -1, 0, 1, 2.
+        double t = x - (i0+1);
+        w[0] = -t*(t-1.)*(t-2.)/6.;
+        w[1] = (t+1.)*(t-1.)*(t-2.)/2.;
+        w[2] = -(t+1.)*t*(t-2.)/2.;
+        w[3] = (t+1.)*t*(t-1.)/6.;
+        return i0;
+    }
+
+    void GetSersicInterpolationTables(const GSParamsPtr& gsparams,
+                                      std::vector<std::vector<double> >& params,
+                                      std::vector<std::vector<double> >& logk,
+                                      std::vector<std::vector<double> >& ft)
+    {
+        GSParamsPtr gsp = gsparams.duplicate();
+        gsp->interpolate_sersic_n = true;
+        boost::shared_ptr<SersicInfoGrid> grid = SersicInfoGrid::get(gsp);
+        int n = grid->size();
+        params.resize(n);
+        logk.resize(n);
+        ft.resize(n);
+        for (int i=0; i<n; ++i) grid->getNode(i)->getFTTable(params[i], logk[i], ft[i]);
+    }
+
+    void SetSersicInterpolationTables(const GSParamsPtr& gsparams,
+                                      const std::vector<std::vector<double> >& params,
+                                      const std::vector<std::vector<double> >& logk,
+                                      const std::vector<std::vector<double> >& ft)
+    {
+        GSParamsPtr gsp = gsparams.duplicate();
+        gsp->interpolate_sersic_n = true;
+        boost::shared_ptr<SersicInfoGrid> grid = SersicInfoGrid::get(gsp);
+        int n = grid->size();
+        if (int(params.size()) != n || int(logk.size()) != n || int(ft.size()) != n)
+            throw SBError("Sersic interpolation tables do not match the grid for these GSParams");
+        for (int i=0; i<n; ++i) grid->getNode(i)->setFTTable(params[i], logk[i], ft[i]);
+    }
+
     // Function object for finding the r that encloses all except a particular flux fraction.
     class SersicMissingFlux
     {
@@ -860,18 +1004,28 @@ namespace galsim {
         dbg<<"SersicInfo shoot: N = "<<N<<std::endl;
         dbg<<"Target flux = 1.0\n";
 
-        if (!_sampler) {
+        bool use_inv_cdf = _gsparams->shoot_inverse_cdf;
+        if (use_inv_cdf ? !_inv_cdf : !_sampler) {
             // Set up the classes for photon shooting
             _radial.reset(new SersicRadialFunction(_invn));
             std::vector<double> range(2,0.);
             double shoot_maxr = calculateMissingFluxRadius(_gsparams->shoot_accuracy);
             if (_truncated && _trunc < shoot_maxr) shoot_maxr = _trunc;
             range[1] = shoot_maxr;
-            _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
+            if (use_inv_cdf)
+                _inv_cdf.reset(new RadialInverseCDF(*_radial, range, _gsparams));
+            else
+                _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
         }
 
-        assert(_sampler.get());
-        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
+        boost::shared_ptr<PhotonArray> result;
+        if (use_inv_cdf) {
+            assert(_inv_cdf.get());
+            result = _inv_cdf->shoot(N,ud);
+        } else {
+            assert(_sampler.get());
+            result = _sampler->shoot(N,ud);
+        }
         dbg<<"SersicInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
         return result;
     }
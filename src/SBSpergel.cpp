@@ -434,14 +434,15 @@ namespace galsim {
         dbg<<"SpergelInfo shoot: N = "<<N<<std::endl;
         dbg<<"Target flux = 1.0\n";
 
-        if (!_sampler) {
+        bool use_inv_cdf = _gsparams->shoot_inverse_cdf;
+        if (use_inv_cdf ? !_inv_cdf : !_sampler) {
             // Set up the classes for photon shooting
             double shoot_rmax = calculateFluxRadius(1. - _gsparams->shoot_accuracy);
+            std::vector<double> range;
             if (_nu > 0.) {
-                std::vector<double> range(2,0.);
+                range.resize(2,0.);
                 range[1] = shoot_rmax;
                 _radial.reset(new SpergelNuPositiveRadialFunction(_nu, _xnorm0));
-                _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
             } else {
                 // exact s.b. profile diverges at origin, so replace the inner most circle
                 // (defined such that enclosed flux is shoot_acccuracy) with a linear function
@@ -461,16 +462,25 @@ namespace galsim {
                 dbg<<"b: "<<b<<std::endl;
                 dbg<<"a: "<<a<<std::endl;
                 dbg<<"a+b*rmin:"<<a+b*shoot_rmin<<std::endl;
-                std::vector<double> range(3,0.);
+                range.resize(3,0.);
                 range[1] = shoot_rmin;
                 range[2] = shoot_rmax;
                 _radial.reset(new SpergelNuNegativeRadialFunction(_nu, shoot_rmin, a, b));
-                _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
             }
+            if (use_inv_cdf)
+                _inv_cdf.reset(new RadialInverseCDF(*_radial, range, _gsparams));
+            else
+                _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
         }
 
-        assert(_sampler.get());
-        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
+        boost::shared_ptr<PhotonArray> result;
+        if (use_inv_cdf) {
+            assert(_inv_cdf.get());
+            result = _inv_cdf->shoot(N,ud);
+        } else {
+            assert(_sampler.get());
+            result = _sampler->shoot(N,ud);
+        }
         dbg<<"SpergelInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
         return result;
     }
@@ -0,0 +1,215 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+//#define DEBUGLOGGING
+
+#include "SBStreak.h"
+#include "SBStreakImpl.h"
+#include "Interpolant.h"  // For sinc(x)
+#include <algorithm>  // For upper_bound
+
+#ifdef DEBUGLOGGING
+#include <fstream>
+//std::ostream* dbgout = &std::cerr;
+//std::ostream* dbgout = new std::ofstream("debug.out");
+//int verbose_level = 2;
+#endif
+
+namespace galsim {
+
+
+    SBStreak::SBStreak(const std::vector<double>& x, const std::vector<double>& y, double flux,
+                       const GSParamsPtr& gsparams) :
+        SBProfile(new SBStreakImpl(x,y,flux,gsparams)) {}
+
+    SBStreak::SBStreak(const SBStreak& rhs) : SBProfile(rhs) {}
+
+    SBStreak::~SBStreak() {}
+
+    const std::vector<double>& SBStreak::getX() const
+    {
+        assert(dynamic_cast<const SBStreakImpl*>(_pimpl.get()));
+        return static_cast<const SBStreakImpl&>(*_pimpl).getX();
+    }
+
+    const std::vector<double>& SBStreak::getY() const
+    {
+        assert(dynamic_cast<const SBStreakImpl*>(_pimpl.get()));
+        return static_cast<const SBStreakImpl&>(*_pimpl).getY();
+    }
+
+    double SBStreak::getLength() const
+    {
+        assert(dynamic_cast<const SBStreakImpl*>(_pimpl.get()));
+        return static_cast<const SBStreakImpl&>(*_pimpl).getLength();
+    }
+
+    std::string SBStreak::SBStreakImpl::serialize() const
+    {
+        std::ostringstream oss(" ");
+        oss.precision(std::numeric_limits<double>::digits10 + 4);
+        oss << "galsim._galsim.SBStreak([";
+        for (size_t i=0; i<_x.size(); ++i) oss << (i==0 ? "" : ", ") << _x[i];
+        oss << "], [";
+        for (size_t i=0; i<_y.size(); ++i) oss << (i==0 ? "" : ", ") << _y[i];
+        oss << "], "<<getFlux()<<", galsim.GSParams("<<*gsparams<<"))";
+        return oss.str();
+    }
+
+    SBStreak::SBStreakImpl::SBStreakImpl(const std::vector<double>& x,
+                                         const std::vector<double>& y, double flux,
+                                         const GSParamsPtr& gsparams) :
+        SBProfileImpl(gsparams), _x(x), _y(y), _flux(flux)
+    {
+        if (_x.size() != _y.size())
+            throw SBError("SBStreak requires x and y to be the same length");
+        if (_x.size() < 2)
+            throw SBError("SBStreak requires at least 2 points");
+
+        const int nseg = _x.size()-1;
+        _cumlength.resize(nseg+1);
+        _cumlength[0] = 0.;
+        for (int i=0; i<nseg; ++i)
+            _cumlength[i+1] = _cumlength[i] + hypot(_x[i+1]-_x[i], _y[i+1]-_y[i]);
+        _length = _cumlength[nseg];
+        dbg<<"SBStreak with "<<nseg<<" segments, length = "<<_length<<std::endl;
+        if (!(_length > 0.))
+            throw SBError("SBStreak requires a path with non-zero length");
+
+        // The flux of each segment is proportional to its length.  The centroid of each
+        // segment is its midpoint.
+        _weight.resize(nseg);
+        double cenx = 0., ceny = 0.;
+        for (int i=0; i<nseg; ++i) {
+            _weight[i] = _flux * (_cumlength[i+1]-_cumlength[i]) / _length;
+            cenx += _weight[i] * 0.5*(_x[i]+_x[i+1]);
+            ceny += _weight[i] * 0.5*(_y[i]+_y[i+1]);
+        }
+        _centroid = _flux == 0. ? Position<double>(0.,0.) :
+            Position<double>(cenx/_flux, ceny/_flux);
+
+        // As for SBBox, use the full extent of the path as the radius for stepK.
+        // The path is within max |p| of the origin.
+        double maxr = 0., maxx = 0., maxy = 0.;
+        _xmin = _xmax = _x[0];
+        _ymin = _ymax = _y[0];
+        for (int i=0; i<=nseg; ++i) {
+            maxr = std::max(maxr, hypot(_x[i],_y[i]));
+            maxx = std::max(maxx, std::abs(_x[i]));
+            maxy = std::max(maxy, std::abs(_y[i]));
+            _xmin = std::min(_xmin, _x[i]);
+            _xmax = std::max(_xmax, _x[i]);
+            _ymin = std::min(_ymin, _y[i]);
+            _ymax = std::max(_ymax, _y[i]);
+        }
+        _stepk = M_PI / (2.*maxr);
+        _stepkx = maxx > 0. ? M_PI / (2.*maxx) : integ::MOCK_INF;
+        _stepky = maxy > 0. ? M_PI / (2.*maxy) : integ::MOCK_INF;
+        dbg<<"stepk = "<<_stepk<<", stepk in x,y = "<<_stepkx<<", "<<_stepky<<std::endl;
+    }
+
+    // Each segment with midpoint c and half-length vector h has Fourier transform
+    //     F(k) = w exp(-i k.c) sin(k.h)/(k.h)
+    // Note: our sinc function is sinc(x) = sin(pi x) / (pi x).
+    std::complex<double> SBStreak::SBStreakImpl::kValue(const Position<double>& k) const
+    {
+        std::complex<double> sum = 0.;
+        const int nseg = _weight.size();
+        for (int i=0; i<nseg; ++i) {
+            double cx = 0.5*(_x[i]+_x[i+1]);
+            double cy = 0.5*(_y[i]+_y[i+1]);
+            double khpi = (k.x*(_x[i+1]-_x[i]) + k.y*(_y[i+1]-_y[i])) / (2.*M_PI);
+            double kc = k.x*cx + k.y*cy;
+            sum += _weight[i] * sinc(khpi) * std::complex<double>(cos(kc), -sin(kc));
+        }
+        return sum;
+    }
+
+    void SBStreak::SBStreakImpl::fillKValue(tmv::MatrixView<std::complex<double> > val,
+                                            double kx0, double dkx, int izero,
+                                            double ky0, double dky, int jzero) const
+    {
+        dbg<<"SBStreak fillKValue\n";
+        dbg<<"kx = "<<kx0<<" + i * "<<dkx<<", izero = "<<izero<<std::endl;
+        dbg<<"ky = "<<ky0<<" + j * "<<dky<<", jzero = "<<jzero<<std::endl;
+        // There is no symmetry to exploit, so just use the general version.
+        fillKValue(val,kx0,dkx,0.,ky0,dky,0.);
+    }
+
+    void SBStreak::SBStreakImpl::fillKValue(tmv::MatrixView<std::complex<double> > val,
+                                            double kx0, double dkx, double dkxy,
+                                            double ky0, double dky, double dkyx) const
+    {
+        dbg<<"SBStreak fillKValue\n";
+        dbg<<"kx = "<<kx0<<" + i * "<<dkx<<" + j * "<<dkxy<<std::endl;
+        dbg<<"ky = "<<ky0<<" + i * "<<dkyx<<" + j * "<<dky<<std::endl;
+        assert(val.stepi() == 1);
+        assert(val.canLinearize());
+        const int m = val.colsize();
+        const int n = val.rowsize();
+        typedef tmv::VIt<std::complex<double>,1,tmv::NonConj> It;
+
+        // Do one segment at a time, so the values of k.h and k.c can be accumulated along
+        // each row.  Both are linear in i and j.
+        val.setZero();
+        const int nseg = _weight.size();
+        for (int iseg=0; iseg<nseg; ++iseg) {
+            const double w = _weight[iseg];
+            if (w == 0.) continue;
+            const double hx = (_x[iseg+1]-_x[iseg]) / (2.*M_PI);
+            const double hy = (_y[iseg+1]-_y[iseg]) / (2.*M_PI);
+            const double cx = 0.5*(_x[iseg]+_x[iseg+1]);
+            const double cy = 0.5*(_y[iseg]+_y[iseg+1]);
+
+            It valit = val.linearView().begin();
+            double kx_j = kx0;
+            double ky_j = ky0;
+            for (int j=0;j<n;++j,kx_j+=dkxy,ky_j+=dky) {
+                double kh = kx_j*hx + ky_j*hy;
+                double kc = kx_j*cx + ky_j*cy;
+                const double dkh = dkx*hx + dkyx*hy;
+                const double dkc = dkx*cx + dkyx*cy;
+                for (int i=0;i<m;++i,kh+=dkh,kc+=dkc)
+                    *valit++ += w * sinc(kh) * std::complex<double>(cos(kc), -sin(kc));
+            }
+        }
+    }
+
+    boost::shared_ptr<PhotonArray> SBStreak::SBStreakImpl::shoot(int N, UniformDeviate u) const
+    {
+        dbg<<"Streak shoot: N = "<<N<<std::endl;
+        dbg<<"Target flux = "<<getFlux()<<std::endl;
+        boost::shared_ptr<PhotonArray> result(new PhotonArray(N));
+        double fluxPerPhoton = _flux/N;
+        const int nseg = _weight.size();
+        for (int i=0; i<N; i++) {
+            // Pick a distance along the path, and find the segment it is in.
+            double s = u() * _length;
+            int iseg = std::upper_bound(_cumlength.begin(), _cumlength.end(), s)
+                - _cumlength.begin() - 1;
+            if (iseg < 0) iseg = 0;
+            if (iseg >= nseg) iseg = nseg-1;
+            double t = (s - _cumlength[iseg]) / (_cumlength[iseg+1] - _cumlength[iseg]);
+            result->setPhoton(i, _x[iseg] + t * (_x[iseg+1]-_x[iseg]),
+                              _y[iseg] + t * (_y[iseg+1]-_y[iseg]), fluxPerPhoton);
+        }
+        dbg<<"Streak Realized flux = "<<result->getTotalFlux()<<std::endl;
+        return result;
+    }
+}
@@ -179,6 +179,30 @@ namespace galsim {
             dbg<<"shift = "<<shift<<", stepk -> "<<_stepk<<std::endl;
         }
 
+        // Calculate maxK, stepK in the x and y directions separately.
+        // The adaptee fits within a circle of radius R = Pi/stepk, and also within a rectangle
+        // with half-widths Pi/stepkx, Pi/stepky.  Use whichever of these two shapes is
+        // narrower in each direction after the transformation.
+        // In k space, the profile transforms with the inverse transpose of the matrix, but
+        // otherwise the logic is the same.
+        double adaptee_maxkx, adaptee_maxky, adaptee_stepkx, adaptee_stepky;
+        _adaptee.getMaxKXY(adaptee_maxkx, adaptee_maxky);
+        _adaptee.getStepKXY(adaptee_stepkx, adaptee_stepky);
+        double R = M_PI / _adaptee.stepK();
+        double Rx = M_PI / adaptee_stepkx;
+        double Ry = M_PI / adaptee_stepky;
+        double xext = std::min(R * hypot(_mA,_mB), std::abs(_mA)*Rx + std::abs(_mB)*Ry);
+        double yext = std::min(R * hypot(_mC,_mD), std::abs(_mC)*Rx + std::abs(_mD)*Ry);
+        _stepkx = std::max(M_PI / (xext + std::abs(_cen.x)), _stepk);
+        _stepky = std::max(M_PI / (yext + std::abs(_cen.y)), _stepk);
+        double K = _adaptee.maxK();
+        double Kx = adaptee_maxkx;
+        double Ky = adaptee_maxky;
+        _maxkx = std::min(K * hypot(_mC,_mD), std::abs(_mD)*Kx + std::abs(_mC)*Ky) / _absdet;
+        _maxky = std::min(K * hypot(_mA,_mB), std::abs(_mB)*Kx + std::abs(_mA)*Ky) / _absdet;
+        _maxkx = std::min(_maxkx, _maxk);
+        _maxky = std::min(_maxky, _maxk);
+
         xdbg<<"Transformation init\n";
         xdbg<<"matrix = "<<_mA<<','<<_mB<<','<<_mC<<','<<_mD<<std::endl;
         xdbg<<"_cen = "<<_cen<<std::endl;
@@ -188,6 +212,8 @@ namespace galsim {
         xdbg<<"major, minor = "<<major<<", "<<minor<<std::endl;
         xdbg<<"maxK() = "<<_maxk<<std::endl;
         xdbg<<"stepK() = "<<_stepk<<std::endl;
+        xdbg<<"maxK in x,y = "<<_maxkx<<", "<<_maxky<<std::endl;
+        xdbg<<"stepK in x,y = "<<_stepkx<<", "<<_stepky<<std::endl;
 
         // Calculate the values for getXRange and getYRange:
         if (_adaptee.isAxisymmetric()) {
@@ -497,6 +523,42 @@ namespace galsim {
     std::complex<double> SBTransform::SBTransformImpl::kValue(const Position<double>& k) const
     { return _kValue(_adaptee,fwdT(k),_absdet,k,_cen); }
 
+    void SBTransform::SBTransformImpl::xValueMany(const double* x, const double* y,
+                                                  double* val, int n) const
+    {
+        if (n <= 0) return;
+        // Transform all the positions into the frame of the adaptee, and let it do the
+        // whole set at once.
+        std::vector<double> xx(n), yy(n);
+        for (int i=0; i<n; ++i) {
+            Position<double> p = inv(Position<double>(x[i]-_cen.x, y[i]-_cen.y));
+            xx[i] = p.x;
+            yy[i] = p.y;
+        }
+        _adaptee.xValueMany(&xx[0], &yy[0], val, n);
+        if (_fluxScaling != 1.)
+            for (int i=0; i<n; ++i) val[i] *= _fluxScaling;
+    }
+
+    void SBTransform::SBTransformImpl::kValueMany(const double* kx, const double* ky,
+                                                  std::complex<double>* val, int n) const
+    {
+        if (n <= 0) return;
+        std::vector<double> kxx(n), kyy(n);
+        for (int i=0; i<n; ++i) {
+            Position<double> k = fwdT(Position<double>(kx[i], ky[i]));
+            kxx[i] = k.x;
+            kyy[i] = k.y;
+        }
+        _adaptee.kValueMany(&kxx[0], &kyy[0], val, n);
+        if (!_zeroCen) {
+            for (int i=0; i<n; ++i)
+                val[i] *= std::polar(_absdet, -kx[i]*_cen.x-ky[i]*_cen.y);
+        } else if (_kValueNoPhase == &SBTransform::SBTransformImpl::_kValueNoPhaseWithDet) {
+            for (int i=0; i<n; ++i) val[i] *= _absdet;
+        }
+    }
+
     std::complex<double> SBTransform::SBTransformImpl::kValueNoPhase(
         const Position<double>& k) const
     { return _kValueNoPhase(_adaptee,fwdT(k),_absdet,k,_cen); }
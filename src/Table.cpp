@@ -24,6 +24,7 @@
 #include "Table.h"
 #include <cmath>
 #include <vector>
+#include <algorithm>
 
 #include <iostream>
 
@@ -305,33 +306,108 @@ namespace galsim {
 
     template<class V, class A>
     Table2D<V,A>::Table2D(const A* _xargs, const A* _yargs, const V* _vals, int _Nx, int _Ny,
-        interpolant in) : iType(in), Nx(_Nx), Ny(_Ny),
-                          xargs(_xargs, _xargs+Nx), yargs(_yargs, _yargs+Ny),
-                          vals(_vals, _vals+Nx*Ny)
+        interpolant in, bool _periodic) :
+        iType(in), Nx(_Nx), Ny(_Ny), xargs(_xargs, _xargs+Nx), yargs(_yargs, _yargs+Ny),
+        vals(_vals, _vals+Nx*Ny), periodic(_periodic)
     {
         // Map specific interpolator to `interpolate`.
         switch (iType) {
           case linear:
                interpolate = &Table2D<V,A>::linearInterpolate;
+               interpGradient = &Table2D<V,A>::linearGradient;
                break;
           case floor:
                interpolate = &Table2D<V,A>::floorInterpolate;
+               interpGradient = &Table2D<V,A>::constantGradient;
                break;
           case ceil:
                interpolate = &Table2D<V,A>::ceilInterpolate;
+               interpGradient = &Table2D<V,A>::constantGradient;
                break;
           case nearest:
                interpolate = &Table2D<V,A>::nearestInterpolate;
+               interpGradient = &Table2D<V,A>::constantGradient;
+               break;
+          case cubic:
+               interpolate = &Table2D<V,A>::cubicInterpolate;
+               interpGradient = &Table2D<V,A>::cubicGradient;
+               setupCubic();
                break;
           default:
                throw TableError("interpolation method not yet implemented");
         }
     }
 
+    // Estimate the derivatives at the grid points by finite differences.  Interior points use
+    // the centered difference.  At the edges, this is either one-sided or, for a periodic table,
+    // uses the points on the other side of the table.
+    template<class A>
+    static void FiniteDiffIndices(const ArgVec<A>& args, bool periodic,
+                                  std::vector<int>& im, std::vector<int>& ip, std::vector<A>& h)
+    {
+        const int N = args.size();
+        if (N < 2) throw TableError("Table2D requires at least 2 points in each direction.");
+        const A period = args.back() - args.front();
+        im.resize(N);
+        ip.resize(N);
+        h.resize(N);
+        for (int i=0; i<N; ++i) {
+            im[i] = std::max(i-1, 0);
+            ip[i] = std::min(i+1, N-1);
+            h[i] = args[ip[i]] - args[im[i]];
+        }
+        if (periodic && N > 2) {
+            im[0] = N-2;
+            h[0] = args[1] - (args[N-2] - period);
+            ip[N-1] = 1;
+            h[N-1] = (args[1] + period) - args[N-2];
+        }
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::setupCubic()
+    {
+        std::vector<int> im, ip, jm, jp;
+        std::vector<A> hx, hy;
+        FiniteDiffIndices(xargs, periodic, im, ip, hx);
+        FiniteDiffIndices(yargs, periodic, jm, jp, hy);
+        fx.resize(Nx*Ny);
+        fy.resize(Nx*Ny);
+        fxy.resize(Nx*Ny);
+        for (int i=0; i<Nx; ++i) {
+            for (int j=0; j<Ny; ++j) {
+                fx[i*Ny+j] = (vals[ip[i]*Ny+j] - vals[im[i]*Ny+j]) / hx[i];
+                fy[i*Ny+j] = (vals[i*Ny+jp[j]] - vals[i*Ny+jm[j]]) / hy[j];
+                fxy[i*Ny+j] = (vals[ip[i]*Ny+jp[j]] - vals[ip[i]*Ny+jm[j]]
+                               - vals[im[i]*Ny+jp[j]] + vals[im[i]*Ny+jm[j]]) / (hx[i]*hy[j]);
+            }
+        }
+    }
+
+    // Wrap an argument into the range of a periodic table.
+    template<class A>
+    static void WrapArg(A& a, const ArgVec<A>& args)
+    {
+        if (a < args.front() || a > args.back()) {
+            const A period = args.back() - args.front();
+            a = std::fmod(a - args.front(), period);
+            if (a < 0) a += period;
+            a += args.front();
+        }
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::wrap(A& x, A& y) const
+    {
+        WrapArg(x, xargs);
+        WrapArg(y, yargs);
+    }
+
     //lookup and interpolate function value.
     template<class V, class A>
-    V Table2D<V,A>::lookup(const A x, const A y) const
+    V Table2D<V,A>::lookup(A x, A y) const
     {
+        if (periodic) wrap(x, y);
         int i = xargs.upperIndex(x);
         int j = yargs.upperIndex(y);
         return (this->*interpolate)(x, y, i, j);
@@ -345,9 +421,12 @@ namespace galsim {
     {
         int i, j;
         for (int k=0; k<N; k++, valvec++) {
-            i = xargs.upperIndex(xvec[k]);
-            j = yargs.upperIndex(yvec[k]);
-            *valvec = (this->*interpolate)(xvec[k], yvec[k], i, j);
+            A x = xvec[k];
+            A y = yvec[k];
+            if (periodic) wrap(x, y);
+            i = xargs.upperIndex(x);
+            j = yargs.upperIndex(y);
+            *valvec = (this->*interpolate)(x, y, i, j);
         }
     }
 
@@ -359,14 +438,62 @@ namespace galsim {
     {
         int i, j;
         for (int outi=0; outi<outNx; outi++) {
-            i = xargs.upperIndex(xvec[outi]);
+            A x = xvec[outi];
+            if (periodic) WrapArg(x, xargs);
+            i = xargs.upperIndex(x);
             for (int outj=0; outj<outNy; outj++, valvec++) {
-                j = yargs.upperIndex(yvec[outj]);
-                *valvec = (this->*interpolate)(xvec[outi], yvec[outj], i, j);
+                A y = yvec[outj];
+                if (periodic) WrapArg(y, yargs);
+                j = yargs.upperIndex(y);
+                *valvec = (this->*interpolate)(x, y, i, j);
+            }
+        }
+    }
+
+    //lookup and interpolate at M shifted copies of N points.
+    template<class V, class A>
+    void Table2D<V,A>::interpManyShifted(const A* xvec, const A* yvec, int N,
+                                          const A* dxvec, const A* dyvec, int M,
+                                          V* valvec) const
+    {
+        int i, j;
+        for (int m=0; m<M; m++) {
+            for (int k=0; k<N; k++, valvec++) {
+                A x = xvec[k] + dxvec[m];
+                A y = yvec[k] + dyvec[m];
+                if (periodic) wrap(x, y);
+                i = xargs.upperIndex(x);
+                j = yargs.upperIndex(y);
+                *valvec = (this->*interpolate)(x, y, i, j);
             }
         }
     }
 
+    //lookup and calculate the gradient of the interpolated function.
+    template<class V, class A>
+    void Table2D<V,A>::gradient(A x, A y, V& dfdxval, V& dfdyval) const
+    {
+        if (periodic) wrap(x, y);
+        int i = xargs.upperIndex(x);
+        int j = yargs.upperIndex(y);
+        (this->*interpGradient)(x, y, i, j, dfdxval, dfdyval);
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::gradientMany(const A* xvec, const A* yvec, V* dfdxvec, V* dfdyvec,
+                                     int N) const
+    {
+        int i, j;
+        for (int k=0; k<N; k++) {
+            A x = xvec[k];
+            A y = yvec[k];
+            if (periodic) wrap(x, y);
+            i = xargs.upperIndex(x);
+            j = yargs.upperIndex(y);
+            (this->*interpGradient)(x, y, i, j, dfdxvec[k], dfdyvec[k]);
+        }
+    }
+
     template<class V, class A>
     V Table2D<V,A>::linearInterpolate(const A x, const A y, int i, int j) const
     {
@@ -408,5 +535,100 @@ namespace galsim {
         return vals[i*Ny+j];
     }
 
+    // The Hermite basis functions on [0,1], and their derivatives.  h0, h1 interpolate the
+    // values at 0 and 1, and g0, g1 interpolate the derivatives at 0 and 1.
+    static void HermiteBasis(double t, double* h, double* g)
+    {
+        double t2 = t*t;
+        double t3 = t2*t;
+        h[0] = 2.*t3 - 3.*t2 + 1.;
+        h[1] = -2.*t3 + 3.*t2;
+        g[0] = t3 - 2.*t2 + t;
+        g[1] = t3 - t2;
+    }
+
+    static void HermiteBasisDeriv(double t, double* h, double* g)
+    {
+        double t2 = t*t;
+        h[0] = 6.*t2 - 6.*t;
+        h[1] = -6.*t2 + 6.*t;
+        g[0] = 3.*t2 - 4.*t + 1.;
+        g[1] = 3.*t2 - 2.*t;
+    }
+
+    template<class V, class A>
+    V Table2D<V,A>::cubicInterpolate(const A x, const A y, int i, int j) const
+    {
+        A dx = xargs[i] - xargs[i-1];
+        A dy = yargs[j] - yargs[j-1];
+        double hx[2], gx[2], hy[2], gy[2];
+        HermiteBasis((x - xargs[i-1]) / dx, hx, gx);
+        HermiteBasis((y - yargs[j-1]) / dy, hy, gy);
+
+        V result = 0;
+        for (int a=0; a<2; ++a) {
+            for (int b=0; b<2; ++b) {
+                int k = (i-1+a)*Ny + j-1+b;
+                result += (vals[k] * hx[a] * hy[b] + fx[k] * gx[a] * dx * hy[b]
+                           + fy[k] * hx[a] * gy[b] * dy + fxy[k] * gx[a] * dx * gy[b] * dy);
+            }
+        }
+        return result;
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::linearGradient(const A x, const A y, int i, int j,
+                                      V& dfdxval, V& dfdyval) const
+    {
+        A dx = xargs[i] - xargs[i-1];
+        A dy = yargs[j] - yargs[j-1];
+        A ax = (xargs[i] - x) / dx;
+        A bx = 1.0 - ax;
+        A ay = (yargs[j] - y) / dy;
+        A by = 1.0 - ay;
+
+        dfdxval = ((vals[i*Ny+j-1] - vals[(i-1)*Ny+j-1]) * ay
+                   + (vals[i*Ny+j] - vals[(i-1)*Ny+j]) * by) / dx;
+        dfdyval = ((vals[(i-1)*Ny+j] - vals[(i-1)*Ny+j-1]) * ax
+                   + (vals[i*Ny+j] - vals[i*Ny+j-1]) * bx) / dy;
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::constantGradient(const A x, const A y, int i, int j,
+                                        V& dfdxval, V& dfdyval) const
+    {
+        // The floor, ceil, and nearest interpolants are piecewise constant.
+        dfdxval = 0;
+        dfdyval = 0;
+    }
+
+    template<class V, class A>
+    void Table2D<V,A>::cubicGradient(const A x, const A y, int i, int j,
+                                     V& dfdxval, V& dfdyval) const
+    {
+        A dx = xargs[i] - xargs[i-1];
+        A dy = yargs[j] - yargs[j-1];
+        A tx = (x - xargs[i-1]) / dx;
+        A ty = (y - yargs[j-1]) / dy;
+        double hx[2], gx[2], hy[2], gy[2];
+        double dhx[2], dgx[2], dhy[2], dgy[2];
+        HermiteBasis(tx, hx, gx);
+        HermiteBasis(ty, hy, gy);
+        HermiteBasisDeriv(tx, dhx, dgx);
+        HermiteBasisDeriv(ty, dhy, dgy);
+
+        dfdxval = 0;
+        dfdyval = 0;
+        for (int a=0; a<2; ++a) {
+            for (int b=0; b<2; ++b) {
+                int k = (i-1+a)*Ny + j-1+b;
+                dfdxval += (vals[k] * dhx[a] / dx * hy[b] + fx[k] * dgx[a] * hy[b]
+                            + fy[k] * dhx[a] / dx * gy[b] * dy + fxy[k] * dgx[a] * gy[b] * dy);
+                dfdyval += (vals[k] * hx[a] * dhy[b] / dy + fx[k] * gx[a] * dx * dhy[b] / dy
+                            + fy[k] * hx[a] * dgy[b] + fxy[k] * gx[a] * dx * dgy[b]);
+            }
+        }
+    }
+
     template class Table2D<double,double>;
 }
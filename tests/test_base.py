@@ -134,7 +134,9 @@ def test_gaussian():
         realspace_relerr = 6.e-1,
         realspace_abserr = 7.e-1,
         integration_relerr = 8.e-1,
-        integration_abserr = 9.e-1))
+        integration_abserr = 9.e-1,
+        shoot_inverse_cdf = True,
+        interpolate_sersic_n = True))
     do_pickle(gauss.SBProfile, lambda x: (x.getSigma(), x.getFlux(), x.getGSParams()))
     do_pickle(gauss, lambda x: x.drawImage(method='no_pixel'))
     do_pickle(gauss)
@@ -586,6 +588,12 @@ def test_sersic():
     sersic2 = galsim.Convolve(sersic, galsim.Gaussian(sigma=0.3))
     do_shoot(sersic2,myImg,"Truncated Sersic")
 
+    # Repeat with the inverse-cdf photon shooting method.
+    gsp = galsim.GSParams(shoot_inverse_cdf=True)
+    sersic3 = galsim.Sersic(n=3, flux=1.7, half_light_radius=2.3, trunc=5.9, gsparams=gsp)
+    sersic3 = galsim.Convolve(sersic3, galsim.Gaussian(sigma=0.3, gsparams=gsp))
+    do_shoot(sersic3,myImg,"Truncated Sersic with shoot_inverse_cdf")
+
     # Test kvalues
     do_kvalue(sersic,myImg, "Truncated Sersic")
 
@@ -925,6 +933,95 @@ def test_sersic_1():
         np.testing.assert_almost_equal(sersic.kValue(pos), expon.kValue(pos), decimal=5)
 
 
+@timer
+def test_sersic_interpolate_n():
+    """Test the Sersic profiles using interpolate_sersic_n match the exact calculation.
+    """
+    gsp = galsim.GSParams(interpolate_sersic_n=True)
+    # Include values near the ends of the allowed range and special values.
+    for n in [0.3, 0.317, 0.72, 1.0, 1.5, 2.379, 3.91, 4.0, 5.83, 6.2]:
+        sersic1 = galsim.Sersic(n=n, half_light_radius=1.3, flux=1.7)
+        sersic2 = galsim.Sersic(n=n, half_light_radius=1.3, flux=1.7, gsparams=gsp)
+        np.testing.assert_equal(sersic2.getHalfLightRadius(), sersic1.getHalfLightRadius())
+        np.testing.assert_equal(sersic2.getScaleRadius(), sersic1.getScaleRadius())
+        np.testing.assert_equal(sersic2.stepK(), sersic1.stepK())
+        np.testing.assert_allclose(sersic2.maxK(), sersic1.maxK(), rtol=0.1,
+                                   err_msg="maxK for interpolated Sersic n=%s is wrong"%n)
+        for (x,y) in [ (0.,0.), (0.01, 0.02), (0.2, -0.5), (1.1, 0.), (3., 2.), (7.2, 5.5) ]:
+            pos = galsim.PositionD(x,y)
+            np.testing.assert_equal(sersic2.xValue(pos), sersic1.xValue(pos))
+            # The tables have an accuracy of kvalue_accuracy relative to the total flux.
+            np.testing.assert_allclose(
+                    sersic2.kValue(pos), sersic1.kValue(pos), rtol=0, atol=2.e-5 * 1.7,
+                    err_msg="kValue for interpolated Sersic n=%s is wrong"%n)
+        im1 = sersic1.drawImage(nx=64, ny=64, scale=0.2, method='no_pixel')
+        im2 = sersic2.drawImage(im1.copy(), method='no_pixel')
+        np.testing.assert_array_almost_equal(
+                im2.array, im1.array, 5,
+                "Drawing interpolated Sersic n=%s disagrees with exact calculation"%n)
+    do_pickle(sersic2)
+    do_pickle(sersic2.SBProfile)
+
+    # Truncated profiles use the exact calculation.
+    sersic1 = galsim.Sersic(n=2.7, half_light_radius=1.3, trunc=4.5)
+    sersic2 = galsim.Sersic(n=2.7, half_light_radius=1.3, trunc=4.5, gsparams=gsp)
+    pos = galsim.PositionD(0.3, 0.4)
+    np.testing.assert_equal(sersic2.kValue(pos), sersic1.kValue(pos))
+
+    # Write the tables to disk and read them back in.  Reading them in this process would be a
+    # no-op, since writing them built the tables here.  So read them in a new process.
+    import pickle
+    import subprocess
+    gsp3 = galsim.GSParams(interpolate_sersic_n=True, kvalue_accuracy=3.e-5)
+    file_name = os.path.join('output', 'sersic_tables.pkl')
+    galsim.Sersic.writeInterpolationTables(file_name, gsparams=gsp3)
+    sersic4 = galsim.Sersic(n=1.77, half_light_radius=1.3, gsparams=gsp)
+    k4 = sersic4.kValue(pos)
+
+    # The subprocess reads a table file, then prints the kValue of an n=1.77 Sersic using it,
+    # along with whether the grid tables are now exactly the ones in the file.
+    script = "\n".join([
+        "import sys, os, pickle",
+        "sys.path.insert(0, %r)"%os.path.abspath(os.path.join(path, "..")),
+        "import galsim",
+        "file_name = sys.argv[1]",
+        "galsim.Sersic.readInterpolationTables(file_name)",
+        "with open(file_name, 'rb') as fin: gsparams, tables = pickle.load(fin)",
+        "tables2 = galsim._galsim._getSersicInterpolationTables(gsparams)",
+        "same = all(list(map(list, t)) == list(map(list, t2)) for t, t2 in zip(tables, tables2))",
+        "sersic = galsim.Sersic(n=1.77, half_light_radius=1.3, gsparams=gsparams)",
+        "k = sersic.kValue(galsim.PositionD(0.3, 0.4))",
+        "print(repr((k.real, k.imag, same)))",
+    ])
+    def read_in_subprocess(file_name):
+        out = subprocess.check_output([sys.executable, '-c', script, file_name])
+        return eval(out.decode().strip().splitlines()[-1])
+
+    kr, ki, same = read_in_subprocess(file_name)
+    assert same
+    np.testing.assert_allclose(kr + 1j*ki, k4, rtol=0, atol=5.e-5)
+
+    # To make sure the tables were really read from the file, rather than built again in the
+    # subprocess, read a file with altered tables.  These are then the ones used.
+    with open(file_name, 'rb') as fin:
+        gsp3b, tables = pickle.load(fin)
+    tables = [ (params, logk, [ 2.*f for f in ft ]) for params, logk, ft in tables ]
+    bad_file_name = os.path.join('output', 'sersic_tables_altered.pkl')
+    with open(bad_file_name, 'wb') as fout:
+        pickle.dump((gsp3b, tables), fout, pickle.HIGHEST_PROTOCOL)
+    kr, ki, same = read_in_subprocess(bad_file_name)
+    assert same
+    assert abs(kr + 1j*ki - k4) > 1.e-3
+    # The tables for a different GSParams have a different number of nodes.
+    try:
+        with open(file_name, 'rb') as fin:
+            gsp3, tables = pickle.load(fin)
+        np.testing.assert_raises(RuntimeError, galsim._galsim._setSersicInterpolationTables,
+                                 gsp, tables)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
 @timer
 def test_airy():
     """Test the generation of a specific Airy profile against a known result.
@@ -1232,6 +1329,93 @@ def test_tophat():
     do_kvalue(conv,im, "Sheared TopHat convolved with pixel in real space")
 
 
+@timer
+def test_streak():
+    """Test the Streak profile.
+    """
+    # A straight streak has a sinc Fourier transform along the direction of motion.
+    length = 3.7
+    angle = 23. * galsim.degrees
+    streak = galsim.Streak(length=length, angle=angle, flux=test_flux)
+    np.testing.assert_almost_equal(streak.length, length)
+    np.testing.assert_almost_equal(streak.flux, test_flux)
+    np.testing.assert_array_almost_equal(
+            streak.x, [-0.5*length*angle.cos(), 0.5*length*angle.cos()])
+    np.testing.assert_array_almost_equal(
+            streak.y, [-0.5*length*angle.sin(), 0.5*length*angle.sin()])
+    for kx, ky in [ (0.,0.), (0.3,-0.7), (1.7,2.3), (-4.1,0.2) ]:
+        kpar = kx*angle.cos() + ky*angle.sin()
+        np.testing.assert_almost_equal(
+                streak.kValue(kx,ky), test_flux * np.sinc(kpar*length/(2.*np.pi)), 10,
+                err_msg="Streak kValue disagrees with analytic sinc")
+
+    # Check the moments and the flux and centroid of a polyline.
+    np.testing.assert_almost_equal(streak.calculateMomentRadius(), length / np.sqrt(24.))
+    x = [ 0.3, 2.3, 2.3, -1.7 ]
+    y = [ -0.4, -0.4, 2.6, 2.6 ]
+    streak = galsim.Streak(x=x, y=y, flux=test_flux)
+    np.testing.assert_almost_equal(streak.length, 9.)
+    np.testing.assert_almost_equal(streak.flux, test_flux)
+    # The segments have lengths 2, 3, 4 and centers (1.3,-0.4), (2.3,1.1), (0.3,2.6).
+    cen = (2.*galsim.PositionD(1.3,-0.4) + 3.*galsim.PositionD(2.3,1.1) +
+           4.*galsim.PositionD(0.3,2.6)) / 9.
+    np.testing.assert_almost_equal(streak.centroid().x, cen.x)
+    np.testing.assert_almost_equal(streak.centroid().y, cen.y)
+    np.testing.assert_almost_equal(streak.kValue(0,0), test_flux)
+
+    # Check the photons are on the path.
+    photons = streak.SBProfile.shoot(1000, galsim.UniformDeviate(1234))
+    px = photons.x
+    py = photons.y
+    on_path = ( (np.abs(py+0.4) < 1.e-12) & (px > 0.3-1.e-12) & (px < 2.3+1.e-12) |
+                (np.abs(px-2.3) < 1.e-12) & (py > -0.4-1.e-12) & (py < 2.6+1.e-12) |
+                (np.abs(py-2.6) < 1.e-12) & (px > -1.7-1.e-12) & (px < 2.3+1.e-12) )
+    assert np.all(on_path)
+    np.testing.assert_almost_equal(np.sum(photons.flux), test_flux)
+
+    # Convolved with a PSF, the real-space convolution along the path matches the DFT.
+    scale = 0.2939
+    im = galsim.ImageF(48,48, scale=scale)
+    psf = galsim.Moffat(beta=3.5, fwhm=0.9)
+    for streak in [ galsim.Streak(length=length, angle=angle, flux=test_flux),
+                    galsim.Streak(x=x, y=y, flux=test_flux).shift(-0.3,-1.1),
+                    galsim.Streak(length=length, flux=test_flux).shear(g1=0.2, g2=-0.1) ]:
+        conv = galsim.Convolve(psf, streak, real_space=True)
+        do_kvalue(conv, im, "Streak convolved with Moffat in real space")
+        do_shoot(conv, im, "Streak convolved with Moffat")
+        im2 = galsim.Convolve(psf, streak).drawImage(im.copy(), method='no_pixel')
+        np.testing.assert_array_almost_equal(
+                im2.array, im.array, 4,
+                err_msg="Real-space Streak convolution disagrees with DFT")
+
+    # With a pixel, the default is a real-space convolution.
+    streak = galsim.Streak(length=length, angle=angle, flux=test_flux)
+    im1 = streak.drawImage(im.copy())
+    im2 = streak.drawImage(im.copy(), method='fft')
+    np.testing.assert_array_almost_equal(
+            im1.array, im2.array, 3,
+            err_msg="Streak convolved with pixel in real space disagrees with DFT")
+    np.testing.assert_almost_equal(im1.array.sum(), test_flux, 5)
+
+    # Check picklability
+    do_pickle(streak.SBProfile, lambda x: (x.getX(), x.getY(), x.getFlux(), x.getGSParams()))
+    do_pickle(streak, lambda x: x.drawImage(nx=20, ny=20, scale=0.3))
+    do_pickle(streak)
+    do_pickle(streak.SBProfile)
+    do_pickle(galsim.Streak(x=x, y=y, flux=test_flux))
+
+    try:
+        np.testing.assert_raises(TypeError, galsim.Streak)
+        np.testing.assert_raises(TypeError, galsim.Streak, length=1., x=x, y=y)
+        np.testing.assert_raises(TypeError, galsim.Streak, x=x, y=y, angle=angle)
+        np.testing.assert_raises(TypeError, galsim.Streak, length=1., angle=1.)
+        np.testing.assert_raises(ValueError, galsim.Streak, length=0.)
+        np.testing.assert_raises(ValueError, galsim.Streak, x=x, y=y[:3])
+        np.testing.assert_raises(ValueError, galsim.Streak, x=[1.], y=[2.])
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
 @timer
 def test_moffat():
     """Test the generation of a specific Moffat profile against a known result.
@@ -1861,6 +2045,12 @@ def test_spergel():
             spergel2 = galsim.Convolve(spergel, galsim.Gaussian(sigma=0.3))
             do_shoot(spergel2,myImg,"Spergel")
 
+            # Repeat with the inverse-cdf photon shooting method.
+            gsp = galsim.GSParams(shoot_inverse_cdf=True)
+            spergel3 = galsim.Spergel(nu=nu, half_light_radius=1.0, gsparams=gsp)
+            spergel3 = galsim.Convolve(spergel3, galsim.Gaussian(sigma=0.3, gsparams=gsp))
+            do_shoot(spergel3,myImg,"Spergel with shoot_inverse_cdf")
+
         # Test integrated flux routines against Mathematica
         spergel = galsim.Spergel(nu=nu, scale_radius=1.0)
         np.testing.assert_almost_equal(
@@ -2150,6 +2340,16 @@ def test_ne():
             galsim.TopHat(radius=1.0, gsparams=gsp)]
     all_obj_diff(gals)
 
+    # Streak.  Params include length, angle, x, y, flux, gsparams.
+    # The following should all test unequal:
+    gals = [galsim.Streak(length=1.0),
+            galsim.Streak(length=1.1),
+            galsim.Streak(length=1.0, angle=10.*galsim.degrees),
+            galsim.Streak(x=[0.,1.,1.], y=[0.,0.,1.]),
+            galsim.Streak(length=1.0, flux=1.1),
+            galsim.Streak(length=1.0, gsparams=gsp)]
+    all_obj_diff(gals)
+
     # Sersic.  Params include n, half_light_radius, scale_radius, flux, trunc, flux_untruncated
     # and gsparams.
     # The following should all test unequal:
@@ -2209,11 +2409,13 @@ if __name__ == "__main__":
     test_sersic_flux_scaling()
     test_sersic_05()
     test_sersic_1()
+    test_sersic_interpolate_n()
     test_airy()
     test_airy_radii()
     test_airy_flux_scaling()
     test_box()
     test_tophat()
+    test_streak()
     test_moffat()
     test_moffat_properties()
     test_moffat_radii()
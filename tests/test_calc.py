@@ -372,7 +372,73 @@ def test_fwhm():
                                    err_msg="non-square image.calculateFWHM is not accurate.")
 
 
+@timer
+def test_exact_sizes():
+    """Test the calculations of HLR, FWHM, and moment radius that don't require drawing.
+    """
+    e1 = galsim.Exponential(scale_radius=5, flux=1.7)
+    g1 = galsim.Gaussian(sigma=5, flux=1.7)
+
+    # Other flux fractions for an analytic profile are integrated directly.
+    r90 = 3.889720170 * e1.scale_radius
+    np.testing.assert_almost_equal(e1.calculateHLR(flux_frac=0.9)/r90, 1.0, decimal=6,
+                                   err_msg="Exponential r90 is not accurate.")
+
+    # Rotations and dilations just scale the analytic values.
+    e2 = e1.dilate(2.3).rotate(23 * galsim.degrees).shift(0.3, -0.7)
+    np.testing.assert_almost_equal(e2.calculateHLR(), 2.3 * e1.half_light_radius, decimal=12)
+    np.testing.assert_almost_equal(e2.calculateFWHM(), 2.3 * 2.*np.log(2.)*5, decimal=6)
+
+    # Round convolutions use the k-space profile.
+    g2 = galsim.Convolve(galsim.Gaussian(sigma=3, flux=1.3), galsim.Gaussian(sigma=4, flux=23))
+    np.testing.assert_almost_equal(g2.calculateHLR()/g1.half_light_radius, 1.0, decimal=7,
+                                   err_msg="Convolution HLR is not accurate.")
+    np.testing.assert_almost_equal(g2.calculateFWHM()/g1.fwhm, 1.0, decimal=7,
+                                   err_msg="Convolution FWHM is not accurate.")
+    psf = galsim.Moffat(beta=3.5, fwhm=2.)
+    conv = galsim.Convolve(galsim.Sersic(n=2.5, half_light_radius=3.), psf)
+    im = conv.drawImage(nx=600, ny=600, scale=0.05)
+    np.testing.assert_almost_equal(conv.calculateHLR()/im.calculateHLR(flux=conv.flux),
+                                   1.0, decimal=3,
+                                   err_msg="Convolution HLR does not match drawn value.")
+
+    # The moments are propagated through transformations, sums and convolutions.
+    e1_sigma = np.sqrt(3.0) * e1.scale_radius
+    np.testing.assert_almost_equal(e1.calculateMomentRadius(), e1_sigma, decimal=12)
+    e3 = galsim.Convolve(e1, g1).shear(e1=0.4, e2=0.3)
+    esq = 0.4**2 + 0.3**2
+    sigma = np.sqrt(e1_sigma**2 + 5**2)
+    trace, det = e3.calculateMomentRadius(rtype='both')
+    np.testing.assert_almost_equal(det, sigma, decimal=12)
+    np.testing.assert_almost_equal(trace, sigma*(1.-esq)**-0.25, decimal=12)
+
+    s1 = galsim.Sum(g1.shift(1,2), galsim.Gaussian(sigma=3, flux=2.).shift(-2, 0.5),
+                    galsim.Moffat(beta=4, scale_radius=2).shear(g1=0.3, g2=-0.1))
+    im = s1.drawImage(nx=1000, ny=1000, scale=0.1, method='no_pixel')
+    test_both = s1.calculateMomentRadius(rtype='both')
+    center = im.trueCenter() + s1.centroid()/0.1
+    np.testing.assert_array_almost_equal(
+            im.calculateMomentRadius(center=center, flux=s1.flux, rtype='both'), test_both, 3,
+            "Sum moment radius does not match drawn value.")
+
+    # Moments about some other point are also allowed.
+    offset = galsim.PositionD(1.3, -0.4)
+    test_trace = s1.calculateMomentRadius(rtype='trace', centroid=s1.centroid()+offset)
+    np.testing.assert_almost_equal(test_trace**2, test_both[0]**2 + 0.5*(1.3**2 + 0.4**2),
+                                   decimal=10)
+
+    # Results are cached, even when the profile needs to be drawn.
+    prof = galsim.Convolve(galsim.Exponential(half_light_radius=1.1).shear(g1=0.2, g2=0.1),
+                           galsim.Kolmogorov(fwhm=0.7))
+    hlr = prof.calculateHLR()
+    assert ('hlr', None, None, 0., 0., 0.5) in prof._size_cache
+    prof._size_cache[('hlr', None, None, 0., 0., 0.5)] = 17.
+    np.testing.assert_equal(prof.calculateHLR(), 17.)
+    np.testing.assert_almost_equal(galsim.Convolve(prof.obj_list).calculateHLR(), hlr)
+
+
 if __name__ == "__main__":
     test_hlr()
     test_sigma()
     test_fwhm()
+    test_exact_sizes()
@@ -292,6 +292,66 @@ def test_realspace_convolve():
     do_pickle(conv.SBProfile)
 
 
+@timer
+def test_realspace_box():
+    """Test the real-space convolution of a round profile with an axis-aligned box, which is
+    done with 1-d integrals rather than the general 2-d integral.
+    """
+    import math
+    sigma = 0.7
+    flux = 3.
+    gauss = galsim.Gaussian(sigma=sigma, flux=flux)
+
+    def box_integral(x1, x2, y1, y2):
+        # The integral of the Gaussian over the rectangle [x1,x2] x [y1,y2].
+        s = sigma * math.sqrt(2.)
+        return 0.25 * flux * (math.erf(x2/s) - math.erf(x1/s)) * (math.erf(y2/s) - math.erf(y1/s))
+
+    scale = 0.2
+    box = galsim.Box(0.3, 0.17, flux=2.)
+    # (box, width, height, flux, center)
+    boxes = [ (galsim.Pixel(scale), scale, scale, 1., (0., 0.)),
+              (box, 0.3, 0.17, 2., (0., 0.)),
+              (box.shift(0.13, -0.05), 0.3, 0.17, 2., (0.13, -0.05)),
+              (box.dilate(1.5), 0.45, 0.255, 2., (0., 0.)) ]
+    for b, width, height, bflux, cen in boxes:
+        norm = bflux / (width * height)
+        def expected_value(x, y):
+            x -= cen[0]
+            y -= cen[1]
+            return norm * box_integral(x - width/2., x + width/2., y - height/2., y + height/2.)
+
+        for conv in [ galsim.Convolve(gauss, b, real_space=True),
+                      galsim.Convolve(b, gauss, real_space=True) ]:
+            for x, y in [ (0., 0.), (0.31, -0.07), (-1.3, 0.9), (3.1, 2.8) ]:
+                np.testing.assert_allclose(
+                    conv.xValue(x, y), expected_value(x, y), rtol=1.e-5, atol=1.e-8 * norm,
+                    err_msg="Real-space convolution with a box has the wrong xValue")
+
+            im = conv.drawImage(nx=30, ny=30, scale=scale, method='no_pixel',
+                                offset=(0.3, -0.2))
+            x0 = im.trueCenter().x + 0.3
+            y0 = im.trueCenter().y - 0.2
+            expected = np.array([[ expected_value((i-x0)*scale, (j-y0)*scale)
+                                   for i in range(im.xmin, im.xmax+1) ]
+                                 for j in range(im.ymin, im.ymax+1) ]) * scale**2
+            np.testing.assert_allclose(
+                im.array, expected, rtol=1.e-5, atol=1.e-7 * np.max(expected),
+                err_msg="Real-space convolution with a box drew the wrong image")
+
+    # A hard-edged round profile.  Rotating a box by 90 degrees makes a box with the width and
+    # height swapped, but it uses the general 2-d integration, so compare the two.
+    tophat = galsim.TopHat(radius=0.5, flux=1.7)
+    conv1 = galsim.Convolve(tophat, galsim.Box(0.17, 0.3), real_space=True)
+    conv2 = galsim.Convolve(tophat, galsim.Box(0.3, 0.17).rotate(90 * galsim.degrees),
+                            real_space=True)
+    im1 = conv1.drawImage(nx=20, ny=20, scale=0.07, method='no_pixel')
+    im2 = conv2.drawImage(nx=20, ny=20, scale=0.07, method='no_pixel')
+    np.testing.assert_allclose(
+        im1.array, im2.array, rtol=1.e-3, atol=1.e-5 * np.max(im2.array),
+        err_msg="Real-space convolution of a TopHat with a box disagrees with 2-d integration")
+
+
 @timer
 def test_realspace_distorted_convolve():
     """
@@ -806,11 +866,141 @@ def test_sum_transform():
         do_pickle(gal2)  # And this.
 
 
+@timer
+def test_large_grid():
+    """Test that Sums and Convolutions drawn on large grids, which are done in strips, match
+    the combination of their components drawn separately.
+    """
+    bulge = galsim.DeVaucouleurs(half_light_radius=0.4, flux=30.).shear(e1=0.2, e2=-0.1)
+    disk = galsim.Exponential(half_light_radius=1.1, flux=60.).shear(g1=-0.3, g2=0.4)
+    knots = galsim.Sum([galsim.Gaussian(sigma=0.1, flux=2.).shift(dx, dy)
+                        for dx, dy in [(0.3, -0.2), (-0.7, 0.1), (0.2, 0.9)]])
+    psf = galsim.Moffat(beta=3.5, fwhm=0.7)
+    pix = galsim.Pixel(scale=0.2)
+    gal = galsim.Sum([bulge, disk.shift(0.1, 0.2), knots])
+    final = galsim.Convolve([gal, psf, pix])
+
+    # 800 x 800 is large enough to be done in several strips.
+    nk = 800
+    dk = 0.04
+    comps = [bulge, disk.shift(0.1, 0.2), knots]
+    re, im = gal.drawKImage(nx=nk, ny=nk, scale=dk)
+    re_sum = np.zeros_like(re.array)
+    im_sum = np.zeros_like(im.array)
+    for comp in comps:
+        re1, im1 = comp.drawKImage(nx=nk, ny=nk, scale=dk)
+        re_sum += re1.array
+        im_sum += im1.array
+    np.testing.assert_almost_equal(re.array, re_sum, decimal=12,
+                                   err_msg="Sum drawKImage on a large grid is incorrect")
+    np.testing.assert_almost_equal(im.array, im_sum, decimal=12,
+                                   err_msg="Sum drawKImage on a large grid is incorrect")
+
+    re, im = final.drawKImage(nx=nk, ny=nk, scale=dk)
+    kval = re_sum + 1j * im_sum
+    for comp in [psf, pix]:
+        re1, im1 = comp.drawKImage(nx=nk, ny=nk, scale=dk)
+        kval *= re1.array + 1j * im1.array
+    np.testing.assert_almost_equal(re.array, kval.real, decimal=12,
+                                   err_msg="Convolve drawKImage on a large grid is incorrect")
+    np.testing.assert_almost_equal(im.array, kval.imag, decimal=12,
+                                   err_msg="Convolve drawKImage on a large grid is incorrect")
+
+    # Also check real space, both with and without a non-trivial wcs.
+    for wcs in [galsim.PixelScale(0.02), galsim.JacobianWCS(0.021, 0.003, -0.002, 0.019)]:
+        image = gal.drawImage(nx=nk, ny=nk, wcs=wcs, method='no_pixel')
+        image_sum = image.copy()
+        image_sum.setZero()
+        for comp in comps:
+            comp.drawImage(image_sum, method='no_pixel', add_to_image=True)
+        np.testing.assert_almost_equal(image.array, image_sum.array, decimal=10,
+                                       err_msg="Sum drawImage on a large grid is incorrect")
+
+
+@timer
+def test_cloud():
+    """Test that a Cloud matches the Sum of the equivalent transformed copies.
+    """
+    rng = np.random.RandomState(8675309)
+    n = 40
+    x = rng.normal(scale=1.2, size=n)
+    y = rng.normal(scale=0.8, size=n)
+    flux = rng.uniform(0.5, 2., size=n)
+    # Use a few distinct dilations, so some copies share them.
+    dilation = rng.choice([0.7, 1., 1.6], size=n)
+    # One negative flux copy.
+    flux[3] = -0.4
+
+    for knot in [ galsim.Gaussian(sigma=0.2, flux=1.7),
+                  galsim.Exponential(half_light_radius=0.3).shear(g1=0.2, g2=0.1) ]:
+        cloud = galsim.Cloud(knot, x, y, flux=flux, dilation=dilation)
+        check = galsim.Sum([ knot.dilate(d).withFlux(f).shift(dx,dy)
+                             for dx, dy, f, d in zip(x, y, flux, dilation) ])
+        np.testing.assert_almost_equal(cloud.flux, np.sum(flux))
+        np.testing.assert_almost_equal(cloud.SBProfile.getPositiveFlux(),
+                                       check.SBProfile.getPositiveFlux())
+        np.testing.assert_almost_equal(cloud.SBProfile.getNegativeFlux(),
+                                       check.SBProfile.getNegativeFlux())
+        np.testing.assert_almost_equal(cloud.centroid().x, check.centroid().x)
+        np.testing.assert_almost_equal(cloud.centroid().y, check.centroid().y)
+        np.testing.assert_almost_equal(cloud.maxK(), check.maxK())
+        np.testing.assert_almost_equal(cloud.calculateMomentRadius(),
+                                       check.calculateMomentRadius())
+
+        np.testing.assert_almost_equal(cloud.xValue(0.3,-0.2), check.xValue(0.3,-0.2))
+        np.testing.assert_almost_equal(cloud.kValue(0.3,-0.2), check.kValue(0.3,-0.2))
+
+        # Draw in k space, both on a regular grid and with a non-trivial wcs.
+        re1, im1 = cloud.drawKImage(nx=64, ny=64, scale=0.1)
+        re2, im2 = check.drawKImage(nx=64, ny=64, scale=0.1)
+        np.testing.assert_almost_equal(re1.array, re2.array, decimal=10)
+        np.testing.assert_almost_equal(im1.array, im2.array, decimal=10)
+        wcs = galsim.JacobianWCS(0.21, 0.03, -0.02, 0.19)
+        im1 = cloud.drawImage(nx=64, ny=64, wcs=wcs)
+        im2 = check.drawImage(nx=64, ny=64, wcs=wcs)
+        np.testing.assert_almost_equal(im1.array, im2.array, decimal=8)
+        im1 = cloud.drawImage(nx=64, ny=64, wcs=wcs, method='no_pixel')
+        im2 = check.drawImage(nx=64, ny=64, wcs=wcs, method='no_pixel')
+        np.testing.assert_almost_equal(im1.array, im2.array, decimal=8)
+
+        # Photon shooting
+        im1 = cloud.drawImage(nx=64, ny=64, scale=0.2, method='phot', n_photons=300000,
+                              rng=galsim.BaseDeviate(1234))
+        im2 = check.drawImage(nx=64, ny=64, scale=0.2)
+        np.testing.assert_almost_equal(im1.array.sum(), np.sum(flux), decimal=1)
+        np.testing.assert_array_almost_equal(im1.array / np.sum(flux), im2.array / np.sum(flux),
+                                             decimal=2)
+
+    # Default flux and dilation
+    cloud = galsim.Cloud(knot, x, y)
+    np.testing.assert_almost_equal(cloud.flux, n * knot.flux)
+    np.testing.assert_array_equal(cloud.dilation, np.ones(n))
+
+    # Check picklability
+    cloud = galsim.Cloud(knot, x[:5], y[:5], flux=flux[:5], dilation=dilation[:5])
+    do_pickle(cloud.SBProfile,
+              lambda x: (repr(x.getObj()), x.getX(), x.getY(), x.getFluxRatio(), x.getScale()))
+    do_pickle(cloud, lambda x: x.drawImage(nx=20, ny=20, scale=0.3))
+    do_pickle(cloud)
+    do_pickle(cloud.SBProfile)
+
+    try:
+        np.testing.assert_raises(TypeError, galsim.Cloud, 3., x, y)
+        np.testing.assert_raises(ValueError, galsim.Cloud, knot, [], [])
+        np.testing.assert_raises(ValueError, galsim.Cloud, knot, x, y[:3])
+        np.testing.assert_raises(ValueError, galsim.Cloud, knot, x, y, flux=flux[:3])
+        np.testing.assert_raises(ValueError, galsim.Cloud, knot, x, y, dilation=-dilation)
+        np.testing.assert_raises(ValueError, galsim.Cloud, knot * 0, x, y)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
 if __name__ == "__main__":
     test_convolve()
     test_convolve_flux_scaling()
     test_shearconvolve()
     test_realspace_convolve()
+    test_realspace_box()
     test_realspace_distorted_convolve()
     test_realspace_shearconvolve()
     test_add()
@@ -820,3 +1010,5 @@ if __name__ == "__main__":
     test_ne()
     test_fourier_sqrt()
     test_sum_transform()
+    test_large_grid()
+    test_cloud()
@@ -987,6 +987,180 @@ def test_offset():
                 "obj.drawImage(im, offset=%f,%f) different from use_true_center=False")
 
 
+@timer
+def test_draw_phot_threads():
+    """Test photon shooting with multiple threads.
+    """
+    obj = galsim.Exponential(flux=1.e6, scale_radius=1.09)
+    test_scale = 0.28
+    N = 64
+    nphot = 1.e6  # Enough for 10 chunks of photons.
+
+    # The same seed and number of threads should give identical results.
+    im1 = obj.drawImage(nx=N, ny=N, scale=test_scale, dtype=float, method='phot',
+                        n_photons=nphot, rng=galsim.BaseDeviate(1234), n_threads=3)
+    im2 = obj.drawImage(nx=N, ny=N, scale=test_scale, dtype=float, method='phot',
+                        n_photons=nphot, rng=galsim.BaseDeviate(1234), n_threads=3)
+    np.testing.assert_array_equal(
+            im1.array, im2.array,
+            "drawImage with n_threads=3 is not reproducible")
+
+    # A different number of threads shoots the same photons, only binned in a different order.
+    im3 = obj.drawImage(nx=N, ny=N, scale=test_scale, dtype=float, method='phot',
+                        n_photons=nphot, rng=galsim.BaseDeviate(1234), n_threads=2)
+    np.testing.assert_array_almost_equal(
+            im1.array, im3.array, 8,
+            "drawImage with n_threads=2 differs from n_threads=3")
+    np.testing.assert_almost_equal(
+            im1.added_flux, im3.added_flux, 6,
+            "added_flux with n_threads=2 differs from n_threads=3")
+
+    # Compare to the serial version, which uses a different rng sequence, so only
+    # statistically equivalent.
+    im4 = obj.drawImage(nx=N, ny=N, scale=test_scale, dtype=float, method='phot',
+                        n_photons=nphot, rng=galsim.BaseDeviate(1234))
+    print('threaded flux = ',im1.array.sum(),' serial flux = ',im4.array.sum())
+    np.testing.assert_allclose(
+            im1.array.sum(), im4.array.sum(), rtol=1.e-3,
+            err_msg="drawImage with n_threads=3 has different flux than serial version")
+    mom1 = galsim.hsm.FindAdaptiveMom(im1)
+    mom4 = galsim.hsm.FindAdaptiveMom(im4)
+    np.testing.assert_allclose(
+            mom1.moments_sigma, mom4.moments_sigma, rtol=3.e-3,
+            err_msg="drawImage with n_threads=3 has different size than serial version")
+
+    # Invalid n_threads values
+    try:
+        np.testing.assert_raises(ValueError, obj.drawImage, method='phot', n_threads=0)
+        np.testing.assert_raises(ValueError, obj.drawImage, method='phot', n_threads=2,
+                                 max_extra_noise=1.)
+        np.testing.assert_raises(ValueError, obj.drawImage, method='fft', n_threads=2)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_drawOffsetImages():
+    """Test that drawOffsetImages matches drawImage with the corresponding offsets.
+    """
+    obj = galsim.Sersic(n=2.3, half_light_radius=0.7, flux=1.7).shear(g1=0.2, g2=-0.1)
+    obj = galsim.Convolve(obj, galsim.Moffat(beta=3.5, fwhm=0.6))
+    test_scale = 0.2
+    offsets = [ (0., 0.), galsim.PositionD(0.5, 0.), (-0.25, 0.75), (1.3, -2.1) ]
+
+    for nx, ny in [ (40, 40), (41, 40), (33, 37) ]:
+        for method in ['fft', 'no_pixel']:
+            for use_true_center in [True, False]:
+                im_list = obj.drawOffsetImages(offsets, nx=nx, ny=ny, scale=test_scale,
+                                               method=method, use_true_center=use_true_center)
+                assert len(im_list) == len(offsets)
+                for offset, im1 in zip(offsets, im_list):
+                    im2 = obj.drawImage(nx=nx, ny=ny, scale=test_scale, method=method,
+                                        offset=offset, use_true_center=use_true_center)
+                    assert im1.bounds == im2.bounds
+                    assert im1.scale == im2.scale
+                    np.testing.assert_array_almost_equal(
+                            im1.array, im2.array, 6,
+                            "drawOffsetImages differs from drawImage for offset=%s, size=%d,%d, "
+                            "method=%s"%(offset, nx, ny, method))
+                    np.testing.assert_almost_equal(
+                            im1.added_flux, im2.added_flux, 6,
+                            "drawOffsetImages added_flux differs from drawImage")
+
+    # If an image is given, it is used for the first offset.
+    im = galsim.ImageD(32, 32, scale=test_scale)
+    im_list = obj.drawOffsetImages(offsets, image=im)
+    assert im_list[0] is im
+    assert all(im2.bounds == im.bounds for im2 in im_list)
+    np.testing.assert_array_almost_equal(
+            im.array, obj.drawImage(nx=32, ny=32, scale=test_scale, method='fft').array, 6,
+            "drawOffsetImages with given image differs from drawImage")
+
+    # The result can be interleaved the same as separate drawImage calls.
+    n = 2
+    offsets = [ galsim.PositionD(i/float(n)-0.25, j/float(n)-0.25)
+                for i in range(n) for j in range(n) ]
+    im_list = obj.drawOffsetImages(offsets, nx=20, ny=20, scale=test_scale*n)
+    img = galsim.utilities.interleaveImages(im_list, N=(n,n), offsets=offsets)
+    im_list2 = [ obj.drawImage(nx=20, ny=20, scale=test_scale*n, offset=offset)
+                 for offset in offsets ]
+    img2 = galsim.utilities.interleaveImages(im_list2, N=(n,n), offsets=offsets)
+    np.testing.assert_array_almost_equal(
+            img.array, img2.array, 6,
+            "Interleaved drawOffsetImages differs from interleaved drawImage")
+
+    # For elongated profiles, the FFT has different sizes in x and y.  Make sure these match
+    # what drawImage uses, including the folding for a profile that is too large for the image.
+    obj2 = galsim.Convolve(galsim.Exponential(half_light_radius=0.8).shear(g1=0.7, g2=0.1),
+                           galsim.Airy(lam_over_diam=0.2))
+    stepkx, stepky = obj2.SBProfile.getStepKXY()
+    assert stepkx < 0.7 * stepky
+    offsets = [ (0., 0.), (0.3, -0.4), (-1.2, 2.5) ]
+    for nx, ny in [ (64, 24), (20, 20) ]:
+        im_list = obj2.drawOffsetImages(offsets, nx=nx, ny=ny, scale=test_scale)
+        for offset, im1 in zip(offsets, im_list):
+            im2 = obj2.drawImage(nx=nx, ny=ny, scale=test_scale, offset=offset)
+            np.testing.assert_array_almost_equal(
+                    im1.array, im2.array, 6,
+                    "drawOffsetImages differs from drawImage for elongated profile, "
+                    "offset=%s, size=%d,%d"%(offset, nx, ny))
+
+    try:
+        np.testing.assert_raises(ValueError, obj.drawOffsetImages, offsets, nx=20, ny=20,
+                                 scale=test_scale, method='phot')
+        np.testing.assert_raises(ValueError, obj.drawOffsetImages, offsets, nx=20, ny=20,
+                                 scale=test_scale, method='real_space')
+        np.testing.assert_raises(ValueError, obj.drawOffsetImages, offsets, nx=20, ny=20)
+        np.testing.assert_raises(ValueError, obj.drawOffsetImages, offsets, nx=20, ny=20,
+                                 scale=test_scale, gain=0.)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_value_arrays():
+    """Test xValue and kValue with arrays of positions.
+    """
+    rng = galsim.UniformDeviate(8675309)
+    x = np.empty(40)
+    y = np.empty(40)
+    galsim.GaussianDeviate(rng, sigma=1.).generate(x)
+    galsim.GaussianDeviate(rng, sigma=1.).generate(y)
+
+    im = galsim.Gaussian(sigma=1.2).drawImage(nx=30, ny=30, scale=0.2)
+    objs = [ galsim.Sersic(n=2.3, half_light_radius=1.1, flux=3.),
+             galsim.Exponential(scale_radius=0.8).shear(g1=0.2, g2=-0.3).shift(0.3, 0.1) * 2.,
+             galsim.Gaussian(sigma=1.) + galsim.Moffat(beta=2.5, fwhm=1.5).shift(-0.2, 0.4),
+             galsim.InterpolatedImage(im).rotate(32 * galsim.degrees),
+           ]
+    for obj in objs:
+        xvals = obj.xValue(x, y)
+        kvals = obj.kValue(x, y)
+        assert xvals.shape == x.shape
+        assert kvals.dtype == complex
+        for i in range(len(x)):
+            np.testing.assert_almost_equal(xvals[i], obj.xValue(x[i], y[i]), 12,
+                                           "xValue array does not match single values")
+            np.testing.assert_almost_equal(kvals[i], obj.kValue(x[i], y[i]), 12,
+                                           "kValue array does not match single values")
+
+        # Other ways to give the positions.
+        np.testing.assert_array_equal(obj.xValue(x=x, y=y), xvals)
+        np.testing.assert_array_equal(obj.kValue(kx=x, ky=y), kvals)
+        np.testing.assert_array_equal(obj.xValue(list(x), list(y)), xvals)
+        np.testing.assert_array_equal(obj.xValue(x.reshape(5,8), y.reshape(5,8)),
+                                      xvals.reshape(5,8))
+        np.testing.assert_array_equal(obj.xValue(x, 0.3), obj.xValue(x, 0.3*np.ones_like(x)))
+
+    # Profiles that are not analytic in real space still raise an exception.
+    conv = galsim.Convolve(objs[0], objs[1])
+    np.testing.assert_almost_equal(conv.kValue(x, y)[3], conv.kValue(x[3], y[3]), 12)
+    try:
+        np.testing.assert_raises(RuntimeError, conv.xValue, x, y)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
 if __name__ == "__main__":
     test_drawImage()
     test_draw_methods()
@@ -994,3 +1168,6 @@ if __name__ == "__main__":
     test_drawKImage_Gaussian()
     test_drawKImage_Exponential_Moffat()
     test_offset()
+    test_draw_phot_threads()
+    test_drawOffsetImages()
+    test_value_arrays()
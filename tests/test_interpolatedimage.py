@@ -969,6 +969,107 @@ def test_stepk_maxk():
     do_pickle(new_int_im)
 
 
+@timer
+def test_with_image():
+    """Test making InterpolatedImages from a template with withImage.
+    """
+    scale = 0.2
+    rng = galsim.UniformDeviate(1234)
+    obj = galsim.Sersic(n=2.1, half_light_radius=0.5)
+    psf = galsim.Moffat(beta=3., fwhm=0.7)
+    im1 = galsim.Convolve(obj, psf).drawImage(nx=40, ny=40, scale=scale)
+    int_im1 = galsim.InterpolatedImage(im1)
+
+    for e1, e2 in [ (0.1, 0.), (0.2, -0.3), (0.05, 0.4) ]:
+        gal = galsim.Convolve(obj.shear(e1=e1, e2=e2), psf)
+        im2 = gal.drawImage(nx=40, ny=40, scale=scale)
+        im2.addNoise(galsim.GaussianNoise(rng, sigma=1.e-4))
+        int_im2 = int_im1.withImage(im2)
+        np.testing.assert_equal(int_im2.stepK(), int_im1.stepK())
+        np.testing.assert_equal(int_im2.maxK(), int_im1.maxK())
+        assert int_im2 == galsim.InterpolatedImage(
+                im2, _serialize_stepk=int_im1._serialize_stepk,
+                _serialize_maxk=int_im1._serialize_maxk)
+
+        # The profile should match the one made with the full constructor.
+        int_im3 = galsim.InterpolatedImage(im2)
+        test_im2 = int_im2.drawImage(nx=50, ny=50, scale=scale, method='no_pixel')
+        test_im3 = int_im3.drawImage(nx=50, ny=50, scale=scale, method='no_pixel')
+        np.testing.assert_array_almost_equal(
+                test_im2.array, test_im3.array, 5,
+                "InterpolatedImage made with withImage does not match full constructor")
+
+    # Other parameters of the template are retained.
+    im2.wcs = None
+    int_im1 = galsim.InterpolatedImage(im1, x_interpolant='lanczos5', normalization='sb',
+                                       scale=0.3, pad_factor=6.)
+    int_im2 = int_im1.withImage(im2, offset=(0.3,-0.2))
+    int_im3 = galsim.InterpolatedImage(im2, x_interpolant='lanczos5', normalization='sb',
+                                       scale=0.3, pad_factor=6., offset=(0.3,-0.2),
+                                       _serialize_stepk=int_im1._serialize_stepk,
+                                       _serialize_maxk=int_im1._serialize_maxk)
+    assert int_im2 == int_im3
+    np.testing.assert_almost_equal(int_im2.getFlux(), im2.array.sum() * 0.3**2)
+    do_pickle(int_im2)
+
+    try:
+        np.testing.assert_raises(ValueError, int_im1.withImage, galsim.ImageD(41, 40))
+        np.testing.assert_raises(TypeError, int_im1.withImage, im2.array)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_table_cache():
+    """Test that InterpolatedImages made from identical images share their internal tables.
+    """
+    obj = galsim.Sersic(n=1.7, half_light_radius=0.6)
+    im1 = obj.drawImage(nx=32, ny=32, scale=0.2)
+    galsim.InterpolatedImage._cache_tables.clear()
+
+    # The same array, or a copy of it, should reuse the same tables.
+    int_im1 = galsim.InterpolatedImage(im1)
+    int_im2 = galsim.InterpolatedImage(im1)
+    int_im3 = galsim.InterpolatedImage(im1.copy(), flux=17.)
+    assert int_im2._sbii is int_im1._sbii
+    assert int_im3._sbii is int_im1._sbii
+    np.testing.assert_almost_equal(int_im3.getFlux(), 17.)
+    np.testing.assert_equal(int_im3.stepK(), int_im1.stepK())
+    np.testing.assert_equal(int_im3.maxK(), int_im1.maxK())
+
+    # Anything that changes the tables should not.
+    for kwargs in [ dict(x_interpolant='lanczos5'), dict(k_interpolant='linear'),
+                    dict(pad_factor=6.), dict(calculate_maxk=False),
+                    dict(gsparams=galsim.GSParams(folding_threshold=1.e-3)),
+                    dict(use_cache=False) ]:
+        int_im4 = galsim.InterpolatedImage(im1, **kwargs)
+        assert int_im4._sbii is not int_im1._sbii
+    int_im4 = galsim.InterpolatedImage(im1, noise_pad_size=10, noise_pad=1.e-6,
+                                       rng=galsim.BaseDeviate(1234))
+    assert int_im4._sbii is not int_im1._sbii
+
+    # Nor should modifying the image in place.
+    im1.array[10,10] += 0.01
+    int_im4 = galsim.InterpolatedImage(im1)
+    assert int_im4._sbii is not int_im1._sbii
+    test_im = int_im4.drawImage(nx=32, ny=32, scale=0.2, method='no_pixel')
+    np.testing.assert_almost_equal(test_im.array, im1.array, 6,
+                                   "InterpolatedImage does not match modified image")
+
+    # A cache that can only hold one entry evicts the least recently used one.
+    Nk = galsim._galsim.goodFFTSize(int(4. * 32))
+    galsim.InterpolatedImage.resizeTableCache(16 * Nk * Nk)
+    assert len(galsim.InterpolatedImage._cache_tables.cache) == 1
+    assert galsim.InterpolatedImage(im1)._sbii is int_im4._sbii
+    im1.array[10,10] -= 0.01
+    assert galsim.InterpolatedImage(im1)._sbii is not int_im1._sbii
+
+    # Setting the size to 0 turns off the caching.
+    galsim.InterpolatedImage.resizeTableCache(0)
+    assert galsim.InterpolatedImage(im1)._sbii is not galsim.InterpolatedImage(im1)._sbii
+    galsim.InterpolatedImage.resizeTableCache(128 * 1024**2)
+
+
 @timer
 def test_kroundtrip():
     a = final
@@ -1174,6 +1275,8 @@ if __name__ == "__main__":
     test_Lanczos7_ref()
     test_conserve_dc()
     test_stepk_maxk()
+    test_with_image()
+    test_table_cache()
     test_kroundtrip()
     test_multihdu_readin()
     test_ne()
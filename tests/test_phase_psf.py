@@ -18,6 +18,7 @@
 
 from __future__ import print_function
 import os
+import pickle
 import numpy as np
 from galsim_test_helpers import *
 
@@ -52,6 +53,128 @@ def test_aperture():
     assert aper1 == aper2, err_str
 
 
+@timer
+def test_aperture_cache():
+    """Test that Apertures constructed implicitly are reused when the parameters match."""
+    lam = 700.0
+    kwargs = dict(diam=1.2, obscuration=0.2, nstruts=3, strut_angle=10*galsim.degrees)
+    psf1 = galsim.OpticalPSF(lam=lam, defocus=0.1, **kwargs)
+    psf2 = galsim.OpticalPSF(lam=lam, coma1=-0.3, **kwargs)
+    assert psf2._psf.aper is psf1._psf.aper
+    # The cached Aperture is identical to one made directly.  (OpticalPSF doesn't use the
+    # wavelength for its Aperture, since the pupil geometry doesn't depend on it.)
+    aper = galsim.Aperture(**kwargs)
+    assert aper == psf1._psf.aper
+    psf3 = galsim.OpticalPSF(lam=lam, coma1=-0.3, aper=aper)
+    np.testing.assert_array_equal(psf3._psf.img.array, psf2._psf.img.array)
+    # Different parameters give a different Aperture.
+    psf4 = galsim.OpticalPSF(lam=lam, defocus=0.1, diam=1.2, obscuration=0.2, nstruts=4,
+                             strut_angle=10*galsim.degrees)
+    assert psf4._psf.aper is not psf1._psf.aper
+    assert psf4._psf.aper != psf1._psf.aper
+    # But the coordinate grids are shared, since the struts don't change the pupil plane sampling.
+    assert psf4._psf.aper.u is psf1._psf.aper.u
+    assert psf4._psf.aper.rsqr is psf1._psf.aper.rsqr
+    assert not psf1._psf.aper.u.flags.writeable
+
+    # The same for PhaseScreenPSFs, for which the Aperture depends on the screens through their
+    # stepK.
+    atm1 = galsim.Atmosphere(screen_size=10.0, r0_500=0.2, rng=galsim.BaseDeviate(1))
+    atm2 = galsim.Atmosphere(screen_size=10.0, r0_500=0.2, rng=galsim.BaseDeviate(2))
+    atm3 = galsim.Atmosphere(screen_size=10.0, r0_500=0.1, rng=galsim.BaseDeviate(3))
+    psf1 = atm1.makePSF(lam=lam, diam=1.2)
+    psf2 = atm2.makePSF(lam=lam, diam=1.2)
+    psf3 = atm3.makePSF(lam=lam, diam=1.2)
+    assert psf2.aper is psf1.aper
+    assert psf1.aper == galsim.Aperture(lam=lam, diam=1.2, screen_list=atm1)
+    assert psf3.aper != psf1.aper
+    assert psf3.aper == galsim.Aperture(lam=lam, diam=1.2, screen_list=atm3)
+
+    # A pupil plane image is only cached when given as a file name.
+    im = galsim.fits.read(os.path.join(imgdir, pp_file))
+    psf1 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=im)
+    psf2 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=im)
+    assert psf2._psf.aper is not psf1._psf.aper
+    assert psf2._psf.aper == psf1._psf.aper
+    psf1 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=os.path.join(imgdir, pp_file))
+    psf2 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=os.path.join(imgdir, pp_file))
+    assert psf2._psf.aper is psf1._psf.aper
+
+    # If the file is rewritten, the Aperture is made again from the new file.
+    file_name = os.path.join('output', 'pupil_plane_cache.fits')
+    im.write(file_name)
+    psf1 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=file_name)
+    im2 = im.copy()
+    im2.array[:im2.array.shape[0]//2, :] = 0.
+    im2.write(file_name)
+    os.utime(file_name, (os.path.getatime(file_name), os.path.getmtime(file_name) + 10))
+    psf2 = galsim.OpticalPSF(lam=lam, diam=1.2, pupil_plane_im=file_name)
+    assert psf2._psf.aper is not psf1._psf.aper
+    assert psf2._psf.aper != psf1._psf.aper
+
+    # The cache is bounded by the memory held by the Apertures, including their Zernike bases.
+    cache = galsim.phase_psf._aperture_cache
+    assert cache.nbytes <= cache.max_bytes
+    aper = psf1._psf.aper
+    assert aper._nbytes() >= aper.illuminated.nbytes
+    max_bytes = cache.max_bytes
+    cache.resize(aper._nbytes() - 1)
+    assert all(entry[0] is not aper for entry in cache.cache.values())
+    cache.resize(max_bytes)
+
+
+@timer
+def test_optical_psf_cache():
+    """Test that OpticalPSFs at different wavelengths share their Aperture and PSF image."""
+    kwargs = dict(diam=2.4, obscuration=0.3, nstruts=4)
+    aberrations = [0, 0, 0, 0, 0.2, 0.1, -0.05, 0.1]
+    psf1 = galsim.OpticalPSF(lam=600.0, aberrations=aberrations, **kwargs)
+    psf2 = galsim.OpticalPSF(lam=900.0, aberrations=aberrations, flux=3.0, **kwargs)
+    assert psf2._psf.aper is psf1._psf.aper
+    # The image array is the same, but with a scale proportional to the wavelength.
+    np.testing.assert_almost_equal(psf2._psf.scale / psf1._psf.scale, 1.5)
+    np.testing.assert_allclose(psf2._psf.img.array * psf2._psf.scale**2 / 3.0,
+                               psf1._psf.img.array * psf1._psf.scale**2, rtol=1.e-12)
+    np.testing.assert_almost_equal(psf2.getFlux(), 3.0)
+    np.testing.assert_almost_equal(psf2.stepK() / psf1.stepK(), 1./1.5)
+    np.testing.assert_almost_equal(psf2.maxK() / psf1.maxK(), 1./1.5)
+
+    # The maxk is the band limit of the aperture, 2 pi diam / lambda, up to one pupil pixel.
+    maxk = 2.*np.pi * 2.4 / 600.e-9 * galsim.arcsec / galsim.radians
+    print('maxk = ',psf1.maxK(), maxk)
+    assert maxk <= psf1.maxK() <= maxk * (1. + 2.*psf1._psf.aper.pupil_plane_scale / 2.4)
+
+    # The result is the same as integrating an OpticalScreen with PhaseScreenPSF.
+    screen = galsim.OpticalScreen(aberrations=aberrations, lam_0=600.0)
+    psf3 = galsim.PhaseScreenPSF(screen, lam=600.0, aper=psf1._psf.aper)
+    im1 = psf1.drawImage(nx=64, ny=64, scale=0.02, method='no_pixel')
+    im3 = psf3.drawImage(nx=64, ny=64, scale=0.02, method='no_pixel')
+    np.testing.assert_allclose(im1.array, im3.array, rtol=0, atol=1.e-10*np.max(im3.array))
+
+    # ChromaticOpticalPSF gives the same profiles when evaluated again at the same wavelength, and
+    # they still pickle correctly.
+    cpsf = galsim.ChromaticOpticalPSF(lam=700.0, aberrations=aberrations, **kwargs)
+    psf4 = cpsf.evaluateAtWavelength(650.0)
+    psf5 = cpsf.evaluateAtWavelength(650.0)
+    assert psf5._psf.aper is psf1._psf.aper
+    assert psf4 == psf5
+    assert pickle.loads(pickle.dumps(psf4)) == psf4
+
+    # The cache is keyed on a digest of the pupil, not the Aperture, so equal Apertures made
+    # separately (here from a pupil image array, which are not cached themselves) share the PSF
+    # image.
+    cache = galsim.phase_psf._optical_psf_cache
+    im = galsim.fits.read(os.path.join(imgdir, pp_file))
+    psf6 = galsim.OpticalPSF(lam=600.0, diam=2.4, aberrations=aberrations, pupil_plane_im=im)
+    nentries = len(cache.cache)
+    psf7 = galsim.OpticalPSF(lam=800.0, diam=2.4, aberrations=aberrations, pupil_plane_im=im)
+    assert psf7._psf.aper is not psf6._psf.aper
+    assert len(cache.cache) == nentries
+    np.testing.assert_allclose(psf7._psf.img.array * psf7._psf.scale**2,
+                               psf6._psf.img.array * psf6._psf.scale**2, rtol=1.e-12)
+    assert not any(isinstance(k, galsim.Aperture) for key in cache.cache for k in key)
+
+
 @timer
 def test_atm_screen_size():
     """Test for consistent AtmosphericScreen size and scale."""
@@ -102,6 +225,64 @@ def test_structure_function():
                                    err_msg="Simulated structure function not close to prediction.")
 
 
+@timer
+def test_atm_screen_storage():
+    """Test the single precision, real FFT generation of AtmosphericScreen."""
+    rng = galsim.BaseDeviate(1234)
+    atm = galsim.AtmosphericScreen(screen_size=10.0, screen_scale=0.1, alpha=0.99, rng=rng)
+    npix = atm.npix
+    assert atm.psi.dtype == np.float32
+    assert atm.psi.shape == (npix, npix//2+1)
+    assert atm.screen.dtype == np.float32
+    atm.advance()
+    assert atm.screen.dtype == np.float32
+
+    # The same as using the full complex FFT with the full power spectrum.
+    psi = np.concatenate([atm.psi, atm.psi[:, 1:npix//2][:, ::-1]], axis=1).astype(float)
+    noise = galsim.utilities.rand_arr((npix, npix), galsim.GaussianDeviate(atm.rng.duplicate()))
+    screen1 = np.fft.ifft2(np.fft.fft2(noise)*psi).real
+    screen2 = atm._random_screen()
+    np.testing.assert_allclose(screen2, screen1, rtol=0, atol=1.e-6*np.max(np.abs(screen1)))
+
+
+@timer
+def test_phase_screen_io():
+    """Test writing and reading a PhaseScreenList."""
+    rng = galsim.BaseDeviate(31415)
+    atm = galsim.Atmosphere(screen_size=10.0, screen_scale=0.25, altitude=[0.0, 5.0],
+                            alpha=[1.0, 0.97], speed=[3.0, 5.0],
+                            direction=[0*galsim.degrees, 60*galsim.degrees], L0=[25.0, None],
+                            rng=rng)
+    atm.append(galsim.OpticalScreen(defocus=0.3, coma2=-0.1, lam_0=700.0))
+    atm.advance_by(0.1)
+    aper = galsim.Aperture(diam=1.0, lam=700.0)
+
+    for file_name in ['output/phase_screens.fits', 'output/phase_screens.fits.gz']:
+        atm.write(file_name)
+        atm2 = galsim.PhaseScreenList.read(file_name)
+        assert atm2 == atm
+        assert atm2[0].tab2d.f.shape == atm[0].tab2d.f.shape
+        np.testing.assert_array_equal(atm2.wavefront(aper), atm.wavefront(aper))
+        theta = (10*galsim.arcsec, -5*galsim.arcsec)
+        np.testing.assert_array_equal(atm2.wavefront(aper, theta), atm.wavefront(aper, theta))
+
+    # The screens evolve in the same way as the originals, and reset to the same initial state.
+    atm.advance()
+    atm2.advance()
+    assert atm2 == atm
+    np.testing.assert_array_equal(atm2.wavefront(aper), atm.wavefront(aper))
+    atm.reset()
+    atm2.reset()
+    assert atm2 == atm
+    np.testing.assert_array_equal(atm2.wavefront(aper), atm.wavefront(aper))
+
+    # The repr of a boiling screen includes the screen only once.
+    from numpy import array, float32
+    r = repr(atm[1])
+    assert '_psi' not in r and '_tab2d' not in r
+    assert eval(r) == atm[1]
+
+
 @timer
 def test_phase_screen_list():
     """Test list-like behaviors of PhaseScreenList."""
@@ -307,6 +488,58 @@ def test_phase_psf_batch():
             psf1.img, psf2.img,
             "Individually generated AtmosphericPSF differs from AtmosphericPSF generated in batch")
 
+    # Include an optical screen, and force the Fourier transforms to be done in several batches.
+    atm.append(galsim.OpticalScreen(defocus=0.3, coma1=-0.2, astig2=0.1, lam_0=1000.0))
+    save_batch_bytes = galsim.phase_psf._batch_bytes
+    try:
+        aper = galsim.Aperture(diam=1.0, lam=1000.0, obscuration=0.2, nstruts=3)
+        galsim.phase_psf._batch_bytes = 3 * 16 * np.prod(aper.illuminated.shape)
+        atm.reset()
+        psfs = atm.makePSF(theta=theta, lam=1000.0, exptime=exptime, aper=aper)
+    finally:
+        galsim.phase_psf._batch_bytes = save_batch_bytes
+    for th, psf1 in zip(theta, psfs):
+        atm.reset()
+        psf2 = atm.makePSF(theta=th, lam=1000.0, exptime=exptime, aper=aper)
+        np.testing.assert_array_equal(
+            psf1.img, psf2.img,
+            "Individually generated PhaseScreenPSF differs from PhaseScreenPSF generated in batch")
+
+
+@timer
+def test_phase_psf_threads():
+    """Test that the threaded time integration matches the serial one."""
+    rng = galsim.BaseDeviate(5678)
+    # With the default time_step of 0.03, this is 10 time steps, so each thread gets several, and
+    # neither 3 nor 4 threads divide them evenly.
+    kwargs = dict(lam=700.0, exptime=0.3, diam=1.0, theta=(0.3*galsim.arcsec, -0.2*galsim.arcsec))
+    # Frozen flow and boiling screens.
+    for alpha in [1.0, 0.99]:
+        atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], r0_500=0.15,
+                                speed=[10.0, 15.0], direction=[0*galsim.degrees, 60*galsim.degrees],
+                                alpha=alpha, rng=rng.duplicate())
+        atm.append(galsim.OpticalScreen(defocus=0.2, lam_0=700.0))
+        psf1 = atm.makePSF(**kwargs)
+        assert psf1._nstep == 10
+        for n_threads in [3, 4]:
+            atm.reset()
+            psf2 = atm.makePSF(n_threads=n_threads, **kwargs)
+            np.testing.assert_allclose(
+                psf2.img.array, psf1.img.array, rtol=1.e-10,
+                err_msg="PhaseScreenPSF with n_threads=%d differs from serial"%n_threads)
+        # The screens are left in the same state either way.
+        atm2 = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], r0_500=0.15,
+                                 speed=[10.0, 15.0], direction=[0*galsim.degrees, 60*galsim.degrees],
+                                 alpha=alpha, rng=rng.duplicate())
+        atm2.makePSF(**kwargs)
+        for layer, layer2 in zip(atm, atm2):
+            np.testing.assert_array_equal(layer.origin, layer2.origin)
+
+    try:
+        np.testing.assert_raises(ValueError, atm.makePSF, n_threads=0, **kwargs)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
 
 @timer
 def test_opt_indiv_aberrations():
@@ -324,6 +557,46 @@ def test_opt_indiv_aberrations():
             "Individually specified aberrations differs from aberrations specified as list.")
 
 
+@timer
+def test_zernike_basis():
+    """Test that the cached Zernike basis gives the same wavefronts as direct evaluation."""
+    aper = galsim.Aperture(diam=1.7, lam=500.0, obscuration=0.3)
+    rng = np.random.RandomState(5772)
+    aberrations = np.zeros((5, 23))
+    aberrations[:, 2:] = rng.normal(scale=0.1, size=(5, 21))
+    rho = aper.rho[aper.illuminated]
+    rsqr = np.abs(rho)**2
+    for ab in aberrations:
+        screen = galsim.OpticalScreen(aberrations=ab, lam_0=700.0)
+        direct = galsim.phase_screens.horner2d(rsqr, rho, screen.coef_array).real * 700.0
+        np.testing.assert_allclose(screen.wavefront(aper), direct, rtol=0, atol=1e-10)
+        # The non-compact wavefront agrees over the illuminated pixels.
+        np.testing.assert_allclose(screen.wavefront(aper, compact=False)[aper.illuminated],
+                                   direct, rtol=0, atol=1e-10)
+
+    # Many sets of aberrations at once give the same answer as one at a time.
+    wfs = galsim.phase_screens.zernike_wavefront(aper, aberrations, lam_0=700.0)
+    assert wfs.shape == (5, np.count_nonzero(aper.illuminated))
+    for ab, wf in zip(aberrations, wfs):
+        screen = galsim.OpticalScreen(aberrations=ab, lam_0=700.0)
+        np.testing.assert_allclose(wf, screen.wavefront(aper), rtol=0, atol=1e-10)
+
+    # The basis is kept with the Aperture, and only recomputed if more terms are needed.
+    basis = aper._zernike_basis(11)
+    assert aper._zernike_basis(4) is basis
+    assert not basis.flags.writeable
+    assert len(aper._zernike_basis(30)) == 31
+    # Row j is Noll Zernike j, which are orthogonal over an unobscured circular pupil.
+    aper2 = galsim.Aperture(diam=1.0, lam=500.0, oversampling=4.0)
+    basis = aper2._zernike_basis(11)
+    gram = np.dot(basis[1:], basis[1:].T) / basis.shape[1]
+    np.testing.assert_allclose(gram, np.eye(11), atol=0.1)
+    # The cached basis is not pickled.
+    aper3 = pickle.loads(pickle.dumps(aper2))
+    assert not hasattr(aper3, '_zern_basis')
+    assert aper3 == aper2
+
+
 @timer
 def test_scale_unit():
     """Test that `scale_unit` keyword correctly sets the units for PhaseScreenPSF."""
@@ -422,12 +695,18 @@ def test_ne():
 
 if __name__ == "__main__":
     test_aperture()
+    test_aperture_cache()
+    test_optical_psf_cache()
     test_atm_screen_size()
     test_structure_function()
+    test_atm_screen_storage()
+    test_phase_screen_io()
     test_phase_screen_list()
     test_frozen_flow()
     test_phase_psf_reset()
     test_phase_psf_batch()
+    test_phase_psf_threads()
     test_opt_indiv_aberrations()
+    test_zernike_basis()
     test_scale_unit()
     test_ne()
@@ -0,0 +1,309 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+from __future__ import print_function
+import numpy as np
+import os
+import sys
+
+from galsim_test_helpers import *
+
+try:
+    import galsim
+except ImportError:
+    path, filename = os.path.split(__file__)
+    sys.path.append(os.path.abspath(os.path.join(path, "..")))
+    import galsim
+
+path, filename = os.path.split(__file__)
+bppath = os.path.abspath(os.path.join(path, "../examples/data/"))
+sedpath = os.path.abspath(os.path.join(path, "../share/"))
+
+
+@timer
+def test_photon_array():
+    """Test the basic methods of PhotonArray class
+    """
+    nphotons = 1000
+
+    # First create from scratch
+    photon_array = galsim.PhotonArray(nphotons)
+    assert len(photon_array.x) == nphotons
+    assert len(photon_array.y) == nphotons
+    assert len(photon_array.flux) == nphotons
+    assert not photon_array.hasAllocatedWavelengths()
+
+    # Initial values should all be 0
+    np.testing.assert_array_equal(photon_array.x, 0.)
+    np.testing.assert_array_equal(photon_array.y, 0.)
+    np.testing.assert_array_equal(photon_array.flux, 0.)
+
+    # The arrays are views, so setting them changes the underlying data.
+    ud = galsim.UniformDeviate(1234)
+    x = np.empty(nphotons)
+    ud.generate(x)
+    photon_array.x[:] = x
+    photon_array.y[:] = 2.*x
+    photon_array.flux[:] = 17.
+    np.testing.assert_array_equal(photon_array.x, x)
+    np.testing.assert_array_equal(photon_array.y, 2.*x)
+    np.testing.assert_almost_equal(photon_array.getTotalFlux(), 17.*nphotons)
+
+    photon_array.scaleXY(3.)
+    np.testing.assert_almost_equal(photon_array.x, 3.*x)
+    photon_array.scaleFlux(0.5)
+    np.testing.assert_almost_equal(photon_array.flux, 8.5)
+    photon_array.setTotalFlux(nphotons)
+    np.testing.assert_almost_equal(photon_array.flux, 1.)
+
+    # Accessing the wavelength array allocates it.
+    photon_array.wavelength[:] = 500.
+    assert photon_array.hasAllocatedWavelengths()
+    np.testing.assert_array_equal(photon_array.wavelength, 500.)
+
+    # The arrays keep the PhotonArray alive.
+    flux = galsim.PhotonArray(10).flux
+    flux[:] = 3.
+    np.testing.assert_array_equal(flux, 3.)
+
+    # Check the photons that come from shoot()
+    obj = galsim.Exponential(flux=1.7, scale_radius=2.3)
+    photon_array = obj.SBProfile.shoot(nphotons, ud)
+    assert photon_array.size() == nphotons
+    np.testing.assert_almost_equal(photon_array.getTotalFlux(), 1.7)
+    np.testing.assert_almost_equal(np.sum(photon_array.flux), 1.7)
+
+    # addTo bins the photons into an image
+    im = galsim.ImageD(64, 64, scale=1)
+    im.setCenter(0,0)
+    added_flux = photon_array.addTo(im.image)
+    np.testing.assert_almost_equal(im.array.sum(), added_flux)
+    assert added_flux <= 1.7 * (1. + 1.e-8)
+
+
+@timer
+def test_save_photons():
+    """Test the save_photons and photon_ops options in drawImage
+    """
+    obj = galsim.Gaussian(flux=1.e4, sigma=1.7)
+    rng = galsim.BaseDeviate(1234)
+
+    # With no photon_ops, the image should match the one drawn by drawShoot.
+    im1 = obj.drawImage(nx=32, ny=32, scale=0.3, method='phot', rng=rng.duplicate())
+    im2 = obj.drawImage(nx=32, ny=32, scale=0.3, method='phot', rng=rng.duplicate(),
+                        save_photons=True)
+    np.testing.assert_almost_equal(im2.array, im1.array)
+    np.testing.assert_almost_equal(im2.added_flux, im1.added_flux)
+
+    # The photons are in the coordinates of the returned image, so binning them should
+    # reproduce the image.
+    photons = im2.photons
+    np.testing.assert_almost_equal(np.sum(photons.flux), im2.added_flux, decimal=5)
+    im3 = im2.copy()
+    im3.setZero()
+    photons.addTo(im3.image)
+    np.testing.assert_almost_equal(im3.array, im2.array)
+    np.testing.assert_almost_equal(np.mean(photons.x), im2.trueCenter().x, decimal=1)
+    np.testing.assert_almost_equal(np.mean(photons.y), im2.trueCenter().y, decimal=1)
+
+    # A photon_op that shifts the photons by a fixed offset in world coordinates.
+    class Shift(object):
+        def applyTo(self, photon_array, local_wcs=None, rng=None):
+            photon_array.x[:] += local_wcs._x(0.6, 0.)
+            photon_array.y[:] += local_wcs._y(0.6, 0.)
+
+    im4 = obj.drawImage(nx=32, ny=32, scale=0.3, method='phot', rng=rng.duplicate(),
+                        photon_ops=[Shift()])
+    im5 = obj.drawImage(nx=32, ny=32, scale=0.3, method='phot', rng=rng.duplicate(),
+                        offset=(2,0))
+    np.testing.assert_almost_equal(im4.array, im5.array)
+
+    try:
+        np.testing.assert_raises(ValueError, obj.drawImage, method='fft', save_photons=True)
+        np.testing.assert_raises(ValueError, obj.drawImage, method='fft', photon_ops=[Shift()])
+        np.testing.assert_raises(ValueError, obj.drawImage, method='phot', n_threads=2,
+                                 save_photons=True)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_wavelength_sampler():
+    """Test the WavelengthSampler photon operator
+    """
+    nphotons = 100000
+    sed = galsim.SED(os.path.join(sedpath, 'CWW_E_ext.sed'), 'Ang', 'flambda').thin()
+    bandpass = galsim.Bandpass(os.path.join(bppath, 'LSST_r.dat'), 'nm').thin()
+
+    sampler = galsim.WavelengthSampler(sed, bandpass)
+    photon_array = galsim.PhotonArray(nphotons)
+    sampler.applyTo(photon_array, rng=galsim.BaseDeviate(1234))
+    wave = photon_array.wavelength
+    assert np.min(wave) >= bandpass.blue_limit
+    assert np.max(wave) <= bandpass.red_limit
+
+    # The mean wavelength should match the photon-weighted mean wavelength.
+    w = np.union1d(sed.wave_list, bandpass.wave_list)
+    w = w[(w >= bandpass.blue_limit) & (w <= bandpass.red_limit)]
+    pdf = sed(w) * bandpass(w)
+    mean = np.trapz(w * pdf, w) / np.trapz(pdf, w)
+    np.testing.assert_allclose(np.mean(wave), mean, rtol=1.e-3)
+
+    # Same seed gives the same wavelengths
+    photon_array2 = galsim.PhotonArray(nphotons)
+    sampler.applyTo(photon_array2, rng=galsim.BaseDeviate(1234))
+    np.testing.assert_array_equal(photon_array2.wavelength, wave)
+
+    do_pickle(sampler)
+
+
+@timer
+def test_dcr():
+    """Test the PhotonDCR photon operator against ChromaticAtmosphere
+    """
+    base_wavelength = 500.
+    zenith_angle = 45 * galsim.degrees
+    parallactic_angle = 30 * galsim.degrees
+    scale = 0.2
+    nphotons = 100000
+
+    dcr = galsim.PhotonDCR(base_wavelength=base_wavelength, zenith_angle=zenith_angle,
+                           parallactic_angle=parallactic_angle)
+    do_pickle(dcr)
+
+    # A photon at the base wavelength isn't moved.  Others are shifted by the difference in
+    # refraction along the direction toward the zenith.
+    wcs = galsim.JacobianWCS(scale, 0.01, -0.02, 1.1*scale)
+    photon_array = galsim.PhotonArray(3)
+    photon_array.wavelength[:] = [base_wavelength, 400., 700.]
+    dcr.applyTo(photon_array, local_wcs=wcs)
+    np.testing.assert_almost_equal(photon_array.x[0], 0.)
+    np.testing.assert_almost_equal(photon_array.y[0], 0.)
+    for i, w in enumerate([400., 700.]):
+        r = (galsim.dcr.get_refraction(w, zenith_angle) -
+             galsim.dcr.get_refraction(base_wavelength, zenith_angle))
+        r = r * galsim.radians / galsim.arcsec
+        sinp, cosp = parallactic_angle.sincos()
+        du, dv = -r * sinp, r * cosp
+        pos = wcs.toImage(galsim.PositionD(du, dv))
+        np.testing.assert_almost_equal(photon_array.x[i+1], pos.x)
+        np.testing.assert_almost_equal(photon_array.y[i+1], pos.y)
+
+    # Drawing with a WavelengthSampler and PhotonDCR should give the same centroid as drawing
+    # a ChromaticAtmosphere with alpha=0.
+    sed = galsim.SED('1', 'nm', 'fphotons')
+    bandpass = galsim.Bandpass('1', 'nm', blue_limit=400., red_limit=600.)
+    psf = galsim.Gaussian(fwhm=0.7)
+    sampler = galsim.WavelengthSampler(sed, bandpass)
+    im1 = psf.withFlux(nphotons).drawImage(nx=64, ny=64, scale=scale, method='phot',
+                                           rng=galsim.BaseDeviate(1234),
+                                           photon_ops=[sampler, dcr])
+    chrom = galsim.ChromaticAtmosphere(psf, base_wavelength=base_wavelength, alpha=0.,
+                                       zenith_angle=zenith_angle,
+                                       parallactic_angle=parallactic_angle)
+    im2 = (chrom * sed).drawImage(bandpass, nx=64, ny=64, scale=scale)
+    mom1 = im1.FindAdaptiveMom()
+    mom2 = im2.FindAdaptiveMom()
+    np.testing.assert_allclose(mom1.moments_centroid.x, mom2.moments_centroid.x, atol=0.05)
+    np.testing.assert_allclose(mom1.moments_centroid.y, mom2.moments_centroid.y, atol=0.05)
+
+    try:
+        # Wavelengths are required.
+        np.testing.assert_raises(RuntimeError, dcr.applyTo, galsim.PhotonArray(10))
+        np.testing.assert_raises(TypeError, galsim.PhotonDCR, base_wavelength=500.)
+        np.testing.assert_raises(TypeError, galsim.PhotonDCR, base_wavelength=500.,
+                                 zenith_angle=zenith_angle, blah=3)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_geometric_optics():
+    """Test the PhotonGeometricOptics photon operator
+    """
+    # A pure tip aberration deflects every photon by the same amount.  The Noll-normalized tip
+    # Zernike is 2 rho cos(phi), so the wavefront gradient is 4 tip lam_0 / diam.
+    tip = 0.5
+    lam_0 = 600.
+    diam = 2.0
+    optics = galsim.OpticalScreen(tip=tip, lam_0=lam_0)
+    op = galsim.PhotonGeometricOptics(optics, diam=diam, obscuration=0.3)
+    do_pickle(op)
+    photon_array = galsim.PhotonArray(1000)
+    op.applyTo(photon_array, rng=galsim.BaseDeviate(1234))
+    shift = 4 * tip * lam_0 / diam * 1.e-9 * galsim.radians / galsim.arcsec
+    np.testing.assert_array_almost_equal(photon_array.x, shift)
+    np.testing.assert_array_almost_equal(photon_array.y, 0.)
+
+    # In image coordinates.
+    wcs = galsim.JacobianWCS(0.2, 0.01, -0.02, 0.22)
+    photon_array = galsim.PhotonArray(10)
+    op.applyTo(photon_array, local_wcs=wcs, rng=galsim.BaseDeviate(1234))
+    pos = wcs.toImage(galsim.PositionD(shift, 0.))
+    np.testing.assert_array_almost_equal(photon_array.x, pos.x)
+    np.testing.assert_array_almost_equal(photon_array.y, pos.y)
+
+    # For an atmosphere, the geometric PSF convolved with the diffraction-limited PSF should be
+    # similar to the PhaseScreenPSF.
+    lam = 700.
+    diam = 4.0
+    exptime = 0.3
+    nphotons = 100000
+    scale = 0.1
+    atm = galsim.Atmosphere(screen_size=20.0, altitude=[0.0, 3.0], r0_500=[0.15, 0.2],
+                            speed=[8.0, 12.0], direction=[0*galsim.degrees, 45*galsim.degrees],
+                            rng=galsim.BaseDeviate(5678))
+    aper = galsim.Aperture(diam=diam, lam=lam, screen_list=atm)
+    theta = (0.1*galsim.arcmin, -0.05*galsim.arcmin)
+    op = galsim.PhotonGeometricOptics(atm, exptime=exptime, aper=aper, theta=theta)
+    atm.reset()
+    psf = atm.makePSF(lam=lam, exptime=exptime, aper=aper, theta=theta)
+    airy = galsim.Airy(lam=lam, diam=diam)
+
+    rng = galsim.BaseDeviate(1234)
+    im1 = airy.withFlux(nphotons).drawImage(nx=64, ny=64, scale=scale, method='phot', rng=rng,
+                                            photon_ops=[op])
+    im2 = psf.drawImage(nx=64, ny=64, scale=scale)
+    mom1 = im1.FindAdaptiveMom()
+    mom2 = im2.FindAdaptiveMom()
+    print('geometric sigma = ',mom1.moments_sigma,', fft sigma = ',mom2.moments_sigma)
+    np.testing.assert_allclose(mom1.moments_sigma, mom2.moments_sigma, rtol=0.2)
+    np.testing.assert_allclose(mom1.moments_centroid.x, mom2.moments_centroid.x, atol=0.5)
+    np.testing.assert_allclose(mom1.moments_centroid.y, mom2.moments_centroid.y, atol=0.5)
+
+    # Every batch of photons sees the same exposure, so the same rng gives the same photons.
+    im3 = airy.withFlux(nphotons).drawImage(nx=64, ny=64, scale=scale, method='phot',
+                                            rng=galsim.BaseDeviate(1234), photon_ops=[op])
+    np.testing.assert_array_equal(im3.array, im1.array)
+
+    try:
+        np.testing.assert_raises(ValueError, galsim.PhotonGeometricOptics, atm)
+        np.testing.assert_raises(ValueError, galsim.PhotonGeometricOptics, atm, exptime=-1,
+                                 diam=diam)
+        np.testing.assert_raises(TypeError, galsim.PhotonGeometricOptics, atm, diam=diam,
+                                 theta=(0.1, 0.2))
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+if __name__ == '__main__':
+    test_photon_array()
+    test_save_photons()
+    test_wavelength_sampler()
+    test_dcr()
+    test_geometric_optics()
@@ -0,0 +1,153 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+from __future__ import print_function
+import os
+import numpy as np
+from galsim_test_helpers import *
+
+try:
+    import galsim
+except ImportError:
+    import sys
+    path, filename = os.path.split(__file__)
+    sys.path.append(os.path.abspath(os.path.join(path, "..")))
+    import galsim
+
+
+def optical_psf(pos):
+    """A simple field-dependent optical PSF, for positions in [0,1000] x [0,1000]."""
+    return galsim.OpticalPSF(lam=700.0, diam=2.4, obscuration=0.2,
+                             defocus=0.2 + 0.3e-3*pos.x, coma1=-0.1e-3*pos.y,
+                             astig2=0.05 + 1.e-4*(pos.x-pos.y))
+
+
+@timer
+def test_psf_field():
+    """Test that PSFField reproduces the PSFs it was built from."""
+    bounds = galsim.BoundsD(0, 1000, 0, 1000)
+    psf_field = galsim.PSFField(optical_psf, bounds, nx=5, ny=4)
+    scale = psf_field.scale
+    n = psf_field.image_size
+    assert psf_field.npca == 20
+    assert psf_field.basis.shape == (20, n*n)
+
+    # With all the principal components, the PSFs at the grid positions are reproduced exactly.
+    for pos in [ galsim.PositionD(0, 0), galsim.PositionD(750, 1000./3.),
+                 galsim.PositionD(1000, 1000) ]:
+        im = optical_psf(pos).drawImage(nx=n, ny=n, scale=scale, method='no_pixel')
+        np.testing.assert_allclose(psf_field.getPSFArray(pos), im.array,
+                                   rtol=0, atol=1.e-10*np.max(im.array))
+
+    # Between the grid positions, the interpolation is a good approximation.
+    pos = galsim.PositionD(321.0, 654.0)
+    im = optical_psf(pos).drawImage(nx=n, ny=n, scale=scale, method='no_pixel')
+    ar = psf_field.getPSFArray(pos)
+    print('max diff = ',np.max(np.abs(ar-im.array)) / np.max(im.array))
+    assert np.max(np.abs(ar-im.array)) < 0.02 * np.max(im.array)
+
+    # getPSF returns the same thing as an InterpolatedImage.
+    psf = psf_field.getPSF(pos)
+    assert isinstance(psf, galsim.InterpolatedImage)
+    np.testing.assert_almost_equal(psf.getFlux(), ar.sum(), decimal=10)
+    im2 = psf.drawImage(nx=n, ny=n, scale=scale, method='no_pixel')
+    np.testing.assert_allclose(im2.array, ar, rtol=0, atol=1.e-6*np.max(ar))
+
+    # Truncating the PCA loses some accuracy, but not much for this smooth variation.
+    psf_field2 = galsim.PSFField(optical_psf, bounds, nx=5, ny=4, npca=4, interpolant='linear')
+    assert psf_field2.npca == 4
+    ar2 = psf_field2.getPSFArray(pos)
+    print('max diff (npca=4) = ',np.max(np.abs(ar2-im.array)) / np.max(im.array))
+    assert np.max(np.abs(ar2-im.array)) < 0.05 * np.max(im.array)
+
+    # Can also give a list of the PSFs on the grid.
+    psfs = [ optical_psf(p) for p in galsim.psf_field._grid_positions(bounds, 5, 4) ]
+    psf_field3 = galsim.PSFField(psfs, galsim.BoundsI(0, 1000, 0, 1000), nx=5, ny=4)
+    np.testing.assert_array_equal(psf_field3.getPSFArray(pos), psf_field.getPSFArray(pos))
+
+    try:
+        np.testing.assert_raises(ValueError, psf_field.getPSF, galsim.PositionD(-1, 300))
+        np.testing.assert_raises(ValueError, psf_field.getPSF, galsim.PositionD(300, 1001))
+        np.testing.assert_raises(ValueError, galsim.PSFField, optical_psf, bounds, nx=1)
+        np.testing.assert_raises(ValueError, galsim.PSFField, psfs[:-1], bounds, nx=5, ny=4)
+        np.testing.assert_raises(ValueError, galsim.PSFField, optical_psf, galsim.BoundsD())
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_psf_field_batch():
+    """Test building a PSFField from PhaseScreenList.makePSF with many field angles."""
+    rng = galsim.BaseDeviate(5678)
+    atm = galsim.Atmosphere(screen_size=10.0, altitude=10.0, r0_500=0.3, rng=rng)
+    atm.append(galsim.OpticalScreen(defocus=0.3, coma1=-0.2, lam_0=1000.0))
+    kwargs = dict(lam=1000.0, diam=1.0, exptime=0.03)
+
+    def psf_func(positions):
+        atm.reset()
+        theta = [ (pos.x*galsim.arcsec, pos.y*galsim.arcsec) for pos in positions ]
+        return atm.makePSF(theta=theta, **kwargs)
+
+    bounds = galsim.BoundsD(-20, 20, -20, 20)
+    psf_field = galsim.PSFField(psf_func, bounds, nx=3, scale=0.05, image_size=48, batch=True)
+    for pos in [ galsim.PositionD(-20, -20), galsim.PositionD(0, 20) ]:
+        atm.reset()
+        psf = atm.makePSF(theta=(pos.x*galsim.arcsec, pos.y*galsim.arcsec), **kwargs)
+        im = psf.drawImage(nx=48, ny=48, scale=0.05, method='no_pixel')
+        np.testing.assert_allclose(psf_field.getPSFArray(pos), im.array,
+                                   rtol=0, atol=1.e-10*np.max(im.array))
+
+
+@timer
+def test_psf_field_config():
+    """Test building a PSFField from a config dict."""
+    config = {
+        'input' : {
+            'psf_field' : {
+                'xmin' : 0, 'xmax' : 1000, 'ymin' : 0, 'ymax' : 1000, 'nx' : 5, 'ny' : 4,
+                'psf' : {
+                    'type' : 'OpticalPSF',
+                    'lam' : 700.0, 'diam' : 2.4, 'obscuration' : 0.2,
+                    'defocus' : '$0.2 + 0.3e-3 * image_pos.x',
+                    'coma1' : '$-0.1e-3 * image_pos.y',
+                    'astig2' : '$0.05 + 1.e-4 * (image_pos.x - image_pos.y)',
+                },
+            },
+        },
+        'psf1' : { 'type' : 'PSFField' },
+        'psf2' : { 'type' : 'PSFField', 'image_pos' : galsim.PositionD(789,567), 'flux' : 17 },
+
+        # This would normally be set by the config processing.  Set it manually here.
+        'image_pos' : galsim.PositionD(321, 654),
+    }
+    galsim.config.ProcessInput(config)
+    psf_field = galsim.PSFField(optical_psf, galsim.BoundsD(0, 1000, 0, 1000), nx=5, ny=4)
+
+    psf1a = galsim.config.BuildGSObject(config, 'psf1')[0]
+    psf1b = psf_field.getPSF(galsim.PositionD(321, 654))
+    gsobject_compare(psf1a, psf1b)
+
+    psf2a = galsim.config.BuildGSObject(config, 'psf2')[0]
+    psf2b = psf_field.getPSF(galsim.PositionD(789, 567)).withFlux(17)
+    gsobject_compare(psf2a, psf2b)
+
+
+if __name__ == "__main__":
+    test_psf_field()
+    test_psf_field_batch()
+    test_psf_field_config()
@@ -229,6 +229,22 @@ def test_uniform():
             testimage.array.flatten(), np.array(uResult), precision,
             err_msg='Wrong uniform random number sequence generated when applied to image.')
 
+    # Test generate
+    u.seed(testseed)
+    test_array = np.empty(3)
+    u.generate(test_array)
+    np.testing.assert_array_almost_equal(
+            test_array, np.array(uResult), precision,
+            err_msg='Wrong uniform random number sequence from generate.')
+
+    # Test generate with a non-contiguous float32 array
+    u.seed(testseed)
+    test_array = np.empty((3,2), dtype=np.float32)
+    u.generate(test_array[:,0])
+    np.testing.assert_array_almost_equal(
+            test_array[:,0], np.array(uResult), precisionF,
+            err_msg='Wrong uniform random number sequence from generate with non-contiguous array.')
+
     # Check picklability
     do_pickle(u, lambda x: x.serialize())
     do_pickle(u, lambda x: (x(), x(), x(), x()))
@@ -0,0 +1,171 @@
+# Copyright (c) 2012-2016 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+from __future__ import print_function
+import numpy as np
+import os
+import sys
+import pickle
+
+from galsim_test_helpers import *
+
+try:
+    import galsim
+except ImportError:
+    path, filename = os.path.split(__file__)
+    sys.path.append(os.path.abspath(os.path.join(path, "..")))
+    import galsim
+
+image_dir = './real_comparison_images'
+catalog_file = 'test_catalog.fits'
+
+
+@timer
+def test_arrays():
+    """Test that arrays round trip exactly through galsim.serialize.
+    """
+    rng = np.random.RandomState(1234)
+    a1 = rng.normal(size=(17,23))
+    a2 = np.asfortranarray(rng.normal(size=(5,7)).astype('>f4'))
+    a3 = (rng.uniform(size=40) * 1000).astype(np.int16)
+    a4 = rng.normal(size=(6,6)) + 1j * rng.normal(size=(6,6))
+    a5 = a1[::3, 2:9]
+    a6 = np.zeros((0,3))
+    a7 = np.array(3.5)
+    a8 = np.zeros(10000)
+    a9 = np.zeros(3, dtype=[('x', '<f8'), ('n', '>i4')])
+    a9['x'] = [1.,2.,3.]
+    a9['n'] = [4,5,6]
+    obj = { 'a1':a1, 'a2':a2, 'a3':a3, 'a4':a4, 'a5':a5, 'a6':a6, 'a7':a7, 'a8':a8, 'a9':a9,
+            'list' : [ 1, 'two', 3. ] }
+    obj2 = galsim.serialize.loads(galsim.serialize.dumps(obj))
+    assert sorted(obj2.keys()) == sorted(obj.keys())
+    assert obj2['list'] == obj['list']
+    for key in obj:
+        if key == 'list': continue
+        print(key, obj[key].dtype, obj2[key].dtype, obj[key].shape, obj2[key].shape)
+        assert obj2[key].dtype == obj[key].dtype
+        assert obj2[key].shape == obj[key].shape
+        np.testing.assert_array_equal(obj2[key], obj[key])
+        assert obj2[key].flags.writeable
+    assert obj2['a2'].flags.f_contiguous
+    assert obj2['a1'].flags.c_contiguous
+
+    # The same array in several places is only stored once, as is a copy of it.
+    # A view of it is a different array though.
+    buffers = []
+    data = galsim.serialize.dumps([a1, a1, a1.copy(), a5], buffer_callback=buffers.append)
+    assert len(buffers) == 2
+    obj2 = galsim.serialize.loads(data, buffers=buffers)
+    assert len(obj2) == 4
+    for a, b in zip(obj2, [a1, a1, a1.copy(), a5]):
+        np.testing.assert_array_equal(a, b)
+    # But as with pickle, the copy comes back as a separate array from the original.
+    assert obj2[1] is obj2[0]
+    assert obj2[2] is not obj2[0]
+    obj2[2][0,0] = 17.
+    assert obj2[0][0,0] == a1[0,0]
+    obj2[0][1,1] = 23.
+    assert obj2[1][1,1] == 23.
+    assert obj2[2][1,1] == a1[1,1]
+
+    # Likewise for two blank images.
+    im1 = galsim.ImageD(10, 10)
+    im2 = galsim.ImageD(10, 10)
+    im1b, im2b = galsim.serialize.loads(galsim.serialize.dumps([im1, im2]))
+    im1b.array[3,4] = 1.
+    assert im2b.array[3,4] == 0.
+
+    # Without compression, the payloads are the raw bytes of the arrays.
+    buffers = []
+    data = galsim.serialize.dumps(a8, buffer_callback=buffers.append, compress=0)
+    assert len(buffers) == 1
+    assert len(buffers[0]) == a8.nbytes
+    np.testing.assert_array_equal(galsim.serialize.loads(data, buffers=buffers), a8)
+    # With compression, the zeros are much smaller.
+    buffers = []
+    data = galsim.serialize.dumps(a8, buffer_callback=buffers.append)
+    assert len(buffers[0]) < a8.nbytes / 10
+    np.testing.assert_array_equal(galsim.serialize.loads(data, buffers=buffers), a8)
+
+    try:
+        np.testing.assert_raises(ValueError, galsim.serialize.loads, data)
+        np.testing.assert_raises(ValueError, galsim.serialize.loads, data, buffers=[])
+        np.testing.assert_raises(ValueError, galsim.serialize.loads, pickle.dumps(a8))
+        np.testing.assert_raises(ValueError, galsim.serialize.loads,
+                                 galsim.serialize.dumps(a8), buffers=buffers)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_profiles():
+    """Test serialization of GSObject and ChromaticObject trees.
+    """
+    im = galsim.Gaussian(sigma=1.7, flux=100).shear(g1=0.1, g2=0.3).drawImage(
+            nx=32, ny=32, scale=0.3)
+    # Two InterpolatedImages made from copies of the same image.
+    ii1 = galsim.InterpolatedImage(im, pad_factor=4)
+    ii2 = galsim.InterpolatedImage(im.copy(), pad_factor=4).shift(0.3,0.1)
+    psf = galsim.Moffat(beta=3.5, fwhm=0.8)
+    obj = galsim.Convolve(galsim.Add(ii1, ii2), psf)
+
+    data = galsim.serialize.dumps(obj)
+    obj2 = galsim.serialize.loads(data)
+    assert obj2 == obj
+    im1 = obj.drawImage(nx=40, ny=40, scale=0.3)
+    im2 = obj2.drawImage(nx=40, ny=40, scale=0.3)
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+    # The padded image is only stored once and compresses well.
+    pickle_data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    print('len(pickle) = ',len(pickle_data),', len(serialize) = ',len(data))
+    assert len(data) < len(pickle_data) / 3
+
+    # Out of band.
+    buffers = []
+    data = galsim.serialize.dumps(obj, buffer_callback=buffers.append)
+    assert len(data) + sum(len(b) for b in buffers) == len(galsim.serialize.dumps(obj))
+    obj2 = galsim.serialize.loads(data, buffers=[ bytes(b) for b in buffers ])
+    assert obj2 == obj
+
+    # RealGalaxy
+    rgc = galsim.RealGalaxyCatalog(catalog_file, dir=image_dir)
+    rg = galsim.RealGalaxy(rgc, index=1)
+    rg2 = galsim.serialize.loads(galsim.serialize.dumps(rg))
+    assert rg2 == rg
+    np.testing.assert_array_equal(rg2.gal_image.array, rg.gal_image.array)
+    np.testing.assert_array_equal(rg2.drawImage(nx=20, ny=20, scale=0.7).array,
+                                  rg.drawImage(nx=20, ny=20, scale=0.7).array)
+
+    # Chromatic
+    wave = np.linspace(500, 900, 101)
+    sed = galsim.SED(galsim.LookupTable(wave, wave**-1.5), wave_type='nm', flux_type='flambda')
+    bandpass = galsim.Bandpass(galsim.LookupTable(wave, np.ones_like(wave)), wave_type='nm')
+    atm = galsim.ChromaticAtmosphere(psf, 500, zenith_angle=0.3*galsim.radians)
+    cobj = galsim.Convolve(ii1 * sed, atm)
+    cobj2 = galsim.serialize.loads(galsim.serialize.dumps(cobj))
+    assert cobj2 == cobj
+    np.testing.assert_array_equal(
+        cobj2.drawImage(bandpass, nx=20, ny=20, scale=0.3).array,
+        cobj.drawImage(bandpass, nx=20, ny=20, scale=0.3).array)
+
+
+if __name__ == "__main__":
+    test_arrays()
+    test_profiles()
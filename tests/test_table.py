@@ -361,6 +361,155 @@ def test_table2d():
         print('The assert_raises tests require nose')
 
 
+@timer
+def test_table2d_gradient():
+    """Check LookupTable2D.gradient against finite differences of the table.
+    """
+    def f(x_, y_):
+        return np.sin(x_) * np.cos(y_) + x_
+
+    x = np.linspace(0.1, 3.3, 25)
+    y = np.linspace(0.2, 10.4, 75)
+    yy, xx = np.meshgrid(y, x)
+    tab2d = galsim.LookupTable2D(x, y, f(xx, yy))
+
+    # Stay away from the grid lines, where the bilinear interpolation has a kink.
+    rng = np.random.RandomState(1234)
+    i = rng.randint(0, len(x)-1, size=100)
+    j = rng.randint(0, len(y)-1, size=100)
+    newx = x[i] + (x[i+1]-x[i]) * rng.uniform(0.1, 0.9, size=100)
+    newy = y[j] + (y[j+1]-y[j]) * rng.uniform(0.1, 0.9, size=100)
+    h = 1.e-5
+    dfdx, dfdy = tab2d.gradient(newx, newy)
+    np.testing.assert_array_almost_equal(
+        dfdx, (tab2d(newx+h, newy) - tab2d(newx-h, newy)) / (2*h), 6)
+    np.testing.assert_array_almost_equal(
+        dfdy, (tab2d(newx, newy+h) - tab2d(newx, newy-h)) / (2*h), 6)
+    # Scalar and 2d inputs.
+    dfdx0, dfdy0 = tab2d.gradient(newx[0], newy[0])
+    assert dfdx0 == dfdx[0] and dfdy0 == dfdy[0]
+    dfdx2, dfdy2 = tab2d.gradient(newx.reshape(10,10), newy.reshape(10,10))
+    np.testing.assert_array_equal(dfdx2, dfdx.reshape(10,10))
+    np.testing.assert_array_equal(dfdy2, dfdy.reshape(10,10))
+
+    # A linear function has an exact gradient everywhere, including the edges.
+    tab2d = galsim.LookupTable2D(x, y, 2*xx + 3*yy, edge_mode='constant', constant=7)
+    dfdx, dfdy = tab2d.gradient([x[0], 1.234, x[-1], x[-1]+1], [y[0], 5.678, y[-1], y[0]])
+    np.testing.assert_array_almost_equal(dfdx, [2, 2, 2, 0])
+    np.testing.assert_array_almost_equal(dfdy, [3, 3, 3, 0])
+
+    # Wrapping
+    x = np.arange(8) * 0.5
+    y = np.arange(10) * 0.3
+    yy, xx = np.meshgrid(y, x)
+    tab2d = galsim.LookupTable2D(x, y, np.sin(2*np.pi*xx/4.) * np.cos(2*np.pi*yy/3.),
+                                 edge_mode='wrap')
+    dfdx, dfdy = tab2d.gradient(newx[:10], newy[:10])
+    dfdx2, dfdy2 = tab2d.gradient(newx[:10] + 3*4., newy[:10] - 2*3.)
+    np.testing.assert_array_almost_equal(dfdx2, dfdx)
+    np.testing.assert_array_almost_equal(dfdy2, dfdy)
+
+    # Piecewise constant interpolants have zero gradient.
+    tab2d = galsim.LookupTable2D(x, y, xx + yy, interpolant='floor')
+    assert tab2d.gradient(1.1, 1.1) == (0., 0.)
+
+    try:
+        tab2d = galsim.LookupTable2D(x, y, xx + yy)
+        np.testing.assert_raises(ValueError, tab2d.gradient, 1e6, 1e6)
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
+@timer
+def test_table2d_cubic():
+    """Check the cubic interpolant, wrapping, and evalShifted for LookupTable2D.
+    """
+    def f(x_, y_):
+        return np.sin(x_) * np.cos(y_) + x_
+
+    x = np.linspace(0.1, 3.3, 25)
+    y = np.linspace(0.2, 10.4, 75)
+    yy, xx = np.meshgrid(y, x)
+    z = f(xx, yy)
+    tab_lin = galsim.LookupTable2D(x, y, z)
+    tab_cub = galsim.LookupTable2D(x, y, z, interpolant='cubic')
+    do_pickle(tab_cub)
+    do_pickle(tab_cub.table)
+    assert tab_cub != tab_lin
+
+    # The cubic interpolant matches the tabulated values, and is much more accurate in between.
+    np.testing.assert_array_almost_equal(tab_cub(xx, yy), z, 12)
+    newx = np.linspace(0.2, 3.1, 45)
+    newy = np.linspace(0.3, 10.1, 85)
+    newyy, newxx = np.meshgrid(newy, newx)
+    # (Away from the edges, where the derivatives are one-sided differences.)
+    inner = (newxx > 0.5) & (newxx < 2.9) & (newyy > 0.6) & (newyy < 10.0)
+    err_lin = np.max(np.abs(tab_lin(newxx, newyy) - f(newxx, newyy))[inner])
+    err_cub = np.max(np.abs(tab_cub(newxx, newyy) - f(newxx, newyy))[inner])
+    print('max error: linear = ',err_lin,', cubic = ',err_cub)
+    assert err_cub < err_lin / 5.
+    # A bilinear function is exact, even on an unequally spaced grid.
+    x2 = np.delete(x, [3, 10, 11])
+    y2 = np.delete(y, [5, 40])
+    yy2, xx2 = np.meshgrid(y2, x2)
+    tab = galsim.LookupTable2D(x2, y2, 2*xx2 + 3*yy2 - xx2*yy2, interpolant='cubic')
+    np.testing.assert_array_almost_equal(tab(newxx, newyy), 2*newxx + 3*newyy - newxx*newyy)
+    dfdx, dfdy = tab.gradient(newxx, newyy)
+    np.testing.assert_array_almost_equal(dfdx, 2 - newyy)
+    np.testing.assert_array_almost_equal(dfdy, 3 - newxx)
+
+    # The gradient matches finite differences, including across the grid lines.
+    h = 1.e-6
+    dfdx, dfdy = tab_cub.gradient(newxx, newyy)
+    np.testing.assert_array_almost_equal(
+        dfdx, (tab_cub(newxx+h, newyy) - tab_cub(newxx-h, newyy)) / (2*h), 5)
+    np.testing.assert_array_almost_equal(
+        dfdy, (tab_cub(newxx, newyy+h) - tab_cub(newxx, newyy-h)) / (2*h), 5)
+    dfdx0, dfdy0 = tab_cub.gradient(newxx[3,4], newyy[3,4])
+    assert dfdx0 == dfdx[3,4] and dfdy0 == dfdy[3,4]
+
+    # Wrapping is done in C++ now, and the cubic interpolant is periodic across the edges.
+    x = np.arange(16) * 0.25
+    y = np.arange(20) * 0.15
+    yy, xx = np.meshgrid(y, x)
+    z = np.sin(2*np.pi*xx/4.) * np.cos(2*np.pi*yy/3.)
+    for interpolant in ['linear', 'cubic']:
+        tab = galsim.LookupTable2D(x, y, z, interpolant=interpolant, edge_mode='wrap')
+        do_pickle(tab)
+        assert tab.table.isPeriodic()
+        np.testing.assert_array_almost_equal(tab(newxx+8., newyy-6.), tab(newxx, newyy))
+        np.testing.assert_almost_equal(tab(-0.1, -0.1), tab(3.9, 2.9))
+        dfdx, dfdy = tab.gradient(newxx, newyy)
+        dfdx2, dfdy2 = tab.gradient(newxx-12., newyy+3.)
+        np.testing.assert_array_almost_equal(dfdx2, dfdx)
+        np.testing.assert_array_almost_equal(dfdy2, dfdy)
+    # Just below and just above the seam of the periodic table agree.
+    tab = galsim.LookupTable2D(x, y, z, interpolant='cubic', edge_mode='wrap')
+    np.testing.assert_almost_equal(tab(4.-1.e-9, 1.), tab(1.e-9, 1.), 6)
+    np.testing.assert_almost_equal(tab.gradient(4.-1.e-9, 1.)[0], tab.gradient(1.e-9, 1.)[0], 6)
+    # And the interpolation is accurate there.
+    xs = np.array([3.9, 3.95, 0.05, 0.1])
+    np.testing.assert_array_almost_equal(tab(xs, 1.+0*xs),
+                                         np.sin(2*np.pi*xs/4.) * np.cos(2*np.pi/3.), 2)
+
+    # evalShifted is equivalent to a loop over the shifts.
+    dx = np.array([0., 1.3, -7.2, 20.])
+    dy = np.array([0.5, -0.1, 2.2, -15.])
+    for edge_mode in ['wrap', 'constant']:
+        tab = galsim.LookupTable2D(x, y, z, interpolant='cubic', edge_mode=edge_mode)
+        ref = np.array([tab(newxx + dx[m], newyy + dy[m]) for m in range(len(dx))])
+        np.testing.assert_array_almost_equal(tab.evalShifted(newxx, newyy, dx, dy), ref)
+    tab = galsim.LookupTable2D(x, y, z)
+    ref = np.array([tab(newx/2. + dx[m], newx/4. + dy[m]/10.) for m in range(2)])
+    np.testing.assert_array_almost_equal(tab.evalShifted(newx/2., newx/4., dx[:2], dy[:2]/10.), ref)
+
+    try:
+        np.testing.assert_raises(ValueError, tab.evalShifted, newxx, newyy, dx, dy)
+        np.testing.assert_raises(ValueError, galsim.LookupTable2D, x, y, z, interpolant='spline')
+    except ImportError:
+        print('The assert_raises tests require nose')
+
+
 @timer
 def test_ne():
     """ Check that inequality works as expected."""
@@ -384,4 +533,6 @@ if __name__ == "__main__":
     test_log()
     test_roundoff()
     test_table2d()
+    test_table2d_gradient()
+    test_table2d_cubic()
     test_ne()
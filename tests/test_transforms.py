@@ -593,6 +593,39 @@ def test_integer_shift_photon():
         err_msg="Integer shift failed for FFT rendered Gaussian GSObject with only PSF shifted ")
 
 
+@timer
+def test_elongated_fft():
+    """Test FFT drawing of highly elongated profiles, which use a rectangular FFT.
+    """
+    # A Gaussian stretched by a large factor in x convolved with a round Gaussian is another
+    # Gaussian, which can be drawn analytically.
+    sigma = 0.3
+    psf_sigma = 0.25
+    stretch = 30.
+    gal = galsim.Gaussian(sigma=sigma).transform(stretch, 0., 0., 1.).withFlux(test_flux)
+    psf = galsim.Gaussian(sigma=psf_sigma)
+    sx = np.sqrt((stretch*sigma)**2 + psf_sigma**2)
+    sy = np.sqrt(sigma**2 + psf_sigma**2)
+    true_prof = galsim.Gaussian(sigma=1.).transform(sx, 0., 0., sy).withFlux(test_flux)
+
+    for angle in [0., 90., 32.]:
+        for shift in [(0., 0.), (1.3, -0.4)]:
+            final = galsim.Convolve(gal.rotate(angle * galsim.degrees), psf).shift(shift)
+            true = true_prof.rotate(angle * galsim.degrees).shift(shift)
+            if angle == 0.:
+                nx, ny = 200, 30
+            elif angle == 90.:
+                nx, ny = 30, 200
+            else:
+                nx, ny = 200, 120
+            im1 = final.drawImage(nx=nx, ny=ny, scale=0.2, method='no_pixel')
+            im2 = true.drawImage(nx=nx, ny=ny, scale=0.2, method='no_pixel')
+            print('angle, shift = ',angle,shift,' max diff = ',np.max(np.abs(im1.array-im2.array)))
+            np.testing.assert_allclose(
+                im1.array, im2.array, rtol=0, atol=1.e-4 * np.max(im2.array),
+                err_msg="FFT drawing of elongated profile disagrees with analytic result")
+
+
 @timer
 def test_flip():
     """Test several ways to flip a profile
@@ -827,5 +860,6 @@ if __name__ == "__main__":
     test_rescale()
     test_integer_shift_fft()
     test_integer_shift_photon()
+    test_elongated_fft()
     test_flip()
     test_ne()